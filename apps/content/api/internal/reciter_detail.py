@@ -1,12 +1,12 @@
 import datetime
 from typing import Literal
 
-from django.db.models import Count, Q
+from django.db.models import F
 from django.utils.translation import gettext_lazy as _
 from ninja import Field, Schema
 from pydantic import AwareDatetime
 
-from apps.content.models import CategoryChoice, Reciter, StatusChoice
+from apps.content.models import Reciter
 from apps.core.ninja_utils.errors import ItqanError, NinjaErrorResponse
 from apps.core.ninja_utils.request import Request
 from apps.core.ninja_utils.router import ItqanRouter
@@ -47,13 +47,9 @@ class ReciterDetailOut(Schema):
 )
 def get_reciter(request: Request, reciter_slug: str):
     try:
-        return Reciter.objects.annotate(
-            recitations_count=Count(
-                "assets",
-                filter=Q(assets__category=CategoryChoice.RECITATION, assets__status=StatusChoice.READY),
-                distinct=True,
-            )
-        ).get(slug=reciter_slug, is_active=True)
+        return Reciter.objects.annotate(recitations_count=F("ready_recitations_count")).get(
+            slug=reciter_slug, is_active=True
+        )
     except Reciter.DoesNotExist as exc:
         raise ItqanError(
             error_name="reciter_not_found",
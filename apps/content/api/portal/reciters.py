@@ -2,13 +2,13 @@ import datetime
 import logging
 from typing import Annotated, Literal
 
-from django.db.models import Count, Q
+from django.db.models import F
 from django.utils.translation import gettext_lazy as _
 from ninja import Field, File, FilterLookup, FilterSchema, Form, Query, Schema, UploadedFile
 from ninja.pagination import paginate
 from pydantic import AwareDatetime
 
-from apps.content.models import CategoryChoice, Reciter, StatusChoice
+from apps.content.models import Reciter
 from apps.content.services.reciter import ReciterService
 from apps.core.ninja_utils.errors import ItqanError, NinjaErrorResponse
 from apps.core.ninja_utils.ordering_base import ordering
@@ -126,13 +126,7 @@ class ReciterFilter(FilterSchema):
 )
 @searching(search_fields=["name_en", "name_ar", "bio_en", "bio_ar"])
 def list_reciters(request: Request, filters: ReciterFilter = Query()):
-    qs = Reciter.objects.annotate(
-        recitations_count=Count(
-            "assets",
-            filter=Q(assets__category=CategoryChoice.RECITATION, assets__status=StatusChoice.READY),
-            distinct=True,
-        )
-    )
+    qs = Reciter.objects.annotate(recitations_count=F("ready_recitations_count"))
     return filters.filter(qs)
 
 
@@ -146,13 +140,7 @@ def list_reciters(request: Request, filters: ReciterFilter = Query()):
 @permission_required([permission_class(PermissionChoice.PORTAL_READ_RECITER)])
 def get_reciter(request: Request, reciter_slug: str):
     try:
-        return Reciter.objects.annotate(
-            recitations_count=Count(
-                "assets",
-                filter=Q(assets__category=CategoryChoice.RECITATION, assets__status=StatusChoice.READY),
-                distinct=True,
-            )
-        ).get(slug=reciter_slug)
+        return Reciter.objects.annotate(recitations_count=F("ready_recitations_count")).get(slug=reciter_slug)
     except Reciter.DoesNotExist as exc:
         raise ItqanError(
             error_name="reciter_not_found",
@@ -188,13 +176,7 @@ def create_reciter(
     )
     logger.info(f"Reciter created [reciter_id={reciter.id}, user_id={request.user.id}]")
     # Re-fetch with recitations_count annotation for the response schema
-    return 201, Reciter.objects.annotate(
-        recitations_count=Count(
-            "assets",
-            filter=Q(assets__category=CategoryChoice.RECITATION, assets__status=StatusChoice.READY),
-            distinct=True,
-        )
-    ).get(slug=reciter.slug)
+    return 201, Reciter.objects.annotate(recitations_count=F("ready_recitations_count")).get(slug=reciter.slug)
 
 
 @router.patch(
@@ -222,13 +204,7 @@ def patch_reciter(
 
     reciter = service.update_reciter(reciter_slug, fields)
     logger.info(f"Reciter updated [reciter_id={reciter.id}, user_id={request.user.id}]")
-    return Reciter.objects.annotate(
-        recitations_count=Count(
-            "assets",
-            filter=Q(assets__category=CategoryChoice.RECITATION, assets__status=StatusChoice.READY),
-            distinct=True,
-        )
-    ).get(slug=reciter.slug)
+    return Reciter.objects.annotate(recitations_count=F("ready_recitations_count")).get(slug=reciter.slug)
 
 
 @router.delete(
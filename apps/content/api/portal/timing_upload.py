@@ -81,7 +81,7 @@ def upload_timing(
         asset_version, filename = sync_asset_recitations_json_file(asset_id=asset.id, folder_id=folder.id)
 
     # bulk_create/bulk_update bypass Django signals, so invalidate explicitly.
-    invalidate_recitation_tracks_cache(asset.id)
+    invalidate_recitation_tracks_cache(asset.id, folder_id=folder.id)
 
     synced_file_url = asset_version.file_url.url if asset_version.file_url else None
 
@@ -0,0 +1,86 @@
+from typing import Literal
+
+from django.db.models import Q
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.utils.translation import gettext_lazy as _
+from ninja import Query, Schema
+
+from apps.content.repositories.recitation import RecitationRepository
+from apps.content.services.asset_access import enforce_asset_access_on_public_api
+from apps.content.services.recitation_ayah_range import RANGE_BUILD_RETRY_AFTER_SECONDS, RecitationAyahRangeService
+from apps.core.ninja_utils.errors import NinjaErrorResponse
+from apps.core.ninja_utils.request import Request
+from apps.core.ninja_utils.router import ItqanRouter
+from apps.core.ninja_utils.tags import NinjaTag
+from apps.usage_tracking.decorators.track_usage import track_extra, track_usage
+from config.settings.base import CLOUDFLARE_R2_PUBLIC_BASE_URL
+
+router = ItqanRouter(tags=[NinjaTag.RECITATIONS])
+
+
+class AyahRangePendingOut(Schema):
+    message: str
+    retry_after: int
+
+
+@router.get(
+    "recitations/{asset_id}/ayahs/",
+    response={
+        202: AyahRangePendingOut,
+        302: None,
+        400: NinjaErrorResponse[Literal["invalid_ayah_range"]],
+        401: NinjaErrorResponse[Literal["authentication_required"]],
+        403: NinjaErrorResponse[Literal["access_denied"]],
+        404: NinjaErrorResponse[Literal["not_found"]]
+        | NinjaErrorResponse[Literal["folder_not_found"]]
+        | NinjaErrorResponse[Literal["ayah_range_not_available"]],
+        503: NinjaErrorResponse[Literal["ayah_range_failed"]] | NinjaErrorResponse[Literal["storage_error"]],
+    },
+)
+@track_usage()
+def get_recitation_ayah_range(
+    request: Request,
+    asset_id: int,
+    from_ayah: str = Query(..., description='First ayah of the range, e.g. "2:5"'),
+    to_ayah: str = Query(..., description='Last ayah of the range (inclusive), e.g. "2:10"'),
+    folder: str | None = Query(None),
+    *,
+    response: HttpResponse,
+):
+    """
+    Redirect to one MP3 holding the ayahs ``from_ayah``..``to_ayah`` of a recitation.
+
+    Both ends must be in the same surah. The file is combined from the per-ayah
+    slices in the background after the first request, which gets 202 with a
+    ``Retry-After``; once it is cached, requests redirect straight to it.
+    """
+    asset = RecitationRepository().get_asset_object(asset_id, Q(restricted_for_tenant=False))
+    if not asset:
+        raise Http404(str(_("No asset matches the given query.")))
+
+    enforce_asset_access_on_public_api(getattr(request, "user", None), asset)
+
+    publisher_name = asset.publisher.name if asset.publisher_id else None
+    track_extra(
+        request,
+        entity_type="recitation_ayah_range",
+        accessed_entity_name=asset.name_ar,
+        entity_ids=[asset.id],
+        entity_names=[asset.name_ar],
+        publisher_ids=[asset.publisher_id] if asset.publisher_id else [],
+        publisher_names=[publisher_name] if asset.publisher_id else [],
+    )
+
+    key = RecitationAyahRangeService().get_range_key(asset.id, folder, from_ayah, to_ayah)
+    if key is None:
+        response["Retry-After"] = str(RANGE_BUILD_RETRY_AFTER_SECONDS)
+        response["Cache-Control"] = "no-store"
+        return 202, AyahRangePendingOut(
+            message=str(_("The audio for this ayah range is being prepared. Retry shortly.")),
+            retry_after=RANGE_BUILD_RETRY_AFTER_SECONDS,
+        )
+
+    resp = HttpResponseRedirect(f"{CLOUDFLARE_R2_PUBLIC_BASE_URL}/media/{key}")
+    # Short-lived: a re-slice moves the range to a new content-addressed key.
+    resp["Cache-Control"] = "public, max-age=300, s-maxage=300"
+    return resp
@@ -4,10 +4,15 @@ from django.db.models import Q
 from ninja import FilterLookup, FilterSchema, Query, Schema
 from ninja.pagination import paginate
 
+from apps.content.cache import acontent_list_etag
+from apps.content.models import Asset
 from apps.content.repositories.recitation import RecitationRepository
 from apps.content.services.recitation import RecitationService
 from apps.content.services.recitation_folder_resolution import sorted_asset_folders
+from apps.core.ninja_utils.conditional import conditional
 from apps.core.ninja_utils.ordering_base import ordering
+from apps.core.ninja_utils.paginations import CatalogPagination
+from apps.core.ninja_utils.projection import ProjectableSchema, Projection
 from apps.core.ninja_utils.router import ItqanRouter
 from apps.core.ninja_utils.searching_base import searching
 from apps.core.ninja_utils.tags import NinjaTag
@@ -43,7 +48,7 @@ class RecitationFolderOut(Schema):
     is_default: bool
 
 
-class RecitationListOut(Schema):
+class RecitationListOut(ProjectableSchema):
     id: int
     name: str
     description: str
@@ -70,16 +75,25 @@ class RecitationListOut(Schema):
     def resolve_riwayah(obj):
         return {"id": obj.riwayah_id, "name": obj.riwayah.name}
 
-    @staticmethod
-    def resolve_surahs_count(obj):
-        return getattr(obj, "surahs_count", 0)
-
     @staticmethod
     def resolve_folders(obj):
         # Lets a consumer discover which ?folder= values this recitation accepts.
         return sorted_asset_folders(obj)
 
 
+# Pages are read from .values() rows rather than Assets; the projection yields what
+# the resolvers above would.
+RECITATION_LIST_PROJECTION = Projection(
+    RecitationListOut,
+    Asset,
+    lookups={"folders": "recitation_folders"},
+    # Read by track_usage off the page; not part of the response.
+    extra=("name_ar", "publisher_id", "publisher__name_ar"),
+    # The order of sorted_asset_folders.
+    sort_keys={"folders": lambda folder: (not folder["is_default"], folder["name"] or "")},
+)
+
+
 class RecitationFilter(FilterSchema):
     publisher_id: Annotated[list[int] | None, FilterLookup(q="publisher_id__in")] = None
     reciter_id: Annotated[list[int] | None, FilterLookup(q="reciter_id__in")] = None
@@ -89,7 +103,8 @@ class RecitationFilter(FilterSchema):
 
 @router.get("recitations/", response=list[RecitationListOut])
 @track_usage(entity_type="recitation", publisher_from="publisher")
-@paginate
+@conditional(acontent_list_etag)
+@paginate(CatalogPagination)
 @ordering(ordering_fields=["name", "created_at", "updated_at"])
 @searching(
     search_fields=[
@@ -104,11 +119,11 @@ class RecitationFilter(FilterSchema):
         "qiraah__name_ar",
     ]
 )
-def list_recitations(request, filters: RecitationFilter = Query()):
+async def list_recitations(request, filters: RecitationFilter = Query()):
     repo = RecitationRepository()
     service = RecitationService(repo)
 
     # Public API doesn't filter by publisher by default, so we pass an empty Q object
-    qs = service.get_all_recitations(Q(restricted_for_tenant=False), filters, annotate_surahs_count=True)
+    qs = service.get_all_recitations(Q(restricted_for_tenant=False), filters)
 
-    return qs
+    return RECITATION_LIST_PROJECTION.apply(qs)
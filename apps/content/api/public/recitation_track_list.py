@@ -1,6 +1,6 @@
-import json
 from typing import Literal
 
+from asgiref.sync import sync_to_async
 from django.core.cache import cache
 from django.db.models import Q
 from django.http import Http404, HttpResponse
@@ -9,22 +9,31 @@ from ninja import Query, Schema
 
 from apps.content.cache import (
     RECITATION_ASSET_META_CACHE_TTL,
-    RECITATION_RESPONSE_CACHE_TTL,
+    RECITATION_FOLDER_ALIAS_CACHE_TTL,
     folder_cache_token,
     recitation_asset_meta_cache_key,
-    recitation_response_cache_key,
+    recitation_cache,
+    recitation_folder_alias_cache_key,
+    recitation_lookup_l1,
 )
 from apps.content.repositories.recitation import RecitationRepository
 from apps.content.services.asset_access import enforce_asset_access_on_public_api
 from apps.content.services.recitation import RecitationService
-from apps.core.mixins.constants import QURAN_SURAHS
+from apps.content.services.recitation_tracks_payload import (
+    RecitationTracksPayload,
+    aget_cached_recitation_tracks_payload,
+    get_recitation_tracks_payload,
+    is_full_recitation_tracks_page,
+    render_recitation_tracks_page,
+)
+from apps.core.compression import accepted_encodings
+from apps.core.ninja_utils.conditional import not_modified, set_validators, strong_etag
 from apps.core.ninja_utils.errors import NinjaErrorResponse
 from apps.core.ninja_utils.paginations import DEFAULT_PAGE_SIZE, PUBLIC_RECITATION_MAX_PAGE_SIZE
 from apps.core.ninja_utils.request import Request
 from apps.core.ninja_utils.router import ItqanRouter
 from apps.core.ninja_utils.tags import NinjaTag
 from apps.usage_tracking.decorators.track_usage import track_extra, track_usage
-from config.settings.base import CLOUDFLARE_R2_PUBLIC_BASE_URL
 
 router = ItqanRouter(tags=[NinjaTag.RECITATIONS])
 
@@ -53,13 +62,14 @@ class RecitationSurahTrackOut(Schema):
     "recitations/{asset_id}/",
     response={
         200: list[RecitationSurahTrackOut],
+        304: None,
         401: NinjaErrorResponse[Literal["authentication_required"]],
         403: NinjaErrorResponse[Literal["access_denied"]],
         404: NinjaErrorResponse[Literal["not_found"]] | NinjaErrorResponse[Literal["folder_not_found"]],
     },
 )
 @track_usage()
-def list_recitation_tracks(
+async def list_recitation_tracks(
     request: Request,
     asset_id: int,
     page: int = Query(1, ge=1, le=114),
@@ -68,16 +78,22 @@ def list_recitation_tracks(
 ):
     page_size = min(page_size, PUBLIC_RECITATION_MAX_PAGE_SIZE)
 
-    # Key on the *requested* folder rather than the resolved one: resolving it would
-    # need a DB read before the cache lookup, defeating the warm-cache no-query
-    # guarantee. folder_cache_token keeps the raw value safe to embed in a key.
-    _resp_key = recitation_response_cache_key(asset_id, page, page_size, folder_cache_token(folder))
-    _meta_key = recitation_asset_meta_cache_key(asset_id)
-
-    cached_resp: bytes | None = cache.get(_resp_key)
-    cached_meta: dict | None = cache.get(_meta_key)
-
-    if cached_resp is not None and cached_meta is not None:
+    # Key the folder alias on the *requested* folder rather than the resolved one:
+    # resolving it would need a DB read before the cache lookup, defeating the
+    # warm-cache no-query guarantee. folder_cache_token keeps the raw value key-safe.
+    # Both keys carry the asset's cache generation, read once for the two of them.
+    generations = await recitation_cache.agenerations(asset_id)
+    _alias_key = recitation_folder_alias_cache_key(asset_id, folder_cache_token(folder), generations)
+    _meta_key = recitation_asset_meta_cache_key(asset_id, generations)
+
+    cached = await recitation_lookup_l1.aget_many([_meta_key, _alias_key])
+    cached_meta: dict | None = cached.get(_meta_key)
+    folder_id: int | None = cached.get(_alias_key)
+    payload: RecitationTracksPayload | None = None
+    if cached_meta is not None and folder_id is not None:
+        payload = await aget_cached_recitation_tracks_payload(asset_id, folder_id)
+
+    if payload is not None:
         track_extra(
             request,
             entity_type="recitation_track",
@@ -87,11 +103,16 @@ def list_recitation_tracks(
             publisher_ids=[cached_meta["publisher_id"]] if cached_meta["publisher_id"] else [],
             publisher_names=[cached_meta["publisher_name"]] if cached_meta["publisher_id"] else [],
         )
-        resp = HttpResponse(cached_resp, content_type="application/json")
-        resp["Cache-Control"] = "public, max-age=300, s-maxage=300"
-        return resp
+        return _tracks_page_response(request, payload, page, page_size)
+
+    # Cache miss: the DB lookups and a possible (single-flight) build run in a thread.
+    payload = await sync_to_async(_load_tracks_payload)(request, asset_id, folder, _meta_key, _alias_key)
+    return _tracks_page_response(request, payload, page, page_size)
 
-    # Cache miss - hit DB.
+
+def _load_tracks_payload(
+    request: Request, asset_id: int, folder: str | None, meta_key: str, alias_key: str
+) -> RecitationTracksPayload:
     repo = RecitationRepository()
     service = RecitationService(repo)
 
@@ -119,51 +140,53 @@ def list_recitation_tracks(
         publisher_names=[publisher_name] if asset.publisher_id else [],
     )
 
-    tracks = service.get_asset_tracks(
-        asset_id,
-        Q(asset__restricted_for_tenant=False),
-        prefetch_timings=True,
-        folder=folder,
-    )
-
-    all_results = []
-    for track in tracks:
-        audio_url = f"{CLOUDFLARE_R2_PUBLIC_BASE_URL}/media/{track.audio_file.name}"
-        surah = QURAN_SURAHS[track.surah_number]
-        all_results.append(
-            {
-                "surah_number": track.surah_number,
-                "surah_name": surah["name"],
-                "surah_name_en": surah["name_en"],
-                "audio_url": audio_url,
-                "duration_ms": track.duration_ms,
-                "size_bytes": track.size_bytes,
-                "revelation_order": surah["revelation_order"],
-                "revelation_place": surah["revelation_place"],
-                "ayahs_count": surah["ayahs_count"],
-                "ayahs_timings": [
-                    {
-                        "ayah_key": t.ayah_key,
-                        "start_ms": t.start_ms,
-                        "end_ms": t.end_ms,
-                        "duration_ms": t.duration_ms,
-                    }
-                    for t in track.ayah_timings.all()
-                ],
-            }
-        )
-
-    total = len(all_results)
-    offset = (page - 1) * page_size
-    paginated = all_results[offset : offset + page_size]
-
-    response_bytes = json.dumps({"results": paginated, "count": total}).encode()
-
-    if offset < total:
-        # Only cache pages that have content; out-of-range pages are not worth storing.
-        cache.set(_resp_key, response_bytes, RECITATION_RESPONSE_CACHE_TTL)
-    cache.set(_meta_key, asset_meta, RECITATION_ASSET_META_CACHE_TTL)
-
-    resp = HttpResponse(response_bytes, content_type="application/json")
+    folder_id = service.resolve_folder(asset_id, folder).id
+    # The artefact is rebuilt in the background whenever tracks or timings change;
+    # it is only built here when no reader has needed it yet.
+    payload = get_recitation_tracks_payload(asset_id, folder_id)
+
+    cache.set(meta_key, asset_meta, RECITATION_ASSET_META_CACHE_TTL)
+    cache.set(alias_key, folder_id, RECITATION_FOLDER_ALIAS_CACHE_TTL)
+    return payload
+
+
+def _tracks_page_response(
+    request: Request, payload: RecitationTracksPayload, page: int, page_size: int
+) -> HttpResponse:
+    """
+    Serve one page of the artefact.
+
+    The whole list goes out as the stored brotli or gzip bytes; other pages are cut
+    uncompressed and left to CompressionMiddleware.
+    """
+    encoding, stored_body = _stored_encoding(request, payload, page, page_size)
+    # Strong validators are per representation, so each stored body gets its own tag.
+    etag = strong_etag(payload.get("digest"), page, page_size, encoding)
+    last_modified = payload.get("built_at")
+
+    resp = not_modified(request, etag, last_modified)
+    if resp is None:
+        if stored_body is not None:
+            resp = HttpResponse(stored_body, content_type="application/json")
+            resp["Content-Encoding"] = encoding
+        else:
+            resp = HttpResponse(
+                render_recitation_tracks_page(payload, page, page_size), content_type="application/json"
+            )
+        set_validators(resp, etag, last_modified)
+    resp["Vary"] = "Accept-Encoding"
     resp["Cache-Control"] = "public, max-age=300, s-maxage=300"
     return resp
+
+
+def _stored_encoding(
+    request: Request, payload: RecitationTracksPayload, page: int, page_size: int
+) -> tuple[str, bytes | None]:
+    if not is_full_recitation_tracks_page(payload, page, page_size):
+        return "identity", None
+    accepted = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+    if "br" in accepted and payload.get("body_br"):
+        return "br", payload["body_br"]
+    if "gzip" in accepted:
+        return "gzip", payload["body"]
+    return "identity", None
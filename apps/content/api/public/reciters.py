@@ -1,12 +1,15 @@
 from typing import Annotated
 
-from django.db.models import Count, Q
+from django.db.models import F
 from ninja import FilterLookup, FilterSchema, Query, Schema
 from ninja.pagination import paginate
 from pydantic import Field
 
-from apps.content.models import CategoryChoice, Reciter, StatusChoice
+from apps.content.cache import acontent_list_etag
+from apps.content.models import Reciter
+from apps.core.ninja_utils.conditional import conditional
 from apps.core.ninja_utils.ordering_base import ordering
+from apps.core.ninja_utils.paginations import CatalogPagination
 from apps.core.ninja_utils.request import Request
 from apps.core.ninja_utils.router import ItqanRouter
 from apps.core.ninja_utils.searching_base import searching
@@ -31,10 +34,11 @@ class ReciterFilter(FilterSchema):
 
 @router.get("reciters/", response=list[ReciterOut])
 @track_usage(entity_type="reciter")
-@paginate
+@conditional(acontent_list_etag)
+@paginate(CatalogPagination)
 @ordering(ordering_fields=["name"])
 @searching(search_fields=["name_en", "name_ar", "slug"])
-def list_reciters(request: Request, filters: ReciterFilter = Query()):
+async def list_reciters(request: Request, filters: ReciterFilter = Query()):
     """
     List reciters that have at least one READY recitation Asset.
 
@@ -44,23 +48,10 @@ def list_reciters(request: Request, filters: ReciterFilter = Query()):
     - Asset.status = READY
     """
 
-    recitation_filter = Q(
-        assets__category=CategoryChoice.RECITATION,
-        assets__status=StatusChoice.READY,
-    )
-
+    # The READY recitation count is stored on the reciter (apps.content.services.catalog_counters).
     qs = (
-        Reciter.objects.filter(
-            is_active=True,
-        )
-        .filter(recitation_filter)
-        .distinct()
-        .annotate(
-            recitations_count=Count(
-                "assets",
-                filter=recitation_filter,
-            )
-        )
+        Reciter.objects.filter(is_active=True, ready_recitations_count__gt=0)
+        .annotate(recitations_count=F("ready_recitations_count"))
         .order_by("name")
     )
 
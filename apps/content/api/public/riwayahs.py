@@ -1,10 +1,13 @@
-from django.db.models import Count, Q
+from django.db.models import F
 from ninja import Schema
 from ninja.pagination import paginate
 from pydantic import Field
 
-from apps.content.models import CategoryChoice, Riwayah, StatusChoice
+from apps.content.cache import acontent_list_etag
+from apps.content.models import Riwayah
+from apps.core.ninja_utils.conditional import conditional
 from apps.core.ninja_utils.ordering_base import ordering
+from apps.core.ninja_utils.paginations import CatalogPagination
 from apps.core.ninja_utils.request import Request
 from apps.core.ninja_utils.router import ItqanRouter
 from apps.core.ninja_utils.tags import NinjaTag
@@ -25,9 +28,10 @@ class RiwayahOut(Schema):
 
 @router.get("riwayahs/", response=list[RiwayahOut])
 @track_usage(entity_type="riwayah")
-@paginate
+@conditional(acontent_list_etag)
+@paginate(CatalogPagination)
 @ordering(ordering_fields=["name"])
-def list_riwayahs(request: Request):
+async def list_riwayahs(request: Request):
     """
     List riwayahs that have at least one READY recitation Asset.
 
@@ -38,24 +42,10 @@ def list_riwayahs(request: Request):
     - Asset.status = READY
     """
 
-    recitation_filter = Q(
-        assets__category=CategoryChoice.RECITATION,
-        assets__riwayah__isnull=False,
-        assets__status=StatusChoice.READY,
-    )
-
+    # The READY recitation count is stored on the riwayah (apps.content.services.catalog_counters).
     qs = (
-        Riwayah.objects.filter(
-            is_active=True,
-        )
-        .filter(recitation_filter)
-        .distinct()
-        .annotate(
-            recitations_count=Count(
-                "assets",
-                filter=recitation_filter,
-            )
-        )
+        Riwayah.objects.filter(is_active=True, ready_recitations_count__gt=0)
+        .annotate(recitations_count=F("ready_recitations_count"))
         .order_by("name")
     )
 
@@ -2,8 +2,10 @@ from ninja import FilterSchema, Query, Schema
 from ninja.pagination import paginate
 from pydantic import Field
 
+from apps.content.cache import content_list_etag
 from apps.content.repositories.recitation import RecitationRepository
 from apps.content.services.riwayah import RiwayahService
+from apps.core.ninja_utils.conditional import conditional
 from apps.core.ninja_utils.ordering_base import ordering
 from apps.core.ninja_utils.request import Request
 from apps.core.ninja_utils.router import ItqanRouter
@@ -37,6 +39,7 @@ class QiraahFilter(FilterSchema):
 
 
 @router.get("qiraahs/", response=list[QiraahOut])
+@conditional(content_list_etag)
 @paginate
 @ordering(ordering_fields=["name"])
 @searching(search_fields=["name", "slug"])
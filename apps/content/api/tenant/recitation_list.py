@@ -3,10 +3,12 @@ from typing import Annotated
 from ninja import FilterLookup, FilterSchema, Query, Schema
 from ninja.pagination import paginate
 
+from apps.content.cache import content_list_etag
 from apps.content.models import Asset
 from apps.content.repositories.recitation import RecitationRepository
 from apps.content.services.recitation import RecitationService
 from apps.content.services.recitation_folder_resolution import sorted_asset_folders
+from apps.core.ninja_utils.conditional import conditional
 from apps.core.ninja_utils.ordering_base import ordering
 from apps.core.ninja_utils.request import Request
 from apps.core.ninja_utils.router import ItqanRouter
@@ -66,6 +68,7 @@ class RecitationFilter(FilterSchema):
 
 
 @router.get("recitations/", response=list[RecitationListOut])
+@conditional(content_list_etag)
 @paginate
 @ordering(ordering_fields=["name", "created_at", "updated_at"])
 @searching(search_fields=["name", "description", "publisher__name", "reciter__name"])
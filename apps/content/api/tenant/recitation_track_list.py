@@ -6,10 +6,12 @@ from ninja import Query, Schema
 from ninja.pagination import paginate
 from pydantic import Field
 
+from apps.content.cache import content_list_etag
 from apps.content.models import RecitationSurahTrack
 from apps.content.repositories.recitation import RecitationRepository
 from apps.content.services.recitation import RecitationService
 from apps.core.mixins.constants import QURAN_SURAHS
+from apps.core.ninja_utils.conditional import conditional
 from apps.core.ninja_utils.errors import NinjaErrorResponse
 from apps.core.ninja_utils.request import Request
 from apps.core.ninja_utils.router import ItqanRouter
@@ -51,6 +53,7 @@ class RecitationSurahTrackOut(Schema):
         404: NinjaErrorResponse[Literal["not_found"]] | NinjaErrorResponse[Literal["folder_not_found"]],
     },
 )
+@conditional(content_list_etag)
 @paginate
 def list_recitation_tracks(request: Request, asset_id: int, folder: str | None = Query(None)):
     repo = RecitationRepository()
@@ -4,8 +4,10 @@ from ninja import FilterLookup, FilterSchema, Query, Schema
 from ninja.pagination import paginate
 from pydantic import Field
 
+from apps.content.cache import content_list_etag
 from apps.content.repositories.recitation import RecitationRepository
 from apps.content.services.recitation import RecitationService
+from apps.core.ninja_utils.conditional import conditional
 from apps.core.ninja_utils.ordering_base import ordering
 from apps.core.ninja_utils.request import Request
 from apps.core.ninja_utils.router import ItqanRouter
@@ -29,6 +31,7 @@ class ReciterFilter(FilterSchema):
 
 
 @router.get("reciters/", response=list[ReciterOut])
+@conditional(content_list_etag)
 @paginate
 @ordering(ordering_fields=["name"])
 @searching(search_fields=["name_en", "name_ar", "slug"])
@@ -1,7 +1,21 @@
+from collections.abc import Callable
 import hashlib
+import logging
 import re
+import time
+from typing import TypeVar
+import uuid
 
 from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import get_language
+
+from apps.core.local_cache import LocalCache
+from apps.core.ninja_utils.conditional import strong_etag
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 # Stands in for "caller did not name a folder" in cache keys, so the default-folder
 # response gets its own entry without a DB lookup to resolve the real slug.
@@ -12,15 +26,215 @@ _SAFE_CACHE_TOKEN_RE = re.compile(r"^[a-z0-9_.-]{1,64}$")
 
 RECITATION_TRACKS_CACHE_TTL = 60 * 5  # 5 minutes
 RECITATION_ASSET_META_CACHE_TTL = 60 * 60  # 1 hour - asset name/publisher rarely changes
-RECITATION_RESPONSE_CACHE_TTL = 60 * 5  # 5 minutes
+# Rebuilt on every change, so the TTL only bounds memory held by assets nobody reads.
+RECITATION_TRACKS_PAYLOAD_CACHE_TTL = 60 * 60 * 24  # 24 hours
+RECITATION_FOLDER_ALIAS_CACHE_TTL = 60 * 60  # 1 hour
+# Debounce window for payload rebuilds: a 114-track upload fires one signal per track,
+# and all of them within this window collapse into a single rebuild.
+RECITATION_PAYLOAD_REBUILD_DELAY_SECONDS = 10
+
+# Single-flight: the lock lease bounds how long a crashed builder can hold others
+# off; the wait is how long a caller with nothing stale to serve polls for the result.
+SINGLE_FLIGHT_LEASE_SECONDS = 15
+SINGLE_FLIGHT_WAIT_SECONDS = 3
+_SINGLE_FLIGHT_POLL_SECONDS = 0.05
+SINGLE_FLIGHT_METRICS = ("builds", "lock_waits", "wait_timeouts", "stale_serves")
+
+
+# Generations are read on every cached request and change rarely; workers keep them
+# in-process and drop them on the invalidation broadcast, with a short TTL as backstop.
+_generation_l1 = LocalCache("cache_generations", ttl=5)
+# Versioned keys never go stale, only unreachable, so their L1 copies are always safe.
+recitation_lookup_l1 = LocalCache("recitation_lookups", ttl=60)
+
+
+class CacheNamespace:
+    """
+    Generation-versioned cache keys for one family of entries.
+
+    A scope is a path of ids, e.g. ``(asset_id,)`` or ``(asset_id, folder_id)``.
+    Every key built for a scope embeds the generation of that scope and of each
+    enclosing one, so ``invalidate`` is a single atomic INCR that makes every key
+    below the scope unreachable at once -- whatever page or variant it was for --
+    while other scopes keep their hot entries. Orphaned entries expire on their TTL.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def _generation_key(self, scope: tuple) -> str:
+        return f"{self.name}:generation:" + ":".join(str(part) for part in scope)
+
+    @staticmethod
+    def _seed() -> int:
+        # Seed from the clock rather than from 0: a generation key evicted and then
+        # re-seeded can never come back to a value that old entries were written under.
+        return time.time_ns() // 1000
+
+    def generations(self, *scope) -> tuple[int, ...]:
+        """Generation of each prefix of ``scope``, outermost first; one round trip when warm."""
+        keys = [self._generation_key(scope[: depth + 1]) for depth in range(len(scope))]
+        found = _generation_l1.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            for key in missing:
+                cache.add(key, self._seed(), timeout=None)
+            seeded = cache.get_many(missing)
+            for key, generation in seeded.items():
+                _generation_l1.set(key, generation)
+            found.update(seeded)
+        return tuple(found.get(key, 0) for key in keys)
+
+    async def agenerations(self, *scope) -> tuple[int, ...]:
+        """``generations`` for async views: an L1 hit costs no await at all."""
+        keys = [self._generation_key(scope[: depth + 1]) for depth in range(len(scope))]
+        found = await _generation_l1.aget_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            for key in missing:
+                await cache.aadd(key, self._seed(), timeout=None)
+            seeded = await cache.aget_many(missing)
+            for key, generation in seeded.items():
+                _generation_l1.set(key, generation)
+            found.update(seeded)
+        return tuple(found.get(key, 0) for key in keys)
+
+    def key(self, entry: str, scope: tuple, *parts, generations: tuple[int, ...] | None = None) -> str:
+        """
+        Versioned key of ``entry`` under ``scope``, with ``parts`` appended verbatim.
+
+        Pass ``generations`` (from ``generations(*scope)``) when building several
+        keys for the same scope, to read the counters once.
+        """
+        if generations is None:
+            generations = self.generations(*scope)
+        versioned = ":".join(f"{part}.{generation}" for part, generation in zip(scope, generations, strict=True))
+        return ":".join([self.name, entry, versioned, *(str(part) for part in parts)])
+
+    def invalidate(self, *scope) -> None:
+        """Move ``scope`` (and everything below it) to a new generation."""
+        key = self._generation_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never read yet, or evicted: any fresh seed differs from what was used before.
+            cache.set(key, self._seed(), timeout=None)
+        _generation_l1.invalidate([key], shared=False)
+
+
+def _single_flight_metric_key(metric: str) -> str:
+    return f"single_flight:metrics:{metric}"
+
+
+def _count_single_flight(metric: str) -> None:
+    key = _single_flight_metric_key(metric)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def single_flight_metrics() -> dict[str, int]:
+    """
+    What single_flight callers did, for dashboards and shell checks.
+
+    The counters are ``INCR``s on shared cache keys, so on Redis they are cluster-wide
+    totals across every web and Celery process since the keys were last cleared, not
+    per-process figures. They never expire; read the rate of change, not the value.
+    """
+    found = cache.get_many([_single_flight_metric_key(metric) for metric in SINGLE_FLIGHT_METRICS])
+    return {metric: found.get(_single_flight_metric_key(metric), 0) for metric in SINGLE_FLIGHT_METRICS}
+
+
+def single_flight(
+    key: str,
+    build: Callable[[], T],
+    *,
+    stale: T | None = None,
+    lease: int = SINGLE_FLIGHT_LEASE_SECONDS,
+    wait: float = SINGLE_FLIGHT_WAIT_SECONDS,
+) -> T:
+    """
+    Run ``build`` for ``key`` in one worker at a time; ``build`` must store its result under ``key``.
+
+    The first caller takes a short-lease lock (``cache.add`` is SET NX EX on Redis)
+    and builds. Everyone else serves ``stale`` when there is one, otherwise polls
+    ``key`` for up to ``wait`` seconds for the builder's result. If it never lands
+    (the builder died, or is unusually slow) the caller builds it itself, so a
+    lost lock costs one duplicate build rather than an error.
+    """
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, lease):
+        _count_single_flight("builds")
+        try:
+            return build()
+        finally:
+            # Past its lease the lock may already belong to another builder.
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    if stale is not None:
+        _count_single_flight("stale_serves")
+        return stale
+
+    _count_single_flight("lock_waits")
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(_SINGLE_FLIGHT_POLL_SECONDS)
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+    _count_single_flight("wait_timeouts")
+    logger.warning(f"Single-flight wait timed out, building without the lock [key={key}]")
+    return build()
 
 
-def recitation_tracks_cache_key(asset_id: int) -> str:
-    return f"public_recitation_tracks:{asset_id}"
+# Scopes: (asset_id,) for asset-wide entries, (asset_id, folder_id) for one folder's tracks.
+recitation_cache = CacheNamespace("public_recitation")
 
 
-def recitation_asset_meta_cache_key(asset_id: int) -> str:
-    return f"public_recitation_asset_meta:{asset_id}"
+# One global scope, moved on by any change that can alter a public or tenant list
+# response (assets, reciters, riwayahs, qiraahs, publishers, folders, tracks).
+content_catalog_cache = CacheNamespace("content_catalog")
+CONTENT_CATALOG_SCOPE = "lists"
+
+
+def invalidate_content_catalog() -> None:
+    content_catalog_cache.invalidate(CONTENT_CATALOG_SCOPE)
+
+
+def content_list_etag(request) -> str:
+    """
+    Validator of a list response, from the catalog generation and what the response varies by.
+
+    The full path carries page, filters, search and ordering; the language picks the
+    modeltranslation fields; the publisher scopes tenant lists. One cache read, no DB.
+    """
+    (generation,) = content_catalog_cache.generations(CONTENT_CATALOG_SCOPE)
+    return _content_list_etag(request, generation)
+
+
+async def acontent_list_etag(request) -> str:
+    """``content_list_etag`` for async views."""
+    (generation,) = await content_catalog_cache.agenerations(CONTENT_CATALOG_SCOPE)
+    return _content_list_etag(request, generation)
+
+
+def _content_list_etag(request, generation: int) -> str:
+    publisher = getattr(request, "publisher", None)
+    return strong_etag(
+        "content_list", generation, request.get_full_path(), get_language(), publisher.id if publisher else ""
+    )
+
+
+def recitation_tracks_cache_key(asset_id: int, generations: tuple[int, ...] | None = None) -> str:
+    return recitation_cache.key("tracks", (asset_id,), generations=generations)
+
+
+def recitation_asset_meta_cache_key(asset_id: int, generations: tuple[int, ...] | None = None) -> str:
+    return recitation_cache.key("asset_meta", (asset_id,), generations=generations)
 
 
 def folder_cache_token(folder: str | None) -> str:
@@ -45,20 +259,75 @@ def folder_cache_token(folder: str | None) -> str:
     return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
 
 
-def recitation_response_cache_key(asset_id: int, page: int, page_size: int, folder_slug: str) -> str:
-    # The folder is part of the key: two variants of the same recitation share an
-    # asset_id, so omitting it would serve one variant's audio for the other.
-    return f"public_recitation_resp:{asset_id}:{folder_slug}:{page}:{page_size}"
+def recitation_tracks_payload_cache_key(asset_id: int, folder_id: int) -> str:
+    # Keyed by the resolved folder: one artefact per variant serves every page,
+    # page_size and spelling of ?folder= that resolves to it. Deliberately not
+    # versioned: the artefact carries the generations it was built under instead,
+    # so the previous one can still be served while its replacement is rebuilt.
+    # The v2 prefix retires artefacts cached before they carried the uncompressed body.
+    return f"public_recitation_payload:v2:{asset_id}:{folder_id}"
+
+
+def recitation_folder_alias_cache_key(
+    asset_id: int, folder_token: str, generations: tuple[int, ...] | None = None
+) -> str:
+    # Maps a requested ?folder= value (see folder_cache_token) to its folder id, so a
+    # warm request finds the artefact without resolving the folder in the DB.
+    return recitation_cache.key("folder_alias", (asset_id,), folder_token, generations=generations)
 
 
-def invalidate_recitation_tracks_cache(asset_id: int) -> None:
-    # Deleting meta is sufficient: the view requires both resp AND meta for a cache hit,
-    # so clearing meta forces a full DB rebuild on the next request. Stale resp bytes
-    # for any (page, page_size) variant are overwritten on that rebuild and expire
-    # naturally within RECITATION_RESPONSE_CACHE_TTL (5 min) for untouched variants.
-    cache.delete_many(
-        [
-            recitation_tracks_cache_key(asset_id),
-            recitation_asset_meta_cache_key(asset_id),
-        ]
+def _recitation_payload_rebuild_pending_key(asset_id: int) -> str:
+    return f"public_recitation_payload_rebuild_pending:{asset_id}"
+
+
+def schedule_recitation_tracks_payload_rebuild(asset_id: int) -> None:
+    """
+    Queue one rebuild of the asset's track payloads after the current transaction commits.
+
+    ``cache.add`` only succeeds for the first caller in the debounce window, so a
+    bulk upload enqueues one task instead of one per track. The task clears the
+    flag before it reads, so a change landing mid-rebuild schedules another.
+    """
+    if not cache.add(
+        _recitation_payload_rebuild_pending_key(asset_id), 1, RECITATION_PAYLOAD_REBUILD_DELAY_SECONDS * 6
+    ):
+        return
+
+    from apps.content.tasks import rebuild_recitation_tracks_payload_task
+
+    transaction.on_commit(
+        lambda: rebuild_recitation_tracks_payload_task.apply_async(
+            args=[asset_id], countdown=RECITATION_PAYLOAD_REBUILD_DELAY_SECONDS
+        )
     )
+
+
+def clear_recitation_tracks_payload_rebuild_pending(asset_id: int) -> None:
+    cache.delete(_recitation_payload_rebuild_pending_key(asset_id))
+
+
+def is_recitation_tracks_payload_rebuild_pending(asset_id: int) -> bool:
+    return cache.get(_recitation_payload_rebuild_pending_key(asset_id)) is not None
+
+
+async def ais_recitation_tracks_payload_rebuild_pending(asset_id: int) -> bool:
+    return await cache.aget(_recitation_payload_rebuild_pending_key(asset_id)) is not None
+
+
+def invalidate_recitation_tracks_cache(asset_id: int, folder_id: int | None = None) -> None:
+    """
+    Make the asset's cached responses stale in one INCR and queue the payload rebuild.
+
+    With ``folder_id`` only that folder's scope moves on, so the other folders of
+    the asset keep their hot entries; without it every entry of the asset does.
+    Stale payloads keep being served until the debounced background rebuild
+    replaces them, instead of every page variant stampeding into the track/timing
+    queries.
+    """
+    if folder_id is None:
+        recitation_cache.invalidate(asset_id)
+    else:
+        recitation_cache.invalidate(asset_id, folder_id)
+    # Tenant track lists are validated against the catalog generation.
+    invalidate_content_catalog()
+    schedule_recitation_tracks_payload_rebuild(asset_id)
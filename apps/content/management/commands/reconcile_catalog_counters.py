@@ -0,0 +1,24 @@
+"""
+Repair the stored catalogue counters (``Asset.surahs_count`` and the
+``ready_recitations_count`` of reciters, riwayahs and qiraahs):
+
+    python manage.py reconcile_catalog_counters
+
+Saves keep the counters current through signals; run this after a bulk
+``QuerySet.update()``, raw SQL or a data import that bypassed them. Only counters
+that disagree with their source rows are written, so a clean run writes nothing.
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from apps.content.services.catalog_counters import reconcile_catalog_counters
+
+
+class Command(BaseCommand):
+    help = "Recount the stored catalogue counters and repair the ones that drifted."
+
+    def handle(self, *args: Any, **kwargs: Any) -> None:
+        for model_name, repaired in reconcile_catalog_counters().items():
+            self.stdout.write(f"{model_name}: {repaired} counter(s) repaired")
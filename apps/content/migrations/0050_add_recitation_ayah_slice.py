@@ -0,0 +1,67 @@
+# Generated by Django 5.2.14 on 2026-10-17 06:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0049_recitation_track_folder_constraints"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecitationAyahSlice",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(help_text="Unique identifier for this record", primary_key=True, serialize=False),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, help_text="Timestamp when this record was created"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, help_text="Timestamp when this record was last updated"),
+                ),
+                (
+                    "ayah_key",
+                    models.CharField(help_text='Format "surah_number:ayah_number" e.g. "2:255"', max_length=20),
+                ),
+                (
+                    "slice_key",
+                    models.CharField(
+                        help_text="Storage key of the sliced file (without media/ prefix)", max_length=512
+                    ),
+                ),
+                (
+                    "source_etag",
+                    models.CharField(
+                        help_text="ETag of the source track object the slice was cut from", max_length=255
+                    ),
+                ),
+                (
+                    "start_ms",
+                    models.PositiveIntegerField(help_text="Start offset the slice was cut at, in milliseconds"),
+                ),
+                ("end_ms", models.PositiveIntegerField(help_text="End offset the slice was cut at, in milliseconds")),
+                (
+                    "encoder_params",
+                    models.JSONField(default=dict, help_text="Encoder settings and probed source parameters used"),
+                ),
+                (
+                    "track",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ayah_slices",
+                        to="content.recitationsurahtrack",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("track", "ayah_key")},
+            },
+        ),
+    ]
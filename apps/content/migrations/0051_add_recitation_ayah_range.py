@@ -0,0 +1,62 @@
+# Generated by Django 5.2.14 on 2026-10-17 06:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0050_add_recitation_ayah_slice"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecitationAyahRange",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(help_text="Unique identifier for this record", primary_key=True, serialize=False),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, help_text="Timestamp when this record was created"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, help_text="Timestamp when this record was last updated"),
+                ),
+                ("first_ayah", models.PositiveIntegerField(help_text="First ayah number of the range (inclusive)")),
+                ("last_ayah", models.PositiveIntegerField(help_text="Last ayah number of the range (inclusive)")),
+                (
+                    "content_hash",
+                    models.CharField(help_text="SHA-256 of the slice fingerprints", max_length=64, unique=True),
+                ),
+                (
+                    "range_key",
+                    models.CharField(
+                        help_text="Storage key of the combined file (without media/ prefix)", max_length=512
+                    ),
+                ),
+                (
+                    "size_bytes",
+                    models.PositiveBigIntegerField(default=0, help_text="Size of the combined file in bytes"),
+                ),
+                (
+                    "last_accessed_at",
+                    models.DateTimeField(db_index=True, help_text="Last time the range was served (LRU clock)"),
+                ),
+                (
+                    "track",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ayah_ranges",
+                        to="content.recitationsurahtrack",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
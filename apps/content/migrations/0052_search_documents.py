@@ -0,0 +1,72 @@
+# Generated by Django 5.2.14 on 2026-10-17 08:00
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from apps.core.migration_operations import PostgresAddIndex
+
+# Mirrors Asset/Reciter.SEARCH_DOCUMENT_SOURCES and apps.core.search — copied rather
+# than imported so this migration keeps working if those later change.
+ASSET_SOURCES = (
+    "name_en",
+    "name_ar",
+    "description_en",
+    "description_ar",
+    "publisher__name_en",
+    "publisher__name_ar",
+    "reciter__name_en",
+    "reciter__name_ar",
+    "riwayah__name_en",
+    "riwayah__name_ar",
+    "qiraah__name_en",
+    "qiraah__name_ar",
+)
+RECITER_SOURCES = ("name_en", "name_ar", "slug")
+
+
+def _document(values):
+    return "\n".join(value.replace("\x00", "").lower() for value in values if value)
+
+
+def backfill_search_documents(apps, schema_editor):
+    for model_name, sources in (("Asset", ASSET_SOURCES), ("Reciter", RECITER_SOURCES)):
+        model = apps.get_model("content", model_name)
+        rows = model.objects.values_list("pk", *sources).iterator(chunk_size=500)
+        documents = [model(pk=pk, search_document=_document(values)) for pk, *values in rows]
+        model.objects.bulk_update(documents, ["search_document"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0051_add_recitation_ayah_range"),
+        ("publishers", "0013_publishermember_group"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="asset",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="reciter",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+        PostgresAddIndex(
+            model_name="asset",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"], name="content_asset_search_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        PostgresAddIndex(
+            model_name="reciter",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"], name="content_reciter_search_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
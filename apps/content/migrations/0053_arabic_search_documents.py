@@ -0,0 +1,82 @@
+# Generated by Django 5.2.14 on 2026-10-17 08:08
+
+import re
+import unicodedata
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+from apps.core.migration_operations import PostgresAddIndex
+
+# Mirrors the models' SEARCH_DOCUMENT_SOURCES and apps.core.search — copied rather
+# than imported so this migration keeps working if those later change.
+SOURCES = {
+    "Asset": (
+        "name_en",
+        "name_ar",
+        "description_en",
+        "description_ar",
+        "publisher__name_en",
+        "publisher__name_ar",
+        "reciter__name_en",
+        "reciter__name_ar",
+        "riwayah__name_en",
+        "riwayah__name_ar",
+        "qiraah__name_en",
+        "qiraah__name_ar",
+    ),
+    "Reciter": ("name_en", "name_ar", "slug"),
+    "Riwayah": ("name_en", "name_ar", "slug"),
+    "Qiraah": ("name_en", "name_ar", "slug"),
+}
+ARABIC_MARKS = re.compile("[\u0610-\u061a\u0640\u064b-\u065f\u0670\u06d6-\u06ed\u08d3-\u08ff]")
+ARABIC_LETTER_FOLDS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ة": "ه", "ى": "ي"})
+
+
+def _normalize(value):
+    value = unicodedata.normalize("NFKC", value.replace("\x00", "")).lower()
+    return ARABIC_MARKS.sub("", value).translate(ARABIC_LETTER_FOLDS)
+
+
+def rebuild_search_documents(apps, schema_editor):
+    for model_name, sources in SOURCES.items():
+        model = apps.get_model("content", model_name)
+        rows = model.objects.values_list("pk", *sources).iterator(chunk_size=500)
+        documents = [
+            model(pk=pk, search_document="\n".join(n for value in values if value and (n := _normalize(value))))
+            for pk, *values in rows
+        ]
+        model.objects.bulk_update(documents, ["search_document"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0052_search_documents"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="qiraah",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="riwayah",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(rebuild_search_documents, migrations.RunPython.noop),
+        PostgresAddIndex(
+            model_name="qiraah",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"], name="content_qiraah_search_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        PostgresAddIndex(
+            model_name="riwayah",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"], name="content_riwayah_search_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.14 on 2026-10-17 08:40
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Mirrors apps.content.services.catalog_counters (and CategoryChoice/StatusChoice) --
+# copied rather than imported so this migration keeps working if those later change.
+READY_RECITATION = {"category": "recitation", "status": "ready"}
+
+
+def _count(queryset, outer_ref):
+    counted = queryset.filter(**{outer_ref: OuterRef("pk")}).order_by().values(outer_ref)
+    return Coalesce(
+        Subquery(counted.annotate(total=Count("pk")).values("total"), output_field=IntegerField()), Value(0)
+    )
+
+
+def backfill_catalog_counters(apps, schema_editor):
+    Asset = apps.get_model("content", "Asset")
+    RecitationSurahTrack = apps.get_model("content", "RecitationSurahTrack")
+    ready = Asset.objects.filter(**READY_RECITATION)
+    Asset.objects.update(surahs_count=_count(RecitationSurahTrack.objects.filter(folder__is_default=True), "asset"))
+    apps.get_model("content", "Reciter").objects.update(ready_recitations_count=_count(ready, "reciter"))
+    apps.get_model("content", "Riwayah").objects.update(ready_recitations_count=_count(ready, "riwayah"))
+    apps.get_model("content", "Qiraah").objects.update(ready_recitations_count=_count(ready, "riwayah__qiraah"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0053_arabic_search_documents"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="surahs_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="qiraah",
+            name="ready_recitations_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="reciter",
+            name="ready_recitations_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="riwayah",
+            name="ready_recitations_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_catalog_counters, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@ import logging
 import re
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import FileExtensionValidator, MaxValueValidator, MinValueValidator
 from django.db import models
 from django.utils import timezone
@@ -9,7 +10,7 @@ from django.utils.translation import gettext_lazy as _
 from django_countries.fields import CountryField
 
 from apps.core.mixins.storage import DeleteFilesOnDeleteMixin
-from apps.core.models import BaseModel
+from apps.core.models import BaseModel, StoredCountersMixin
 from apps.core.slugs import slugify_name
 from apps.core.uploads import (
     upload_to_asset_files,
@@ -58,7 +59,7 @@ class StatusChoice(models.TextChoices):
     READY = "ready", _("Ready")
 
 
-class Asset(DeleteFilesOnDeleteMixin, BaseModel):
+class Asset(StoredCountersMixin, DeleteFilesOnDeleteMixin, BaseModel):
     class MaddLevelChoice(models.TextChoices):
         TWASSUT = "twassut", _("Twassut")
         QASR = "qasr", _("Qasr")
@@ -182,7 +183,31 @@ class Asset(DeleteFilesOnDeleteMixin, BaseModel):
         ),
     )
 
+    # Maintained by apps.content.signals; searched by PostgresSearching.
+    SEARCH_DOCUMENT_SOURCES = (
+        "name_en",
+        "name_ar",
+        "description_en",
+        "description_ar",
+        "publisher__name_en",
+        "publisher__name_ar",
+        "reciter__name_en",
+        "reciter__name_ar",
+        "riwayah__name_en",
+        "riwayah__name_ar",
+        "qiraah__name_en",
+        "qiraah__name_ar",
+    )
+    search_document = models.TextField(blank=True, default="", editable=False)
+    # Tracks in the default folder. Maintained by apps.content.signals (see
+    # apps.content.services.catalog_counters).
+    surahs_count = models.PositiveIntegerField(default=0, editable=False)
+    STORED_COUNTERS = ("surahs_count",)
+
     class Meta:
+        indexes = [
+            GinIndex(fields=["search_document"], name="content_asset_search_trgm", opclasses=["gin_trgm_ops"]),
+        ]
         constraints = [
             models.CheckConstraint(
                 condition=models.Q(
@@ -522,7 +547,7 @@ class Distribution(BaseModel):
         return f"Distribution(asset={self.asset_version.asset.name}, channel={self.channel})"
 
 
-class Reciter(BaseModel):
+class Reciter(StoredCountersMixin, BaseModel):
     """Quran reciter/qari (e.g. Mshari Al-Afasi, Saad Al-Ghamidi, etc)"""
 
     name = models.CharField(max_length=255, unique=True)
@@ -538,6 +563,19 @@ class Reciter(BaseModel):
     is_active = models.BooleanField(default=True)
     nationality = CountryField(blank=True, default="")
 
+    # Maintained by apps.content.signals; searched by PostgresSearching.
+    SEARCH_DOCUMENT_SOURCES = ("name_en", "name_ar", "slug")
+    search_document = models.TextField(blank=True, default="", editable=False)
+    # READY recitation assets. Maintained by apps.content.signals (see
+    # apps.content.services.catalog_counters).
+    ready_recitations_count = models.PositiveIntegerField(default=0, editable=False)
+    STORED_COUNTERS = ("ready_recitations_count",)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_document"], name="content_reciter_search_trgm", opclasses=["gin_trgm_ops"]),
+        ]
+
     def save(self, *args, **kwargs) -> None:
         if not self.slug:
             self.slug = slugify_name(self.name_en, self.name_ar)
@@ -547,7 +585,7 @@ class Reciter(BaseModel):
         return f"Reciter(name={self.name})"
 
 
-class Qiraah(BaseModel):
+class Qiraah(StoredCountersMixin, BaseModel):
     """Quran recitation method/school (e.g. Qiraah Asim, Qiraah Nafi, etc)"""
 
     name = models.CharField(max_length=255, unique=True)
@@ -555,6 +593,19 @@ class Qiraah(BaseModel):
     bio = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
 
+    # Maintained by apps.content.signals; searched by PostgresSearching.
+    SEARCH_DOCUMENT_SOURCES = ("name_en", "name_ar", "slug")
+    search_document = models.TextField(blank=True, default="", editable=False)
+    # READY recitation assets. Maintained by apps.content.signals (see
+    # apps.content.services.catalog_counters).
+    ready_recitations_count = models.PositiveIntegerField(default=0, editable=False)
+    STORED_COUNTERS = ("ready_recitations_count",)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_document"], name="content_qiraah_search_trgm", opclasses=["gin_trgm_ops"]),
+        ]
+
     def save(self, *args, **kwargs) -> None:
         if not self.slug:
             self.slug = slugify_name(self.name_en, self.name_ar)
@@ -564,7 +615,7 @@ class Qiraah(BaseModel):
         return f"Qiraah(name={self.name})"
 
 
-class Riwayah(BaseModel):
+class Riwayah(StoredCountersMixin, BaseModel):
     """Quran recitation tradition/transmission (e.g. Hafs, Warsh, etc)"""
 
     qiraah = models.ForeignKey(
@@ -578,10 +629,19 @@ class Riwayah(BaseModel):
     bio = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
 
+    # Maintained by apps.content.signals; searched by PostgresSearching.
+    SEARCH_DOCUMENT_SOURCES = ("name_en", "name_ar", "slug")
+    search_document = models.TextField(blank=True, default="", editable=False)
+    # READY recitation assets. Maintained by apps.content.signals (see
+    # apps.content.services.catalog_counters).
+    ready_recitations_count = models.PositiveIntegerField(default=0, editable=False)
+    STORED_COUNTERS = ("ready_recitations_count",)
+
     class Meta:
         unique_together = [["qiraah", "name"]]
         indexes = [
             models.Index(fields=["qiraah", "slug"]),
+            GinIndex(fields=["search_document"], name="content_riwayah_search_trgm", opclasses=["gin_trgm_ops"]),
         ]
 
     def save(self, *args, **kwargs) -> None:
@@ -771,6 +831,54 @@ class RecitationAyahTiming(BaseModel):
         super().save(*args, **kwargs)
 
 
+class RecitationAyahSlice(BaseModel):
+    """
+    Fingerprint of the per-ayah audio file last written for one ayah of a track.
+
+    Records every input that determines the slice bytes -- the source object's
+    ETag, the (start_ms, end_ms) cut and the encoder parameters -- so a re-slice
+    only re-encodes and re-uploads ayahs whose inputs changed. Written by
+    RecitationAudioSlicingService after a successful run; never edited by hand.
+    """
+
+    track = models.ForeignKey(RecitationSurahTrack, on_delete=models.CASCADE, related_name="ayah_slices")
+    ayah_key = models.CharField(max_length=20, help_text='Format "surah_number:ayah_number" e.g. "2:255"')
+    slice_key = models.CharField(max_length=512, help_text="Storage key of the sliced file (without media/ prefix)")
+    source_etag = models.CharField(max_length=255, help_text="ETag of the source track object the slice was cut from")
+    start_ms = models.PositiveIntegerField(help_text="Start offset the slice was cut at, in milliseconds")
+    end_ms = models.PositiveIntegerField(help_text="End offset the slice was cut at, in milliseconds")
+    encoder_params = models.JSONField(default=dict, help_text="Encoder settings and probed source parameters used")
+
+    class Meta:
+        unique_together = [["track", "ayah_key"]]
+
+    def __str__(self) -> str:
+        return f"RecitationAyahSlice(track={self.track_id}, ayah_key={self.ayah_key})"
+
+
+class RecitationAyahRange(BaseModel):
+    """
+    A combined MP3 for a run of consecutive ayahs, cached in R2.
+
+    ``content_hash`` is derived from the RecitationAyahSlice fingerprints of every
+    ayah in the range, so a re-slice yields a new hash and a new object instead of
+    serving stale audio; the superseded row simply stops being read and ages out.
+    ``last_accessed_at`` drives least-recently-used eviction once the cache
+    outgrows ``AYAH_RANGE_CACHE_MAX_BYTES``.
+    """
+
+    track = models.ForeignKey(RecitationSurahTrack, on_delete=models.CASCADE, related_name="ayah_ranges")
+    first_ayah = models.PositiveIntegerField(help_text="First ayah number of the range (inclusive)")
+    last_ayah = models.PositiveIntegerField(help_text="Last ayah number of the range (inclusive)")
+    content_hash = models.CharField(max_length=64, unique=True, help_text="SHA-256 of the slice fingerprints")
+    range_key = models.CharField(max_length=512, help_text="Storage key of the combined file (without media/ prefix)")
+    size_bytes = models.PositiveBigIntegerField(default=0, help_text="Size of the combined file in bytes")
+    last_accessed_at = models.DateTimeField(db_index=True, help_text="Last time the range was served (LRU clock)")
+
+    def __str__(self) -> str:
+        return f"RecitationAyahRange(track={self.track_id}, ayahs={self.first_ayah}-{self.last_ayah})"
+
+
 class ContentIssueReport(BaseModel):
     """Issue reports for Assets."""
 
@@ -11,9 +11,7 @@ if TYPE_CHECKING:
 
 class BaseRecitationRepository(ABC):
     @abstractmethod
-    def list_recitations_qs(
-        self, publisher_q: Q | None, filters_dict: dict[str, Any], annotate_surahs_count: bool = False
-    ) -> QuerySet[Asset]:
+    def list_recitations_qs(self, publisher_q: Q | None, filters_dict: dict[str, Any]) -> QuerySet[Asset]:
         """
         Returns a queryset of recitation assets.
         """
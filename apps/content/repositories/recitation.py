@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from django.db import models, transaction
-from django.db.models import Count, Prefetch, Q
+from django.db.models import Case, Count, Exists, OuterRef, Prefetch, Q, Value, When
 
 from apps.content.models import (
     Asset,
@@ -17,6 +17,7 @@ from apps.content.models import (
     StatusChoice,
 )
 from apps.content.repositories.base import BaseRecitationRepository
+from apps.core.expressions import subquery_count
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -29,9 +30,7 @@ class RecitationRepository(BaseRecitationRepository):
         self.riwayah_model = Riwayah
         self.qiraah_model = Qiraah
 
-    def list_recitations_qs(
-        self, publisher_q: Q | None, filters_dict: dict[str, Any], annotate_surahs_count: bool = False
-    ) -> QuerySet[Asset]:
+    def list_recitations_qs(self, publisher_q: Q | None, filters_dict: dict[str, Any]) -> QuerySet[Asset]:
         """
         Returns a queryset of Asset objects.
         """
@@ -72,18 +71,6 @@ class RecitationRepository(BaseRecitationRepository):
             if license_codes := filters_dict.get("license_code"):
                 qs = qs.filter(license__in=license_codes)
 
-        if annotate_surahs_count:
-            # Count the default folder's tracks only. Counting every folder would
-            # report 228 for a recitation published in two variants, when what the
-            # caller wants is "how many surahs does this recitation cover".
-            qs = qs.annotate(
-                surahs_count=Count(
-                    "recitation_tracks",
-                    filter=Q(recitation_tracks__folder__is_default=True),
-                    distinct=True,
-                )
-            )
-
         # Sorting support
         qs = qs.annotate(
             reciter_name=models.F("reciter__name"),
@@ -263,27 +250,35 @@ class RecitationRepository(BaseRecitationRepository):
         Returns a queryset of Reciter objects that have READY recitation assets
         for the given publisher, with optional filters applied.
         """
-        recitation_filter = Q(
-            assets__category=CategoryChoice.RECITATION,
-            assets__status=StatusChoice.READY,
-        )
-        if publisher_q is not None:
+        if not publisher_q:
+            # Catalogue-wide counts are stored (apps.content.services.catalog_counters),
+            # so no join to assets, no aggregate and no distinct().
+            qs = (
+                Reciter.objects.filter(is_active=True, ready_recitations_count__gt=0)
+                .annotate(recitations_count=models.F("ready_recitations_count"))
+                .order_by("name")
+            )
+        else:
+            recitation_filter = Q(
+                assets__category=CategoryChoice.RECITATION,
+                assets__status=StatusChoice.READY,
+            )
             recitation_filter &= publisher_q
 
-        qs = (
-            Reciter.objects.filter(
-                is_active=True,
-            )
-            .filter(recitation_filter)
-            .distinct()
-            .annotate(
-                recitations_count=Count(
-                    "assets",
-                    filter=recitation_filter,
+            qs = (
+                Reciter.objects.filter(
+                    is_active=True,
+                )
+                .filter(recitation_filter)
+                .distinct()
+                .annotate(
+                    recitations_count=Count(
+                        "assets",
+                        filter=recitation_filter,
+                    )
                 )
+                .order_by("name")
             )
-            .order_by("name")
-        )
 
         # Apply filters if provided
         if filters_dict:
@@ -302,29 +297,36 @@ class RecitationRepository(BaseRecitationRepository):
         """
         Returns a queryset of Riwayah objects that have READY recitation assets.
         """
-        recitation_filter = Q(
-            assets__category=CategoryChoice.RECITATION,
-            assets__riwayah__isnull=False,
-            assets__status=StatusChoice.READY,
-        )
-        if publisher_q is not None:
+        if not publisher_q:
+            qs = (
+                self.riwayah_model.objects.filter(is_active=True, ready_recitations_count__gt=0)
+                .annotate(recitations_count=models.F("ready_recitations_count"))
+                .order_by("name")
+                .select_related("qiraah")
+            )
+        else:
+            recitation_filter = Q(
+                assets__category=CategoryChoice.RECITATION,
+                assets__riwayah__isnull=False,
+                assets__status=StatusChoice.READY,
+            )
             recitation_filter &= publisher_q
 
-        qs = (
-            self.riwayah_model.objects.filter(
-                is_active=True,
-            )
-            .filter(recitation_filter)
-            .distinct()
-            .annotate(
-                recitations_count=Count(
-                    "assets",
-                    filter=recitation_filter,
+            qs = (
+                self.riwayah_model.objects.filter(
+                    is_active=True,
                 )
+                .filter(recitation_filter)
+                .distinct()
+                .annotate(
+                    recitations_count=Count(
+                        "assets",
+                        filter=recitation_filter,
+                    )
+                )
+                .order_by("name")
+                .select_related("qiraah")
             )
-            .order_by("name")
-            .select_related("qiraah")
-        )
 
         if filters_dict:
             if "is_active" in filters_dict:
@@ -342,31 +344,47 @@ class RecitationRepository(BaseRecitationRepository):
         """
         Returns a queryset of Qiraah objects that have READY recitation assets through riwayahs.
         """
-        recitation_filter = Q(
-            riwayahs__assets__category=CategoryChoice.RECITATION,
-            riwayahs__assets__riwayah__isnull=False,
-            riwayahs__assets__status=StatusChoice.READY,
-        )
-        if publisher_q is not None:
+        if not publisher_q:
+            # Same counts as below, from the stored counters: riwayahs with READY
+            # recitations (while the qiraah is active) and the recitations themselves.
+            riwayahs_count = subquery_count(self.riwayah_model.objects.filter(ready_recitations_count__gt=0), "qiraah")
+            qs = (
+                self.qiraah_model.objects.filter(
+                    Exists(self.riwayah_model.objects.filter(qiraah=OuterRef("pk"), is_active=True)),
+                    ready_recitations_count__gt=0,
+                )
+                .annotate(
+                    riwayahs_count=Case(When(is_active=True, then=riwayahs_count), default=Value(0)),
+                    recitations_count=models.F("ready_recitations_count"),
+                )
+                .order_by("name")
+                .prefetch_related("riwayahs")
+            )
+        else:
+            recitation_filter = Q(
+                riwayahs__assets__category=CategoryChoice.RECITATION,
+                riwayahs__assets__riwayah__isnull=False,
+                riwayahs__assets__status=StatusChoice.READY,
+            )
             recitation_filter &= publisher_q
 
-        qs = (
-            self.qiraah_model.objects.filter(
-                riwayahs__is_active=True,
-            )
-            .filter(recitation_filter)
-            .distinct()
-            .annotate(
-                riwayahs_count=Count("riwayahs", filter=Q(is_active=True), distinct=True),
-                recitations_count=Count(
-                    "riwayahs__assets",
-                    filter=recitation_filter,
-                    distinct=True,
-                ),
+            qs = (
+                self.qiraah_model.objects.filter(
+                    riwayahs__is_active=True,
+                )
+                .filter(recitation_filter)
+                .distinct()
+                .annotate(
+                    riwayahs_count=Count("riwayahs", filter=Q(is_active=True), distinct=True),
+                    recitations_count=Count(
+                        "riwayahs__assets",
+                        filter=recitation_filter,
+                        distinct=True,
+                    ),
+                )
+                .order_by("name")
+                .prefetch_related("riwayahs")
             )
-            .order_by("name")
-            .prefetch_related("riwayahs")
-        )
 
         if filters_dict:
             if "is_active" in filters_dict:
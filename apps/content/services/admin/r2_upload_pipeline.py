@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import logging
+from pathlib import Path
+import threading
+from typing import Any
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from django.utils.functional import Promise
+
+from apps.core.ninja_utils.errors import ItqanError
+
+logger = logging.getLogger(__name__)
+
+
+class R2UploadPipeline:
+    """
+    Push objects to R2 from a bounded thread pool while the caller keeps producing.
+
+    The producer (an ffmpeg loop, an export builder, ...) calls ``submit`` for each
+    finished object and moves straight on to the next one; PUTs run on up to
+    ``max_workers`` threads. ``submit`` blocks once ``max_pending`` uploads are
+    queued or in flight, so a fast producer never buffers an unbounded backlog.
+
+    Error semantics are all-or-nothing, matching the services that used to PUT
+    inline: the first failed upload stops the pipeline, queued uploads are
+    cancelled, and the next ``submit``/``join`` raises. Storage failures
+    (ClientError / BotoCoreError) surface as ItqanError("storage_error", 503) -
+    the error the Celery tasks classify as retryable - with the caller's generic
+    message; raw storage details go to the log only.
+
+    Use as a context manager: a clean exit waits for every upload (``join``), an
+    exception exit cancels whatever has not started and waits for the rest.
+    """
+
+    def __init__(
+        self,
+        s3: Any,
+        *,
+        error_message: str | Promise,
+        bucket: str | None = None,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+    ) -> None:
+        self._s3 = s3
+        self._error_message = error_message
+        self._bucket = bucket or settings.CLOUDFLARE_R2_BUCKET
+        self._max_workers = max(1, max_workers or settings.R2_UPLOAD_MAX_WORKERS)
+        self._slots = threading.BoundedSemaphore(max(1, max_pending or settings.R2_UPLOAD_MAX_PENDING))
+        self._lock = threading.Lock()
+        self._error: BaseException | None = None
+        self._futures: list[Future] = []
+        self._pool: ThreadPoolExecutor | None = None
+
+    def __enter__(self) -> R2UploadPipeline:
+        self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="r2-upload")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self._shutdown(cancel=True)
+            return
+        try:
+            self.join()
+        finally:
+            self._shutdown(cancel=True)
+
+    def submit(self, r2_key: str, body: Path | bytes, content_type: str) -> None:
+        """Queue one object for upload; ``body`` is a local file path or the raw bytes."""
+        if self._pool is None:
+            raise RuntimeError("R2UploadPipeline must be used as a context manager.")
+        self._raise_if_failed()
+        self._slots.acquire()
+        # Submitting under the lock orders every submit against a failure: either the
+        # future is already listed when _on_done cancels the backlog, or it is never made.
+        with self._lock:
+            future = None if self._error is not None else self._pool.submit(self._put, r2_key, body, content_type)
+            if future is not None:
+                self._futures.append(future)
+        if future is None:
+            self._slots.release()
+            self._raise_if_failed()
+            return
+        future.add_done_callback(self._on_done)
+
+    def join(self) -> None:
+        """Wait for every submitted upload; raise if any of them failed."""
+        wait(self._futures)
+        self._raise_if_failed()
+
+    def _put(self, r2_key: str, body: Path | bytes, content_type: str) -> None:
+        if isinstance(body, Path):
+            with open(body, "rb") as f:
+                self._s3.put_object(Bucket=self._bucket, Key=r2_key, Body=f, ContentType=content_type)
+        else:
+            self._s3.put_object(Bucket=self._bucket, Key=r2_key, Body=body, ContentType=content_type)
+
+    def _on_done(self, future: Future) -> None:
+        self._slots.release()
+        if future.cancelled() or future.exception() is None:
+            return
+        with self._lock:
+            if self._error is None:
+                self._error = future.exception()
+                logger.warning("R2 upload failed; stopping the upload pipeline", exc_info=self._error)
+            # Nothing queued behind a failure may still be written.
+            for pending in self._futures:
+                pending.cancel()
+
+    def _raise_if_failed(self) -> None:
+        error = self._error
+        if error is None:
+            return
+        if isinstance(error, (ClientError | BotoCoreError)):
+            raise ItqanError(error_name="storage_error", message=self._error_message, status_code=503) from error
+        raise error
+
+    def _shutdown(self, cancel: bool) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=cancel)
+            self._pool = None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from pathlib import Path
 import shutil
@@ -13,7 +14,8 @@ from botocore.exceptions import BotoCoreError, ClientError
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
-from apps.content.models import RecitationSurahTrack
+from apps.content.models import RecitationAyahSlice, RecitationSurahTrack
+from apps.content.services.admin.r2_upload_pipeline import R2UploadPipeline
 from apps.core.ninja_utils.errors import ItqanError
 
 if TYPE_CHECKING:
@@ -27,6 +29,9 @@ FADE_DURATION_SECONDS = 0.02
 # the 60s CELERY_TASK_SOFT_TIME_LIMIT so a stalled slice fails as slicing_failed
 # instead of hanging the worker.
 FFMPEG_SLICE_TIMEOUT_SECONDS = 30
+# Code-level encoder inputs recorded on every RecitationAyahSlice. Changing any of
+# them makes every stored slice stale, so the next re-slice re-encodes everything.
+SLICE_ENCODER_SETTINGS = {"codec": "libmp3lame", "fade_duration_s": FADE_DURATION_SECONDS}
 
 
 def _split_ayah_key(ayah_key: str) -> tuple[str, str] | None:
@@ -78,9 +83,20 @@ class RecitationAudioSlicingService:
     failures are not rolled back - a failure partway through the loop leaves the
     already-written ayah objects in place. Those objects are deterministic
     (asset/folder/surah/ayah), so re-running the track overwrites them in place
-    and converges to the full set; partial slices never accumulate.
+    and converges to the full set; partial slices never accumulate. Slice
+    fingerprints (RecitationAyahSlice) are recorded only after a fully successful
+    run, so ayahs written by a failed run are re-sliced on the next one.
+
+    Ayahs are encoded by a pool of ``max_workers`` ffmpeg processes (default
+    ``settings.AYAH_SLICING_MAX_WORKERS``). Each process seeks straight to its
+    ayah in the input, so the surah is decoded once in total across the pool
+    instead of once per ayah from the start of the file. Finished slices go to R2
+    through an ``R2UploadPipeline`` while later ayahs are still encoding.
     """
 
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers = max(1, max_workers or settings.AYAH_SLICING_MAX_WORKERS)
+
     def _get_s3_client(self):
         return boto3.client(
             "s3",
@@ -108,8 +124,16 @@ class RecitationAudioSlicingService:
         """
         return f"uploads/assets/{asset_id}/recitations/{folder_id}/{surah_number:03}/ayah_{ayah_number:03}.mp3"
 
-    def slice_track(self, track_id: int) -> dict[str, Any]:
-        """Slice every ayah of one track; returns track/asset ids, sliced count and generated keys."""
+    def slice_track(self, track_id: int, force: bool = False) -> dict[str, Any]:
+        """
+        Slice the ayahs of one track whose inputs changed since they were last sliced.
+
+        An ayah is skipped when its RecitationAyahSlice fingerprint still matches the
+        source object's ETag, its (start_ms, end_ms) and SLICE_ENCODER_SETTINGS; when
+        every ayah is current the source is not even downloaded. ``force`` re-slices
+        every ayah. Returns track/asset ids, the re-sliced and skipped counts, and
+        the keys written by this run.
+        """
         try:
             track = RecitationSurahTrack.objects.get(pk=track_id)
         except RecitationSurahTrack.DoesNotExist as exc:
@@ -121,33 +145,24 @@ class RecitationAudioSlicingService:
 
         timings = list(track.ayah_timings.all().order_by("start_ms"))
         if not timings:
-            return {"track_id": track.id, "asset_id": track.asset_id, "sliced": 0, "keys": []}
+            return {"track_id": track.id, "asset_id": track.asset_id, "sliced": 0, "skipped": 0, "keys": []}
 
         self._validate_timings(track, timings)
 
         s3 = self._get_s3_client()
         keys: list[str] = []
+        pending: list[RecitationAyahTiming] = []
         temp_dir = Path(tempfile.mkdtemp(prefix="ayah-slicing-"))
         try:
             source_path = temp_dir / "source.mp3"
+            source_key = self._to_r2_key(track.audio_file.name)
             try:
-                body = s3.get_object(Bucket=settings.CLOUDFLARE_R2_BUCKET, Key=self._to_r2_key(track.audio_file.name))[
-                    "Body"
-                ]
-                try:
-                    with open(source_path, "wb") as f:
-                        shutil.copyfileobj(body, f)
-                finally:
-                    # Close always runs, but a cleanup failure must not mask a copy
-                    # failure nor fail an otherwise-successful download.
-                    try:
-                        body.close()
-                    except Exception:
-                        logger.warning(
-                            "Failed to close source audio stream for track %s",
-                            track.id,
-                            exc_info=True,
-                        )
+                # The fingerprint needs only the source's ETag, so an up-to-date track
+                # costs one HEAD and its body is never requested.
+                source_etag = s3.head_object(Bucket=settings.CLOUDFLARE_R2_BUCKET, Key=source_key).get("ETag", "")
+                pending = timings if force else self._timings_to_slice(track, timings, source_etag)
+                if pending:
+                    self._download_source(s3, track, source_key, source_etag, source_path)
             except (ClientError, BotoCoreError) as exc:
                 logger.warning("Failed to read source audio from storage for track %s", track.id, exc_info=True)
                 raise ItqanError(
@@ -158,34 +173,132 @@ class RecitationAudioSlicingService:
                     status_code=503,
                 ) from exc
 
-            audio_params = self._probe_audio_params(source_path)
-
-            for timing in timings:
-                ayah_number = self._parse_ayah_number(timing.ayah_key, track.surah_number)
-                key = self._build_slice_key(track.asset_id, track.folder_id, track.surah_number, ayah_number)
-                output_path = temp_dir / f"{track.surah_number:03}_{ayah_number:03}.mp3"
-                self._run_ffmpeg(source_path, output_path, timing.start_ms, timing.end_ms, audio_params)
-                try:
-                    with open(output_path, "rb") as f:
-                        s3.put_object(
-                            Bucket=settings.CLOUDFLARE_R2_BUCKET,
-                            Key=self._to_r2_key(key),
-                            Body=f,
-                            ContentType="audio/mpeg",
-                        )
-                except (ClientError, BotoCoreError) as exc:
-                    logger.warning("Failed to store sliced ayah audio for track %s", track.id, exc_info=True)
-                    raise ItqanError(
-                        error_name="storage_error",
-                        message=_("Failed to store sliced ayah audio for track {track_id}.").format(track_id=track.id),
-                        status_code=503,
-                    ) from exc
-                keys.append(key)
+            if pending:
+                audio_params = self._probe_audio_params(source_path)
+                slices = self._slice_pending(track, pending, source_path, temp_dir, audio_params, s3)
+                keys = [key for key, _output_path, _timing in slices]
+                self._record_slices(track, slices, source_etag, audio_params)
         finally:
             shutil.rmtree(temp_dir, ignore_errors=True)
 
-        logger.info(f"Recitation track sliced [track_id={track.id}, asset_id={track.asset_id}, sliced={len(keys)}]")
-        return {"track_id": track.id, "asset_id": track.asset_id, "sliced": len(keys), "keys": keys}
+        # Fingerprints of ayahs that no longer have a timing describe nothing servable.
+        track.ayah_slices.exclude(ayah_key__in=[timing.ayah_key for timing in timings]).delete()
+
+        skipped = len(timings) - len(pending)
+        logger.info(
+            f"Recitation track sliced [track_id={track.id}, asset_id={track.asset_id}, sliced={len(keys)}, "
+            f"skipped={skipped}]"
+        )
+        return {"track_id": track.id, "asset_id": track.asset_id, "sliced": len(keys), "skipped": skipped, "keys": keys}
+
+    def _download_source(self, s3, track: RecitationSurahTrack, source_key: str, source_etag: str, path: Path) -> None:
+        """
+        Stream the source object to ``path``.
+
+        ``IfMatch`` pins the download to the ETag the fingerprints will record: a source
+        replaced since the HEAD fails the request instead of being sliced under the old ETag.
+        """
+        params = {"IfMatch": source_etag} if source_etag else {}
+        body = s3.get_object(Bucket=settings.CLOUDFLARE_R2_BUCKET, Key=source_key, **params)["Body"]
+        try:
+            with open(path, "wb") as f:
+                shutil.copyfileobj(body, f)
+        finally:
+            # Close always runs, but a cleanup failure must not mask a copy
+            # failure nor fail an otherwise-successful download.
+            try:
+                body.close()
+            except Exception:
+                logger.warning("Failed to close source audio stream for track %s", track.id, exc_info=True)
+
+    def _slice_pending(
+        self,
+        track: RecitationSurahTrack,
+        timings: list[RecitationAyahTiming],
+        source_path: Path,
+        temp_dir: Path,
+        audio_params: dict[str, int | None],
+        s3,
+    ) -> list[tuple[str, Path, RecitationAyahTiming]]:
+        """Encode and upload the given ayahs; returns (key, output path, timing) in ayah order."""
+        slices: list[tuple[str, Path, RecitationAyahTiming]] = []
+        for timing in timings:
+            ayah_number = self._parse_ayah_number(timing.ayah_key, track.surah_number)
+            key = self._build_slice_key(track.asset_id, track.folder_id, track.surah_number, ayah_number)
+            output_path = temp_dir / f"{track.surah_number:03}_{ayah_number:03}.mp3"
+            slices.append((key, output_path, timing))
+
+        # Both pools are fully drained when this returns, before the caller removes the
+        # temp dir; leaving each with-block waits for its threads.
+        upload_error = _("Failed to store sliced ayah audio for track {track_id}.").format(track_id=track.id)
+        with (
+            ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ayah-slicing") as pool,
+            R2UploadPipeline(s3, error_message=upload_error) as uploads,
+        ):
+            futures = [
+                pool.submit(self._run_ffmpeg, source_path, output_path, timing.start_ms, timing.end_ms, audio_params)
+                for _key, output_path, timing in slices
+            ]
+            try:
+                # Results are consumed in ayah order so the returned keys keep timing
+                # order; finished slices upload while later ayahs are still encoding.
+                for (key, output_path, _timing), future in zip(slices, futures, strict=True):
+                    future.result()
+                    uploads.submit(self._to_r2_key(key), output_path, "audio/mpeg")
+                uploads.join()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return slices
+
+    @staticmethod
+    def _timings_to_slice(
+        track: RecitationSurahTrack, timings: list[RecitationAyahTiming], source_etag: str
+    ) -> list[RecitationAyahTiming]:
+        """Timings whose recorded slice is missing or was cut from different inputs."""
+        if not source_etag:
+            # Without an ETag nothing proves the source is unchanged.
+            return timings
+        recorded = {ayah_slice.ayah_key: ayah_slice for ayah_slice in track.ayah_slices.all()}
+        pending = []
+        for timing in timings:
+            ayah_slice = recorded.get(timing.ayah_key)
+            is_current = (
+                ayah_slice is not None
+                and ayah_slice.source_etag == source_etag
+                and (ayah_slice.start_ms, ayah_slice.end_ms) == (timing.start_ms, timing.end_ms)
+                and all(ayah_slice.encoder_params.get(name) == value for name, value in SLICE_ENCODER_SETTINGS.items())
+            )
+            if not is_current:
+                pending.append(timing)
+        return pending
+
+    @staticmethod
+    def _record_slices(
+        track: RecitationSurahTrack,
+        slices: list[tuple[str, Path, RecitationAyahTiming]],
+        source_etag: str,
+        audio_params: dict[str, int | None],
+    ) -> None:
+        """Upsert the fingerprint of every ayah written by this run."""
+        RecitationAyahSlice.objects.bulk_create(
+            [
+                RecitationAyahSlice(
+                    track=track,
+                    ayah_key=timing.ayah_key,
+                    slice_key=key,
+                    source_etag=source_etag,
+                    start_ms=timing.start_ms,
+                    end_ms=timing.end_ms,
+                    encoder_params={**SLICE_ENCODER_SETTINGS, **audio_params},
+                )
+                for key, _output_path, timing in slices
+            ],
+            update_conflicts=True,
+            unique_fields=["track", "ayah_key"],
+            update_fields=["slice_key", "source_etag", "start_ms", "end_ms", "encoder_params", "updated_at"],
+        )
 
     def _validate_timings(self, track: RecitationSurahTrack, timings: list[RecitationAyahTiming]) -> None:
         """Reject the whole track when any ayah timing is invalid, before any slicing."""
@@ -266,7 +379,19 @@ class RecitationAudioSlicingService:
     def _run_ffmpeg(
         self, source_path: Path, output_path: Path, start_ms: int, end_ms: int, audio_params: dict[str, int | None]
     ) -> None:
-        """Slice [start_ms, end_ms) out of the source MP3 and apply short boundary fades."""
+        """
+        Slice [start_ms, end_ms) out of the source MP3 and apply short boundary fades.
+
+        ``-ss`` is an input option so ffmpeg seeks the demuxer close to start_ms and
+        only decodes the ayah itself, then trims decoded samples to the timestamp it
+        seeked to. ``-t`` is then the slice duration on the reset output timeline.
+
+        The trade-off: that timestamp is only as exact as the demuxer's seek. CBR
+        sources and VBR sources with a Xing/VBRI table of contents (LAME writes one)
+        seek to the right frame; a VBR source without one is seeked by an average
+        bitrate estimate, so its cuts may land off the timings. Nothing here verifies
+        the boundaries against such a file; re-mux those sources with a TOC first.
+        """
         duration_s = (end_ms - start_ms) / 1000
         # Symmetrically clamp both fades so they always fit fully inside the
         # slice; slices >= 2 * FADE_DURATION_SECONDS keep the full configured
@@ -276,19 +401,21 @@ class RecitationAudioSlicingService:
         fade_filter = (
             f"afade=t=in:st=0:d={fade_duration_s}," f"afade=t=out:st={fade_out_start_s:.3f}:d={fade_duration_s}"
         )
+        # -nostdin: several ffmpeg processes run at once and must not compete for stdin.
         cmd = [
             "ffmpeg",
+            "-nostdin",
             "-y",
-            "-i",
-            str(source_path),
             "-ss",
             f"{start_ms / 1000:.3f}",
-            "-to",
-            f"{end_ms / 1000:.3f}",
+            "-i",
+            str(source_path),
+            "-t",
+            f"{duration_s:.3f}",
             "-af",
             fade_filter,
             "-c:a",
-            "libmp3lame",
+            SLICE_ENCODER_SETTINGS["codec"],
         ]
         # Preserve the source MP3 characteristics through the re-encode where
         # they are known. mutagen reports bitrate in bits/second and ffmpeg's
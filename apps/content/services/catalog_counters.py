@@ -0,0 +1,78 @@
+"""
+Stored catalogue counters, so public lists read a column instead of aggregating.
+
+- ``Asset.surahs_count``: tracks in the asset's default folder.
+- ``Reciter/Riwayah/Qiraah.ready_recitations_count``: READY recitation assets of the
+  reciter, of the riwayah, and of the qiraah's riwayahs.
+
+Counters are recomputed from their source rows (never incremented) by the
+receivers in ``apps.content.signals``, inside the transaction of the change that
+moved them. Bulk ``update()``s and raw SQL bypass the receivers; ``python manage.py
+reconcile_catalog_counters`` repairs whatever drifted.
+
+The rows are locked (``SELECT ... FOR UPDATE``, by model then pk) before the recount.
+Under READ COMMITTED an ``UPDATE`` that waits on another writer's row lock keeps the
+snapshot it started with, so its ``COUNT`` would miss the rows that writer committed
+and store a stale total. Counting in a statement issued after the lock is granted sees
+them.
+
+They are catalogue-wide: counts scoped to a publisher are still aggregated per request.
+"""
+
+from collections.abc import Iterable
+
+from django.db import transaction
+from django.db.models import F, Model, QuerySet
+from django.db.models.functions import Coalesce
+
+from apps.content.models import Asset, CategoryChoice, Qiraah, RecitationSurahTrack, Reciter, Riwayah, StatusChoice
+from apps.core.expressions import subquery_count
+
+RECITATIONS_COUNTER = "ready_recitations_count"
+SURAHS_COUNTER = "surahs_count"
+
+
+def _ready_recitations() -> QuerySet[Asset]:
+    return Asset.objects.filter(category=CategoryChoice.RECITATION, status=StatusChoice.READY)
+
+
+def _counters() -> list[tuple[type[Model], str, Coalesce]]:
+    return [
+        (Asset, SURAHS_COUNTER, subquery_count(RecitationSurahTrack.objects.filter(folder__is_default=True), "asset")),
+        (Reciter, RECITATIONS_COUNTER, subquery_count(_ready_recitations(), "reciter")),
+        (Riwayah, RECITATIONS_COUNTER, subquery_count(_ready_recitations(), "riwayah")),
+        (Qiraah, RECITATIONS_COUNTER, subquery_count(_ready_recitations(), "riwayah__qiraah")),
+    ]
+
+
+def _lock(model: type[Model], ids: Iterable[int]) -> None:
+    list(model.objects.select_for_update().filter(pk__in=ids).order_by("pk").values_list("pk", flat=True))
+
+
+def refresh_catalog_counters(
+    *,
+    asset_ids: Iterable[int | None] = (),
+    reciter_ids: Iterable[int | None] = (),
+    riwayah_ids: Iterable[int | None] = (),
+    qiraah_ids: Iterable[int | None] = (),
+) -> None:
+    """Recompute the counters of the given rows; ``None`` ids (unset foreign keys) are skipped."""
+    ids_by_model = {Asset: asset_ids, Reciter: reciter_ids, Riwayah: riwayah_ids, Qiraah: qiraah_ids}
+    with transaction.atomic():
+        for model, counter, total in _counters():
+            ids = {pk for pk in ids_by_model[model] if pk is not None}
+            if ids:
+                _lock(model, ids)
+                model.objects.filter(pk__in=ids).update(**{counter: total})
+
+
+def reconcile_catalog_counters() -> dict[str, int]:
+    """Rewrite every counter that disagrees with its source rows; returns how many per model."""
+    repaired = {}
+    with transaction.atomic():
+        for model, counter, total in _counters():
+            stale = model.objects.annotate(actual=total).exclude(**{counter: F("actual")})
+            stale_ids = list(stale.values_list("pk", flat=True))
+            _lock(model, stale_ids)
+            repaired[model.__name__] = model.objects.filter(pk__in=stale_ids).update(**{counter: total})
+    return repaired
@@ -8,6 +8,7 @@ from django.utils.translation import gettext as _
 
 from apps.content.models import LicenseChoice, Qiraah, Reciter, Riwayah
 from apps.content.repositories.recitation import RecitationRepository
+from apps.content.repositories.recitation_folder import RecitationFolderRepository
 from apps.content.services.asset_access import guard_restrict_for_tenant
 from apps.content.services.recitation_folder_resolution import find_folder_by_token
 from apps.core.ninja_utils.errors import ItqanError
@@ -17,21 +18,19 @@ logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
 
-    from apps.content.models import Asset, RecitationSurahTrack
+    from apps.content.models import Asset, RecitationFolder, RecitationSurahTrack
 
 
 class RecitationService:
     def __init__(self, repo: RecitationRepository | None = None) -> None:
         self.repo = repo or RecitationRepository()
 
-    def get_all_recitations(
-        self, publisher_q: Q | None = None, filters: Any = None, annotate_surahs_count: bool = False
-    ) -> QuerySet[Asset]:
+    def get_all_recitations(self, publisher_q: Q | None = None, filters: Any = None) -> QuerySet[Asset]:
         """
         Business Logic: Retrieve all recitations with optional filtering.
         """
         filters_dict = filters.model_dump(exclude_none=True) if filters and hasattr(filters, "model_dump") else {}
-        return self.repo.list_recitations_qs(publisher_q, filters_dict, annotate_surahs_count=annotate_surahs_count)
+        return self.repo.list_recitations_qs(publisher_q, filters_dict)
 
     def _get_recitation_or_404(self, recitation_slug: str, publisher_q: Q | None = None) -> Asset:
         recitation = self.repo.get_recitation(recitation_slug, publisher_q=publisher_q)
@@ -226,16 +225,7 @@ class RecitationService:
         rather than returning an empty list, so callers can tell a typo apart from a
         folder that has no tracks yet.
         """
-        folder_id = None
-        if folder is not None:
-            matched = find_folder_by_token(asset_id, folder)
-            if matched is None:
-                raise ItqanError(
-                    error_name="folder_not_found",
-                    message=_("Folder {folder} not found.").format(folder=folder),
-                    status_code=404,
-                )
-            folder_id = matched.id
+        folder_id = None if folder is None else self.resolve_folder(asset_id, folder).id
 
         return self.repo.list_recitation_tracks_for_asset(
             asset_id,
@@ -244,6 +234,25 @@ class RecitationService:
             folder_id=folder_id,
         )
 
+    def resolve_folder(self, asset_id: int, folder: str | None) -> RecitationFolder:
+        """
+        Business Logic: Resolve a ``?folder=`` value (slug or name) to the folder it names.
+
+        None means the asset's default folder. Raises ``folder_not_found`` when
+        nothing matches.
+        """
+        if folder is None:
+            matched = RecitationFolderRepository().get_default_for_asset(asset_id)
+        else:
+            matched = find_folder_by_token(asset_id, folder)
+        if matched is None:
+            raise ItqanError(
+                error_name="folder_not_found",
+                message=_("Folder {folder} not found.").format(folder=folder),
+                status_code=404,
+            )
+        return matched
+
     def get_all_reciters(self, publisher_q: Q, filters: Any = None) -> QuerySet:
         """
         Business Logic: Retrieve all reciters that have READY recitations for a specific publisher/tenant.
@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import hashlib
+import json
+import logging
+from pathlib import Path
+import shutil
+import subprocess
+import tempfile
+from typing import Any
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.content.models import RecitationAyahRange, RecitationAyahSlice, RecitationSurahTrack
+from apps.content.services.admin.recitation_audio_slicing_service import SLICE_ENCODER_SETTINGS, is_canonical_ayah_key
+from apps.content.services.recitation import RecitationService
+from apps.content.tasks import build_recitation_ayah_range_task
+from apps.core.mixins.constants import QURAN_SURAHS
+from apps.core.ninja_utils.errors import ItqanError
+
+logger = logging.getLogger(__name__)
+
+# Combining pre-sliced ayahs is a remux (or at worst a short re-encode), so the
+# repo's 30s external-call deadline is ample while keeping the request bounded.
+FFMPEG_CONCAT_TIMEOUT_SECONDS = 30
+# last_accessed_at is only rewritten when older than this, so a popular range costs
+# one UPDATE per interval instead of one per request.
+RANGE_TOUCH_INTERVAL = timedelta(hours=1)
+# Never evict a range served within this window: its last_accessed_at may lag by up
+# to RANGE_TOUCH_INTERVAL and clients may still hold a cached redirect to it.
+RANGE_EVICTION_GRACE = timedelta(days=1)
+# Combined files are content-addressed, so their bytes never change under a key.
+RANGE_OBJECT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# A cold range is built by build_recitation_ayah_range_task, never in the request. Until
+# its row exists, requests get 202 with this Retry-After.
+RANGE_BUILD_RETRY_AFTER_SECONDS = 5
+# A queued build is not queued again for this long. It covers the task's retries, and
+# a build lost with its worker is queued again by the first request after it lapses.
+RANGE_BUILD_PENDING_SECONDS = 60 * 10
+
+
+def ayah_range_build_pending_key(content_hash: str) -> str:
+    """Set while a build of ``content_hash`` is queued or running, so it is queued once."""
+    return f"ayah_range:build_pending:{content_hash}"
+
+
+class RecitationAyahRangeService:
+    """
+    Serve a run of consecutive ayahs as one MP3, combined from the per-ayah slices.
+
+    A range is only available once every ayah in it has been sliced (has a
+    RecitationAyahSlice). The combined file is content-addressed: its key embeds a
+    hash of the slice fingerprints, so it is produced once, uploaded as an
+    immutable object and served from the edge on every later request. A re-slice
+    changes the hash, so stale audio is never served; the superseded object is
+    left for ``evict_least_recently_used`` to reclaim.
+
+    Slices of one track share their encoder settings, so they are joined with
+    ffmpeg's concat demuxer and ``-c copy`` - no decode, no re-encode. Only when
+    the slices disagree, or the remux fails, is the range re-encoded. That work runs
+    in ``build_recitation_ayah_range_task``; requests only read the result.
+    """
+
+    def _get_s3_client(self):
+        return boto3.client(
+            "s3",
+            endpoint_url=settings.CLOUDFLARE_R2_ENDPOINT,
+            aws_access_key_id=settings.CLOUDFLARE_R2_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.CLOUDFLARE_R2_SECRET_ACCESS_KEY,
+            region_name="auto",
+            config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+        )
+
+    def _to_r2_key(self, key: str) -> str:
+        """R2 object keys must be prefixed with "media/" to work with our bucket configuration."""
+        _MEDIA_PREFIX = "media/"
+        return key if key.startswith(_MEDIA_PREFIX) else f"{_MEDIA_PREFIX}{key}"
+
+    def _build_range_key(
+        self, asset_id: int, folder_id: int, surah_number: int, first_ayah: int, last_ayah: int, content_hash: str
+    ) -> str:
+        """
+        Content-addressed storage key for one combined range.
+
+        Lives beside the slices from ``RecitationAudioSlicingService._build_slice_key``
+        under the surah directory, in its own ``ranges/`` prefix so the two never collide.
+        """
+        return (
+            f"uploads/assets/{asset_id}/recitations/{folder_id}/{surah_number:03}/ranges/"
+            f"ayah_{first_ayah:03}-{last_ayah:03}_{content_hash}.mp3"
+        )
+
+    @staticmethod
+    def parse_ayah_range(from_ayah: str, to_ayah: str) -> tuple[int, int, int]:
+        """
+        Validate a "surah:ayah" range and return (surah_number, first_ayah, last_ayah).
+
+        Both ends must be canonical keys of the same surah, in order, within the
+        surah's ayah count and at most ``AYAH_RANGE_MAX_AYAHS`` ayahs long.
+        """
+        surah_part = from_ayah.split(":", 1)[0]
+        surah_number = int(surah_part) if surah_part.isdecimal() else 0
+        if surah_number not in QURAN_SURAHS or not all(
+            is_canonical_ayah_key(key, surah_number) for key in (from_ayah, to_ayah)
+        ):
+            raise ItqanError(
+                error_name="invalid_ayah_range",
+                message=_('Ayah range must be two "surah:ayah" keys of the same surah.'),
+                status_code=400,
+            )
+        first_ayah = int(from_ayah.split(":")[1])
+        last_ayah = int(to_ayah.split(":")[1])
+        if first_ayah > last_ayah or last_ayah > QURAN_SURAHS[surah_number]["ayahs_count"]:
+            raise ItqanError(
+                error_name="invalid_ayah_range",
+                message=_("Ayah range {from_ayah}-{to_ayah} is out of order or beyond the end of the surah.").format(
+                    from_ayah=from_ayah, to_ayah=to_ayah
+                ),
+                status_code=400,
+            )
+        if last_ayah - first_ayah + 1 > settings.AYAH_RANGE_MAX_AYAHS:
+            raise ItqanError(
+                error_name="invalid_ayah_range",
+                message=_("Ayah ranges are limited to {max_ayahs} ayahs.").format(
+                    max_ayahs=settings.AYAH_RANGE_MAX_AYAHS
+                ),
+                status_code=400,
+            )
+        return surah_number, first_ayah, last_ayah
+
+    def get_range_key(self, asset_id: int, folder: str | None, from_ayah: str, to_ayah: str) -> str | None:
+        """
+        Storage key (without media/ prefix) of the audio for ``from_ayah``..``to_ayah``.
+
+        A single ayah resolves to its slice directly and a built range to its cached
+        object. A range not built yet is queued for ``build_recitation_ayah_range_task``
+        and None is returned; ask again after ``RANGE_BUILD_RETRY_AFTER_SECONDS``.
+        """
+        surah_number, first_ayah, last_ayah = self.parse_ayah_range(from_ayah, to_ayah)
+        track = (
+            RecitationService()
+            .get_asset_tracks(asset_id, Q(asset__restricted_for_tenant=False), folder=folder)
+            .filter(surah_number=surah_number)
+            .first()
+        )
+        ordered = None if track is None else self._range_slices(track, first_ayah, last_ayah)
+        if ordered is None:
+            raise ItqanError(
+                error_name="ayah_range_not_available",
+                message=_("Audio for ayahs {from_ayah}-{to_ayah} is not available yet.").format(
+                    from_ayah=from_ayah, to_ayah=to_ayah
+                ),
+                status_code=404,
+            )
+        if len(ordered) == 1:
+            return ordered[0].slice_key
+
+        content_hash = self._content_hash(ordered)
+        ayah_range = RecitationAyahRange.objects.filter(content_hash=content_hash).first()
+        if ayah_range is None:
+            self._schedule_build(track, first_ayah, last_ayah, content_hash)
+            return None
+        if ayah_range.last_accessed_at < timezone.now() - RANGE_TOUCH_INTERVAL:
+            RecitationAyahRange.objects.filter(pk=ayah_range.pk).update(last_accessed_at=timezone.now())
+        return ayah_range.range_key
+
+    def build_range(self, track_id: int, first_ayah: int, last_ayah: int) -> RecitationAyahRange | None:
+        """
+        Build and record the combined file for ayahs ``first_ayah``..``last_ayah`` of a track.
+
+        Slices are read again, so a re-slice since the request was queued builds the
+        current audio. Returns None when the track or one of its slices is gone.
+        """
+        track = RecitationSurahTrack.objects.filter(pk=track_id).first()
+        slices = None if track is None else self._range_slices(track, first_ayah, last_ayah)
+        if slices is None:
+            return None
+        content_hash = self._content_hash(slices)
+        ayah_range = RecitationAyahRange.objects.filter(content_hash=content_hash).first()
+        if ayah_range is None:
+            ayah_range = self._build_range(track, first_ayah, last_ayah, slices, content_hash)
+        return ayah_range
+
+    @staticmethod
+    def _range_slices(track: RecitationSurahTrack, first_ayah: int, last_ayah: int) -> list[RecitationAyahSlice] | None:
+        """The track's slices for the range in ayah order, or None when any ayah is not sliced."""
+        wanted = [f"{track.surah_number}:{ayah}" for ayah in range(first_ayah, last_ayah + 1)]
+        slices = {s.ayah_key: s for s in track.ayah_slices.filter(ayah_key__in=wanted)}
+        if len(slices) != len(wanted):
+            return None
+        return [slices[key] for key in wanted]
+
+    @staticmethod
+    def _schedule_build(track: RecitationSurahTrack, first_ayah: int, last_ayah: int, content_hash: str) -> None:
+        # cache.add succeeds for the first request only, so a burst of requests for a cold
+        # range queues one build.
+        if not cache.add(ayah_range_build_pending_key(content_hash), 1, RANGE_BUILD_PENDING_SECONDS):
+            return
+        transaction.on_commit(lambda: build_recitation_ayah_range_task.delay(track.id, first_ayah, last_ayah))
+
+    @staticmethod
+    def _content_hash(slices: list[RecitationAyahSlice]) -> str:
+        """SHA-256 over every input that determines the slices' bytes, in ayah order."""
+        fingerprint = [
+            [s.slice_key, s.source_etag, s.start_ms, s.end_ms, s.encoder_params, SLICE_ENCODER_SETTINGS] for s in slices
+        ]
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+
+    def _build_range(
+        self,
+        track: RecitationSurahTrack,
+        first_ayah: int,
+        last_ayah: int,
+        slices: list[RecitationAyahSlice],
+        content_hash: str,
+    ) -> RecitationAyahRange:
+        """Download the slices, join them, upload the result and record it in the cache."""
+        s3 = self._get_s3_client()
+        range_key = self._build_range_key(
+            track.asset_id, track.folder_id, track.surah_number, first_ayah, last_ayah, content_hash
+        )
+        temp_dir = Path(tempfile.mkdtemp(prefix="ayah-range-"))
+        try:
+            list_path = temp_dir / "slices.txt"
+            output_path = temp_dir / "range.mp3"
+            try:
+                slice_paths = [temp_dir / f"{index:03}.mp3" for index in range(len(slices))]
+                # Slices are small and independent, so the round trips overlap instead of adding up.
+                with ThreadPoolExecutor(
+                    max_workers=settings.AYAH_RANGE_DOWNLOAD_MAX_WORKERS, thread_name_prefix="ayah-range-download"
+                ) as pool:
+                    downloads = [
+                        pool.submit(
+                            s3.download_file,
+                            settings.CLOUDFLARE_R2_BUCKET,
+                            self._to_r2_key(ayah_slice.slice_key),
+                            str(slice_path),
+                        )
+                        for ayah_slice, slice_path in zip(slices, slice_paths, strict=True)
+                    ]
+                    for download in downloads:
+                        download.result()
+                list_path.write_text("".join(f"file '{slice_path}'\n" for slice_path in slice_paths))
+
+                # Differing probed parameters (bitrate, rate, channels) cannot be remuxed
+                # into one valid stream, so those ranges go straight to a re-encode.
+                stream_copy = all(s.encoder_params == slices[0].encoder_params for s in slices)
+                if not (stream_copy and self._run_concat(list_path, output_path, stream_copy=True)):
+                    if not self._run_concat(list_path, output_path, stream_copy=False):
+                        raise ItqanError(
+                            error_name="ayah_range_failed",
+                            message=_("Failed to combine ayah audio."),
+                            status_code=503,
+                        )
+
+                with open(output_path, "rb") as f:
+                    s3.put_object(
+                        Bucket=settings.CLOUDFLARE_R2_BUCKET,
+                        Key=self._to_r2_key(range_key),
+                        Body=f,
+                        ContentType="audio/mpeg",
+                        CacheControl=RANGE_OBJECT_CACHE_CONTROL,
+                    )
+            except (ClientError, BotoCoreError) as exc:
+                logger.warning(
+                    "Failed to build ayah range %s in storage for track %s", range_key, track.id, exc_info=True
+                )
+                raise ItqanError(
+                    error_name="storage_error",
+                    message=_("Failed to prepare ayah range audio in storage."),
+                    status_code=503,
+                ) from exc
+            size_bytes = output_path.stat().st_size
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        # Two overlapping builds (a queued build that outlived its pending key) write the
+        # same bytes under the same key; the unique content_hash lets the loser adopt the
+        # winner's row.
+        ayah_range, _created = RecitationAyahRange.objects.get_or_create(
+            content_hash=content_hash,
+            defaults={
+                "track": track,
+                "first_ayah": first_ayah,
+                "last_ayah": last_ayah,
+                "range_key": range_key,
+                "size_bytes": size_bytes,
+                "last_accessed_at": timezone.now(),
+            },
+        )
+        logger.info(f"Ayah range cached [track_id={track.id}, ayahs={first_ayah}-{last_ayah}, size_bytes={size_bytes}]")
+        return ayah_range
+
+    def _run_concat(self, list_path: Path, output_path: Path, stream_copy: bool) -> bool:
+        """Join the listed slices with ffmpeg's concat demuxer; True when ffmpeg succeeded."""
+        cmd = ["ffmpeg", "-nostdin", "-y", "-f", "concat", "-safe", "0", "-i", str(list_path), "-map_metadata", "-1"]
+        cmd += ["-c", "copy"] if stream_copy else ["-c:a", SLICE_ENCODER_SETTINGS["codec"]]
+        cmd.append(str(output_path))
+        try:
+            completed = subprocess.run(cmd, capture_output=True, text=True, timeout=FFMPEG_CONCAT_TIMEOUT_SECONDS)
+        except FileNotFoundError as exc:
+            raise ItqanError(
+                error_name="ayah_range_failed",
+                message=_("ffmpeg binary not found; ayah ranges are unavailable."),
+                status_code=503,
+            ) from exc
+        except subprocess.TimeoutExpired:
+            logger.error("ffmpeg timed out combining %s", list_path, exc_info=True)
+            return False
+        if completed.returncode != 0:
+            logger.warning(
+                "ffmpeg failed combining %s (stream_copy=%s): %s",
+                list_path,
+                stream_copy,
+                (completed.stderr or "").strip(),
+            )
+            return False
+        return True
+
+    def evict_least_recently_used(self, max_bytes: int | None = None) -> dict[str, Any]:
+        """
+        Delete the least recently served ranges until the cache fits in ``max_bytes``.
+
+        Defaults to ``settings.AYAH_RANGE_CACHE_MAX_BYTES``. Rows are deleted before
+        their objects, so a storage failure can only orphan an object (reclaimable
+        later), never leave a row pointing at a missing file.
+        """
+        budget = settings.AYAH_RANGE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        total_bytes = RecitationAyahRange.objects.aggregate(total=Sum("size_bytes"))["total"] or 0
+        victims: list[tuple[int, str]] = []
+        freed_bytes = 0
+        if total_bytes > budget:
+            candidates = (
+                RecitationAyahRange.objects.filter(last_accessed_at__lt=timezone.now() - RANGE_EVICTION_GRACE)
+                .order_by("last_accessed_at")
+                .values_list("id", "range_key", "size_bytes")
+            )
+            for range_id, range_key, size_bytes in candidates.iterator():
+                if total_bytes - freed_bytes <= budget:
+                    break
+                victims.append((range_id, range_key))
+                freed_bytes += size_bytes
+
+        if victims:
+            RecitationAyahRange.objects.filter(id__in=[range_id for range_id, _key in victims]).delete()
+            s3 = self._get_s3_client()
+            keys = [self._to_r2_key(range_key) for _id, range_key in victims]
+            for start in range(0, len(keys), 1000):
+                batch = keys[start : start + 1000]
+                try:
+                    s3.delete_objects(
+                        Bucket=settings.CLOUDFLARE_R2_BUCKET,
+                        Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                    )
+                except (ClientError, BotoCoreError):
+                    logger.warning("Failed to delete %s evicted ayah range objects", len(batch), exc_info=True)
+
+        logger.info(
+            f"Ayah range cache eviction [evicted={len(victims)}, freed_bytes={freed_bytes}, "
+            f"total_bytes={total_bytes - freed_bytes}, budget={budget}]"
+        )
+        return {"evicted": len(victims), "freed_bytes": freed_bytes, "total_bytes": total_bytes - freed_bytes}
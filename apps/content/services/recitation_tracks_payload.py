@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import time
+from typing import TypedDict
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from apps.content.cache import (
+    RECITATION_TRACKS_PAYLOAD_CACHE_TTL,
+    ais_recitation_tracks_payload_rebuild_pending,
+    is_recitation_tracks_payload_rebuild_pending,
+    recitation_cache,
+    recitation_tracks_payload_cache_key,
+    single_flight,
+)
+from apps.content.models import RecitationFolder
+from apps.content.repositories.recitation import RecitationRepository
+from apps.core.compression import brotli_compress
+from apps.core.mixins.constants import QURAN_SURAHS
+from apps.core.ninja_utils.renderer import dumps
+from config.settings.base import CLOUDFLARE_R2_PUBLIC_BASE_URL
+
+logger = logging.getLogger(__name__)
+
+# The renderer's compact layout, so a page cut from the artefact is byte-identical
+# to the API rendering {"results": page, "count": total}.
+_PREFIX = b'{"results":['
+_ITEM_SEPARATOR = b","
+
+
+class RecitationTracksPayload(TypedDict):
+    """
+    The whole public track list of one (asset, folder), serialized once.
+
+    ``raw`` is the full response ``{"results": [...], "count": N}``, ``body`` its
+    gzip and ``body_br`` its brotli. The compressed bodies only ever go out whole;
+    ``spans`` holds the [start, end) byte offsets of each track object inside
+    ``raw``, so any other page is a slice of it rather than a re-serialization or
+    a decompression.
+    ``generations`` are the (asset, folder) cache generations it was built under;
+    ``digest`` fingerprints the uncompressed body and ``built_at`` (epoch seconds)
+    bounds when it last changed -- the response validators.
+    """
+
+    generations: tuple[int, ...]
+    digest: str
+    built_at: int
+    count: int
+    spans: list[tuple[int, int]]
+    raw: bytes
+    body: bytes
+    body_br: bytes
+
+
+def _suffix(count: int) -> bytes:
+    return f'],"count":{count}}}'.encode()
+
+
+def _track_item(track) -> dict:
+    surah = QURAN_SURAHS[track.surah_number]
+    return {
+        "surah_number": track.surah_number,
+        "surah_name": surah["name"],
+        "surah_name_en": surah["name_en"],
+        "audio_url": f"{CLOUDFLARE_R2_PUBLIC_BASE_URL}/media/{track.audio_file.name}",
+        "duration_ms": track.duration_ms,
+        "size_bytes": track.size_bytes,
+        "revelation_order": surah["revelation_order"],
+        "revelation_place": surah["revelation_place"],
+        "ayahs_count": surah["ayahs_count"],
+        "ayahs_timings": [
+            {
+                "ayah_key": t.ayah_key,
+                "start_ms": t.start_ms,
+                "end_ms": t.end_ms,
+                "duration_ms": t.duration_ms,
+            }
+            for t in track.ayah_timings.all()
+        ],
+    }
+
+
+def build_recitation_tracks_payload(asset_id: int, folder_id: int) -> RecitationTracksPayload:
+    """Serialize every track of the folder (with its timings) and cache the artefact."""
+    # Read before the tracks: a change committed mid-build bumps past this value,
+    # so the artefact is seen as stale rather than passing for the newer state.
+    generations = recitation_cache.generations(asset_id, folder_id)
+    tracks = RecitationRepository().list_recitation_tracks_for_asset(
+        asset_id, Q(asset__restricted_for_tenant=False), prefetch_timings=True, folder_id=folder_id
+    )
+    items = [dumps(_track_item(track)) for track in tracks]
+
+    spans: list[tuple[int, int]] = []
+    position = len(_PREFIX)
+    for item in items:
+        spans.append((position, position + len(item)))
+        position += len(item) + len(_ITEM_SEPARATOR)
+    body = _PREFIX + _ITEM_SEPARATOR.join(items) + _suffix(len(items))
+
+    payload: RecitationTracksPayload = {
+        "generations": generations,
+        "digest": hashlib.blake2b(body, digest_size=16).hexdigest(),
+        "built_at": int(time.time()),
+        "count": len(items),
+        "spans": spans,
+        "raw": body,
+        "body": gzip.compress(body),
+        "body_br": brotli_compress(body),
+    }
+    cache.set(recitation_tracks_payload_cache_key(asset_id, folder_id), payload, RECITATION_TRACKS_PAYLOAD_CACHE_TTL)
+    return payload
+
+
+def _is_servable(payload: RecitationTracksPayload, asset_id: int, folder_id: int) -> bool:
+    # An artefact from an older generation is still served while its background
+    # rebuild is queued; stale with no rebuild on the way (e.g. the task was lost) is not.
+    if payload.get("generations") == recitation_cache.generations(asset_id, folder_id):
+        return True
+    return is_recitation_tracks_payload_rebuild_pending(asset_id)
+
+
+def get_cached_recitation_tracks_payload(asset_id: int, folder_id: int) -> RecitationTracksPayload | None:
+    """The cached artefact if it may be served, else None."""
+    cached = cache.get(recitation_tracks_payload_cache_key(asset_id, folder_id))
+    if cached is not None and _is_servable(cached, asset_id, folder_id):
+        return cached
+    return None
+
+
+async def aget_cached_recitation_tracks_payload(asset_id: int, folder_id: int) -> RecitationTracksPayload | None:
+    """``get_cached_recitation_tracks_payload`` for async views."""
+    cached = await cache.aget(recitation_tracks_payload_cache_key(asset_id, folder_id))
+    if cached is None:
+        return None
+    if cached.get("generations") == await recitation_cache.agenerations(asset_id, folder_id):
+        return cached
+    if await ais_recitation_tracks_payload_rebuild_pending(asset_id):
+        return cached
+    return None
+
+
+def get_recitation_tracks_payload(asset_id: int, folder_id: int) -> RecitationTracksPayload:
+    """
+    The servable cached artefact, built in place only when there is none.
+
+    The build is single-flight: when a famous recitation's artefact is missing,
+    one worker runs the track/timing queries while concurrent readers get the
+    stale artefact, or wait briefly for the fresh one.
+    """
+    key = recitation_tracks_payload_cache_key(asset_id, folder_id)
+    cached = cache.get(key)
+    if cached is not None and _is_servable(cached, asset_id, folder_id):
+        return cached
+    return single_flight(key, lambda: build_recitation_tracks_payload(asset_id, folder_id), stale=cached)
+
+
+def rebuild_asset_recitation_tracks_payloads(asset_id: int) -> int:
+    """Rebuild the stale artefacts among the asset's folders; returns how many were built."""
+    rebuilt = 0
+    for folder_id in RecitationFolder.objects.filter(asset_id=asset_id).values_list("id", flat=True):
+        cached = cache.get(recitation_tracks_payload_cache_key(asset_id, folder_id))
+        if cached is not None and cached.get("generations") == recitation_cache.generations(asset_id, folder_id):
+            continue
+        build_recitation_tracks_payload(asset_id, folder_id)
+        rebuilt += 1
+    return rebuilt
+
+
+def render_recitation_tracks_page(payload: RecitationTracksPayload, page: int, page_size: int) -> bytes:
+    """Uncompressed response bytes for one page, cut out of the artefact."""
+    offset = (page - 1) * page_size
+    spans = payload["spans"][offset : offset + page_size]
+    if not spans:
+        return _PREFIX + _suffix(payload["count"])
+    return _PREFIX + payload["raw"][spans[0][0] : spans[-1][1]] + _suffix(payload["count"])
+
+
+def is_full_recitation_tracks_page(payload: RecitationTracksPayload, page: int, page_size: int) -> bool:
+    """True when the page is the whole list, so a stored compressed body is the response as-is."""
+    return page == 1 and page_size >= payload["count"]
@@ -1,14 +1,75 @@
-from django.db.models.signals import post_delete, post_save
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from apps.content.cache import invalidate_recitation_tracks_cache
-from apps.content.models import Asset, CategoryChoice, RecitationFolder, RecitationSurahTrack
+from apps.content.cache import (
+    CONTENT_CATALOG_SCOPE,
+    content_catalog_cache,
+    invalidate_content_catalog,
+    invalidate_recitation_tracks_cache,
+    recitation_tracks_payload_cache_key,
+)
+from apps.content.models import (
+    Asset,
+    CategoryChoice,
+    Qiraah,
+    RecitationFolder,
+    RecitationSurahTrack,
+    Reciter,
+    Riwayah,
+    StatusChoice,
+)
+from apps.content.services.catalog_counters import refresh_catalog_counters
+from apps.core.ninja_utils.counting import cache_counts
+from apps.core.search import refresh_search_documents
+from apps.publishers.models import Publisher
+
+
+@receiver(post_save, sender=Asset)
+@receiver(post_delete, sender=Asset)
+@receiver(post_save, sender=Reciter)
+@receiver(post_delete, sender=Reciter)
+@receiver(post_save, sender=Riwayah)
+@receiver(post_delete, sender=Riwayah)
+@receiver(post_save, sender=Qiraah)
+@receiver(post_delete, sender=Qiraah)
+@receiver(post_save, sender=Publisher)
+@receiver(post_delete, sender=Publisher)
+@receiver(post_save, sender=RecitationFolder)
+@receiver(post_delete, sender=RecitationFolder)
+def clear_content_list_validators(sender, **kwargs) -> None:
+    # Track changes reach the catalog through invalidate_recitation_tracks_cache.
+    invalidate_content_catalog()
+
+
+# List counts of these models are cached under the catalog generation the receivers
+# above move on, so a change to any of them recounts every list.
+cache_counts(
+    (Asset, Reciter, Riwayah, Qiraah, Publisher),
+    version=lambda: content_catalog_cache.generations(CONTENT_CATALOG_SCOPE),
+    aversion=lambda: content_catalog_cache.agenerations(CONTENT_CATALOG_SCOPE),
+)
 
 
 @receiver(post_save, sender=RecitationSurahTrack)
 @receiver(post_delete, sender=RecitationSurahTrack)
 def clear_recitation_tracks_cache(sender, instance: RecitationSurahTrack, **kwargs) -> None:
-    invalidate_recitation_tracks_cache(instance.asset_id)
+    invalidate_recitation_tracks_cache(instance.asset_id, folder_id=instance.folder_id)
+
+
+@receiver(post_save, sender=RecitationFolder)
+def clear_recitation_folder_aliases(sender, instance: RecitationFolder, created: bool, **kwargs) -> None:
+    # A renamed folder changes which ?folder= spellings resolve to it; the aliases
+    # are asset-scoped, so the whole asset moves to a new generation.
+    if not created:
+        invalidate_recitation_tracks_cache(instance.asset_id)
+
+
+@receiver(post_delete, sender=RecitationFolder)
+def drop_recitation_folder_payload(sender, instance: RecitationFolder, **kwargs) -> None:
+    # The background rebuild only visits folders that still exist, so a deleted
+    # folder's artefact has to be dropped here or it would be served until its TTL.
+    cache.delete(recitation_tracks_payload_cache_key(instance.asset_id, instance.id))
 
 
 @receiver(post_save, sender=Asset)
@@ -34,3 +95,95 @@ def create_default_recitation_folder(sender, instance: Asset, created: bool, **k
             "slug": RecitationFolder.DEFAULT_SLUG,
         },
     )
+
+
+@receiver(post_save, sender=Asset)
+@receiver(post_save, sender=Reciter)
+@receiver(post_save, sender=Riwayah)
+@receiver(post_save, sender=Qiraah)
+@receiver(post_save, sender=Publisher)
+def refresh_content_search_documents(sender, instance, **kwargs) -> None:
+    """
+    Keep the denormalised search documents in step with the names they are built from.
+
+    Assets embed their publisher/reciter/riwayah/qiraah names, so renaming one of those
+    rewrites the documents of every asset pointing at it. Bulk `update()`s bypass this;
+    run `rebuild_search_documents` after one.
+    """
+    if sender is not Publisher:
+        refresh_search_documents(sender.objects.filter(pk=instance.pk))
+    if sender is Asset:
+        return
+    relation = {Reciter: "reciter", Riwayah: "riwayah", Qiraah: "qiraah", Publisher: "publisher"}[sender]
+    refresh_search_documents(Asset.objects.filter(**{relation: instance}))
+
+
+# The Asset fields the catalogue counters depend on.
+_COUNTED_ASSET_FIELDS = ("category", "status", "reciter_id", "riwayah_id")
+
+
+def _counted_asset_fields(instance: Asset) -> dict:
+    return {name: getattr(instance, name) for name in _COUNTED_ASSET_FIELDS}
+
+
+def _is_ready_recitation(fields: dict | None) -> bool:
+    return bool(fields) and fields["category"] == CategoryChoice.RECITATION and fields["status"] == StatusChoice.READY
+
+
+@receiver(pre_save, sender=Asset)
+def remember_counted_asset_fields(sender, instance: Asset, **kwargs) -> None:
+    instance._counted_fields_before = (
+        None if instance._state.adding else Asset.objects.filter(pk=instance.pk).values(*_COUNTED_ASSET_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Asset)
+@receiver(post_delete, sender=Asset)
+def refresh_asset_catalog_counters(sender, instance: Asset, signal, **kwargs) -> None:
+    """
+    Recount the reciters, riwayahs and qiraahs an asset was and is counted under.
+
+    Runs in the caller's transaction (the repository's writes are atomic), so a
+    rolled-back save leaves the counters as they were. Saves that neither make nor
+    unmake a READY recitation write nothing.
+    """
+    if signal is post_delete:
+        before, after = _counted_asset_fields(instance), None
+    else:
+        before, after = getattr(instance, "_counted_fields_before", None), _counted_asset_fields(instance)
+    if before == after or not (_is_ready_recitation(before) or _is_ready_recitation(after)):
+        return
+    counted = [fields for fields in (before, after) if fields]
+    riwayah_ids = {fields["riwayah_id"] for fields in counted} - {None}
+    refresh_catalog_counters(
+        reciter_ids=[fields["reciter_id"] for fields in counted],
+        riwayah_ids=riwayah_ids,
+        qiraah_ids=Riwayah.objects.filter(pk__in=riwayah_ids).values_list("qiraah_id", flat=True),
+    )
+
+
+@receiver(post_save, sender=RecitationSurahTrack)
+@receiver(post_delete, sender=RecitationSurahTrack)
+@receiver(post_save, sender=RecitationFolder)
+@receiver(post_delete, sender=RecitationFolder)
+def refresh_asset_surahs_count(sender, instance: RecitationSurahTrack | RecitationFolder, **kwargs) -> None:
+    # A track added, moved or removed, or a folder made (or no longer) the default.
+    refresh_catalog_counters(asset_ids=[instance.asset_id])
+
+
+@receiver(pre_save, sender=Riwayah)
+def remember_riwayah_qiraah(sender, instance: Riwayah, **kwargs) -> None:
+    instance._qiraah_id_before = (
+        None
+        if instance._state.adding
+        else Riwayah.objects.filter(pk=instance.pk).values_list("qiraah_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Riwayah)
+def refresh_riwayah_qiraah_counters(sender, instance: Riwayah, created: bool, **kwargs) -> None:
+    # A riwayah moved to another qiraah takes its recitations along. (Riwayahs with
+    # assets cannot be deleted: Asset.riwayah is PROTECT.)
+    qiraah_id_before = getattr(instance, "_qiraah_id_before", None)
+    if not created and qiraah_id_before != instance.qiraah_id:
+        refresh_catalog_counters(qiraah_ids=[qiraah_id_before, instance.qiraah_id])
@@ -178,12 +178,14 @@ def notify_publishers_pending_access_requests() -> None:
     soft_time_limit=1500,
     time_limit=1800,
 )
-def slice_recitation_track_task(self, track_id: int) -> dict:
+def slice_recitation_track_task(self, track_id: int, force: bool = False) -> dict:
     """
     Slice one recitation surah track into per-ayah audio files.
 
-    Delegates to RecitationAudioSlicingService.slice_track and invalidates the
-    asset's recitation caches only after a fully successful service run.
+    Delegates to RecitationAudioSlicingService.slice_track, which only re-slices
+    ayahs whose source ETag, timing or encoder settings changed (every ayah when
+    ``force`` is set). The asset's recitation caches are invalidated only after a
+    fully successful run that actually wrote slices.
 
     Retries are limited to transient storage failures (ItqanError
     "storage_error"): validation, missing-track and ffmpeg failures are
@@ -191,16 +193,20 @@ def slice_recitation_track_task(self, track_id: int) -> dict:
     send_issue_status_update_email (countdown=60s * (retries + 1)).
 
     Time limits: slicing runs ffmpeg once per ayah with its own 30s timeout,
-    so the repository-wide 60s soft limit does not apply. The longest surah
-    (Al-Baqarah, 286 ayahs) at a generous ~5s per slice takes ~24 minutes;
-    soft_time_limit=1500 (25 min) / time_limit=1800 (30 min) keep the same
-    20% headroom convention as sync_audio_usage_task (300/360).
+    so the repository-wide 60s soft limit does not apply. Slices are encoded
+    AYAH_SLICING_MAX_WORKERS at a time and each one seeks straight to its ayah,
+    so the limits below are a worst-case ceiling: a single worker at a generous
+    ~5s per slice finishes the longest surah (Al-Baqarah, 286 ayahs) in ~24
+    minutes. soft_time_limit=1500 (25 min) / time_limit=1800 (30 min) keep the
+    same 20% headroom convention as sync_audio_usage_task (300/360).
 
     Args:
         track_id: RecitationSurahTrack primary key.
+        force: Re-slice every ayah even when its inputs are unchanged.
 
     Returns:
-        The slicing service result: track_id, asset_id, sliced count and keys.
+        The slicing service result: track_id, asset_id, sliced (re-sliced) and
+        skipped counts, and the keys written by this run.
     """
     logger.info(f"Task started [task=slice_recitation_track_task, task_id={self.request.id}, track_id={track_id}]")
     from apps.content.cache import invalidate_recitation_tracks_cache
@@ -208,7 +214,7 @@ def slice_recitation_track_task(self, track_id: int) -> dict:
     from apps.core.ninja_utils.errors import ItqanError
 
     try:
-        result = RecitationAudioSlicingService().slice_track(track_id)
+        result = RecitationAudioSlicingService().slice_track(track_id, force=force)
     except ItqanError as exc:
         if exc.error_name == "storage_error" and self.request.retries < self.max_retries:
             logger.warning(
@@ -222,10 +228,11 @@ def slice_recitation_track_task(self, track_id: int) -> dict:
         )
         raise
 
-    invalidate_recitation_tracks_cache(asset_id=result["asset_id"])
+    if result["sliced"]:
+        invalidate_recitation_tracks_cache(asset_id=result["asset_id"])
     logger.info(
         f"Task completed [task=slice_recitation_track_task, task_id={self.request.id}, track_id={track_id}, "
-        f"sliced={result['sliced']}]"
+        f"sliced={result['sliced']}, skipped={result['skipped']}]"
     )
     return result
 
@@ -234,13 +241,18 @@ def slice_recitation_track_task(self, track_id: int) -> dict:
     soft_time_limit=300,
     time_limit=360,
 )
-def slice_all_recitation_tracks_task() -> dict:
+def slice_all_recitation_tracks_task(force: bool = False) -> dict:
     """
     Enqueue slice_recitation_track_task for every existing recitation track.
 
     Only track IDs are loaded (values_list) and each track is scheduled as its
-    own child task; no slicing happens inside this task. Intended for manual or
-    one-off invocations; no beat schedule is attached.
+    own child task; no slicing happens inside this task. Children skip ayahs
+    whose inputs are unchanged, so a fleet-wide run only re-encodes what changed
+    and reports per-track sliced/skipped counts in each child result. Intended for
+    manual or one-off invocations; no beat schedule is attached.
+
+    Args:
+        force: Passed to every child to re-slice all ayahs regardless of changes.
 
     Returns:
         Dictionary with the number of scheduled child tasks.
@@ -249,6 +261,110 @@ def slice_all_recitation_tracks_task() -> dict:
 
     track_ids = list(RecitationSurahTrack.objects.values_list("id", flat=True))
     for track_id in track_ids:
-        slice_recitation_track_task.delay(track_id)
+        slice_recitation_track_task.delay(track_id, force=force)
     logger.info(f"Task completed [task=slice_all_recitation_tracks_task, scheduled={len(track_ids)}]")
     return {"scheduled_count": len(track_ids)}
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    soft_time_limit=300,
+    time_limit=360,
+)
+def build_recitation_ayah_range_task(self, track_id: int, first_ayah: int, last_ayah: int) -> dict:
+    """
+    Combine the per-ayah slices of one range into the cached MP3 the public endpoint redirects to.
+
+    Queued by RecitationAyahRangeService.get_range_key on the first request for a
+    range; that request and any repeat before this finishes get 202 with Retry-After.
+
+    Retries follow slice_recitation_track_task: only transient storage failures
+    (ItqanError "storage_error"), with countdown=60s * (retries + 1).
+
+    Time limits: a build is one round of concurrent slice downloads, a remux and at
+    worst a re-encode (each ffmpeg run capped at 30s) and one upload, so about 70s
+    in the worst case. soft_time_limit=300 / time_limit=360 match
+    evict_recitation_ayah_ranges_task.
+
+    Args:
+        track_id: RecitationSurahTrack primary key.
+        first_ayah: First ayah number of the range.
+        last_ayah: Last ayah number of the range (inclusive).
+
+    Returns:
+        Dictionary with the range key, or None when the track or a slice is gone.
+    """
+    from apps.content.services.recitation_ayah_range import RecitationAyahRangeService
+    from apps.core.ninja_utils.errors import ItqanError
+
+    try:
+        ayah_range = RecitationAyahRangeService().build_range(track_id, first_ayah, last_ayah)
+    except ItqanError as exc:
+        if exc.error_name == "storage_error" and self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=60 * (self.request.retries + 1)) from exc
+        logger.error(
+            f"Task failed [task=build_recitation_ayah_range_task, task_id={self.request.id}, track_id={track_id}, "
+            f"ayahs={first_ayah}-{last_ayah}, error_name={exc.error_name}]"
+        )
+        raise
+
+    range_key = ayah_range.range_key if ayah_range else None
+    logger.info(
+        f"Task completed [task=build_recitation_ayah_range_task, task_id={self.request.id}, track_id={track_id}, "
+        f"ayahs={first_ayah}-{last_ayah}, range_key={range_key}]"
+    )
+    return {"track_id": track_id, "range_key": range_key}
+
+
+@shared_task(
+    soft_time_limit=300,
+    time_limit=360,
+)
+def evict_recitation_ayah_ranges_task() -> dict:
+    """
+    Periodic task to keep the combined ayah-range cache within AYAH_RANGE_CACHE_MAX_BYTES.
+
+    Deletes the least recently served RecitationAyahRange rows and their R2
+    objects until the total size fits the budget. Ranges superseded by a re-slice
+    are never served again, so they age to the front of the queue on their own.
+
+    Returns:
+        Dictionary with evicted count, freed bytes and the remaining total.
+    """
+    from apps.content.services.recitation_ayah_range import RecitationAyahRangeService
+
+    result = RecitationAyahRangeService().evict_least_recently_used()
+    logger.info(
+        f"Task completed [task=evict_recitation_ayah_ranges_task, evicted={result['evicted']}, "
+        f"freed_bytes={result['freed_bytes']}]"
+    )
+    return result
+
+
+@shared_task(
+    soft_time_limit=300,
+    time_limit=360,
+)
+def rebuild_recitation_tracks_payload_task(asset_id: int) -> dict:
+    """
+    Rebuild the precomputed public track payload of every folder of one recitation.
+
+    Scheduled (debounced) by invalidate_recitation_tracks_cache whenever tracks or
+    timings change, so the public tracks endpoint only ever slices a ready
+    artefact. The pending flag is cleared first: a change that lands while this
+    runs schedules a fresh rebuild rather than being folded into a stale one.
+
+    Args:
+        asset_id: Recitation Asset primary key.
+
+    Returns:
+        Dictionary with the number of folder payloads rebuilt.
+    """
+    from apps.content.cache import clear_recitation_tracks_payload_rebuild_pending
+    from apps.content.services.recitation_tracks_payload import rebuild_asset_recitation_tracks_payloads
+
+    clear_recitation_tracks_payload_rebuild_pending(asset_id)
+    rebuilt = rebuild_asset_recitation_tracks_payloads(asset_id)
+    logger.info(f"Task completed [task=rebuild_recitation_tracks_payload_task, asset_id={asset_id}, folders={rebuilt}]")
+    return {"asset_id": asset_id, "rebuilt_folders": rebuilt}
@@ -0,0 +1,118 @@
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from model_bakery import baker
+from oauth2_provider.models import Application
+
+from apps.content.models import Asset, CategoryChoice, RecitationAyahSlice, RecitationSurahTrack, StatusChoice
+from apps.content.services.recitation_ayah_range import RANGE_BUILD_RETRY_AFTER_SECONDS, RecitationAyahRangeService
+from apps.core.tests.base import BaseTestCase
+from apps.publishers.models import Publisher
+from apps.users.models import User
+from config.settings.base import CLOUDFLARE_R2_PUBLIC_BASE_URL
+
+
+class PublicRecitationAyahRangeTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.publisher = baker.make(Publisher)
+        self.asset = baker.make(
+            Asset,
+            category=CategoryChoice.RECITATION,
+            publisher=self.publisher,
+            status=StatusChoice.READY,
+            is_open_access=True,
+            reciter=baker.make("content.Reciter", name="Test Reciter"),
+            riwayah=baker.make("content.Riwayah", name="Test Riwayah"),
+        )
+        self.folder = self.asset.recitation_folders.get(is_default=True)
+        self.track = RecitationSurahTrack.objects.create(
+            asset=self.asset,
+            folder=self.folder,
+            surah_number=1,
+            duration_ms=7000,
+            audio_file=SimpleUploadedFile("001.mp3", b"dummy"),
+        )
+        self.slice_key = f"uploads/assets/{self.asset.id}/recitations/{self.folder.id}/001/ayah_002.mp3"
+        RecitationAyahSlice.objects.create(
+            track=self.track, ayah_key="1:2", slice_key=self.slice_key, source_etag='"e"', start_ms=1000, end_ms=2000
+        )
+        self.user = User.objects.create_user(email="oauthuser@example.com", name="OAuth User")
+        self.app = Application.objects.create(
+            user=self.user,
+            name="App 1",
+            client_type="confidential",
+            authorization_grant_type="password",
+        )
+
+    def test_get_ayah_range_where_audio_available_should_redirect_to_r2_object(self):
+        # Arrange
+        self.authenticate_client(self.app)
+        range_key = f"uploads/assets/{self.asset.id}/recitations/{self.folder.id}/001/ranges/ayah_002-005_abc.mp3"
+
+        # Act
+        with patch.object(RecitationAyahRangeService, "get_range_key", return_value=range_key) as mock_get:
+            response = self.client.get(f"/recitations/{self.asset.id}/ayahs/?from_ayah=1:2&to_ayah=1:5")
+
+        # Assert
+        self.assertEqual(302, response.status_code, response.content)
+        self.assertEqual(f"{CLOUDFLARE_R2_PUBLIC_BASE_URL}/media/{range_key}", response["Location"])
+        self.assertIn("max-age=300", response["Cache-Control"])
+        mock_get.assert_called_once_with(self.asset.id, None, "1:2", "1:5")
+
+    def test_get_ayah_range_where_range_not_built_yet_should_return_202_with_retry_after(self):
+        # Arrange
+        self.authenticate_client(self.app)
+
+        # Act
+        with patch.object(RecitationAyahRangeService, "get_range_key", return_value=None):
+            response = self.client.get(f"/recitations/{self.asset.id}/ayahs/?from_ayah=1:2&to_ayah=1:5")
+
+        # Assert
+        self.assertEqual(202, response.status_code, response.content)
+        self.assertEqual(str(RANGE_BUILD_RETRY_AFTER_SECONDS), response["Retry-After"])
+        self.assertEqual("no-store", response["Cache-Control"])
+        self.assertEqual(RANGE_BUILD_RETRY_AFTER_SECONDS, response.json()["retry_after"])
+
+    def test_get_ayah_range_where_single_ayah_should_redirect_to_its_slice(self):
+        # Arrange
+        self.authenticate_client(self.app)
+
+        # Act
+        response = self.client.get(f"/recitations/{self.asset.id}/ayahs/?from_ayah=1:2&to_ayah=1:2")
+
+        # Assert
+        self.assertEqual(302, response.status_code, response.content)
+        self.assertEqual(f"{CLOUDFLARE_R2_PUBLIC_BASE_URL}/media/{self.slice_key}", response["Location"])
+
+    def test_get_ayah_range_where_range_invalid_should_return_400(self):
+        # Arrange
+        self.authenticate_client(self.app)
+
+        # Act
+        response = self.client.get(f"/recitations/{self.asset.id}/ayahs/?from_ayah=1:5&to_ayah=2:1")
+
+        # Assert
+        self.assertEqual(400, response.status_code, response.content)
+        self.assertEqual("invalid_ayah_range", response.json()["error_name"])
+
+    def test_get_ayah_range_where_ayahs_not_sliced_should_return_404(self):
+        # Arrange
+        self.authenticate_client(self.app)
+
+        # Act
+        response = self.client.get(f"/recitations/{self.asset.id}/ayahs/?from_ayah=1:2&to_ayah=1:3")
+
+        # Assert
+        self.assertEqual(404, response.status_code, response.content)
+        self.assertEqual("ayah_range_not_available", response.json()["error_name"])
+
+    def test_get_ayah_range_where_asset_does_not_exist_should_return_404(self):
+        # Arrange
+        self.authenticate_client(self.app)
+
+        # Act
+        response = self.client.get("/recitations/999999/ayahs/?from_ayah=1:2&to_ayah=1:2")
+
+        # Assert
+        self.assertEqual(404, response.status_code, response.content)
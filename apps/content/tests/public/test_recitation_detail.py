@@ -1,11 +1,12 @@
 import unittest
 
+from django.core.cache import cache as django_cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import override_settings
 from model_bakery import baker
 from oauth2_provider.models import Application
 
-from apps.content.cache import DEFAULT_FOLDER_CACHE_TOKEN, recitation_response_cache_key
+from apps.content.cache import recitation_tracks_payload_cache_key
 from apps.content.models import (
     Asset,
     AssetAccess,
@@ -16,7 +17,6 @@ from apps.content.models import (
     StatusChoice,
 )
 from apps.core.ninja_utils.paginations import (
-    DEFAULT_PAGE_SIZE,
     PUBLIC_RECITATION_MAX_PAGE_SIZE,
     PublicRecitationPagination,
 )
@@ -28,6 +28,7 @@ from apps.users.models import APIKey, User
 class RecitationTracksTest(BaseTestCase):
     def setUp(self):
         super().setUp()
+        django_cache.clear()
         self.publisher = baker.make(Publisher)
         self.asset = baker.make(
             Asset,
@@ -291,6 +292,7 @@ class RecitationTracksPageSizeCapTest(BaseTestCase):
         self.assertLessEqual(len(body["results"]), PUBLIC_RECITATION_MAX_PAGE_SIZE)
 
     def test_list_recitation_tracks_where_second_request_should_hit_cache(self):
+        import gzip
         import json
 
         from django.core.cache import cache as django_cache
@@ -302,14 +304,11 @@ class RecitationTracksPageSizeCapTest(BaseTestCase):
         first = self.client.get(f"/recitations/{self.asset.id}/")
         self.assertEqual(200, first.status_code, first.content)
 
-        # Pre-serialized response bytes must exist after first request.
-        cached_bytes = django_cache.get(
-            recitation_response_cache_key(
-                self.asset.id, page=1, page_size=DEFAULT_PAGE_SIZE, folder_slug=DEFAULT_FOLDER_CACHE_TOKEN
-            )
-        )
-        self.assertIsNotNone(cached_bytes)
-        cached_data = json.loads(cached_bytes)
+        # The pre-serialized folder payload must exist after first request.
+        default_folder = self.asset.recitation_folders.get(is_default=True)
+        payload = django_cache.get(recitation_tracks_payload_cache_key(self.asset.id, default_folder.id))
+        self.assertIsNotNone(payload)
+        cached_data = json.loads(gzip.decompress(payload["body"]))
         self.assertEqual(3, len(cached_data["results"]))
 
         # Second request returns same data (served from cache).
@@ -359,6 +358,7 @@ class RecitationTracksAccessControlTest(BaseTestCase):
 
     def setUp(self):
         super().setUp()
+        django_cache.clear()
         self.publisher = baker.make(Publisher)
         self.asset = baker.make(
             Asset,
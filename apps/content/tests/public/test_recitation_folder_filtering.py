@@ -1,5 +1,3 @@
-import json
-
 from django.core.cache import cache as django_cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import connection
@@ -7,7 +5,7 @@ from django.test.utils import CaptureQueriesContext
 from model_bakery import baker
 from oauth2_provider.models import Application
 
-from apps.content.cache import DEFAULT_FOLDER_CACHE_TOKEN, folder_cache_token, recitation_response_cache_key
+from apps.content.cache import DEFAULT_FOLDER_CACHE_TOKEN, folder_cache_token, recitation_tracks_payload_cache_key
 from apps.content.models import (
     Asset,
     CategoryChoice,
@@ -16,7 +14,6 @@ from apps.content.models import (
     RecitationSurahTrack,
     StatusChoice,
 )
-from apps.core.ninja_utils.paginations import DEFAULT_PAGE_SIZE
 from apps.core.tests.base import BaseTestCase
 from apps.publishers.models import Publisher
 from apps.users.models import User
@@ -251,18 +248,12 @@ class PublicRecitationFolderFilteringTest(BaseTestCase):
         self.assertNotEqual(default_body["results"], echo_body["results"])
 
         # ...backed by distinct cache entries
-        default_key = recitation_response_cache_key(
-            self.asset.id, page=1, page_size=DEFAULT_PAGE_SIZE, folder_slug=DEFAULT_FOLDER_CACHE_TOKEN
-        )
-        echo_key = recitation_response_cache_key(
-            self.asset.id, page=1, page_size=DEFAULT_PAGE_SIZE, folder_slug="with-echo"
-        )
+        default_key = recitation_tracks_payload_cache_key(self.asset.id, self.default_folder.id)
+        echo_key = recitation_tracks_payload_cache_key(self.asset.id, self.echo_folder.id)
         self.assertNotEqual(default_key, echo_key)
 
-        cached_default = json.loads(django_cache.get(default_key))
-        cached_echo = json.loads(django_cache.get(echo_key))
-        self.assertEqual(2, cached_default["count"])
-        self.assertEqual(1, cached_echo["count"])
+        self.assertEqual(2, django_cache.get(default_key)["count"])
+        self.assertEqual(1, django_cache.get(echo_key)["count"])
 
     def test_list_tracks_where_served_from_cache_should_still_be_folder_specific(self):
         # Arrange - warm both, then re-request so both are cache hits
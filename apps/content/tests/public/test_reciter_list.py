@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from model_bakery import baker
 from oauth2_provider.models import Application
 
@@ -112,3 +114,33 @@ class RecitersListTest(BaseTestCase):
 
         names = [item["name"] for item in items]
         self.assertEqual(sorted(names), names)  # ascending by name
+
+    def test_list_reciters_where_etag_matches_should_return_304_without_listing_query(self):
+        # Arrange
+        self.authenticate_client(self.app)
+        etag = self.client.get("/reciters/?page_size=5")["ETag"]
+
+        # Act
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get("/reciters/?page_size=5", HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(etag, response["ETag"])
+        reciter_queries = [q["sql"] for q in captured.captured_queries if "content_reciter" in q["sql"]]
+        self.assertEqual([], reciter_queries)
+
+    def test_list_reciters_where_reciter_changed_should_return_new_etag(self):
+        # Arrange
+        self.authenticate_client(self.app)
+        etag = self.client.get("/reciters/")["ETag"]
+        self.active_reciter.name = "Renamed Reciter"
+        self.active_reciter.save()
+
+        # Act
+        response = self.client.get("/reciters/", HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEqual(200, response.status_code, response.content)
+        self.assertNotEqual(etag, response["ETag"])
+        self.assertEqual("Renamed Reciter", response.json()["results"][0]["name"])
@@ -16,6 +16,7 @@ from apps.usage_tracking.decorators.track_usage import (
     _RECITER_NAME_CACHE_KEY,
     _resolve_reciter_name,
     _resolve_reciter_names,
+    usage_event_queue,
 )
 from apps.users.models import APIKey, User
 
@@ -25,6 +26,7 @@ _REDIS = "apps.usage_tracking.decorators.track_usage._get_tracking_redis"
 class UsageTrackingIntegrationTest(BaseTestCase):
     def setUp(self):
         super().setUp()
+        usage_event_queue.clear()
         # Two distinct publishers so we can prove publisher comes from the asset.
         self.publisher_a = baker.make(Publisher, name="Publisher A")
         self.publisher_b = baker.make(Publisher, name="Publisher B")
@@ -60,11 +62,16 @@ class UsageTrackingIntegrationTest(BaseTestCase):
         )
         self.authenticate_client(self.app)
 
+    def _pushed(self, mock_get_redis):
+        """Flush the event queue and return every payload pushed to the tracking buffer."""
+        usage_event_queue.flush()
+        rpush = mock_get_redis.return_value.pipeline.return_value.rpush
+        return [payload for call in rpush.call_args_list for payload in call.args[1:]]
+
     def _props(self, mock_get_redis):
-        mock_r = mock_get_redis.return_value
-        assert mock_r.rpush.called, "expected rpush to be called on Redis mock"
-        raw = mock_r.rpush.call_args[0][1]
-        return json.loads(raw)["properties"]
+        pushed = self._pushed(mock_get_redis)
+        assert pushed, "expected an event pushed to the Redis pipeline"
+        return json.loads(pushed[-1])["properties"]
 
     @patch(_REDIS)
     def test_recitations_list_records_distinct_publishers_of_served_assets(self, mock_get_redis):
@@ -93,7 +100,7 @@ class UsageTrackingIntegrationTest(BaseTestCase):
     def test_recitation_detail_404_dispatches_nothing(self, mock_get_redis):
         response = self.client.get("/recitations/999999/")
         self.assertEqual(404, response.status_code, response.content)
-        mock_get_redis.return_value.rpush.assert_not_called()
+        self.assertEqual([], self._pushed(mock_get_redis))
 
     @patch(_REDIS)
     def test_reciters_list_records_entities_with_no_publisher(self, mock_get_redis):
@@ -208,9 +215,9 @@ class UsageTrackingIntegrationTest(BaseTestCase):
         self.assertEqual(200, first_response.status_code, first_response.content)
         self.assertEqual(200, second_response.status_code, second_response.content)
 
-        calls = mock_get_redis.return_value.rpush.call_args_list
-        first_props = json.loads(calls[-2].args[1])["properties"]
-        second_props = json.loads(calls[-1].args[1])["properties"]
+        pushed = self._pushed(mock_get_redis)
+        first_props = json.loads(pushed[-2])["properties"]
+        second_props = json.loads(pushed[-1])["properties"]
 
         self.assertEqual(first_key.prefix, first_props["application_id"])
         self.assertEqual(second_key.prefix, second_props["application_id"])
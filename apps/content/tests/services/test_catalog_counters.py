@@ -0,0 +1,157 @@
+import threading
+import time
+from unittest import skipUnless
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from model_bakery import baker
+
+from apps.content.models import Asset, CategoryChoice, Qiraah, RecitationSurahTrack, Reciter, Riwayah, StatusChoice
+from apps.content.services.catalog_counters import reconcile_catalog_counters
+from apps.core.tests.base import BaseTestCase
+from apps.publishers.models import Publisher
+
+
+class CatalogCountersTest(BaseTestCase):
+    def setUp(self) -> None:
+        self.qiraah = baker.make(Qiraah, name="Asim")
+        self.riwayah = baker.make(Riwayah, name="Hafs", qiraah=self.qiraah)
+        self.reciter = baker.make(Reciter, name="Reciter")
+        self.asset = baker.make(
+            Asset,
+            publisher=baker.make(Publisher, name="Publisher"),
+            category=CategoryChoice.RECITATION,
+            status=StatusChoice.READY,
+            reciter=self.reciter,
+            riwayah=self.riwayah,
+        )
+
+    def assert_recitations_count(self, expected: int, *instances) -> None:
+        for instance in instances:
+            instance.refresh_from_db()
+            self.assertEqual(expected, instance.ready_recitations_count, instance)
+
+    def test_asset_save_where_ready_recitation_created_or_unpublished_should_refresh_counters(self):
+        # Arrange
+        self.assert_recitations_count(1, self.reciter, self.riwayah, self.qiraah)
+
+        # Act
+        self.asset.status = StatusChoice.DRAFT
+        self.asset.save()
+
+        # Assert
+        self.assert_recitations_count(0, self.reciter, self.riwayah, self.qiraah)
+
+    def test_riwayah_save_where_qiraah_changed_should_move_its_recitations(self):
+        # Arrange
+        other_qiraah = baker.make(Qiraah, name="Nafi")
+
+        # Act
+        self.riwayah.qiraah = other_qiraah
+        self.riwayah.save()
+
+        # Assert
+        self.assert_recitations_count(0, self.qiraah)
+        self.assert_recitations_count(1, other_qiraah)
+
+    def test_track_save_where_added_to_default_folder_should_refresh_surahs_count(self):
+        # Act
+        track = RecitationSurahTrack.objects.create(
+            asset=self.asset, surah_number=1, audio_file=SimpleUploadedFile("a.mp3", b"fake-bytes")
+        )
+        self.asset.refresh_from_db()
+        added_count = self.asset.surahs_count
+        track.delete()
+        self.asset.refresh_from_db()
+
+        # Assert
+        self.assertEqual((1, 0), (added_count, self.asset.surahs_count))
+
+    def test_save_where_instance_is_stale_should_keep_stored_counter(self):
+        # Arrange
+        stale_reciter = Reciter.objects.get(pk=self.reciter.pk)
+        Asset.objects.get(pk=self.asset.pk).delete()
+
+        # Act
+        stale_reciter.name = "Renamed"
+        stale_reciter.save()
+
+        # Assert
+        self.assert_recitations_count(0, self.reciter)
+        self.assertEqual("Renamed", self.reciter.name)
+
+    def test_reconcile_catalog_counters_where_update_bypassed_signals_should_repair_drift(self):
+        # Arrange
+        Asset.objects.filter(pk=self.asset.pk).update(status=StatusChoice.DRAFT)
+
+        # Act
+        repaired = reconcile_catalog_counters()
+
+        # Assert
+        self.assertEqual({"Asset": 0, "Reciter": 1, "Riwayah": 1, "Qiraah": 1}, repaired)
+        self.assert_recitations_count(0, self.reciter, self.riwayah, self.qiraah)
+        self.assertEqual({"Asset": 0, "Reciter": 0, "Riwayah": 0, "Qiraah": 0}, reconcile_catalog_counters())
+
+
+@skipUnless(connection.vendor == "postgresql", "needs concurrent transactions under READ COMMITTED")
+class CatalogCountersConcurrencyTest(TransactionTestCase):
+    def make_ready_recitation(self, publisher: Publisher, reciter: Reciter, riwayah: Riwayah) -> Asset:
+        return baker.make(
+            Asset,
+            publisher=publisher,
+            category=CategoryChoice.RECITATION,
+            status=StatusChoice.READY,
+            reciter=reciter,
+            riwayah=riwayah,
+        )
+
+    def wait_for_blocked_writer(self) -> None:
+        with connection.cursor() as cursor:
+            for _ in range(100):
+                cursor.execute(
+                    "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database() AND wait_event_type = 'Lock'"
+                )
+                if cursor.fetchone()[0]:
+                    return
+                time.sleep(0.05)
+        self.fail("the second writer never waited on the first one's lock")
+
+    def test_refresh_where_two_writers_overlap_should_count_both_recitations(self):
+        # Arrange
+        publisher = baker.make(Publisher, name="Publisher")
+        reciter = baker.make(Reciter, name="Reciter")
+        riwayah = baker.make(Riwayah, name="Hafs", qiraah=baker.make(Qiraah, name="Asim"))
+        first_written, release_first = threading.Event(), threading.Event()
+
+        def first_writer() -> None:
+            try:
+                with transaction.atomic():
+                    self.make_ready_recitation(publisher, reciter, riwayah)
+                    first_written.set()
+                    release_first.wait(timeout=10)
+            finally:
+                connection.close()
+
+        def second_writer() -> None:
+            try:
+                with transaction.atomic():
+                    self.make_ready_recitation(publisher, reciter, riwayah)
+            finally:
+                connection.close()
+
+        # Act
+        first = threading.Thread(target=first_writer)
+        first.start()
+        first_written.wait(timeout=10)
+        second = threading.Thread(target=second_writer)
+        second.start()
+        self.wait_for_blocked_writer()
+        release_first.set()
+        first.join(timeout=10)
+        second.join(timeout=10)
+
+        # Assert
+        for counted in (reciter, riwayah, riwayah.qiraah):
+            counted.refresh_from_db()
+            self.assertEqual(2, counted.ready_recitations_count, counted)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+from unittest.mock import Mock
+
+import boto3
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from apps.content.services.admin.r2_upload_pipeline import R2UploadPipeline
+from apps.core.ninja_utils.errors import ItqanError
+from apps.core.tests.base import BaseTestCase
+
+
+class TestR2UploadPipeline(BaseTestCase):
+    def setUp(self) -> None:
+        self.s3 = boto3.client("s3", region_name="us-east-1")
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="r2-upload-test-"))
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+
+    def _bucket_keys(self, prefix: str) -> list[str]:
+        response = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=prefix)
+        return sorted(obj["Key"] for obj in response.get("Contents", []))
+
+    def test_submit_where_paths_and_bytes_given_should_upload_all_with_content_type(self):
+        # Arrange
+        path = self.temp_dir / "a.mp3"
+        path.write_bytes(b"from-file")
+
+        # Act
+        with R2UploadPipeline(self.s3, error_message="failed", max_workers=2) as uploads:
+            uploads.submit("media/pipeline/a.mp3", path, "audio/mpeg")
+            uploads.submit("media/pipeline/b.json", b"from-bytes", "application/json")
+
+        # Assert
+        self.assertEqual(["media/pipeline/a.mp3", "media/pipeline/b.json"], self._bucket_keys("media/pipeline/"))
+        body = self.s3.get_object(Bucket=self.bucket_name, Key="media/pipeline/a.mp3")["Body"].read()
+        self.assertEqual(b"from-file", body)
+        head = self.s3.head_object(Bucket=self.bucket_name, Key="media/pipeline/b.json")
+        self.assertEqual("application/json", head["ContentType"])
+
+    def test_submit_where_max_pending_reached_should_block_until_an_upload_finishes(self):
+        # Arrange - the first PUT is held open, so a second submit must wait for its slot
+        release_first = threading.Event()
+        s3 = Mock()
+        s3.put_object.side_effect = lambda **kwargs: release_first.wait(timeout=5)
+        second_submitted = threading.Event()
+
+        def produce(uploads: R2UploadPipeline) -> None:
+            uploads.submit("k1", b"1", "audio/mpeg")
+            uploads.submit("k2", b"2", "audio/mpeg")
+            second_submitted.set()
+
+        # Act
+        with R2UploadPipeline(s3, error_message="failed", max_workers=2, max_pending=1) as uploads:
+            producer = threading.Thread(target=produce, args=(uploads,))
+            producer.start()
+            blocked = not second_submitted.wait(timeout=0.2)
+            release_first.set()
+            producer.join(timeout=5)
+
+        # Assert
+        self.assertTrue(blocked)
+        self.assertTrue(second_submitted.is_set())
+        self.assertEqual(2, s3.put_object.call_count)
+
+    def test_join_where_upload_raises_client_error_should_raise_storage_error_with_generic_message(self):
+        # Arrange
+        s3 = Mock()
+        s3.put_object.side_effect = ClientError({"Error": {"Code": "AccessDenied", "Message": "denied"}}, "PutObject")
+
+        # Act / Assert
+        with self.assertRaises(ItqanError) as ctx:
+            with R2UploadPipeline(s3, error_message="Failed to store objects.") as uploads:
+                uploads.submit("k1", b"1", "audio/mpeg")
+
+        self.assertEqual("storage_error", ctx.exception.error_name)
+        self.assertEqual(503, ctx.exception.status_code)
+        self.assertEqual("Failed to store objects.", ctx.exception.message)
+
+    def test_submit_where_earlier_upload_failed_should_raise_and_not_upload_more(self):
+        # Arrange - a connection-level failure is BotoCoreError, also a storage_error
+        s3 = Mock()
+        s3.put_object.side_effect = EndpointConnectionError(endpoint_url="http://internal-r2.local:5000")
+
+        # Act / Assert - join, a later submit and the clean block exit all report the failure
+        with self.assertRaises(ItqanError) as exit_ctx:
+            with R2UploadPipeline(s3, error_message="failed", max_workers=1) as uploads:
+                uploads.submit("k1", b"1", "audio/mpeg")
+                with self.assertRaises(ItqanError) as join_ctx:
+                    uploads.join()
+                with self.assertRaises(ItqanError) as submit_ctx:
+                    uploads.submit("k2", b"2", "audio/mpeg")
+
+        self.assertEqual("storage_error", join_ctx.exception.error_name)
+        self.assertEqual("storage_error", submit_ctx.exception.error_name)
+        self.assertEqual("storage_error", exit_ctx.exception.error_name)
+        self.assertEqual(1, s3.put_object.call_count)
+
+    def test_submit_where_used_outside_context_manager_should_raise(self):
+        # Arrange
+        uploads = R2UploadPipeline(Mock(), error_message="failed")
+
+        # Act / Assert
+        with self.assertRaises(RuntimeError):
+            uploads.submit("k1", b"1", "audio/mpeg")
@@ -3,17 +3,20 @@ from __future__ import annotations
 from pathlib import Path
 import subprocess
 import tempfile
+import threading
 from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import boto3
 from botocore.exceptions import ClientError, EndpointConnectionError
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from model_bakery import baker
 
 from apps.content.models import (
     Asset,
     CategoryChoice,
+    RecitationAyahSlice,
     RecitationAyahTiming,
     RecitationFolder,
     RecitationSurahTrack,
@@ -94,6 +97,7 @@ class TestRecitationAudioSlicingService(BaseTestCase):
     def _failing_storage_client(self, *, download_error=None, upload_error=None) -> Mock:
         """Mock S3 client whose download/upload can be made to fail with a given exception."""
         s3 = Mock()
+        s3.head_object.return_value = {}
         if download_error is not None:
             s3.get_object.side_effect = download_error
         else:
@@ -158,12 +162,14 @@ class TestRecitationAudioSlicingService(BaseTestCase):
         with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"x")) as mock_run:
             self.service.slice_track(self.track.id)
 
-        # Assert - ffmpeg receives seconds with ms precision, as output options (after -i)
+        # Assert - ffmpeg receives seconds with ms precision; -ss is an input option
+        # (before -i) so only the ayah is decoded, and -t carries the slice duration
         cmd = mock_run.call_args.args[0]
         self.assertEqual("-ss", cmd[cmd.index("-ss") + 0])
         self.assertEqual("1.234", cmd[cmd.index("-ss") + 1])
-        self.assertEqual("3.456", cmd[cmd.index("-to") + 1])
-        self.assertGreater(cmd.index("-ss"), cmd.index("-i"))
+        self.assertEqual("2.222", cmd[cmd.index("-t") + 1])
+        self.assertLess(cmd.index("-ss"), cmd.index("-i"))
+        self.assertNotIn("-to", cmd)
 
     def test_slice_track_where_ayah_is_sliced_should_apply_short_in_and_out_fades(self):
         # Arrange - 2.224s ayah => fade-out starts at 2.224 - 0.02 = 2.204
@@ -394,13 +400,182 @@ class TestRecitationAudioSlicingService(BaseTestCase):
         # Act
         with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"x")):
             first = self.service.slice_track(self.track.id)
-            second = self.service.slice_track(self.track.id)
+            second = self.service.slice_track(self.track.id, force=True)
 
         # Assert - deterministic keys overwrite the same objects; no duplicates accumulate
         self.assertEqual(first["keys"], second["keys"])
         slice_keys = [key for key in self._bucket_keys() if "/ayah_" in key]
         self.assertEqual(2, len(slice_keys))
 
+    def test_slice_track_where_slicing_succeeds_should_record_one_fingerprint_per_ayah(self):
+        # Arrange
+        self._upload_source_audio()
+        self._add_timing("1:1", start_ms=0, end_ms=1000)
+        self._add_timing("1:2", start_ms=1000, end_ms=2000)
+        source_etag = self.s3.head_object(Bucket=self.bucket_name, Key=f"media/{self.track.audio_file.name}")["ETag"]
+
+        # Act
+        with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"x")):
+            result = self.service.slice_track(self.track.id)
+
+        # Assert - source ETag, timing tuple and encoder settings are persisted per ayah
+        ayah_slices = {s.ayah_key: s for s in RecitationAyahSlice.objects.filter(track=self.track)}
+        self.assertEqual({"1:1", "1:2"}, set(ayah_slices))
+        self.assertEqual(result["keys"][1], ayah_slices["1:2"].slice_key)
+        self.assertEqual(source_etag, ayah_slices["1:2"].source_etag)
+        self.assertEqual((1000, 2000), (ayah_slices["1:2"].start_ms, ayah_slices["1:2"].end_ms))
+        self.assertEqual("libmp3lame", ayah_slices["1:2"].encoder_params["codec"])
+
+    def test_slice_track_where_nothing_changed_should_skip_every_ayah_without_ffmpeg(self):
+        # Arrange
+        self._upload_source_audio()
+        self._add_timing("1:1", start_ms=0, end_ms=1000)
+        self._add_timing("1:2", start_ms=1000, end_ms=2000)
+        with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"x")):
+            self.service.slice_track(self.track.id)
+
+        # Act
+        with patch("subprocess.run") as mock_run:
+            result = self.service.slice_track(self.track.id)
+
+        # Assert
+        mock_run.assert_not_called()
+        self.assertEqual(0, result["sliced"])
+        self.assertEqual(2, result["skipped"])
+        self.assertEqual([], result["keys"])
+
+    def test_slice_track_where_nothing_changed_should_read_only_source_headers(self):
+        # Arrange
+        self._upload_source_audio()
+        self._add_timing("1:1", start_ms=0, end_ms=1000)
+        with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"x")):
+            self.service.slice_track(self.track.id)
+        s3 = Mock(wraps=self.s3)
+
+        # Act
+        with patch.object(self.service, "_get_s3_client", return_value=s3):
+            self.service.slice_track(self.track.id)
+
+        # Assert
+        s3.head_object.assert_called_once()
+        s3.get_object.assert_not_called()
+
+    def test_slice_track_where_source_replaced_after_head_should_raise_storage_error(self):
+        # Arrange
+        self._upload_source_audio()
+        self._add_timing("1:1", start_ms=0, end_ms=1000)
+        s3 = Mock(wraps=self.s3)
+        source_key = f"media/{self.track.audio_file.name}"
+
+        def head_then_replace(**kwargs):
+            head = self.s3.head_object(**kwargs)
+            self.s3.put_object(Bucket=self.bucket_name, Key=source_key, Body=b"new-source")
+            return head
+
+        s3.head_object.side_effect = head_then_replace
+
+        # Act / Assert
+        with (
+            patch.object(self.service, "_get_s3_client", return_value=s3),
+            patch("subprocess.run", side_effect=self._fake_ffmpeg(b"x")) as mock_run,
+            self.assertRaises(ItqanError) as ctx,
+        ):
+            self.service.slice_track(self.track.id)
+
+        self._assert_slicing_rejected(ctx, "storage_error", 503)
+        mock_run.assert_not_called()
+
+    def test_slice_track_where_one_timing_changed_should_reslice_only_that_ayah(self):
+        # Arrange
+        self._upload_source_audio()
+        self._add_timing("1:1", start_ms=0, end_ms=1000)
+        changed = self._add_timing("1:2", start_ms=1000, end_ms=2000)
+        with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"x")):
+            self.service.slice_track(self.track.id)
+        changed.end_ms = 2500
+        changed.save()
+
+        # Act
+        with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"y")) as mock_run:
+            result = self.service.slice_track(self.track.id)
+
+        # Assert
+        mock_run.assert_called_once()
+        self.assertEqual(1, result["sliced"])
+        self.assertEqual(1, result["skipped"])
+        self.assertEqual(
+            [f"uploads/assets/{self.asset.id}/recitations/{self.default_folder.id}/001/ayah_002.mp3"], result["keys"]
+        )
+        self.assertEqual(2500, RecitationAyahSlice.objects.get(track=self.track, ayah_key="1:2").end_ms)
+
+    def test_slice_track_where_source_audio_replaced_should_reslice_every_ayah(self):
+        # Arrange
+        self._upload_source_audio()
+        self._add_timing("1:1", start_ms=0, end_ms=1000)
+        self._add_timing("1:2", start_ms=1000, end_ms=2000)
+        with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"x")):
+            self.service.slice_track(self.track.id)
+        self.s3.put_object(Bucket=self.bucket_name, Key=f"media/{self.track.audio_file.name}", Body=b"new-source")
+
+        # Act
+        with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"y")) as mock_run:
+            result = self.service.slice_track(self.track.id)
+
+        # Assert - a new ETag invalidates every fingerprint
+        self.assertEqual(2, mock_run.call_count)
+        self.assertEqual(2, result["sliced"])
+        self.assertEqual(0, result["skipped"])
+
+    def test_slice_track_where_encoder_settings_changed_should_reslice_every_ayah(self):
+        # Arrange
+        self._upload_source_audio()
+        self._add_timing("1:1", start_ms=0, end_ms=1000)
+        with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"x")):
+            self.service.slice_track(self.track.id)
+        RecitationAyahSlice.objects.filter(track=self.track).update(
+            encoder_params={"codec": "libmp3lame", "fade_duration_s": 0.05}
+        )
+
+        # Act
+        with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"y")):
+            result = self.service.slice_track(self.track.id)
+
+        # Assert
+        self.assertEqual(1, result["sliced"])
+        self.assertEqual(0, result["skipped"])
+
+    def test_slice_track_where_timing_removed_should_drop_its_fingerprint(self):
+        # Arrange
+        self._upload_source_audio()
+        self._add_timing("1:1", start_ms=0, end_ms=1000)
+        removed = self._add_timing("1:2", start_ms=1000, end_ms=2000)
+        with patch("subprocess.run", side_effect=self._fake_ffmpeg(b"x")):
+            self.service.slice_track(self.track.id)
+        removed.delete()
+
+        # Act
+        result = self.service.slice_track(self.track.id)
+
+        # Assert
+        self.assertEqual(1, result["skipped"])
+        self.assertEqual(
+            ["1:1"], list(RecitationAyahSlice.objects.filter(track=self.track).values_list("ayah_key", flat=True))
+        )
+
+    def test_slice_track_where_run_fails_should_not_record_fingerprints(self):
+        # Arrange
+        self._upload_source_audio()
+        self._add_timing("1:1", start_ms=0, end_ms=1000)
+        failed = subprocess.CompletedProcess(args=["ffmpeg"], returncode=1, stderr="boom")
+
+        # Act
+        with patch("subprocess.run", return_value=failed):
+            with self.assertRaises(ItqanError):
+                self.service.slice_track(self.track.id)
+
+        # Assert - the next run must re-slice the ayah
+        self.assertFalse(RecitationAyahSlice.objects.filter(track=self.track).exists())
+
     def test_slice_track_where_ffmpeg_times_out_should_raise_slicing_failed_with_generic_message(self):
         # Arrange
         self._upload_source_audio()
@@ -426,10 +601,84 @@ class TestRecitationAudioSlicingService(BaseTestCase):
         # Assert - every flag the slice depends on is present, in one argv list
         cmd = mock_run.call_args.args[0]
         self.assertEqual("ffmpeg", cmd[0])
-        for flag in ("-y", "-i", "-ss", "-to", "-af", "-c:a", "libmp3lame"):
+        for flag in ("-y", "-i", "-ss", "-t", "-af", "-c:a", "libmp3lame"):
             self.assertIn(flag, cmd)
         self.assertTrue(cmd[-1].endswith("001_001.mp3"))
 
+    def test_slice_track_where_ffmpeg_finishes_out_of_order_should_upload_and_return_keys_in_ayah_order(self):
+        # Arrange - the first ayah's ffmpeg blocks until the last one has finished,
+        # which can only happen when slices are encoded concurrently
+        self._upload_source_audio()
+        self._add_timing("1:1", start_ms=0, end_ms=1000)
+        self._add_timing("1:2", start_ms=1000, end_ms=2000)
+        self._add_timing("1:3", start_ms=2000, end_ms=3000)
+        last_done = threading.Event()
+
+        def fake_run(cmd, **kwargs):
+            if cmd[-1].endswith("001_001.mp3"):
+                self.assertTrue(last_done.wait(timeout=5))
+            Path(cmd[-1]).write_bytes(b"x")
+            if cmd[-1].endswith("001_003.mp3"):
+                last_done.set()
+            return subprocess.CompletedProcess(args=cmd, returncode=0)
+
+        service = RecitationAudioSlicingService(max_workers=3)
+
+        # Act
+        with (
+            patch.object(service, "_get_s3_client", return_value=self.s3),
+            patch("subprocess.run", side_effect=fake_run),
+        ):
+            result = service.slice_track(self.track.id)
+
+        # Assert - keys keep timing order regardless of completion order
+        self.assertEqual(3, result["sliced"])
+        self.assertEqual(
+            [
+                f"uploads/assets/{self.asset.id}/recitations/{self.default_folder.id}/001/ayah_{n:03}.mp3"
+                for n in (1, 2, 3)
+            ],
+            result["keys"],
+        )
+
+    def test_init_where_max_workers_not_given_should_use_setting(self):
+        # Arrange / Act
+        with override_settings(AYAH_SLICING_MAX_WORKERS=7):
+            default_service = RecitationAudioSlicingService()
+        explicit_service = RecitationAudioSlicingService(max_workers=2)
+        with override_settings(AYAH_SLICING_MAX_WORKERS=0):
+            clamped_service = RecitationAudioSlicingService()
+
+        # Assert
+        self.assertEqual(7, default_service.max_workers)
+        self.assertEqual(2, explicit_service.max_workers)
+        self.assertEqual(1, clamped_service.max_workers)
+
+    def test_slice_track_where_one_ayah_fails_should_not_upload_that_ayah_or_later_ones(self):
+        # Arrange - the second ayah fails; later ayahs may already be encoded but must not be stored
+        self._upload_source_audio()
+        self._add_timing("1:1", start_ms=0, end_ms=1000)
+        self._add_timing("1:2", start_ms=1000, end_ms=2000)
+        self._add_timing("1:3", start_ms=2000, end_ms=3000)
+
+        def fake_run(cmd, **kwargs):
+            if cmd[-1].endswith("001_002.mp3"):
+                return subprocess.CompletedProcess(args=cmd, returncode=1, stderr="boom")
+            Path(cmd[-1]).write_bytes(b"x")
+            return subprocess.CompletedProcess(args=cmd, returncode=0)
+
+        # Act / Assert
+        with patch("subprocess.run", side_effect=fake_run):
+            with self.assertRaises(ItqanError) as ctx:
+                self.service.slice_track(self.track.id)
+
+        self._assert_slicing_rejected(ctx, "slicing_failed", 503)
+        slice_keys = sorted(key for key in self._bucket_keys() if "/ayah_" in key)
+        self.assertEqual(
+            [f"media/uploads/assets/{self.asset.id}/recitations/{self.default_folder.id}/001/ayah_001.mp3"],
+            slice_keys,
+        )
+
     def _capturing_ffmpeg(self, cmd, **kwargs):
         Path(cmd[-1]).write_bytes(b"slice")
         self.captured_cmds.append(cmd)
@@ -509,7 +758,7 @@ class TestRecitationAudioSlicingService(BaseTestCase):
                     ),
                     patch("subprocess.run", side_effect=self._capturing_ffmpeg),
                 ):
-                    self.service.slice_track(self.track.id)
+                    self.service.slice_track(self.track.id, force=True)
 
                 # Assert
                 cmd = self.captured_cmds[0]
@@ -645,6 +894,7 @@ class TestRecitationAudioSlicingService(BaseTestCase):
         self._add_timing("1:1", start_ms=0, end_ms=1000)
         body = Mock()
         failing_s3 = Mock()
+        failing_s3.head_object.return_value = {}
         failing_s3.get_object.return_value = {"Body": body}
 
         # Act / Assert
@@ -668,6 +918,7 @@ class TestRecitationAudioSlicingService(BaseTestCase):
             close=Mock(side_effect=RuntimeError("close failed")),
         )
         s3 = Mock()
+        s3.head_object.return_value = {}
         s3.get_object.return_value = {"Body": body}
 
         # Act
@@ -694,6 +945,7 @@ class TestRecitationAudioSlicingService(BaseTestCase):
             with self.subTest(error=type(exc).__name__):
                 body = Mock(close=Mock(side_effect=RuntimeError("close failed")))
                 s3 = Mock()
+                s3.head_object.return_value = {}
                 s3.get_object.return_value = {"Body": body}
 
                 # Act / Assert - original storage failure stays mapped to storage_error 503
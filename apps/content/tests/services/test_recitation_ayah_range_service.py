@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+import subprocess
+from unittest.mock import patch
+
+import boto3
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.utils import timezone
+from model_bakery import baker
+
+from apps.content.models import (
+    Asset,
+    CategoryChoice,
+    RecitationAyahRange,
+    RecitationAyahSlice,
+    RecitationFolder,
+    RecitationSurahTrack,
+    Reciter,
+    Riwayah,
+)
+from apps.content.services.recitation_ayah_range import RecitationAyahRangeService, ayah_range_build_pending_key
+from apps.core.ninja_utils.errors import ItqanError
+from apps.core.tests.base import BaseTestCase
+
+ENCODER_PARAMS = {
+    "codec": "libmp3lame",
+    "fade_duration_s": 0.02,
+    "bitrate": 128000,
+    "sample_rate": 44100,
+    "channels": 2,
+}
+
+
+class TestRecitationAyahRangeService(BaseTestCase):
+    def setUp(self) -> None:
+        self.asset = baker.make(
+            Asset,
+            name="test",
+            category=CategoryChoice.RECITATION,
+            reciter=baker.make(Reciter, name="Test Reciter", slug="test-reciter"),
+            riwayah=baker.make(Riwayah, name="Test Riwayah"),
+        )
+        self.folder = RecitationFolder.objects.get(asset=self.asset, is_default=True)
+        self.track = RecitationSurahTrack.objects.create(
+            asset=self.asset,
+            folder=self.folder,
+            surah_number=1,
+            audio_file=SimpleUploadedFile("001.mp3", b"x"),
+            duration_ms=7000,
+        )
+        self.service = RecitationAyahRangeService()
+        self.s3 = boto3.client("s3", region_name="us-east-1")
+        client_patcher = patch.object(self.service, "_get_s3_client", return_value=self.s3)
+        client_patcher.start()
+        self.addCleanup(client_patcher.stop)
+        # The moto bucket lives for the whole class and ids are reused, so keys would collide.
+        self.addCleanup(self._empty_bucket)
+        for ayah_number in range(1, 4):
+            self._add_slice(ayah_number)
+
+    def _empty_bucket(self) -> None:
+        for obj in self.s3.list_objects_v2(Bucket=self.bucket_name).get("Contents", []):
+            self.s3.delete_object(Bucket=self.bucket_name, Key=obj["Key"])
+
+    def _slice_key(self, ayah_number: int) -> str:
+        return f"uploads/assets/{self.asset.id}/recitations/{self.folder.id}/001/ayah_{ayah_number:03}.mp3"
+
+    def _add_slice(self, ayah_number: int, **overrides) -> RecitationAyahSlice:
+        key = self._slice_key(ayah_number)
+        self.s3.put_object(Bucket=self.bucket_name, Key=f"media/{key}", Body=f"ayah-{ayah_number}".encode())
+        fields = {
+            "track": self.track,
+            "ayah_key": f"1:{ayah_number}",
+            "slice_key": key,
+            "source_etag": '"etag-1"',
+            "start_ms": (ayah_number - 1) * 1000,
+            "end_ms": ayah_number * 1000,
+            "encoder_params": ENCODER_PARAMS,
+            **overrides,
+        }
+        return RecitationAyahSlice.objects.create(**fields)
+
+    def _fake_concat(self, output_body: bytes = b"combined", fail_stream_copy: bool = False):
+        """Stand-in for ffmpeg: writes the joined file, optionally failing the -c copy attempt."""
+        self.concat_cmds: list[list[str]] = []
+
+        def fake_run(cmd, **kwargs):
+            self.concat_cmds.append(cmd)
+            if fail_stream_copy and "copy" in cmd:
+                return subprocess.CompletedProcess(args=cmd, returncode=1, stderr="non-monotonic DTS")
+            Path(cmd[-1]).write_bytes(output_body)
+            return subprocess.CompletedProcess(args=cmd, returncode=0)
+
+        return fake_run
+
+    def test_parse_ayah_range_where_range_is_valid_should_return_surah_and_bounds(self):
+        # Arrange / Act / Assert
+        self.assertEqual((2, 5, 10), self.service.parse_ayah_range("2:5", "2:10"))
+
+    def test_parse_ayah_range_where_range_is_invalid_should_raise_invalid_ayah_range(self):
+        # Arrange - cross-surah, non-canonical, reversed, past the surah end, unknown surah
+        for from_ayah, to_ayah in [
+            ("2:5", "3:1"),
+            ("2:05", "2:10"),
+            ("2:10", "2:5"),
+            ("1:1", "1:8"),
+            ("115:1", "115:2"),
+        ]:
+            with self.subTest(from_ayah=from_ayah, to_ayah=to_ayah):
+                # Act / Assert
+                with self.assertRaises(ItqanError) as ctx:
+                    self.service.parse_ayah_range(from_ayah, to_ayah)
+                self.assertEqual("invalid_ayah_range", ctx.exception.error_name)
+                self.assertEqual(400, ctx.exception.status_code)
+
+    @override_settings(AYAH_RANGE_MAX_AYAHS=5)
+    def test_parse_ayah_range_where_range_exceeds_max_ayahs_should_raise_invalid_ayah_range(self):
+        # Arrange / Act / Assert
+        with self.assertRaises(ItqanError) as ctx:
+            self.service.parse_ayah_range("2:1", "2:6")
+        self.assertEqual("invalid_ayah_range", ctx.exception.error_name)
+
+    def test_get_range_key_where_single_ayah_should_return_slice_key_without_ffmpeg(self):
+        # Arrange / Act
+        with patch("subprocess.run") as mock_run:
+            key = self.service.get_range_key(self.asset.id, None, "1:2", "1:2")
+
+        # Assert
+        mock_run.assert_not_called()
+        self.assertEqual(self._slice_key(2), key)
+
+    def test_get_range_key_where_slice_missing_should_raise_ayah_range_not_available(self):
+        # Arrange
+        RecitationAyahSlice.objects.filter(ayah_key="1:3").delete()
+
+        # Act / Assert
+        with self.assertRaises(ItqanError) as ctx:
+            self.service.get_range_key(self.asset.id, None, "1:1", "1:3")
+        self.assertEqual("ayah_range_not_available", ctx.exception.error_name)
+        self.assertEqual(404, ctx.exception.status_code)
+
+    def test_build_range_where_range_is_cold_should_stream_copy_upload_and_record_range(self):
+        # Act
+        with patch("subprocess.run", side_effect=self._fake_concat(b"combined")):
+            key = self.service.build_range(self.track.id, 1, 3).range_key
+
+        # Assert - one remux, no re-encode; the object is immutable and recorded for LRU
+        self.assertEqual(1, len(self.concat_cmds))
+        cmd = self.concat_cmds[0]
+        self.assertEqual(["-c", "copy"], cmd[cmd.index("-c") : cmd.index("-c") + 2])
+        self.assertIn("concat", cmd)
+        ayah_range = RecitationAyahRange.objects.get()
+        self.assertEqual(key, ayah_range.range_key)
+        self.assertEqual((1, 3, len(b"combined")), (ayah_range.first_ayah, ayah_range.last_ayah, ayah_range.size_bytes))
+        self.assertIn(ayah_range.content_hash, key)
+        head = self.s3.head_object(Bucket=self.bucket_name, Key=f"media/{key}")
+        self.assertEqual("audio/mpeg", head["ContentType"])
+        self.assertIn("immutable", head["CacheControl"])
+
+    def test_get_range_key_where_range_built_should_return_its_key_without_ffmpeg(self):
+        # Arrange
+        with patch("subprocess.run", side_effect=self._fake_concat()):
+            first = self.service.build_range(self.track.id, 1, 3).range_key
+
+        # Act
+        with patch("subprocess.run") as mock_run:
+            second = self.service.get_range_key(self.asset.id, None, "1:1", "1:3")
+
+        # Assert
+        mock_run.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_get_range_key_where_range_not_built_should_queue_one_build_and_return_none(self):
+        # Arrange
+        slices = list(RecitationAyahSlice.objects.order_by("start_ms"))
+        self.addCleanup(cache.delete, ayah_range_build_pending_key(self.service._content_hash(slices)))
+
+        # Act - a burst of first requests
+        with (
+            patch("apps.content.services.recitation_ayah_range.build_recitation_ayah_range_task.delay") as mock_delay,
+            patch("subprocess.run") as mock_run,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            keys = [self.service.get_range_key(self.asset.id, None, "1:1", "1:3") for _ in range(3)]
+
+        # Assert - nothing is built in the request, and the build is queued once
+        self.assertEqual([None, None, None], keys)
+        mock_run.assert_not_called()
+        mock_delay.assert_called_once_with(self.track.id, 1, 3)
+
+    def test_build_range_where_a_slice_was_removed_since_queued_should_build_nothing(self):
+        # Arrange
+        RecitationAyahSlice.objects.filter(ayah_key="1:2").delete()
+
+        # Act
+        with patch("subprocess.run") as mock_run:
+            ayah_range = self.service.build_range(self.track.id, 1, 3)
+
+        # Assert
+        self.assertIsNone(ayah_range)
+        mock_run.assert_not_called()
+        self.assertFalse(RecitationAyahRange.objects.exists())
+
+    def test_get_range_key_where_cached_range_is_stale_in_lru_clock_should_touch_last_accessed_at(self):
+        # Arrange
+        with patch("subprocess.run", side_effect=self._fake_concat()):
+            self.service.build_range(self.track.id, 1, 3)
+        long_ago = timezone.now() - timedelta(days=3)
+        RecitationAyahRange.objects.update(last_accessed_at=long_ago)
+
+        # Act
+        self.service.get_range_key(self.asset.id, None, "1:1", "1:3")
+
+        # Assert
+        self.assertGreater(RecitationAyahRange.objects.get().last_accessed_at, long_ago)
+
+    def test_build_range_where_an_ayah_was_resliced_should_build_a_new_content_addressed_object(self):
+        # Arrange
+        with patch("subprocess.run", side_effect=self._fake_concat()):
+            first = self.service.build_range(self.track.id, 1, 3).range_key
+        RecitationAyahSlice.objects.filter(ayah_key="1:2").update(end_ms=2100)
+
+        # Act
+        with patch("subprocess.run", side_effect=self._fake_concat()):
+            second = self.service.build_range(self.track.id, 1, 3).range_key
+
+        # Assert - stale audio is never served from the old key
+        self.assertNotEqual(first, second)
+        self.assertEqual(2, RecitationAyahRange.objects.count())
+
+    def test_build_range_where_slices_disagree_on_encoder_params_should_reencode(self):
+        # Arrange
+        RecitationAyahSlice.objects.filter(ayah_key="1:3").update(encoder_params={**ENCODER_PARAMS, "bitrate": 64000})
+
+        # Act
+        with patch("subprocess.run", side_effect=self._fake_concat()):
+            self.service.build_range(self.track.id, 1, 3)
+
+        # Assert
+        self.assertEqual(1, len(self.concat_cmds))
+        self.assertNotIn("copy", self.concat_cmds[0])
+        self.assertIn("libmp3lame", self.concat_cmds[0])
+
+    def test_build_range_where_stream_copy_fails_should_fall_back_to_reencode(self):
+        # Act
+        with patch("subprocess.run", side_effect=self._fake_concat(fail_stream_copy=True)):
+            key = self.service.build_range(self.track.id, 1, 3).range_key
+
+        # Assert
+        self.assertEqual(2, len(self.concat_cmds))
+        self.assertIn("libmp3lame", self.concat_cmds[1])
+        self.assertTrue(RecitationAyahRange.objects.filter(range_key=key).exists())
+
+    def test_build_range_where_ffmpeg_fails_should_raise_and_record_nothing(self):
+        # Arrange
+        failed = subprocess.CompletedProcess(args=["ffmpeg"], returncode=1, stderr="boom")
+
+        # Act
+        with patch("subprocess.run", return_value=failed):
+            with self.assertRaises(ItqanError) as ctx:
+                self.service.build_range(self.track.id, 1, 3)
+
+        # Assert
+        self.assertEqual("ayah_range_failed", ctx.exception.error_name)
+        self.assertFalse(RecitationAyahRange.objects.exists())
+
+    def test_build_range_where_slice_object_missing_in_storage_should_raise_storage_error(self):
+        # Arrange
+        self.s3.delete_object(Bucket=self.bucket_name, Key=f"media/{self._slice_key(2)}")
+
+        # Act / Assert
+        with patch("subprocess.run", side_effect=self._fake_concat()):
+            with self.assertRaises(ItqanError) as ctx:
+                self.service.build_range(self.track.id, 1, 3)
+        self.assertEqual("storage_error", ctx.exception.error_name)
+        self.assertEqual(503, ctx.exception.status_code)
+
+    def test_evict_least_recently_used_where_over_budget_should_delete_oldest_idle_ranges_first(self):
+        # Arrange - three 100-byte ranges: two idle for days, one just served
+        now = timezone.now()
+        ranges = []
+        for index, accessed in enumerate([now - timedelta(days=5), now - timedelta(days=3), now]):
+            key = f"uploads/assets/{self.asset.id}/recitations/{self.folder.id}/001/ranges/r{index}.mp3"
+            self.s3.put_object(Bucket=self.bucket_name, Key=f"media/{key}", Body=b"x" * 100)
+            ranges.append(
+                RecitationAyahRange.objects.create(
+                    track=self.track,
+                    first_ayah=1,
+                    last_ayah=index + 2,
+                    content_hash=f"{index:064}",
+                    range_key=key,
+                    size_bytes=100,
+                    last_accessed_at=accessed,
+                )
+            )
+
+        # Act
+        result = self.service.evict_least_recently_used(max_bytes=150)
+
+        # Assert - the two idle ranges go, oldest first; the recently served one is kept
+        self.assertEqual({"evicted": 2, "freed_bytes": 200, "total_bytes": 100}, result)
+        self.assertEqual([ranges[2].id], list(RecitationAyahRange.objects.values_list("id", flat=True)))
+        prefix = f"media/uploads/assets/{self.asset.id}/recitations/{self.folder.id}/001/ranges/"
+        remaining = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=prefix).get("Contents", [])
+        self.assertEqual([f"{prefix}r2.mp3"], [obj["Key"] for obj in remaining])
+
+    def test_evict_least_recently_used_where_within_budget_should_evict_nothing(self):
+        # Arrange
+        RecitationAyahRange.objects.create(
+            track=self.track,
+            first_ayah=1,
+            last_ayah=2,
+            content_hash="0" * 64,
+            range_key="k.mp3",
+            size_bytes=100,
+            last_accessed_at=timezone.now() - timedelta(days=30),
+        )
+
+        # Act
+        result = self.service.evict_least_recently_used(max_bytes=100)
+
+        # Assert
+        self.assertEqual(0, result["evicted"])
+        self.assertEqual(1, RecitationAyahRange.objects.count())
@@ -288,7 +288,7 @@ class RecitationServiceFolderScopingTest(BaseTestCase):
 
     def test_get_all_recitations_where_multiple_folders_should_count_default_folder_surahs_only(self):
         # Arrange / Act
-        qs = self.service.get_all_recitations(None, None, annotate_surahs_count=True)
+        qs = self.service.get_all_recitations(None, None)
         recitation = qs.get(id=self.asset.id)
 
         # Assert - 2 default tracks + 1 echo track must not report 3 surahs
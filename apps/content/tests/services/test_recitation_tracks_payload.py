@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import gzip
+import json
+from unittest.mock import patch
+
+import brotli
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from oauth2_provider.models import Application
+
+from apps.content.cache import (
+    CacheNamespace,
+    clear_recitation_tracks_payload_rebuild_pending,
+    invalidate_recitation_tracks_cache,
+    recitation_asset_meta_cache_key,
+    recitation_tracks_payload_cache_key,
+    single_flight,
+    single_flight_metrics,
+)
+from apps.content.models import (
+    Asset,
+    CategoryChoice,
+    RecitationAyahTiming,
+    RecitationFolder,
+    RecitationSurahTrack,
+    StatusChoice,
+)
+from apps.content.services.recitation_tracks_payload import (
+    build_recitation_tracks_payload,
+    get_cached_recitation_tracks_payload,
+    get_recitation_tracks_payload,
+    render_recitation_tracks_page,
+)
+from apps.core.ninja_utils.renderer import dumps
+from apps.core.tests.base import BaseTestCase
+from apps.publishers.models import Publisher
+from apps.users.models import User
+
+
+class RecitationTracksPayloadTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.asset = baker.make(
+            Asset,
+            category=CategoryChoice.RECITATION,
+            publisher=baker.make(Publisher),
+            status=StatusChoice.READY,
+            is_open_access=True,
+            reciter=baker.make("content.Reciter", name="Test Reciter"),
+            riwayah=baker.make("content.Riwayah", name="Test Riwayah"),
+        )
+        self.folder = self.asset.recitation_folders.get(is_default=True)
+        for surah_number in range(1, 6):
+            track = RecitationSurahTrack.objects.create(
+                asset=self.asset,
+                folder=self.folder,
+                surah_number=surah_number,
+                duration_ms=surah_number * 1000,
+                size_bytes=512,
+                audio_file=SimpleUploadedFile(f"{surah_number:03}.mp3", b"dummy"),
+            )
+            RecitationAyahTiming.objects.create(track=track, ayah_key=f"{surah_number}:1", start_ms=0, end_ms=500)
+        self.app = Application.objects.create(
+            user=User.objects.create_user(email="payload@example.com", name="Payload User"),
+            name="Payload App",
+            client_type="confidential",
+            authorization_grant_type="password",
+        )
+        # Creating the fixtures above queued a debounced rebuild; start from a clean slate.
+        cache.clear()
+
+    def test_render_recitation_tracks_page_where_any_page_should_match_fresh_serialization(self):
+        # Arrange
+        payload = build_recitation_tracks_payload(self.asset.id, self.folder.id)
+        full = json.loads(gzip.decompress(payload["body"]))
+
+        # Act / Assert - every page is a byte-exact cut of the artefact, as the API renderer writes it
+        for page, page_size in [(1, 2), (2, 2), (3, 2), (1, 5), (4, 2)]:
+            with self.subTest(page=page, page_size=page_size):
+                expected = {"results": full["results"][(page - 1) * page_size : page * page_size], "count": 5}
+                rendered = render_recitation_tracks_page(payload, page, page_size)
+                self.assertEqual(dumps(expected), rendered)
+
+    def test_render_recitation_tracks_page_where_page_is_partial_should_slice_without_decompressing(self):
+        # Arrange
+        payload = build_recitation_tracks_payload(self.asset.id, self.folder.id)
+
+        # Act
+        with patch.object(gzip, "decompress") as mock_decompress:
+            rendered = render_recitation_tracks_page(payload, 2, 2)
+
+        # Assert
+        mock_decompress.assert_not_called()
+        self.assertEqual([3, 4], [track["surah_number"] for track in json.loads(rendered)["results"]])
+
+    def test_list_tracks_where_payload_cached_should_serve_every_page_without_track_queries(self):
+        # Arrange
+        self.authenticate_client(self.app)
+        self.client.get(f"/recitations/{self.asset.id}/?page_size=2")
+
+        # Act - other page/page_size variants reuse the same artefact
+        with CaptureQueriesContext(connection) as captured:
+            second = self.client.get(f"/recitations/{self.asset.id}/?page=2&page_size=2")
+            third = self.client.get(f"/recitations/{self.asset.id}/?page=1&page_size=3")
+
+        # Assert
+        self.assertEqual([3, 4], [t["surah_number"] for t in second.json()["results"]])
+        self.assertEqual([1, 2, 3], [t["surah_number"] for t in third.json()["results"]])
+        track_queries = [q["sql"] for q in captured.captured_queries if "content_recitationsurahtrack" in q["sql"]]
+        self.assertEqual([], track_queries)
+
+    def test_list_tracks_where_client_accepts_gzip_and_page_is_whole_list_should_send_stored_bytes(self):
+        # Arrange
+        self.authenticate_client(self.app)
+        payload = build_recitation_tracks_payload(self.asset.id, self.folder.id)
+
+        # Act
+        response = self.client.get(f"/recitations/{self.asset.id}/?page_size=114", HTTP_ACCEPT_ENCODING="gzip")
+
+        # Assert
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("gzip", response["Content-Encoding"])
+        self.assertEqual(payload["body"], response.content)
+        self.assertEqual(5, json.loads(gzip.decompress(response.content))["count"])
+
+    def test_list_tracks_where_client_accepts_br_and_page_is_whole_list_should_send_stored_brotli(self):
+        # Arrange
+        self.authenticate_client(self.app)
+        payload = build_recitation_tracks_payload(self.asset.id, self.folder.id)
+
+        # Act
+        response = self.client.get(f"/recitations/{self.asset.id}/?page_size=114", HTTP_ACCEPT_ENCODING="gzip, br")
+
+        # Assert
+        self.assertEqual("br", response["Content-Encoding"])
+        self.assertEqual(payload["body_br"], response.content)
+        self.assertEqual(5, json.loads(brotli.decompress(response.content))["count"])
+
+    def test_invalidate_where_many_tracks_change_should_schedule_one_rebuild(self):
+        # Arrange / Act - one signal per saved track, as during a bulk upload
+        with patch("apps.content.tasks.rebuild_recitation_tracks_payload_task.apply_async") as mock_apply:
+            with self.captureOnCommitCallbacks(execute=True):
+                for track in RecitationSurahTrack.objects.filter(asset=self.asset):
+                    track.save()
+
+        # Assert
+        mock_apply.assert_called_once()
+        self.assertEqual([self.asset.id], mock_apply.call_args.kwargs["args"])
+
+    def test_rebuild_task_where_tracks_changed_should_replace_payload_and_allow_next_schedule(self):
+        # Arrange
+        build_recitation_tracks_payload(self.asset.id, self.folder.id)
+
+        # Act - the delete signal schedules the rebuild; eager celery runs it on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            RecitationSurahTrack.objects.filter(asset=self.asset, surah_number=5).delete()
+
+        # Assert
+        payload = cache.get(recitation_tracks_payload_cache_key(self.asset.id, self.folder.id))
+        self.assertEqual(4, payload["count"])
+        with patch("apps.content.tasks.rebuild_recitation_tracks_payload_task.apply_async") as mock_apply:
+            with self.captureOnCommitCallbacks(execute=True):
+                invalidate_recitation_tracks_cache(self.asset.id)
+        mock_apply.assert_called_once()
+
+    def test_folder_delete_should_drop_its_payload(self):
+        # Arrange
+        echo = RecitationFolder.objects.create(asset=self.asset, name="With echo", name_en="With echo")
+        build_recitation_tracks_payload(self.asset.id, echo.id)
+
+        # Act
+        echo.delete()
+
+        # Assert
+        self.assertIsNone(cache.get(recitation_tracks_payload_cache_key(self.asset.id, echo.id)))
+
+    def test_invalidate_where_folder_given_should_stale_only_that_folder(self):
+        # Arrange
+        echo = RecitationFolder.objects.create(asset=self.asset, name="With echo", name_en="With echo")
+        build_recitation_tracks_payload(self.asset.id, self.folder.id)
+        build_recitation_tracks_payload(self.asset.id, echo.id)
+        meta_key = recitation_asset_meta_cache_key(self.asset.id)
+        cache.set(meta_key, {"name_ar": "x"}, 60)
+
+        # Act
+        invalidate_recitation_tracks_cache(self.asset.id, folder_id=self.folder.id)
+        clear_recitation_tracks_payload_rebuild_pending(self.asset.id)
+
+        # Assert
+        self.assertIsNone(get_cached_recitation_tracks_payload(self.asset.id, self.folder.id))
+        self.assertIsNotNone(get_cached_recitation_tracks_payload(self.asset.id, echo.id))
+        self.assertEqual(meta_key, recitation_asset_meta_cache_key(self.asset.id))
+
+    def test_get_payload_where_stale_and_rebuild_pending_should_serve_previous_artefact(self):
+        # Arrange
+        previous = build_recitation_tracks_payload(self.asset.id, self.folder.id)
+        RecitationSurahTrack.objects.filter(asset=self.asset, surah_number=5).delete()
+
+        # Act - the delete bumped the generation and queued the rebuild (not run yet)
+        with CaptureQueriesContext(connection) as captured:
+            payload = get_recitation_tracks_payload(self.asset.id, self.folder.id)
+
+        # Assert
+        self.assertEqual(previous["body"], payload["body"])
+        self.assertEqual([], captured.captured_queries)
+
+    def test_get_payload_where_stale_and_no_rebuild_pending_should_rebuild_in_place(self):
+        # Arrange
+        build_recitation_tracks_payload(self.asset.id, self.folder.id)
+        RecitationSurahTrack.objects.filter(asset=self.asset, surah_number=5).delete()
+        clear_recitation_tracks_payload_rebuild_pending(self.asset.id)
+
+        # Act
+        payload = get_recitation_tracks_payload(self.asset.id, self.folder.id)
+
+        # Assert
+        self.assertEqual(4, payload["count"])
+
+    def test_get_payload_where_stale_and_another_worker_rebuilding_should_serve_stale(self):
+        # Arrange
+        previous = build_recitation_tracks_payload(self.asset.id, self.folder.id)
+        RecitationSurahTrack.objects.filter(asset=self.asset, surah_number=5).delete()
+        clear_recitation_tracks_payload_rebuild_pending(self.asset.id)
+        key = recitation_tracks_payload_cache_key(self.asset.id, self.folder.id)
+        cache.add(f"{key}:lock", "other-worker", 15)
+
+        # Act
+        with CaptureQueriesContext(connection) as captured:
+            payload = get_recitation_tracks_payload(self.asset.id, self.folder.id)
+
+        # Assert
+        self.assertEqual(previous["body"], payload["body"])
+        self.assertEqual([], captured.captured_queries)
+        self.assertEqual(1, single_flight_metrics()["stale_serves"])
+
+    def test_get_payload_where_cold_and_another_worker_rebuilding_should_wait_for_its_result(self):
+        # Arrange
+        built = build_recitation_tracks_payload(self.asset.id, self.folder.id)
+        key = recitation_tracks_payload_cache_key(self.asset.id, self.folder.id)
+        cache.delete(key)
+        cache.add(f"{key}:lock", "other-worker", 15)
+
+        # Act - the other worker publishes while this one polls
+        with patch("apps.content.cache.time.sleep", side_effect=lambda _: cache.set(key, built)):
+            with CaptureQueriesContext(connection) as captured:
+                payload = get_recitation_tracks_payload(self.asset.id, self.folder.id)
+
+        # Assert
+        self.assertEqual(built["body"], payload["body"])
+        self.assertEqual([], captured.captured_queries)
+        self.assertEqual(1, single_flight_metrics()["lock_waits"])
+
+    def test_list_tracks_where_etag_matches_should_return_304_from_cache(self):
+        # Arrange
+        self.authenticate_client(self.app)
+        first = self.client.get(f"/recitations/{self.asset.id}/?page_size=2")
+
+        # Act
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(f"/recitations/{self.asset.id}/?page_size=2", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        # Assert
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b"", response.content)
+        self.assertEqual(first["ETag"], response["ETag"])
+        self.assertEqual(first["Last-Modified"], response["Last-Modified"])
+        track_queries = [q["sql"] for q in captured.captured_queries if "content_recitationsurahtrack" in q["sql"]]
+        self.assertEqual([], track_queries)
+
+    def test_list_tracks_where_tracks_changed_should_not_match_previous_etag(self):
+        # Arrange
+        self.authenticate_client(self.app)
+        etag = self.client.get(f"/recitations/{self.asset.id}/?page_size=10")["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            RecitationSurahTrack.objects.filter(asset=self.asset, surah_number=5).delete()
+
+        # Act
+        response = self.client.get(f"/recitations/{self.asset.id}/?page_size=10", HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEqual(200, response.status_code, response.content)
+        self.assertNotEqual(etag, response["ETag"])
+        self.assertEqual(4, response.json()["count"])
+
+
+class SingleFlightTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_single_flight_where_lock_free_should_build_once_and_release_lock(self):
+        # Arrange
+        def build():
+            cache.set("sf:key", "value")
+            return "value"
+
+        # Act
+        result = single_flight("sf:key", build)
+
+        # Assert
+        self.assertEqual("value", result)
+        self.assertIsNone(cache.get("sf:key:lock"))
+        self.assertEqual(1, single_flight_metrics()["builds"])
+
+    def test_single_flight_where_builder_never_publishes_should_build_after_wait(self):
+        # Arrange
+        cache.add("sf:key:lock", "other-worker", 15)
+
+        # Act
+        result = single_flight("sf:key", lambda: "built", wait=0)
+
+        # Assert
+        self.assertEqual("built", result)
+        self.assertEqual(1, single_flight_metrics()["wait_timeouts"])
+
+
+class CacheNamespaceTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.namespace = CacheNamespace("test_namespace")
+
+    def test_invalidate_where_outer_scope_bumped_should_change_every_key_below_it(self):
+        # Arrange
+        before = [self.namespace.key("page", (1,), 1), self.namespace.key("item", (1, 7))]
+        other = self.namespace.key("page", (2,), 1)
+
+        # Act
+        self.namespace.invalidate(1)
+
+        # Assert
+        after = [self.namespace.key("page", (1,), 1), self.namespace.key("item", (1, 7))]
+        self.assertTrue(all(old != new for old, new in zip(before, after, strict=True)))
+        self.assertEqual(other, self.namespace.key("page", (2,), 1))
+
+    def test_generations_where_counter_evicted_should_not_reuse_old_keys(self):
+        # Arrange
+        old_key = self.namespace.key("page", (1,))
+
+        # Act
+        cache.clear()
+        new_key = self.namespace.key("page", (1,))
+
+        # Assert
+        self.assertNotEqual(old_key, new_key)
+        self.assertEqual(new_key, self.namespace.key("page", (1,)))
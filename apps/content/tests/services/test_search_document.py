@@ -0,0 +1,62 @@
+from model_bakery import baker
+
+from apps.content.models import Asset, CategoryChoice, Reciter, StatusChoice
+from apps.core.search import refresh_search_documents
+from apps.core.tests.base import BaseTestCase
+from apps.publishers.models import Publisher
+
+
+class SearchDocumentTest(BaseTestCase):
+    def setUp(self) -> None:
+        self.reciter = baker.make(Reciter, name_en="Saad Al-Ghamidi", name_ar="سعد الغامدي", slug="saad")
+        self.asset = Asset.objects.create(
+            publisher=Publisher.objects.create(name="Tafsir Center"),
+            status=StatusChoice.READY,
+            name="Murattal",
+            description="Full mushaf",
+            category=CategoryChoice.RECITATION,
+            license="CC0",
+            file_size="1 MB",
+            format="mp3",
+            language="ar",
+            reciter=self.reciter,
+            riwayah=baker.make("content.Riwayah", name="Hafs"),
+        )
+
+    def test_save_where_asset_is_created_should_build_document_from_related_names(self):
+        # Arrange / Act
+        self.asset.refresh_from_db()
+
+        # Assert
+        document = self.asset.search_document.split("\n")
+        self.assertIn("murattal", document)
+        self.assertIn("tafsir center", document)
+        self.assertIn("سعد الغامدي", document)
+        self.assertIn("hafs", document)
+
+    def test_save_where_reciter_is_renamed_should_rebuild_its_assets_documents(self):
+        # Arrange
+        self.reciter.name_en = "Saad Alghamdi"
+
+        # Act
+        self.reciter.save()
+
+        # Assert
+        self.reciter.refresh_from_db()
+        self.asset.refresh_from_db()
+        self.assertEqual(self.reciter.search_document, "saad alghamdi\nسعد الغامدي\nsaad")
+        self.assertIn("saad alghamdi", self.asset.search_document)
+        self.assertNotIn("saad al-ghamidi", self.asset.search_document)
+
+    def test_refresh_search_documents_where_update_bypassed_signals_should_rewrite_only_stale_rows(self):
+        # Arrange
+        baker.make(Reciter, name_en="Other", name_ar="آخر", slug="other")
+        Reciter.objects.filter(pk=self.reciter.pk).update(name_en="Renamed")
+
+        # Act
+        changed = refresh_search_documents(Reciter.objects.all())
+
+        # Assert
+        self.reciter.refresh_from_db()
+        self.assertEqual(changed, 1)
+        self.assertTrue(self.reciter.search_document.startswith("renamed\n"))
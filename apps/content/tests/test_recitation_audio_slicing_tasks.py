@@ -10,11 +10,17 @@ from model_bakery import baker
 
 from apps.content.cache import recitation_asset_meta_cache_key, recitation_tracks_cache_key
 from apps.content.models import Asset, CategoryChoice, RecitationFolder, RecitationSurahTrack, Reciter, Riwayah
-from apps.content.tasks import slice_all_recitation_tracks_task, slice_recitation_track_task
+from apps.content.tasks import (
+    build_recitation_ayah_range_task,
+    evict_recitation_ayah_ranges_task,
+    slice_all_recitation_tracks_task,
+    slice_recitation_track_task,
+)
 from apps.core.ninja_utils.errors import ItqanError
 from apps.core.tests.base import BaseTestCase
 
 SERVICE_PATH = "apps.content.services.admin.recitation_audio_slicing_service.RecitationAudioSlicingService"
+RANGE_SERVICE_PATH = "apps.content.services.recitation_ayah_range.RecitationAyahRangeService"
 
 
 @override_settings(CELERY_TASK_EAGER_PROPAGATES=False)
@@ -46,6 +52,7 @@ class TestRecitationAudioSlicingTasks(BaseTestCase):
             "track_id": self.track.id,
             "asset_id": self.asset.id,
             "sliced": 2,
+            "skipped": 0,
             "keys": [
                 f"uploads/assets/{self.asset.id}/recitations/{self.folder.id}/001/ayah_001.mp3",
                 f"uploads/assets/{self.asset.id}/recitations/{self.folder.id}/001/ayah_002.mp3",
@@ -63,12 +70,40 @@ class TestRecitationAudioSlicingTasks(BaseTestCase):
             result = slice_recitation_track_task.apply(args=[self.track.id], throw=False)
 
         # Assert - delegates to the service and invalidates the asset caches after success
-        mock_service.return_value.slice_track.assert_called_once_with(self.track.id)
+        mock_service.return_value.slice_track.assert_called_once_with(self.track.id, force=False)
         self.assertEqual("SUCCESS", result.state)
         self.assertEqual(payload, result.result)
         self.assertIsNone(cache.get(recitation_tracks_cache_key(self.asset.id)))
         self.assertIsNone(cache.get(recitation_asset_meta_cache_key(self.asset.id)))
 
+    def test_slice_recitation_track_task_where_every_ayah_is_unchanged_should_not_invalidate_cache(self):
+        # Arrange
+        self._seed_recitation_cache()
+        payload = {**self._slicing_payload(), "sliced": 0, "skipped": 2, "keys": []}
+
+        # Act
+        with patch(SERVICE_PATH) as mock_service:
+            mock_service.return_value.slice_track.return_value = payload
+            result = slice_recitation_track_task.apply(args=[self.track.id], throw=False)
+
+        # Assert - nothing was rewritten, so cached responses stay valid
+        self.assertEqual("SUCCESS", result.state)
+        self.assertEqual(payload, result.result)
+        self.assertIsNotNone(cache.get(recitation_tracks_cache_key(self.asset.id)))
+        self.assertIsNotNone(cache.get(recitation_asset_meta_cache_key(self.asset.id)))
+
+    def test_slice_all_where_force_should_pass_force_to_every_child(self):
+        # Arrange
+        expected_ids = list(RecitationSurahTrack.objects.values_list("id", flat=True))
+
+        # Act
+        with patch("apps.content.tasks.slice_recitation_track_task.delay") as mock_delay:
+            result = slice_all_recitation_tracks_task.apply(kwargs={"force": True}, throw=False)
+
+        # Assert
+        self.assertEqual("SUCCESS", result.state)
+        mock_delay.assert_has_calls([call(track_id, force=True) for track_id in expected_ids])
+
     def test_slice_recitation_track_task_where_service_fails_should_not_invalidate_cache(self):
         # Arrange
         self._seed_recitation_cache()
@@ -143,7 +178,7 @@ class TestRecitationAudioSlicingTasks(BaseTestCase):
         self.assertEqual("SUCCESS", result.state)
         self.assertEqual({"scheduled_count": 3}, result.result)
         self.assertEqual(3, mock_delay.call_count)
-        mock_delay.assert_has_calls([call(track_id) for track_id in expected_ids])
+        mock_delay.assert_has_calls([call(track_id, force=False) for track_id in expected_ids])
 
     def test_slice_all_where_no_tracks_exist_should_schedule_nothing(self):
         # Arrange
@@ -157,3 +192,53 @@ class TestRecitationAudioSlicingTasks(BaseTestCase):
         self.assertEqual("SUCCESS", result.state)
         self.assertEqual({"scheduled_count": 0}, result.result)
         mock_delay.assert_not_called()
+
+    def test_evict_recitation_ayah_ranges_task_should_delegate_to_service_and_return_its_result(self):
+        # Arrange
+        payload = {"evicted": 2, "freed_bytes": 200, "total_bytes": 100}
+
+        # Act
+        with patch(
+            "apps.content.services.recitation_ayah_range.RecitationAyahRangeService.evict_least_recently_used",
+            return_value=payload,
+        ) as mock_evict:
+            result = evict_recitation_ayah_ranges_task.apply(throw=False)
+
+        # Assert
+        self.assertEqual("SUCCESS", result.state)
+        self.assertEqual(payload, result.result)
+        mock_evict.assert_called_once_with()
+
+    def test_build_recitation_ayah_range_task_should_return_the_built_range_key(self):
+        # Arrange
+        range_key = f"uploads/assets/{self.asset.id}/recitations/{self.folder.id}/001/ranges/ayah_001-003_abc.mp3"
+
+        # Act
+        with patch(RANGE_SERVICE_PATH) as mock_service:
+            mock_service.return_value.build_range.return_value.range_key = range_key
+            result = build_recitation_ayah_range_task.apply(args=[self.track.id, 1, 3], throw=False)
+
+        # Assert
+        self.assertEqual("SUCCESS", result.state)
+        self.assertEqual({"track_id": self.track.id, "range_key": range_key}, result.result)
+        mock_service.return_value.build_range.assert_called_once_with(self.track.id, 1, 3)
+
+    def test_build_recitation_ayah_range_task_where_storage_error_should_retry(self):
+        # Act
+        with patch(RANGE_SERVICE_PATH) as mock_service:
+            mock_service.return_value.build_range.side_effect = ItqanError("storage_error", "storage down", 503)
+            result = build_recitation_ayah_range_task.apply(args=[self.track.id, 1, 3], throw=False)
+
+        # Assert - initial run plus max_retries (3) eager retries, then permanent failure
+        self.assertEqual("FAILURE", result.state)
+        self.assertEqual(4, mock_service.return_value.build_range.call_count)
+
+    def test_build_recitation_ayah_range_task_where_ffmpeg_fails_should_not_retry(self):
+        # Act
+        with patch(RANGE_SERVICE_PATH) as mock_service:
+            mock_service.return_value.build_range.side_effect = ItqanError("ayah_range_failed", "boom", 503)
+            result = build_recitation_ayah_range_task.apply(args=[self.track.id, 1, 3], throw=False)
+
+        # Assert
+        self.assertEqual("FAILURE", result.state)
+        self.assertEqual(1, mock_service.return_value.build_range.call_count)
@@ -0,0 +1,31 @@
+"""Content-coding negotiation shared by the compression middleware and views that store pre-compressed bodies."""
+
+import brotli
+
+# Stored bodies are compressed once per rebuild, so they can afford a slower, tighter
+# setting than per-response compression in the middleware.
+BROTLI_STORED_QUALITY = 9
+BROTLI_RESPONSE_QUALITY = 5
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Content codings the client accepts (``q=0`` means refused), lower-cased."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = params.strip().lower()
+        if weight.startswith("q="):
+            try:
+                if float(weight[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    return accepted
+
+
+def brotli_compress(data: bytes, quality: int = BROTLI_STORED_QUALITY) -> bytes:
+    return brotli.compress(data, quality=quality)
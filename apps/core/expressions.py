@@ -0,0 +1,15 @@
+from django.db.models import Count, IntegerField, OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def subquery_count(queryset: QuerySet, outer_ref: str) -> Coalesce:
+    """
+    ``COUNT(*)`` of the ``queryset`` rows whose ``outer_ref`` is the outer row, as a correlated subquery.
+
+    Unlike a ``Count()`` annotation it adds no join or ``GROUP BY`` to the outer
+    query, so it composes with other counts and filters without ``distinct()``.
+    """
+    counted = queryset.filter(**{outer_ref: OuterRef("pk")}).order_by().values(outer_ref)
+    return Coalesce(
+        Subquery(counted.annotate(total=Count("pk")).values("total"), output_field=IntegerField()), Value(0)
+    )
@@ -0,0 +1,253 @@
+"""
+Per-process L1 cache in front of Django's cache, for hot, tiny lookups.
+
+Tenant domains, reciter names and cache generations are read on nearly every
+request; each read is a Redis round trip plus an unpickle. A ``LocalCache`` keeps
+them in the worker's memory -- bounded LRU, short jittered TTL -- and falls back
+to Django's cache, then to the caller's fetch.
+
+Invalidation reaches every worker: ``invalidate`` drops the keys here and in
+Django's cache, then publishes them on a Redis channel that a daemon thread in
+each process listens to. If that thread loses its connection it clears every L1
+on reconnect (messages may have been missed); the TTL bounds staleness when Redis
+pub/sub is unavailable altogether.
+
+L1 is only active in front of django-redis: with an in-process backend (LocMem in
+dev and tests) there is nothing to save and no channel to invalidate through, so
+every call goes straight to Django's cache.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "l1_cache:invalidate"
+_SEPARATOR = "\x1f"
+_CLEAR_ALL = "*"
+_RECONNECT_DELAY_SECONDS = 1
+
+_MISSING = object()
+_registry: dict[str, "LocalCache"] = {}
+_listener_pid: int | None = None
+_listener_lock = threading.Lock()
+
+
+def _redis_backed() -> bool:
+    return settings.CACHES["default"]["BACKEND"].startswith("django_redis")
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU with jittered TTL, layered over Django's cache.
+
+    The jitter spreads expiries of entries set together (e.g. at worker start) so
+    they do not all fall through to Redis on the same request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: int = 1024,
+        ttl: float = 30,
+        jitter: float = 0.2,
+        enabled: bool | None = None,
+    ) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.jitter = jitter
+        self._enabled = enabled
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is None:
+            self._enabled = _redis_backed()
+        return self._enabled
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if not self.enabled:
+            return default
+        _ensure_listener()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        if not self.enabled:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl * (1 + random.uniform(-self.jitter, self.jitter))
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, keys: Iterable[str]) -> None:
+        """Drop ``keys`` from this process only."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any], *, timeout: int) -> Any:
+        """
+        L1, then Django's cache, then ``fetch()``; the result is stored in both.
+
+        ``None`` is a valid result and is cached too (wrapped in Django's cache), so
+        a lookup that finds nothing does not fall through on every request.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        wrapped = cache.get(key)
+        if wrapped is None:
+            wrapped = (fetch(),)
+            cache.set(key, wrapped, timeout)
+        value = wrapped[0]
+        self.set(key, value)
+        return value
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Like ``cache.get_many``: hits come from L1, the rest from Django's cache in one call."""
+        found: dict[str, Any] = {}
+        misses: list[str] = []
+        for key in keys:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                misses.append(key)
+            else:
+                found[key] = value
+        if misses:
+            fetched = cache.get_many(misses)
+            for key, value in fetched.items():
+                self.set(key, value)
+            found.update(fetched)
+        return found
+
+    async def aget_many(self, keys: list[str]) -> dict[str, Any]:
+        """``get_many`` for async views: L1 hits never leave the event loop."""
+        found: dict[str, Any] = {}
+        misses: list[str] = []
+        for key in keys:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                misses.append(key)
+            else:
+                found[key] = value
+        if misses:
+            fetched = await cache.aget_many(misses)
+            for key, value in fetched.items():
+                self.set(key, value)
+            found.update(fetched)
+        return found
+
+    def invalidate(self, keys: Iterable[str], *, shared: bool = True) -> None:
+        """
+        Drop ``keys`` from every process's L1, and from Django's cache when ``shared``.
+
+        Pass ``shared=False`` when the caller already updated Django's cache itself
+        (e.g. an INCR) and only the local copies are stale.
+        """
+        keys = list(keys)
+        if shared:
+            cache.delete_many(keys)
+        self.discard(keys)
+        if self.enabled:
+            _publish([f"{self.name}{_SEPARATOR}{key}" for key in keys])
+
+
+def _publish(messages: list[str]) -> None:
+    connection = _redis_connection()
+    if connection is None:
+        return
+    try:
+        for message in messages:
+            connection.publish(INVALIDATION_CHANNEL, message)
+    except Exception:
+        # Other workers fall back on the TTL; never fail the write that invalidated.
+        logger.warning("l1_cache: failed to publish invalidation", exc_info=True)
+
+
+def _redis_connection():
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except (ImportError, NotImplementedError):
+        return None
+
+
+def _apply(message: str) -> None:
+    if message == _CLEAR_ALL:
+        for local_cache in _registry.values():
+            local_cache.clear()
+        return
+    name, _, key = message.partition(_SEPARATOR)
+    local_cache = _registry.get(name)
+    if local_cache is not None:
+        local_cache.discard([key])
+
+
+def _listener_connection():
+    # Own connection with no read timeout: listen() blocks until a message arrives,
+    # and a timeout would turn every quiet spell into a reconnect that clears L1.
+    import redis
+
+    kwargs = dict(_redis_connection().connection_pool.connection_kwargs)
+    kwargs["socket_timeout"] = None
+    return redis.Redis(**kwargs)
+
+
+def _listen() -> None:
+    while True:
+        try:
+            pubsub = _listener_connection().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Anything published while we were not subscribed is lost: start clean.
+            _apply(_CLEAR_ALL)
+            for message in pubsub.listen():
+                data = message["data"]
+                _apply(data.decode() if isinstance(data, bytes) else data)
+        except Exception:
+            logger.warning("l1_cache: invalidation listener disconnected, reconnecting", exc_info=True)
+            time.sleep(_RECONNECT_DELAY_SECONDS)
+
+
+def _ensure_listener() -> None:
+    """Start this process's listener thread once; re-checked after fork (gunicorn prefork)."""
+    global _listener_pid
+    pid = os.getpid()
+    if _listener_pid == pid:
+        return
+    with _listener_lock:
+        if _listener_pid == pid:
+            return
+        _listener_pid = pid
+        if not _redis_backed():
+            return
+        threading.Thread(target=_listen, name="l1-cache-invalidation", daemon=True).start()
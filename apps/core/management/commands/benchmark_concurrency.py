@@ -0,0 +1,57 @@
+import asyncio
+import statistics
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent GETs at one endpoint through Django's ASGI handler on a single "
+        "event loop -- one gunicorn/uvicorn worker's worth -- and report throughput and "
+        "p50/p99. Compare an async endpoint with a sync one, or --concurrency 1 with N, "
+        "to see how much concurrency a worker actually gets."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--path", required=True, help="e.g. /recitations/?page_size=20")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--api-key", default=None, help="sent as X-API-Key")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["requests"] < 2 or options["concurrency"] < 1:
+            raise CommandError("--requests must be at least 2 and --concurrency at least 1")
+        # Django's async test client always sends Host: testserver.
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            samples_ms, elapsed, statuses = asyncio.run(self._run(**options))
+
+        percentiles = statistics.quantiles(samples_ms, n=100)
+        self.stdout.write(
+            f"{options['path']} concurrency={options['concurrency']} requests={len(samples_ms)} "
+            f"throughput={len(samples_ms) / elapsed:.1f} req/s p50={percentiles[49]:.1f}ms "
+            f"p99={percentiles[98]:.1f}ms statuses={dict(sorted(statuses.items()))}"
+        )
+
+    async def _run(
+        self, *, path: str, requests: int, concurrency: int, api_key: str | None, **kwargs: Any
+    ) -> tuple[list[float], float, dict[int, int]]:
+        client = AsyncClient()
+        headers = {"x-api-key": api_key} if api_key else {}
+        semaphore = asyncio.Semaphore(concurrency)
+        samples_ms: list[float] = []
+        statuses: dict[int, int] = {}
+
+        async def one() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                samples_ms.append((time.perf_counter() - started) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return samples_ms, time.perf_counter() - started, statuses
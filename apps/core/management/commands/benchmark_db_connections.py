@@ -0,0 +1,37 @@
+import statistics
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Time a minimal request cycle (connect if needed, SELECT 1, end-of-request cleanup) "
+        "against the configured database and report p50/p99. Run it once per connection "
+        "mode (e.g. DB_POOL=false DB_CONN_MAX_AGE=0, then DB_POOL=true) to compare them."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args: Any, requests: int, database: str, **kwargs: Any) -> None:
+        connection = connections[database]
+        samples_ms: list[float] = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            # What request_finished does: close, return to the pool, or keep, per settings.
+            close_old_connections()
+            samples_ms.append((time.perf_counter() - started) * 1000)
+
+        percentiles = statistics.quantiles(samples_ms, n=100)
+        settings_dict = connection.settings_dict
+        mode = "pool" if settings_dict["OPTIONS"].get("pool") else f"CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}"
+        self.stdout.write(
+            f"{mode}: requests={requests} p50={percentiles[49]:.2f}ms p99={percentiles[98]:.2f}ms "
+            f"mean={statistics.fmean(samples_ms):.2f}ms"
+        )
@@ -0,0 +1,102 @@
+from collections.abc import Callable
+import datetime
+from decimal import Decimal
+import json
+import statistics
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from ninja.responses import NinjaJSONEncoder
+
+from apps.core.mixins.constants import QURAN_SURAHS
+from apps.core.ninja_utils import renderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Time JSON serialisation of a full 114-surah recitation track list (every ayah "
+        "timing) and of list pages, with ninja's stdlib renderer and with ours (orjson). "
+        "Payloads are synthetic, no database needed."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--page-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["repeat"] < 2 or options["page_size"] < 1:
+            raise CommandError("--repeat must be at least 2 and --page-size at least 1")
+        payloads = {
+            "recitation tracks (114 surahs)": _recitation_tracks_payload(),
+            f"list page ({options['page_size']} rows)": _list_page_payload(options["page_size"]),
+        }
+        encoders: dict[str, Callable[[Any], bytes]] = {
+            "ninja json": lambda data: json.dumps(data, cls=NinjaJSONEncoder).encode(),
+            "orjson": renderer.dumps,
+        }
+
+        for payload_name, data in payloads.items():
+            for encoder_name, encode in encoders.items():
+                samples_ms = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    body = encode(data)
+                    samples_ms.append((time.perf_counter() - started) * 1000)
+                percentiles = statistics.quantiles(samples_ms, n=100)
+                self.stdout.write(
+                    f"{payload_name} {encoder_name}: bytes={len(body)} p50={percentiles[49]:.2f}ms "
+                    f"p99={percentiles[98]:.2f}ms"
+                )
+
+
+def _recitation_tracks_payload() -> dict[str, Any]:
+    """The shape of the public track list of a complete recitation."""
+    results = []
+    for surah_number, surah in QURAN_SURAHS.items():
+        timings = [
+            {
+                "ayah_key": f"{surah_number}:{ayah}",
+                "start_ms": ayah * 7000,
+                "end_ms": ayah * 7000 + 6500,
+                "duration_ms": 6500,
+            }
+            for ayah in range(1, surah["ayahs_count"] + 1)
+        ]
+        results.append(
+            {
+                "surah_number": surah_number,
+                "surah_name": surah["name"],
+                "surah_name_en": surah["name_en"],
+                "audio_url": f"https://cdn.example.com/media/recitations/{surah_number:03}.mp3",
+                "duration_ms": surah["ayahs_count"] * 7000,
+                "size_bytes": surah["ayahs_count"] * 112_000,
+                "revelation_order": surah["revelation_order"],
+                "revelation_place": surah["revelation_place"],
+                "ayahs_count": surah["ayahs_count"],
+                "ayahs_timings": timings,
+            }
+        )
+    return {"results": results, "count": len(results)}
+
+
+def _list_page_payload(page_size: int) -> dict[str, Any]:
+    """A list page as ninja hands it to the renderer: schema output with datetimes and Decimals."""
+    updated_at = datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC)
+    results = [
+        {
+            "id": row,
+            "name": f"مصحف المدينة {row}",
+            "description": "Murattal recitation, recorded in the studio. " * 3,
+            "publisher": {"id": row % 40, "name": f"Publisher {row % 40}"},
+            "reciter": {"id": row % 300, "name": f"Reciter {row % 300}"},
+            "riwayah": {"id": 1, "name": "Hafs an Asim"},
+            "qiraah": {"id": 1, "name": "Asim", "bio": "One of the seven canonical readers."},
+            "surahs_count": 114,
+            "rating": Decimal("4.75"),
+            "updated_at": updated_at + datetime.timedelta(seconds=row),
+            "folders": [{"name": "Default", "slug": "default", "is_default": True}],
+        }
+        for row in range(page_size)
+    ]
+    return {"results": results, "count": page_size * 10, "count_kind": "exact"}
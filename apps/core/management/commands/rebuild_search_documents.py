@@ -0,0 +1,28 @@
+"""
+Rebuild the denormalised search documents of every model that declares
+`SEARCH_DOCUMENT_SOURCES` (assets, reciters, riwayahs, qiraahs, ayahs):
+
+    python manage.py rebuild_search_documents
+
+Saves keep the documents current through signals; run this after a bulk
+`QuerySet.update()` or a data import that bypassed them, or after changing
+`apps.core.search.normalize_search_text`. Only rows whose document changed are
+written.
+"""
+
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from apps.core.search import refresh_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild search_document from its sources for every model that has one."
+
+    def handle(self, *args: Any, **kwargs: Any) -> None:
+        for model in apps.get_models():
+            if getattr(model, "SEARCH_DOCUMENT_SOURCES", None):
+                changed = refresh_search_documents(model.objects.all())
+                self.stdout.write(f"{model.__name__}: {changed} search document(s) rebuilt")
@@ -0,0 +1,46 @@
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+from apps.core.compression import BROTLI_RESPONSE_QUALITY, accepted_encodings, brotli_compress
+
+# Only API bodies are compressed: HTML pages carry CSRF tokens, and compressing
+# secrets next to reflected input is what BREACH exploits.
+_COMPRESSIBLE_CONTENT_TYPES = ("application/json",)
+
+# Not worth a compression pass below this size (Django's gzip threshold).
+_MIN_COMPRESS_BYTES = 200
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Negotiated brotli/gzip for JSON API responses.
+
+    Brotli wins when the client accepts it; otherwise Django's gzip handling
+    applies unchanged, streaming included. Bodies a view already encoded (the stored recitation payloads) pass
+    through untouched, so they are never compressed twice.
+    """
+
+    def process_response(self, request, response):
+        if not response.get("Content-Type", "").startswith(_COMPRESSIBLE_CONTENT_TYPES):
+            return response
+        if response.streaming:
+            return super().process_response(request, response)
+        if "br" not in accepted_encodings(request.headers.get("Accept-Encoding", "")):
+            return super().process_response(request, response)
+
+        if len(response.content) < _MIN_COMPRESS_BYTES or response.has_header("Content-Encoding"):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed = brotli_compress(response.content, quality=BROTLI_RESPONSE_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+
+        # Same as gzip: a strong ETag is per representation, so the compressed one is weak.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class PostgresAddIndex(migrations.AddIndex):
+    """
+    `AddIndex` for Postgres-only index types (GIN, pg_trgm opclasses).
+
+    The index stays in the migration state everywhere, but is only created on
+    Postgres; on other databases the queries it serves still work unindexed.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
@@ -19,3 +19,26 @@ class BaseModel(models.Model):
 
     def __str__(self):
         return f"{self.__class__.__name__}({self.id})"
+
+
+class StoredCountersMixin(models.Model):
+    """
+    Keeps ``save()`` from writing the columns named in ``STORED_COUNTERS``.
+
+    Stored counters are recomputed in SQL by whatever maintains them; an instance
+    loaded before that would otherwise write its stale values back on its next save.
+    """
+
+    STORED_COUNTERS: tuple[str, ...] = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs) -> None:
+        if not self._state.adding and not kwargs.get("force_insert") and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.STORED_COUNTERS
+            ]
+        super().save(*args, **kwargs)
@@ -1,12 +1,17 @@
+import asyncio
+
 from allauth.headless.contrib.ninja.security import XSessionTokenAuth
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.utils.functional import SimpleLazyObject
 from django.utils.translation import gettext_lazy as _
 from ninja.errors import AuthenticationError
 from ninja_keys.auth import ApiKeyAuth as BaseApiKeyAuth
 from oauth2_provider.contrib.rest_framework import OAuth2Authentication
 
-from apps.users.models import User
+from apps.users.cache import VerifiedApiKey, aget_verified_api_key, get_verified_api_key
+from apps.users.models import APIKey, User
 
 
 class OAuth2Auth(OAuth2Authentication):
@@ -38,24 +43,58 @@ class ApiKeyAuth(BaseApiKeyAuth):
     per-app attribution without re-resolving the raw X-API-Key header.
     ``request.user`` is still set to the key's owner for per-asset access checks
     and user-scoped permissions.
+
+    Keys are resolved through the verified-key cache (``apps.users.cache``), so a
+    warm request touches neither the key table nor the hasher. ``request.auth`` is
+    an unsaved ``APIKey`` carrying the cached fields, and the owner is loaded lazily,
+    only when a view actually reads ``request.user``.
     """
 
     def authenticate(self, request, key):
         if not key:
             return None
-        model = self.model
-        try:
-            api_key = model.objects.get_from_key(key)
-        except model.DoesNotExist:
+        api_key = self._usable_key(get_verified_api_key(key))
+        if api_key is None:
+            return None
+
+        user_id = api_key.user_id
+        request.user = SimpleLazyObject(lambda: User.objects.get(pk=user_id))
+        return api_key
+
+    async def acall(self, request):
+        key = self._get_key(request)
+        if not key:
             return None
+        api_key = self._usable_key(await aget_verified_api_key(key))
+        if api_key is None:
+            return None
+
+        # Loaded eagerly: throttles and access checks read request.user on the event
+        # loop, where a lazy query is not allowed.
+        request.user = await User.objects.aget(pk=api_key.user_id)
+        return api_key
+
+    @staticmethod
+    def _usable_key(verified: VerifiedApiKey | None) -> APIKey | None:
+        if verified is None or verified["revoked"]:
+            return None
+        api_key = APIKey(**verified)
         if api_key.has_expired:
             raise AuthenticationError(message=str(_("API key has expired.")))
-
-        request.user = api_key.user
         return api_key
 
 
 class PublicAuth:
+    """
+    The public API's auth chain: API key, then OAuth2, then (if enabled) anonymous.
+
+    Serves sync and async operations alike. Ninja calls an ``is_async`` callback
+    from both; inside a running event loop (an async view) this returns a coroutine
+    that resolves API keys without blocking the loop, and elsewhere it answers
+    synchronously as before.
+    """
+
+    is_async = True
     openapi_security_schema: dict = {
         "type": "apiKey",
         "in": "header",
@@ -64,15 +103,40 @@ class PublicAuth:
     }
 
     def __call__(self, request):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._authenticate(request)
+        return self._aauthenticate(request)
+
+    def _authenticate(self, request):
+        for auth_method in self._methods():
+            result = auth_method(request)
+            if result is not None:
+                return result
+        return self._anonymous(request)
+
+    async def _aauthenticate(self, request):
+        for auth_method in self._methods():
+            if isinstance(auth_method, ApiKeyAuth):
+                result = await auth_method.acall(request)
+            else:
+                result = await sync_to_async(auth_method)(request)
+            if result is not None:
+                return result
+        return self._anonymous(request)
+
+    @staticmethod
+    def _methods() -> list:
         methods = []
         if settings.ENABLE_API_KEY_AUTH:
             methods.append(ApiKeyAuth())
         if settings.ENABLE_OAUTH2:
             methods.append(OAuth2Auth())
-        for auth_method in methods:
-            result = auth_method(request)
-            if result is not None:
-                return result
+        return methods
+
+    @staticmethod
+    def _anonymous(request):
         if settings.ENABLE_ANONYMOUS_TRAFFIC:
             anonymous_user = AnonymousUser()
             request.user = anonymous_user
@@ -0,0 +1,112 @@
+from collections.abc import Callable
+from functools import wraps
+import hashlib
+import inspect
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+__all__ = [
+    "conditional",
+    "not_modified",
+    "set_validators",
+    "strong_etag",
+]
+
+# Name of the ninja "temporal response" argument injected into decorated views: ninja
+# passes the response it will render into, so the 200 can carry the same validator.
+_RESPONSE_ARG = "_conditional_response"
+
+
+def strong_etag(*parts: Any) -> str:
+    """Quoted strong ETag derived from ``parts``; equal parts always give the same tag."""
+    digest = hashlib.blake2b("\x1f".join(str(part) for part in parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def not_modified(request: HttpRequest, etag: str, last_modified: int | None = None) -> HttpResponse | None:
+    """
+    The 304 answering ``request`` when its validators match, else None.
+
+    ``If-None-Match`` wins over ``If-Modified-Since`` (RFC 9110), so a
+    conservative ``last_modified`` can never hide a changed representation.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response: HttpResponse, etag: str, last_modified: int | None = None) -> None:
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+
+
+def conditional(etag_func: Callable[[HttpRequest], Any]) -> Callable[..., Any]:
+    """
+    Answer revalidations of a GET endpoint with 304 before the view runs.
+
+    ``etag_func`` must derive the validator from cheap state only -- cache-held
+    generations and request attributes, never the DB -- so a match costs no query;
+    returning None skips the check. The 200 carries the same ETag. Place it under
+    ``@track_usage`` and above ``@paginate``::
+
+        @router.get("reciters/", response=list[ReciterOut])
+        @track_usage(entity_type="reciter")
+        @conditional(content_list_etag)
+        @paginate
+        def list_reciters(request, ...):
+            ...
+
+    Async views get an async wrapper; give them an async ``etag_func`` too, or the
+    sync one runs in a thread.
+    """
+
+    def wrapper(view: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(view)
+        parameters = list(signature.parameters.values())
+        response_param = inspect.Parameter(_RESPONSE_ARG, inspect.Parameter.KEYWORD_ONLY, annotation=HttpResponse)
+        if parameters and parameters[-1].kind == inspect.Parameter.VAR_KEYWORD:
+            parameters.insert(-1, response_param)
+        else:
+            parameters.append(response_param)
+
+        if inspect.iscoroutinefunction(view):
+            aetag_func = etag_func if inspect.iscoroutinefunction(etag_func) else sync_to_async(etag_func)
+
+            @wraps(view)
+            async def conditional_view(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+                response: HttpResponse = kwargs.pop(_RESPONSE_ARG)
+                unchanged = _revalidate(request, response, await aetag_func(request))
+                if unchanged is not None:
+                    return unchanged
+                return await view(request, *args, **kwargs)
+
+        else:
+
+            @wraps(view)
+            def conditional_view(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+                response: HttpResponse = kwargs.pop(_RESPONSE_ARG)
+                unchanged = _revalidate(request, response, etag_func(request))
+                if unchanged is not None:
+                    return unchanged
+                return view(request, *args, **kwargs)
+
+        conditional_view.__signature__ = signature.replace(parameters=parameters)  # type: ignore[attr-defined]
+        return conditional_view
+
+    return wrapper
+
+
+def _revalidate(request: HttpRequest, response: HttpResponse, etag: str | None) -> HttpResponse | None:
+    """The 304 when ``etag`` matches, else None with the ETag set on the 200 to come."""
+    if etag is None:
+        return None
+    unchanged = not_modified(request, etag)
+    if unchanged is None:
+        set_validators(response, etag)
+    return unchanged
@@ -0,0 +1,180 @@
+"""
+How paginated list endpoints get their ``count``.
+
+An exact ``COUNT(*)`` over a list query (joins, ``DISTINCT``, annotations) often
+costs more than fetching the page itself, and it is repeated on every page of
+every crawl. ``ListCounter`` tries, in order:
+
+1. ``cached`` -- an exact count computed earlier for the same query, only when
+   the caller opts in (``cache_count=True``, which ``CatalogPagination`` passes).
+   Keys are a digest of the count query's SQL and parameters (so filters, search
+   and language are all part of it; ordering is not), versioned by the model's
+   registered generation. Apps register the models whose generation their signals
+   move on (see ``cache_counts``); other models are never cached. Only opt in for
+   lists whose rows depend on nothing but tables that move that generation: a
+   list filtered through memberships or access grants would keep a stale total.
+2. ``estimated`` -- on Postgres, the planner's row estimate for the query
+   (``EXPLAIN``, which reads ``reltuples`` and column statistics) when it is at
+   least ``LIST_COUNT_ESTIMATE_THRESHOLD``. Exact counts of lists that large are
+   the expensive ones, and nobody pages through them by total. The ``EXPLAIN`` is
+   a round trip of its own, so it only runs when the model's table holds at least
+   that many rows by ``pg_class.reltuples`` -- read once per table and cached for
+   ``TABLE_ROWS_CACHE_TTL``. A list over a smaller table cannot reach the
+   threshold and goes straight to ``COUNT(*)``.
+3. ``exact`` -- ``COUNT(*)``, cached for next time when opted in and the model is registered.
+"""
+
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+from typing import Any, Literal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import DatabaseError, connections
+from django.db.models import Model, QuerySet
+
+from apps.core.local_cache import LocalCache
+
+logger = logging.getLogger(__name__)
+
+CountKind = Literal["exact", "cached", "estimated"]
+
+# Versioned keys never go stale, only unreachable; the TTL only bounds memory.
+LIST_COUNT_CACHE_TTL = 60 * 60 * 6  # 6 hours
+# reltuples only moves on VACUUM/ANALYZE; a table crossing the threshold can wait this long.
+TABLE_ROWS_CACHE_TTL = 60 * 10  # 10 minutes
+
+_table_rows_l1 = LocalCache("list_count_table_rows", ttl=60 * 5)
+
+
+@dataclass(frozen=True)
+class _CountVersion:
+    version: Callable[[], Any]
+    aversion: Callable[[], Awaitable[Any]]
+
+
+_count_versions: dict[type[Model], _CountVersion] = {}
+
+
+def cache_counts(
+    models: Iterable[type[Model]], *, version: Callable[[], Any], aversion: Callable[[], Awaitable[Any]]
+) -> None:
+    """
+    Cache exact list counts of ``models`` under ``version()``.
+
+    ``version`` must change whenever a row that any of their list queries can see
+    changes -- typically a cache generation moved on by post_save/post_delete
+    receivers. ``aversion`` is its async twin, for async views.
+    """
+    for model in models:
+        _count_versions[model] = _CountVersion(version=version, aversion=aversion)
+
+
+class ListCounter:
+    def __init__(self, *, estimate_threshold: int | None = None, cache_timeout: int = LIST_COUNT_CACHE_TTL) -> None:
+        self._estimate_threshold = estimate_threshold
+        self.cache_timeout = cache_timeout
+
+    @property
+    def estimate_threshold(self) -> int:
+        if self._estimate_threshold is None:
+            return settings.LIST_COUNT_ESTIMATE_THRESHOLD
+        return self._estimate_threshold
+
+    def count(self, items: QuerySet | list, *, cache_count: bool = False) -> tuple[int, CountKind]:
+        if not isinstance(items, QuerySet):
+            return len(items), "exact"
+        queryset = items.order_by()
+        count_version = _count_versions.get(queryset.model) if cache_count else None
+        key = self._cache_key(queryset, count_version.version()) if count_version else None
+        if key:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached, "cached"
+        estimate = self._estimate(queryset)
+        if estimate is not None:
+            return estimate, "estimated"
+        total = queryset.count()
+        if key:
+            cache.set(key, total, timeout=self.cache_timeout)
+        return total, "exact"
+
+    async def acount(self, items: QuerySet | list, *, cache_count: bool = False) -> tuple[int, CountKind]:
+        """``count`` for async views: a cached count is one cache read on the event loop."""
+        if not isinstance(items, QuerySet):
+            return len(items), "exact"
+        queryset = items.order_by()
+        count_version = _count_versions.get(queryset.model) if cache_count else None
+        key = self._cache_key(queryset, await count_version.aversion()) if count_version else None
+        if key:
+            cached = await cache.aget(key)
+            if cached is not None:
+                return cached, "cached"
+        if connections[queryset.db].vendor == "postgresql":
+            estimate = await sync_to_async(self._estimate)(queryset)
+            if estimate is not None:
+                return estimate, "estimated"
+        total = await queryset.acount()
+        if key:
+            await cache.aset(key, total, timeout=self.cache_timeout)
+        return total, "exact"
+
+    @staticmethod
+    def _cache_key(queryset: QuerySet, version: Any) -> str | None:
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        digest = hashlib.sha256(repr((queryset.db, sql, params)).encode()).hexdigest()
+        return f"list_count:{queryset.model._meta.label_lower}:{version}:{digest}"
+
+    def _estimate(self, queryset: QuerySet) -> int | None:
+        """The planner's row estimate when it reaches the threshold; ``None`` to count exactly."""
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        if self._table_rows(queryset) < self.estimate_threshold:
+            return None
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            # e.g. an empty ``__in`` filter: ``count()`` answers 0 without a query.
+            return None
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+        except DatabaseError:
+            logger.warning("ListCounter: could not estimate %s rows", queryset.model._meta.label, exc_info=True)
+            return None
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        rows = int(plan[0]["Plan"]["Plan Rows"])
+        return rows if rows >= self.estimate_threshold else None
+
+    @staticmethod
+    def _table_rows(queryset: QuerySet) -> int:
+        """``reltuples`` of the model's table; 0 when unknown (never analyzed, or the read failed)."""
+        db_table = queryset.model._meta.db_table
+
+        def fetch() -> int:
+            try:
+                with connections[queryset.db].cursor() as cursor:
+                    cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)", [db_table])
+                    row = cursor.fetchone()
+            except DatabaseError:
+                logger.warning("ListCounter: could not read the size of %s", db_table, exc_info=True)
+                return 0
+            # -1 until the table is first vacuumed or analyzed.
+            return max(int(row[0]), 0) if row else 0
+
+        key = f"list_count:table_rows:{queryset.db}:{db_table}"
+        return _table_rows_l1.get_or_fetch(key, fetch, timeout=TABLE_ROWS_CACHE_TTL)
+
+
+list_counter = ListCounter()
@@ -1,17 +1,29 @@
-from typing import Any
-
-from django.db.models import QuerySet
+import datetime
+import json
+from typing import Any, Literal
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+from django.utils.translation import gettext_lazy as _
 from ninja import Schema
-from ninja.pagination import PageNumberPagination as NinjaPageNumberPagination
+from ninja.pagination import AsyncPaginationBase, PageNumberPagination as NinjaPageNumberPagination
 from pydantic import Field
 
+from apps.core.ninja_utils.counting import list_counter
+from apps.core.ninja_utils.errors import ItqanError
+
 MAX_PAGE_SIZE = 1000
 DEFAULT_PAGE_SIZE = 20
 PUBLIC_RECITATION_MAX_PAGE_SIZE = 114
 
+_CURSOR_SALT = "apps.core.ninja_utils.paginations.cursor"
+
 
 class NinjaPagination(NinjaPageNumberPagination):
     items_attribute: str = "results"
+    # Whether exact counts may be cached (see apps.core.ninja_utils.counting).
+    cache_count: bool = False
 
     class Input(Schema):
         page: int = Field(1, ge=1)
@@ -23,6 +35,10 @@ class NinjaPagination(NinjaPageNumberPagination):
     class Output(Schema):
         results: list[Any]
         count: int
+        count_kind: Literal["exact", "cached", "estimated"] = Field(
+            "exact",
+            description="How `count` was obtained: counted now, a cached exact count, or the database's estimate",
+        )
 
     def paginate_queryset(
         self,
@@ -31,9 +47,11 @@ class NinjaPagination(NinjaPageNumberPagination):
         **params: Any,
     ) -> Any:
         offset = (pagination.page - 1) * pagination.page_size
+        count, count_kind = list_counter.count(queryset, cache_count=self.cache_count)
         return {
             "results": queryset[offset : offset + pagination.page_size],
-            "count": self._items_count(queryset),
+            "count": count,
+            "count_kind": count_kind,
         }
 
     async def apaginate_queryset(
@@ -43,12 +61,27 @@ class NinjaPagination(NinjaPageNumberPagination):
         **params: Any,
     ) -> Any:
         offset = (pagination.page - 1) * pagination.page_size
+        count, count_kind = await list_counter.acount(queryset, cache_count=self.cache_count)
+        # Evaluated here with the async ORM: ninja iterates the page synchronously,
+        # which a lazy queryset does not allow inside the event loop.
         return {
-            "results": queryset[offset : offset + pagination.page_size],
-            "count": await self._aitems_count(queryset),
+            "results": [item async for item in queryset[offset : offset + pagination.page_size]],
+            "count": count,
+            "count_kind": count_kind,
         }
 
 
+class CatalogPagination(NinjaPagination):
+    """
+    ``NinjaPagination`` with cached exact counts, for the public catalogue lists.
+
+    Their rows depend only on catalogue tables, whose saves move the generation
+    the cached counts are versioned by (``cache_counts`` in ``apps.content.signals``).
+    """
+
+    cache_count = True
+
+
 class PublicRecitationPagination(NinjaPageNumberPagination):
     """Pagination for the public recitation tracks endpoint.
 
@@ -80,3 +113,131 @@ class PublicRecitationPagination(NinjaPageNumberPagination):
             "results": queryset[offset : offset + pagination.page_size],
             "count": self._items_count(queryset),
         }
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o: Any) -> Any:
+        if isinstance(o, datetime.datetime):
+            # DjangoJSONEncoder drops microseconds, which would repeat rows at page edges.
+            return o.isoformat()
+        return super().default(o)
+
+
+class _CursorSerializer(signing.JSONSerializer):
+    """Lets cursors carry datetimes, decimals and UUIDs; filters parse the strings back."""
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), cls=_CursorEncoder).encode("latin-1")
+
+
+class CursorPagination(AsyncPaginationBase):
+    """
+    Keyset pagination: each page continues after the last row of the previous one.
+
+    `NinjaPagination` pays an `OFFSET` that grows with the page number plus a
+    `COUNT(*)` on every page. Here a page is `WHERE (ordering) > (last row's
+    values) LIMIT page_size`, which costs the same on page 1 and page 10,000 as
+    long as the ordering is indexed. The total is only counted when
+    `with_count=true` is sent.
+
+    The ordering is whatever the queryset has after `@searching`/`@ordering`
+    (or the model's default), with the primary key appended so it is total. `next` is a
+    signed, opaque token holding that ordering and the last row's values: a
+    tampered cursor, or one reused with a different `?ordering=`/`?search=`
+    ranking, is rejected with `invalid_cursor` instead of skipping rows.
+    Ordering columns must be non-null. Opt in per endpoint with
+    `@paginate(CursorPagination)`.
+    """
+
+    items_attribute: str = "results"
+
+    class Input(Schema):
+        cursor: str | None = Field(None, description="`next` from the previous page; omit for the first page")
+        page_size: int = Field(DEFAULT_PAGE_SIZE, ge=1)
+        with_count: bool = Field(False, description="Also return the total number of results (one more query)")
+
+        def __init__(self, page_size: int = DEFAULT_PAGE_SIZE, **kwargs: Any) -> None:
+            super().__init__(page_size=min(page_size, MAX_PAGE_SIZE), **kwargs)
+
+    class Output(Schema):
+        results: list[Any]
+        next: str | None = None
+        count: int | None = None
+
+    def paginate_queryset(self, queryset: QuerySet, pagination: Input, **params: Any) -> Any:
+        fields = self._ordering(queryset)
+        page = list(self._page_queryset(queryset, fields, pagination))
+        return {
+            "results": page[: pagination.page_size],
+            "next": self._next_cursor(page, fields, pagination.page_size),
+            "count": self._items_count(queryset) if pagination.with_count else None,
+        }
+
+    async def apaginate_queryset(self, queryset: QuerySet, pagination: Input, **params: Any) -> Any:
+        fields = self._ordering(queryset)
+        page = [item async for item in self._page_queryset(queryset, fields, pagination)]
+        return {
+            "results": page[: pagination.page_size],
+            "next": self._next_cursor(page, fields, pagination.page_size),
+            "count": await self._aitems_count(queryset) if pagination.with_count else None,
+        }
+
+    def _page_queryset(self, queryset: QuerySet, fields: list[str], pagination: Input) -> QuerySet:
+        queryset = queryset.order_by(*fields)
+        if pagination.cursor:
+            queryset = queryset.filter(self._after(fields, self._decode(pagination.cursor, fields)))
+        # One extra row tells whether there is a next page.
+        return queryset[: pagination.page_size + 1]
+
+    @staticmethod
+    def _ordering(queryset: QuerySet) -> list[str]:
+        fields = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if any(not isinstance(field, str) or field == "?" for field in fields):
+            raise TypeError("CursorPagination needs an ordering of field names")
+        pk_name = queryset.model._meta.pk.name
+        if not {"pk", "-pk", pk_name, f"-{pk_name}"} & set(fields):
+            fields.append(pk_name)
+        return fields
+
+    @staticmethod
+    def _after(fields: list[str], values: list[Any]) -> Q:
+        """Rows strictly after `values` in `fields` order: (a > x) OR (a = x AND b > y) OR ..."""
+        condition = Q()
+        for index, field in enumerate(fields):
+            name = field.removeprefix("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            ties = {
+                previous.removeprefix("-"): value
+                for previous, value in zip(fields[:index], values[:index], strict=True)
+            }
+            condition |= Q(**ties, **{f"{name}__{lookup}": values[index]})
+        return condition
+
+    @staticmethod
+    def _next_cursor(page: list[Any], fields: list[str], page_size: int) -> str | None:
+        if len(page) <= page_size:
+            return None
+        last = page[page_size - 1]
+        values = [_attribute(last, field.removeprefix("-")) for field in fields]
+        return signing.dumps({"o": fields, "v": values}, salt=_CURSOR_SALT, serializer=_CursorSerializer, compress=True)
+
+    @staticmethod
+    def _decode(cursor: str, fields: list[str]) -> list[Any]:
+        try:
+            payload = signing.loads(cursor, salt=_CURSOR_SALT, serializer=_CursorSerializer)
+        except signing.BadSignature:
+            payload = None
+        if not isinstance(payload, dict) or payload.get("o") != fields or len(payload.get("v", ())) != len(fields):
+            raise ItqanError(
+                error_name="invalid_cursor",
+                message=_("Invalid cursor. Restart from the first page with the same ordering and search."),
+                status_code=400,
+            )
+        return payload["v"]
+
+
+def _attribute(item: Any, path: str) -> Any:
+    value = item
+    for name in path.split("__"):
+        value = value.get(name) if isinstance(value, dict) else getattr(value, name)
+    return value
@@ -0,0 +1,241 @@
+"""
+Serialize list pages from ``.values()`` rows instead of model instances.
+
+A list endpoint normally hands model instances to ninja: every row builds the
+model and its ``select_related`` relations, and pydantic then calls the output
+schema's ``resolve_*`` methods on each one. On 1000-row pages that dominates the
+CPU time of the request.
+
+A ``Projection`` is derived from the output schema once:
+
+- scalar fields become columns, and translated fields become one column per
+  language, resolved with modeltranslation's own fallback rules;
+- nested schemas become columns across the foreign key (``publisher__name``);
+  a null foreign key gives ``None``;
+- ``list[Schema]`` fields become one query per page over the reverse relation,
+  grouped by the parent row.
+
+``projection.apply(queryset)`` returns a values queryset whose rows are already in
+the schema's shape (``ProjectedRow``), so ``@searching``, ``@ordering`` and
+``NinjaPagination`` compose with it as usual. The output schema must derive from
+``ProjectableSchema``, which validates such rows without running its resolvers.
+Opting in is per endpoint: the projection has to produce what the resolvers would.
+"""
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from types import NoneType, SimpleNamespace, UnionType
+from typing import Any, Union, get_args, get_origin
+
+from django.db.models import Model, QuerySet
+from django.db.models.query import ValuesIterable
+from modeltranslation.settings import AVAILABLE_LANGUAGES
+from modeltranslation.translator import NotRegistered, translator
+from modeltranslation.utils import build_localized_fieldname
+from ninja import Schema
+from pydantic import BaseModel, model_validator
+
+
+class ProjectedRow(dict):
+    """A response row already in its output schema's shape."""
+
+
+class ProjectableSchema(Schema):
+    """An output schema that accepts ``ProjectedRow``s as they are, without calling its resolvers."""
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _run_root_validator(cls, values, handler, info):
+        if isinstance(values, ProjectedRow):
+            return handler(values)
+        return super()._run_root_validator(values, handler, info)
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _schema_of(annotation: Any) -> type[BaseModel] | None:
+    annotation = _unwrap_optional(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def _check_projectable(schema: type[BaseModel]) -> None:
+    if getattr(schema, "_ninja_resolvers", None) and not issubclass(schema, ProjectableSchema):
+        raise TypeError(f"{schema.__name__} has resolvers, so it must derive from ProjectableSchema to be projected")
+
+
+def _translated_fields(model: type[Model]) -> set[str]:
+    try:
+        return set(translator.get_options_for_model(model).all_fields)
+    except NotRegistered:
+        return set()
+
+
+@dataclass
+class _Node:
+    """How one schema, at one depth of foreign keys, is read out of a values row."""
+
+    model: type[Model]
+    prefix: str
+    scalars: list[tuple[str, str]] = field(default_factory=list)
+    translated: list[tuple[str, Any, tuple[tuple[str, str], ...]]] = field(default_factory=list)
+    children: list[tuple[str, "_Node"]] = field(default_factory=list)
+    pk_column: str = ""
+
+    @classmethod
+    def build(
+        cls,
+        schema: type[BaseModel],
+        model: type[Model],
+        *,
+        prefix: str = "",
+        lookups: dict[str, str] | None = None,
+        extra: Iterable[str] = (),
+        skip: Iterable[str] = (),
+    ) -> "_Node":
+        _check_projectable(schema)
+        lookups = lookups or {}
+        node = cls(model=model, prefix=prefix, pk_column=f"{prefix}{model._meta.pk.name}")
+        translated = _translated_fields(model)
+        nested_extra: dict[str, list[str]] = defaultdict(list)
+        for path in extra:
+            head, _, rest = path.partition("__")
+            head_field = schema.model_fields.get(head)
+            if rest and head_field is not None and _schema_of(head_field.annotation) is not None:
+                nested_extra[head].append(rest)
+            else:
+                node._add_scalar(path, path, translated)
+
+        for name, model_field in schema.model_fields.items():
+            if name in skip:
+                continue
+            key = model_field.alias or name
+            lookup = lookups.get(name, name)
+            nested = _schema_of(model_field.annotation)
+            if nested is not None:
+                related_model = model._meta.get_field(lookup).related_model
+                child = cls.build(nested, related_model, prefix=f"{prefix}{lookup}__", extra=nested_extra[name])
+                node.children.append((key, child))
+            else:
+                node._add_scalar(key, lookup, translated)
+        return node
+
+    def _add_scalar(self, key: str, lookup: str, translated: set[str]) -> None:
+        if lookup not in translated:
+            self.scalars.append((key, f"{self.prefix}{lookup}"))
+            return
+        columns = tuple(
+            (localized, f"{self.prefix}{localized}")
+            for localized in (build_localized_fieldname(lookup, language) for language in AVAILABLE_LANGUAGES)
+        )
+        self.translated.append((key, getattr(self.model, lookup), columns))
+
+    def columns(self) -> Iterator[str]:
+        yield self.pk_column
+        yield from (column for _key, column in self.scalars)
+        for _key, _descriptor, columns in self.translated:
+            yield from (column for _localized, column in columns)
+        for _key, child in self.children:
+            yield from child.columns()
+
+    def read(self, row: dict[str, Any]) -> ProjectedRow | None:
+        if row[self.pk_column] is None:
+            return None
+        result = ProjectedRow((key, row[column]) for key, column in self.scalars)
+        for key, descriptor, columns in self.translated:
+            # The descriptor applies the active language and its fallbacks, as attribute access would.
+            holder = SimpleNamespace(**{localized: row[column] for localized, column in columns})
+            result[key] = descriptor.__get__(holder, None)
+        for key, child in self.children:
+            result[key] = child.read(row)
+        return result
+
+
+@dataclass(frozen=True)
+class _RelatedList:
+    key: str
+    node: _Node
+    join_column: str
+    sort_key: Callable[[ProjectedRow], Any] | None
+
+
+class Projection:
+    """
+    Reads rows of ``model`` straight into the shape of ``schema``.
+
+    ``lookups`` maps schema fields to model lookups where their names differ (a
+    reverse relation, say). ``extra`` names lookups selected on top of the schema's
+    fields; pydantic drops them from the response, but code reading the page
+    before validation (``track_usage``) sees them. A path into a nested schema
+    (``publisher__name_ar``) lands in the nested dict. ``sort_keys`` orders the
+    items of ``list[Schema]`` fields.
+    """
+
+    def __init__(
+        self,
+        schema: type[ProjectableSchema],
+        model: type[Model],
+        *,
+        lookups: dict[str, str] | None = None,
+        extra: Iterable[str] = (),
+        sort_keys: dict[str, Callable[[ProjectedRow], Any]] | None = None,
+    ) -> None:
+        lookups = lookups or {}
+        sort_keys = sort_keys or {}
+        self.related: list[_RelatedList] = []
+        related_names = set()
+        for name, model_field in schema.model_fields.items():
+            if get_origin(model_field.annotation) is not list:
+                continue
+            item_schema = _schema_of(get_args(model_field.annotation)[0])
+            if item_schema is None:
+                continue
+            relation = model._meta.get_field(lookups.get(name, name))
+            join_column = relation.field.attname
+            node = _Node.build(item_schema, relation.related_model, extra=[join_column])
+            self.related.append(_RelatedList(model_field.alias or name, node, join_column, sort_keys.get(name)))
+            related_names.add(name)
+
+        self.root = _Node.build(schema, model, lookups=lookups, extra=extra, skip=related_names)
+        self.columns = tuple(dict.fromkeys(self.root.columns()))
+        self.iterable_class = type(f"{schema.__name__}Iterable", (_ProjectionIterable,), {"projection": self})
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        """``queryset`` as a values queryset yielding ``ProjectedRow``s."""
+        projected = queryset.prefetch_related(None).values(*self.columns)
+        projected._iterable_class = self.iterable_class
+        return projected
+
+    def read(self, rows: list[dict[str, Any]], queryset: QuerySet) -> list[ProjectedRow]:
+        results = [self.root.read(row) for row in rows]
+        if not results:
+            return results
+        pks = [row[self.root.pk_column] for row in rows]
+        for related in self.related:
+            grouped: dict[Any, list[ProjectedRow]] = {pk: [] for pk in pks}
+            items = related.node.model._default_manager.using(queryset.db).filter(**{f"{related.join_column}__in": pks})
+            for item_row in items.order_by(related.node.pk_column).values(*dict.fromkeys(related.node.columns())):
+                item = related.node.read(item_row)
+                grouped[item.pop(related.join_column)].append(item)
+            for pk, result in zip(pks, results, strict=True):
+                related_items = grouped[pk]
+                if related.sort_key is not None:
+                    related_items.sort(key=related.sort_key)
+                result[related.key] = related_items
+        return results
+
+
+class _ProjectionIterable(ValuesIterable):
+    projection: Projection
+
+    def __iter__(self) -> Iterator[ProjectedRow]:
+        # The page is read whole so that each related list costs one query for all its rows.
+        yield from self.projection.read(list(super().__iter__()), self.queryset)
@@ -0,0 +1,53 @@
+"""
+JSON encoding and decoding for every NinjaAPI instance (see ``create_ninja_api``).
+
+Bodies go through orjson. Types it has no native form for -- and datetimes, whose
+format we keep -- are handed to ninja's ``NinjaJSONEncoder``, so datetimes stay
+ISO 8601 with milliseconds and ``Z``, Decimals become strings, lazy translations are
+rendered in the active language and Pydantic models are dumped, exactly as with
+ninja's default renderer.
+
+Where orjson and the stdlib ``json`` module disagree, we decide as follows:
+
+- Integers beyond 64 bits make orjson raise. Such a body is re-encoded with the stdlib
+  module (compact, UTF-8, same as orjson's output), which writes them in full.
+- NaN and Infinity are written as ``null``, as orjson does. The stdlib writes bare
+  ``NaN``/``Infinity`` tokens, which are not JSON and which strict clients reject.
+- When parsing, ``NaN``/``Infinity`` tokens are rejected as malformed, and integers
+  beyond 64 bits are read as floats. No request schema takes such integers: ids are
+  64-bit.
+"""
+
+import json
+from typing import Any
+
+from django.http import HttpRequest
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+import orjson
+
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+# Compact and UTF-8, which is what orjson writes.
+_STDLIB_DUMPS_PARAMS = {"separators": (",", ":"), "ensure_ascii": False}
+_encoder = NinjaJSONEncoder()
+
+
+def dumps(data: Any) -> bytes:
+    """``data`` as UTF-8 JSON bytes."""
+    try:
+        return orjson.dumps(data, default=_encoder.default, option=_ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        # Integers beyond 64 bits; anything that is not serialisable at all raises here too.
+        return json.dumps(data, cls=NinjaJSONEncoder, **_STDLIB_DUMPS_PARAMS).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON; malformed input raises ``json.JSONDecodeError``."""
+    return orjson.loads(data)
+
+
+class NinjaRenderer(BaseRenderer):
+    media_type = "application/json"
+
+    def render(self, request: HttpRequest, data: Any, *, response_status: int) -> bytes:
+        return dumps(data)
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Q, QuerySet
+
+from apps.core.ninja_utils.searching import Searching
+from apps.core.search import normalize_search_text
+
+SEARCH_DOCUMENT_FIELD = "search_document"
+
+
+class PostgresSearching(Searching):
+    """
+    Searches a model's denormalised `search_document`, through its pg_trgm GIN index on Postgres.
+
+    A model opts in by declaring `SEARCH_DOCUMENT_SOURCES`, the lookups its document
+    is built from, and keeping `search_document` up to date. Documents and terms go
+    through the same `normalize_search_text`, so Arabic input matches regardless of
+    diacritics or hamza/ta marbuta/alef maqsura forms. Every term must occur in the
+    document (`LIKE '%term%'`, served by the trigram index instead of one
+    `UPPER(...) LIKE` per joined column). On Postgres results are also ranked by how
+    closely the whole query matches a word of the document, ahead of the view's own
+    ordering.
+
+    Falls back to `Searching` for lists, models without a document, and search fields
+    that are not exactly the document's sources: one it does not hold (prefixed
+    lookups included), or only some of them, which the whole document would widen.
+    """
+
+    def searching_queryset(self, items: QuerySet | list, searching_input: Searching.Input) -> QuerySet | list:
+        search_terms = [
+            normalized
+            for term in self.get_search_terms(searching_input.search)
+            if (normalized := normalize_search_text(term))
+        ]
+        if not (self.search_fields and search_terms and isinstance(items, QuerySet) and self.uses_document(items)):
+            return super().searching_queryset(items, searching_input)
+
+        conditions = [Q(**{f"{SEARCH_DOCUMENT_FIELD}__contains": term}) for term in search_terms]
+        items = items.filter(*conditions)
+        if connections[items.db].vendor != "postgresql":
+            return items
+        rank = TrigramWordSimilarity(" ".join(search_terms), SEARCH_DOCUMENT_FIELD)
+        return items.annotate(search_rank=rank).order_by("-search_rank", *items.query.order_by)
+
+    def uses_document(self, items: QuerySet) -> bool:
+        """
+        True when the search fields cover exactly the document's sources.
+
+        The document is matched as a whole, so searching it for a subset of its
+        sources would also match the others and widen the results.
+        """
+        sources = getattr(items.model, "SEARCH_DOCUMENT_SOURCES", None)
+        if not sources:
+            return False
+        covered: set[str] = set()
+        for search_field in self.search_fields:
+            columns = self._document_columns(search_field, sources)
+            if not columns:
+                return False
+            covered.update(columns)
+        return covered == set(sources)
+
+    def _document_columns(self, search_field: str, sources: tuple[str, ...]) -> set[str]:
+        """The document sources ``search_field`` searches; empty when the document does not hold it."""
+        if search_field[0] in self.lookup_prefixes:
+            return set()
+        if search_field in sources:
+            return {search_field}
+        # A modeltranslation field resolves to the active language; the document holds all of them.
+        columns = {f"{search_field}_{code}" for code, _name in settings.LANGUAGES}
+        return columns if columns <= set(sources) else set()
@@ -0,0 +1,51 @@
+from collections.abc import Iterable
+import re
+import unicodedata
+
+from django.db.models import QuerySet
+
+# Joins the source values of a search document. Search terms are split on
+# whitespace, so a term can never match across two source values.
+_DOCUMENT_SEPARATOR = "\n"
+_UPDATE_BATCH_SIZE = 500
+
+# Tashkeel, Quranic annotation marks (Uthmani text) and tatweel; users type without them.
+_ARABIC_MARKS = re.compile("[\u0610-\u061a\u0640\u064b-\u065f\u0670\u06d6-\u06ed\u08d3-\u08ff]")
+# Letter forms users type interchangeably: hamza/madda/wasla alef, ta marbuta, alef maqsura.
+_ARABIC_LETTER_FOLDS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ة": "ه", "ى": "ي"})
+
+
+def normalize_search_text(value: str | None) -> str:
+    """
+    Fold `value` the same way for stored documents and incoming search terms.
+
+    Lower-cases, maps Arabic presentation forms to plain letters (NFKC), drops
+    diacritics and tatweel, and folds أ/إ/آ/ٱ to ا, ة to ه and ى to ي.
+    """
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKC", value.replace("\x00", "")).lower()
+    return _ARABIC_MARKS.sub("", value).translate(_ARABIC_LETTER_FOLDS)
+
+
+def build_search_document(values: Iterable[str | None]) -> str:
+    """Denormalised, normalised text a model row is searched by (see `PostgresSearching`)."""
+    return _DOCUMENT_SEPARATOR.join(normalized for value in values if (normalized := normalize_search_text(value)))
+
+
+def refresh_search_documents(queryset: QuerySet) -> int:
+    """
+    Rebuild `search_document` for every row of `queryset`, returning how many changed.
+
+    The model must declare `SEARCH_DOCUMENT_SOURCES`. Sources are read in one query
+    (joins included) and only rows whose document actually changed are written.
+    """
+    model = queryset.model
+    stale = []
+    rows = queryset.values_list("pk", "search_document", *model.SEARCH_DOCUMENT_SOURCES)
+    for pk, current, *values in rows.iterator(chunk_size=_UPDATE_BATCH_SIZE):
+        document = build_search_document(values)
+        if document != current:
+            stale.append(model(pk=pk, search_document=document))
+    model.objects.bulk_update(stale, ["search_document"], batch_size=_UPDATE_BATCH_SIZE)
+    return len(stale)
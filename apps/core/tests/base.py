@@ -38,6 +38,8 @@ class BaseTestCase(TestCase):
             cls.mock_aws.stop()
         except Exception:
             pass
+        # Roll back the class-level transaction, so later TransactionTestCases start clean.
+        super().tearDownClass()
 
     @classmethod
     def mock_storage(cls):
@@ -0,0 +1,65 @@
+import gzip
+import json
+
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from apps.core.compression import accepted_encodings, brotli
+from apps.core.middlewares.compression import CompressionMiddleware
+
+BODY = {"results": [{"surah_number": n, "ayahs_timings": [{"start_ms": 0, "end_ms": 1000}]} for n in range(50)]}
+
+
+class AcceptedEncodingsTest(SimpleTestCase):
+    def test_accepted_encodings_where_q_zero_should_exclude_coding(self):
+        self.assertEqual({"gzip", "deflate"}, accepted_encodings("gzip, deflate;q=0.5, br;q=0"))
+
+    def test_accepted_encodings_where_header_empty_should_return_empty_set(self):
+        self.assertEqual(set(), accepted_encodings(""))
+
+
+class CompressionMiddlewareTest(SimpleTestCase):
+    def _process(self, response: HttpResponse, accept_encoding: str) -> HttpResponse:
+        request = RequestFactory().get("/recitations/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda r: response)(request)
+
+    def test_process_response_where_client_accepts_gzip_should_compress_json(self):
+        # Act
+        response = self._process(JsonResponse(BODY), "gzip")
+
+        # Assert
+        self.assertEqual("gzip", response["Content-Encoding"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(BODY, json.loads(gzip.decompress(response.content)))
+
+    def test_process_response_where_html_should_not_compress(self):
+        # Act
+        response = self._process(HttpResponse("<p>x</p>" * 100, content_type="text/html"), "gzip, br")
+
+        # Assert
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_process_response_where_body_already_encoded_should_pass_through(self):
+        # Arrange
+        stored = gzip.compress(json.dumps(BODY).encode())
+        encoded = HttpResponse(stored, content_type="application/json")
+        encoded["Content-Encoding"] = "gzip"
+
+        # Act
+        response = self._process(encoded, "gzip, br")
+
+        # Assert
+        self.assertEqual(stored, response.content)
+
+    def test_process_response_where_client_accepts_br_should_prefer_brotli(self):
+        # Arrange
+        json_response = JsonResponse(BODY)
+        json_response["ETag"] = '"abc"'
+
+        # Act
+        response = self._process(json_response, "gzip, br")
+
+        # Assert
+        self.assertEqual("br", response["Content-Encoding"])
+        self.assertEqual('W/"abc"', response["ETag"])
+        self.assertEqual(BODY, json.loads(brotli.decompress(response.content)))
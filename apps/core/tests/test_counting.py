@@ -0,0 +1,124 @@
+from unittest.mock import MagicMock, patch
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from model_bakery import baker
+
+from apps.content.models import Reciter
+from apps.core.ninja_utils import counting
+from apps.core.ninja_utils.counting import ListCounter
+from apps.core.tests.base import BaseTestCase
+from apps.users.models import User
+
+
+class ListCounterTest(BaseTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.counter = ListCounter(estimate_threshold=1000)
+        baker.make(Reciter, _quantity=3)
+
+    def test_count_where_model_is_registered_should_cache_exact_count_per_query(self):
+        # Arrange
+        queryset = Reciter.objects.filter(is_active=True)
+        self.counter.count(queryset.order_by("name"), cache_count=True)
+
+        # Act
+        with self.assertNumQueries(0):
+            cached = self.counter.count(queryset.order_by("-name"), cache_count=True)
+
+        # Assert
+        self.assertEqual(cached, (3, "cached"))
+        self.assertEqual(self.counter.count(queryset.filter(slug="missing"), cache_count=True), (0, "exact"))
+
+    def test_count_where_registered_model_is_saved_should_recount(self):
+        # Arrange
+        queryset = Reciter.objects.all()
+        self.counter.count(queryset, cache_count=True)
+
+        # Act
+        baker.make(Reciter)
+
+        # Assert
+        self.assertEqual(self.counter.count(queryset, cache_count=True), (4, "exact"))
+
+    def test_count_where_model_is_not_registered_should_count_every_time(self):
+        # Arrange
+        baker.make(User, _quantity=2)
+        self.counter.count(User.objects.all(), cache_count=True)
+
+        # Act
+        result = self.counter.count(User.objects.all(), cache_count=True)
+
+        # Assert
+        self.assertEqual(result[1], "exact")
+
+    def test_count_where_caller_did_not_opt_in_should_count_every_time(self):
+        # Arrange
+        queryset = Reciter.objects.all()
+        self.counter.count(queryset)
+
+        # Act
+        with self.assertNumQueries(1):
+            result = self.counter.count(queryset)
+
+        # Assert
+        self.assertEqual(result, (3, "exact"))
+
+    def test_count_where_postgres_estimate_reaches_threshold_should_return_estimate(self):
+        # Arrange
+        connections, cursor = self._postgres_connections()
+        cursor.fetchone.side_effect = [(80000,), ([{"Plan": {"Plan Rows": 5000}}],)]
+
+        # Act
+        with patch.object(counting, "connections", connections):
+            result = self.counter.count(Reciter.objects.filter(is_active=False))
+
+        # Assert
+        self.assertEqual(result, (5000, "estimated"))
+        sql = cursor.execute.call_args.args[0]
+        self.assertTrue(sql.startswith("EXPLAIN (FORMAT JSON) SELECT"))
+
+    def test_count_where_postgres_table_is_below_threshold_should_count_without_explain(self):
+        # Arrange
+        connections, cursor = self._postgres_connections()
+        cursor.fetchone.return_value = (10,)
+
+        # Act
+        with patch.object(counting, "connections", connections):
+            self.counter.count(Reciter.objects.all())
+            result = self.counter.count(Reciter.objects.filter(is_active=True))
+
+        # Assert
+        self.assertEqual(result, (3, "exact"))
+        self.assertEqual(cursor.execute.call_count, 1)
+        self.assertIn("pg_class", cursor.execute.call_args.args[0])
+
+    def test_count_where_filter_matches_nothing_by_construction_should_return_zero_quietly(self):
+        # Arrange
+        connections, cursor = self._postgres_connections()
+        cursor.fetchone.return_value = (80000,)
+
+        # Act
+        with patch.object(counting, "connections", connections), self.assertNoLogs(counting.logger, "WARNING"):
+            result = self.counter.count(Reciter.objects.filter(id__in=[]))
+
+        # Assert
+        self.assertEqual(result, (0, "exact"))
+        self.assertNotIn("EXPLAIN", " ".join(call.args[0] for call in cursor.execute.call_args_list))
+
+    def test_acount_where_cached_by_sync_count_should_return_cached(self):
+        # Arrange
+        queryset = Reciter.objects.all()
+        self.counter.count(queryset, cache_count=True)
+
+        # Act
+        result = async_to_sync(self.counter.acount)(queryset, cache_count=True)
+
+        # Assert
+        self.assertEqual(result, (3, "cached"))
+
+    def _postgres_connections(self) -> tuple[MagicMock, MagicMock]:
+        connections = MagicMock()
+        connection = connections.__getitem__.return_value
+        connection.vendor = "postgresql"
+        return connections, connection.cursor.return_value.__enter__.return_value
@@ -0,0 +1,112 @@
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.core import local_cache
+from apps.core.local_cache import LocalCache
+
+
+class LocalCacheTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.l1 = LocalCache("test_l1", max_entries=2, ttl=30, enabled=True)
+
+    def test_get_or_fetch_where_cached_locally_should_not_reach_shared_cache_or_fetch(self):
+        # Arrange
+        fetch = Mock(return_value="value")
+        self.l1.get_or_fetch("k", fetch, timeout=60)
+
+        # Act
+        with patch.object(cache, "get") as mock_get:
+            value = self.l1.get_or_fetch("k", fetch, timeout=60)
+
+        # Assert
+        self.assertEqual("value", value)
+        fetch.assert_called_once()
+        mock_get.assert_not_called()
+
+    def test_get_or_fetch_where_result_is_none_should_cache_it(self):
+        # Arrange
+        fetch = Mock(return_value=None)
+        self.l1.get_or_fetch("k", fetch, timeout=60)
+        self.l1.clear()
+
+        # Act - served from the shared cache, not re-fetched
+        value = self.l1.get_or_fetch("k", fetch, timeout=60)
+
+        # Assert
+        self.assertIsNone(value)
+        fetch.assert_called_once()
+
+    def test_set_where_over_capacity_should_evict_least_recently_used(self):
+        # Arrange
+        self.l1.set("a", 1)
+        self.l1.set("b", 2)
+        self.l1.get("a")
+
+        # Act
+        self.l1.set("c", 3)
+
+        # Assert
+        self.assertEqual(1, self.l1.get("a"))
+        self.assertIsNone(self.l1.get("b"))
+        self.assertEqual(3, self.l1.get("c"))
+
+    def test_get_where_ttl_elapsed_should_miss(self):
+        # Arrange
+        with patch.object(local_cache.time, "monotonic", return_value=1000.0):
+            self.l1.set("a", 1)
+
+        # Act - past the TTL even with the maximum jitter
+        with patch.object(local_cache.time, "monotonic", return_value=1000.0 + 30 * 1.2 + 1):
+            value = self.l1.get("a")
+
+        # Assert
+        self.assertIsNone(value)
+
+    def test_invalidate_should_drop_shared_copy_and_notify_other_workers(self):
+        # Arrange
+        self.l1.get_or_fetch("k", lambda: "old", timeout=60)
+
+        # Act
+        with patch.object(local_cache, "_publish") as mock_publish:
+            self.l1.invalidate(["k"])
+
+        # Assert
+        self.assertIsNone(self.l1.get("k"))
+        self.assertIsNone(cache.get("k"))
+        mock_publish.assert_called_once_with([f"test_l1{local_cache._SEPARATOR}k"])
+
+    def test_apply_where_other_worker_invalidated_should_discard_local_entry(self):
+        # Arrange
+        self.l1.set("k", "old")
+        self.l1.set("other", "kept")
+
+        # Act
+        local_cache._apply(f"test_l1{local_cache._SEPARATOR}k")
+
+        # Assert
+        self.assertIsNone(self.l1.get("k"))
+        self.assertEqual("kept", self.l1.get("other"))
+
+    async def test_aget_many_where_cached_locally_should_not_reach_shared_cache(self):
+        # Arrange
+        self.l1.set("a", 1)
+        await cache.aset("b", 2)
+
+        # Act
+        with patch.object(cache, "aget_many", wraps=cache.aget_many) as mock_aget_many:
+            found = await self.l1.aget_many(["a", "b"])
+
+        # Assert
+        self.assertEqual({"a": 1, "b": 2}, found)
+        mock_aget_many.assert_called_once_with(["b"])
+
+    def test_get_where_disabled_should_pass_through(self):
+        # Arrange
+        disabled = LocalCache("test_l1_disabled", enabled=False)
+        disabled.set("k", "v")
+
+        # Act / Assert
+        self.assertIsNone(disabled.get("k"))
@@ -0,0 +1,93 @@
+from asgiref.sync import async_to_sync
+from model_bakery import baker
+
+from apps.content.models import Reciter
+from apps.core.ninja_utils.errors import ItqanError
+from apps.core.ninja_utils.paginations import CursorPagination
+from apps.core.tests.base import BaseTestCase
+
+
+class CursorPaginationTest(BaseTestCase):
+    def setUp(self) -> None:
+        self.paginator = CursorPagination()
+        self.reciters = [baker.make(Reciter, name=f"Reciter {letter}", is_active=True) for letter in "ECADB"]
+
+    def _crawl(self, queryset, page_size: int = 2) -> list[list[int]]:
+        pages, cursor = [], None
+        while True:
+            page = self.paginator.paginate_queryset(
+                queryset, CursorPagination.Input(page_size=page_size, cursor=cursor)
+            )
+            pages.append([reciter.id for reciter in page["results"]])
+            cursor = page["next"]
+            if cursor is None:
+                return pages
+
+    def test_paginate_queryset_where_crawled_by_name_should_visit_every_row_once_in_order(self):
+        # Arrange
+        expected = [reciter.id for reciter in sorted(self.reciters, key=lambda reciter: reciter.name)]
+
+        # Act
+        pages = self._crawl(Reciter.objects.order_by("name"))
+
+        # Assert
+        self.assertEqual(pages, [expected[0:2], expected[2:4], expected[4:5]])
+
+    def test_paginate_queryset_where_ordering_has_ties_and_datetimes_should_break_ties_on_pk(self):
+        # Arrange
+        expected = [reciter.id for reciter in sorted(self.reciters, key=lambda reciter: reciter.created_at)]
+
+        # Act
+        pages = self._crawl(Reciter.objects.order_by("-is_active", "created_at"), page_size=3)
+
+        # Assert
+        self.assertEqual([reciter_id for page in pages for reciter_id in page], expected)
+
+    def test_paginate_queryset_where_with_count_should_return_total_only_when_requested(self):
+        # Arrange
+        queryset = Reciter.objects.order_by("name")
+
+        # Act
+        counted = self.paginator.paginate_queryset(queryset, CursorPagination.Input(page_size=2, with_count=True))
+        uncounted = self.paginator.paginate_queryset(queryset, CursorPagination.Input(page_size=2))
+
+        # Assert
+        self.assertEqual(counted["count"], 5)
+        self.assertIsNone(uncounted["count"])
+
+    def test_paginate_queryset_where_cursor_is_tampered_should_raise_invalid_cursor(self):
+        # Arrange
+        cursor = self.paginator.paginate_queryset(
+            Reciter.objects.order_by("name"), CursorPagination.Input(page_size=2)
+        )["next"]
+
+        # Act / Assert
+        with self.assertRaises(ItqanError) as ctx:
+            self.paginator.paginate_queryset(
+                Reciter.objects.order_by("name"), CursorPagination.Input(page_size=2, cursor=cursor[:-1] + "x")
+            )
+        self.assertEqual(ctx.exception.error_name, "invalid_cursor")
+
+    def test_paginate_queryset_where_ordering_changed_since_cursor_should_raise_invalid_cursor(self):
+        # Arrange
+        cursor = self.paginator.paginate_queryset(
+            Reciter.objects.order_by("name"), CursorPagination.Input(page_size=2)
+        )["next"]
+
+        # Act / Assert
+        with self.assertRaises(ItqanError) as ctx:
+            self.paginator.paginate_queryset(
+                Reciter.objects.order_by("-name"), CursorPagination.Input(page_size=2, cursor=cursor)
+            )
+        self.assertEqual(ctx.exception.error_name, "invalid_cursor")
+
+    def test_apaginate_queryset_where_async_should_return_same_page_as_sync(self):
+        # Arrange
+        queryset = Reciter.objects.order_by("name")
+        pagination = CursorPagination.Input(page_size=2)
+
+        # Act
+        page = async_to_sync(self.paginator.apaginate_queryset)(queryset, pagination)
+
+        # Assert
+        self.assertEqual(page, self.paginator.paginate_queryset(queryset, pagination))
@@ -0,0 +1,75 @@
+from django.db.models import Q
+from django.utils import translation
+from model_bakery import baker
+from ninja import Schema
+
+from apps.content.api.public.recitation_list import RECITATION_LIST_PROJECTION, RecitationListOut
+from apps.content.models import Asset, CategoryChoice, Qiraah, RecitationFolder, Reciter, Riwayah, StatusChoice
+from apps.content.repositories.recitation import RecitationRepository
+from apps.core.ninja_utils.projection import ProjectedRow, Projection
+from apps.core.tests.base import BaseTestCase
+from apps.publishers.models import Publisher
+
+
+class ProjectionTest(BaseTestCase):
+    def setUp(self) -> None:
+        publisher = baker.make(Publisher, name_en="Publisher", name_ar="الناشر")
+        qiraah = baker.make(Qiraah, name_en="Asim", name_ar="عاصم", bio_en="Kufa", bio_ar="")
+        riwayah = baker.make(Riwayah, name_en="Hafs", name_ar="حفص", qiraah=qiraah)
+        for name, riwayah_for_asset in [("First", riwayah), ("Second", None)]:
+            asset = baker.make(
+                Asset,
+                category=CategoryChoice.RECITATION,
+                status=StatusChoice.READY,
+                publisher=publisher,
+                # An empty Arabic name falls back to English, as the descriptor would.
+                reciter=baker.make(Reciter, name_en=f"{name} Reciter", name_ar="" if name == "First" else "قارئ"),
+                riwayah=riwayah_for_asset,
+                qiraah=qiraah,
+                name_en=name,
+                name_ar=f"{name} ar",
+            )
+            RecitationFolder.objects.create(asset=asset, name="Zeta", slug="zeta", is_default=False)
+            RecitationFolder.objects.create(asset=asset, name="Alpha", slug="alpha", is_default=False)
+        self.queryset = RecitationRepository().list_recitations_qs(Q(), {}).order_by("id")
+
+    def test_apply_where_rows_projected_should_serialize_like_model_instances(self):
+        for language in ["en", "ar"]:
+            with self.subTest(language=language), translation.override(language):
+                # Arrange
+                expected = [RecitationListOut.from_orm(asset).model_dump() for asset in self.queryset]
+
+                # Act
+                rows = list(RECITATION_LIST_PROJECTION.apply(self.queryset))
+
+                # Assert
+                self.assertEqual(expected, [RecitationListOut.model_validate(row).model_dump() for row in rows])
+                self.assertTrue(all(isinstance(row, ProjectedRow) for row in rows))
+
+    def test_apply_where_page_sliced_should_read_related_lists_in_one_query(self):
+        # Arrange
+        projected = RECITATION_LIST_PROJECTION.apply(self.queryset)
+
+        # Act
+        with self.assertNumQueries(2):
+            rows = list(projected[:2])
+
+        # Assert
+        self.assertEqual(["default", "alpha", "zeta"], [folder["slug"] for folder in rows[0]["folders"]])
+        self.assertIsNone(rows[1]["riwayah"])
+        self.assertEqual(
+            ("الناشر", rows[0]["publisher_id"]), (rows[0]["publisher"]["name_ar"], rows[0]["publisher"]["id"])
+        )
+
+    def test_projection_where_schema_has_resolvers_but_is_not_projectable_should_raise_type_error(self):
+        # Arrange
+        class NamedOut(Schema):
+            name: str
+
+            @staticmethod
+            def resolve_name(obj):
+                return obj.name.upper()
+
+        # Act / Assert
+        with self.assertRaises(TypeError):
+            Projection(NamedOut, Asset)
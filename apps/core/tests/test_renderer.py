@@ -0,0 +1,70 @@
+import datetime
+from decimal import Decimal
+import json
+
+from django.test import SimpleTestCase
+from django.utils import translation
+from django.utils.translation import gettext_lazy as _
+from ninja import Schema
+from ninja.responses import NinjaJSONEncoder
+
+from apps.core.ninja_utils.renderer import dumps, loads
+
+
+class _PublisherOut(Schema):
+    id: int
+    name: str
+
+
+def _payload() -> dict:
+    return {
+        "updated_at": datetime.datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=datetime.UTC),
+        "published_on": datetime.date(2025, 3, 1),
+        "rating": Decimal("4.75"),
+        "label": _("Recitation"),
+        "publisher": _PublisherOut(id=1, name="دار النشر"),
+        "ids": {1: "one"},
+    }
+
+
+class RendererTest(SimpleTestCase):
+    def test_dumps_where_payload_has_non_native_types_should_encode_like_ninja_json_renderer(self):
+        # Arrange
+        data = _payload()
+
+        # Act
+        with translation.override("ar"):
+            body = dumps(data)
+            expected = json.loads(json.dumps(data, cls=NinjaJSONEncoder))
+
+        # Assert
+        self.assertEqual(expected, json.loads(body))
+        self.assertEqual("2025-03-01T12:30:15.123Z", json.loads(body)["updated_at"])
+        self.assertEqual("4.75", json.loads(body)["rating"])
+
+    def test_dumps_where_int_beyond_64_bits_should_write_it_in_full(self):
+        # Arrange
+        data = {"name": "دار النشر", "size": 2**70}
+
+        # Act
+        body = dumps(data)
+
+        # Assert
+        self.assertEqual('{"name":"دار النشر","size":1180591620717411303424}'.encode(), body)
+
+    def test_dumps_where_float_is_nan_or_infinite_should_write_null(self):
+        # Act
+        body = dumps({"nan": float("nan"), "inf": float("inf")})
+
+        # Assert
+        self.assertEqual(b'{"nan":null,"inf":null}', body)
+
+    def test_loads_where_body_malformed_should_raise_json_decode_error(self):
+        # Arrange
+        body = b"{'single': 'quotes'}"
+
+        # Act / Assert
+        with self.assertRaises(json.JSONDecodeError):
+            loads(body)
+        with self.assertRaises(json.JSONDecodeError):
+            loads(b'{"score": NaN}')
@@ -0,0 +1,27 @@
+from django.test import SimpleTestCase
+
+from apps.core.search import build_search_document, normalize_search_text
+
+
+class NormalizeSearchTextTest(SimpleTestCase):
+    def test_strips_tashkeel_and_tatweel(self):
+        self.assertEqual("بسم الله الرحمن الرحيم", normalize_search_text("بِسْمِ ٱللَّهِ ٱلرَّحْمَٰنِ ٱلرَّحِيمِ"))
+        self.assertEqual("محمد", normalize_search_text("مـحـمـد"))
+
+    def test_folds_alef_ta_marbuta_and_alef_maqsura(self):
+        self.assertEqual("احمد", normalize_search_text("أحمد"))
+        self.assertEqual("اسلام", normalize_search_text("إسلام"))
+        self.assertEqual("مكتبه", normalize_search_text("مكتبة"))
+        self.assertEqual("مصطفي", normalize_search_text("مصطفى"))
+
+    def test_lowercases_latin_and_maps_presentation_forms(self):
+        self.assertEqual("saad الله", normalize_search_text("Saad ﷲ"))
+
+    def test_empty_and_none(self):
+        self.assertEqual("", normalize_search_text(""))
+        self.assertEqual("", normalize_search_text(None))
+
+
+class BuildSearchDocumentTest(SimpleTestCase):
+    def test_joins_normalized_values_and_skips_empty_ones(self):
+        self.assertEqual("hafs\nحفص", build_search_document(["Hafs", None, "", "حَفْص"]))
@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock, patch
+
+from model_bakery import baker
+
+from apps.content.models import Reciter
+from apps.core.ninja_utils import searching_postgres
+from apps.core.ninja_utils.searching import Searching
+from apps.core.ninja_utils.searching_postgres import PostgresSearching
+from apps.core.tests.base import BaseTestCase
+
+
+def _postgres_connections() -> MagicMock:
+    connections = MagicMock()
+    connections.__getitem__.return_value.vendor = "postgresql"
+    return connections
+
+
+class PostgresSearchingTest(BaseTestCase):
+    def setUp(self) -> None:
+        self.saad = baker.make(Reciter, name_en="Saad Al-Ghamidi", name_ar="سعد الغامِدي", slug="saad")
+        self.other = baker.make(Reciter, name_en="Mishary", name_ar="مشاري", slug="mishary")
+
+    def _search(self, searcher: PostgresSearching, value: str):
+        return searcher.searching_queryset(Reciter.objects.order_by("name"), Searching.Input(search=value))
+
+    def test_searching_queryset_where_database_is_not_postgres_should_match_document_without_ranking(self):
+        # Arrange
+        searcher = PostgresSearching(search_fields=["name_en", "name_ar", "slug"])
+
+        # Act
+        results = self._search(searcher, "GHAMIDI")
+
+        # Assert
+        self.assertEqual(list(results), [self.saad])
+        self.assertIn('"search_document" LIKE', str(results.query))
+        self.assertNotIn("search_rank", results.query.annotations)
+
+    def test_searching_queryset_where_arabic_differs_in_tashkeel_and_letter_forms_should_match(self):
+        # Arrange
+        searcher = PostgresSearching(search_fields=["name_en", "name_ar", "slug"])
+
+        # Act
+        results = self._search(searcher, "سَعْد الغامدى")
+
+        # Assert
+        self.assertEqual(list(results), [self.saad])
+
+    def test_searching_queryset_where_postgres_should_match_terms_in_document_and_rank(self):
+        # Arrange
+        searcher = PostgresSearching(search_fields=["name", "name_en", "name_ar", "slug"])
+
+        # Act
+        with patch.object(searching_postgres, "connections", _postgres_connections()):
+            results = self._search(searcher, "Saad ghamidi")
+
+        # Assert
+        sql = str(results.query)
+        self.assertIn('"search_document" LIKE %saad%', sql)
+        self.assertIn('"search_document" LIKE %ghamidi%', sql)
+        self.assertEqual(results.query.order_by, ("-search_rank", "name_en"))
+
+    def test_searching_queryset_where_field_is_not_in_document_should_fall_back_to_field_lookups(self):
+        # Arrange
+        searcher = PostgresSearching(search_fields=["name_en", "bio"])
+
+        # Act
+        with patch.object(searching_postgres, "connections", _postgres_connections()):
+            results = self._search(searcher, "saad")
+
+        # Assert
+        self.assertNotIn("search_rank", results.query.annotations)
+
+    def test_searching_queryset_where_fields_are_a_subset_of_document_should_fall_back_to_field_lookups(self):
+        # Arrange - the slug is in the document but not searched, so it must not match
+        baker.make(Reciter, name_en="Yasser", name_ar="ياسر", slug="dossari")
+        searcher = PostgresSearching(search_fields=["name_en", "name_ar"])
+
+        # Act
+        with patch.object(searching_postgres, "connections", _postgres_connections()):
+            results = self._search(searcher, "dossari")
+
+        # Assert
+        self.assertNotIn("search_rank", results.query.annotations)
+        self.assertEqual(list(results), [])
+
+    def test_searching_queryset_where_field_has_lookup_prefix_should_fall_back_to_field_lookups(self):
+        # Arrange
+        searcher = PostgresSearching(search_fields=["^slug"])
+
+        # Act
+        with patch.object(searching_postgres, "connections", _postgres_connections()):
+            results = self._search(searcher, "saad")
+
+        # Assert
+        self.assertNotIn("search_rank", results.query.annotations)
+        self.assertEqual(list(results), [self.saad])
@@ -1,18 +1,32 @@
+import copy
 import functools
 from typing import TYPE_CHECKING, Protocol
 
-from django.core.cache import cache
 from django.db.models import Q
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.utils.translation import gettext as _
 from rest_framework import status
 
+from apps.core.local_cache import LocalCache
 from apps.publishers.models import Domain, Publisher, PublisherMember
 
 if TYPE_CHECKING:
     from apps.core.ninja_utils.request import Request
 
 
+TENANT_CACHE_TTL = 60 * 5  # 5 minutes
+# Resolved on every tenant/portal request; kept in-process in front of Redis.
+tenant_cache = LocalCache("tenant", ttl=60)
+
+
+def tenant_domain_cache_key(host: str) -> str:
+    return f"tenant_domain:{host}"
+
+
+def tenant_publisher_cache_key(publisher_id: int | str) -> str:
+    return f"tenant_publisher:{publisher_id}"
+
+
 class PublisherMiddleware:
     def __init__(self, get_response) -> None:
         self.get_response = get_response
@@ -70,11 +84,12 @@ def get_portal_publisher(request: HttpRequest) -> Publisher | None:
     if not value:
         return None
     if value.isdigit():
-        result = cache.get(f"x_tenant_id-{value}")
-        if result is None:
-            result = Publisher.objects.filter(id=int(value)).first()
-            cache.set(f"x_tenant_id-{value}", result, timeout=60 * 5)
-        return result
+        publisher = tenant_cache.get_or_fetch(
+            tenant_publisher_cache_key(value),
+            lambda: Publisher.objects.filter(id=int(value)).first(),
+            timeout=TENANT_CACHE_TTL,
+        )
+        return _request_copy(publisher)
     domain = get_publisher_domain(request, "X-Tenant")
     return domain.publisher if domain else None
 
@@ -91,14 +106,33 @@ def get_publisher_domain(request: HttpRequest, header_name: str) -> Domain | Non
 
     host: str = remove_www(referer.split(":")[0])
     if host:
-        result = cache.get(f"x_tenant-{host}")
-        if not result:
-            result = Domain.objects.filter(domain=host).select_related("publisher").first()
-            cache.set(f"x_tenant-{host}", result, timeout=60 * 5)
-        return result
+        # Unknown hosts are cached too: browsers send an Origin on every request.
+        domain = tenant_cache.get_or_fetch(
+            tenant_domain_cache_key(host),
+            lambda: Domain.objects.filter(domain=host).select_related("publisher").first(),
+            timeout=TENANT_CACHE_TTL,
+        )
+        return _request_copy(domain)
     return None
 
 
+def _request_copy[T: (Domain, Publisher)](instance: T | None) -> T | None:
+    """
+    A copy of a cached tenant instance that belongs to one request.
+
+    The L1 cache hands the same instance to every request and thread of the process,
+    so an attribute set on it (an annotation, ``refresh_from_db``, a related-object
+    cache) would leak into other requests. A shallow copy gets its own field values
+    and relation cache; a domain's cached publisher is copied along with it.
+    """
+    if instance is None:
+        return None
+    copied = copy.copy(instance)
+    if isinstance(instance, Domain) and Domain.publisher.is_cached(instance):
+        copied.publisher = copy.copy(instance.publisher)
+    return copied
+
+
 class PublisherQ(Protocol):
     """Protocol for publisher_q to be used in type hinting, for the Request Object."""
 
@@ -1,11 +1,25 @@
-from django.core.cache import cache
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from apps.publishers.models import Domain
+from apps.publishers.middlewares.publisher_middleware import (
+    tenant_cache,
+    tenant_domain_cache_key,
+    tenant_publisher_cache_key,
+)
+from apps.publishers.models import Domain, Publisher
 
 
 @receiver(post_save, sender=Domain)
 @receiver(post_delete, sender=Domain)
 def clear_domain_cache(sender: type[Domain], instance: Domain, **kwargs: object) -> None:
-    cache.delete(f"x_tenant-{instance.domain}")
+    tenant_cache.invalidate([tenant_domain_cache_key(instance.domain)])
+
+
+@receiver(post_save, sender=Publisher)
+@receiver(post_delete, sender=Publisher)
+def clear_publisher_cache(sender: type[Publisher], instance: Publisher, **kwargs: object) -> None:
+    # Cached domains carry their publisher, so they go stale with it.
+    hosts = list(Domain.objects.filter(publisher_id=instance.pk).values_list("domain", flat=True))
+    tenant_cache.invalidate(
+        [tenant_publisher_cache_key(instance.pk), *(tenant_domain_cache_key(host) for host in hosts)]
+    )
@@ -1,9 +1,17 @@
+from unittest.mock import patch
+
 from django.db.models import Q
+from django.test import RequestFactory
 from model_bakery import baker
 
 from apps.core.permissions import PermissionChoice
 from apps.core.tests.base import BaseTestCase
-from apps.publishers.middlewares.publisher_middleware import portal_publisher_q
+from apps.publishers.middlewares.publisher_middleware import (
+    get_portal_publisher,
+    get_publisher_domain,
+    portal_publisher_q,
+    tenant_cache,
+)
 from apps.publishers.models import Domain, Publisher, PublisherMember
 from apps.publishers.tests.group_helpers import admin_group, member_group
 from apps.users.models import User
@@ -272,3 +280,44 @@ class XTenantHeaderScopingTest(BaseTestCase):
         # Assert
         self.assertEqual(200, response.status_code, response.content)
         self.assertEqual(3, response.json()["count"])
+
+
+class TenantCacheTest(BaseTestCase):
+    def setUp(self) -> None:
+        enabled = patch.object(tenant_cache, "_enabled", True)
+        enabled.start()
+        self.addCleanup(enabled.stop)
+        self.addCleanup(tenant_cache.clear)
+
+    def test_get_publisher_domain_where_served_from_l1_should_give_each_request_its_own_instances(self):
+        # Arrange
+        publisher = baker.make(Publisher, slug="l1-pub")
+        baker.make(Domain, domain="l1.example.com", publisher=publisher)
+        request = RequestFactory().get("/", HTTP_ORIGIN="https://l1.example.com")
+        first = get_publisher_domain(request, "Origin")
+        first.publisher.assets_count = 7
+
+        # Act
+        with self.assertNumQueries(0):
+            second = get_publisher_domain(request, "Origin")
+
+        # Assert
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.publisher, second.publisher)
+        self.assertFalse(hasattr(second.publisher, "assets_count"))
+        self.assertEqual(publisher.id, second.publisher.id)
+
+    def test_get_portal_publisher_where_served_from_l1_should_give_each_request_its_own_instance(self):
+        # Arrange
+        publisher = baker.make(Publisher, slug="l1-portal-pub")
+        request = RequestFactory().get("/portal/", HTTP_X_TENANT=str(publisher.id))
+        first = get_portal_publisher(request)
+        first.name = "Changed by one request"
+
+        # Act
+        with self.assertNumQueries(0):
+            second = get_portal_publisher(request)
+
+        # Assert
+        self.assertIsNot(first, second)
+        self.assertEqual(publisher.name, second.name)
@@ -5,6 +5,7 @@ from ninja import Schema
 from apps.core.ninja_utils.errors import NinjaErrorResponse
 from apps.core.ninja_utils.request import Request
 from apps.core.ninja_utils.router import ItqanRouter
+from apps.core.ninja_utils.searching_base import searching
 from apps.core.ninja_utils.tags import NinjaTag
 from apps.quran.repositories.quran import QuranRepository
 from apps.quran.services.quran import QuranService
@@ -33,8 +34,13 @@ class AyahOut(Schema):
     "suras/{int:sura_id}/ayahs/",
     response={200: list[AyahOut], 404: NinjaErrorResponse[Literal["sura_not_found"]]},
 )
+@searching(search_fields=["text"])
 def list_ayahs(request: Request, sura_id: int):
-    """List all ayahs of a sura (with their words), ordered within the sura."""
+    """
+    List all ayahs of a sura (with their words), ordered within the sura.
+
+    `?search=` matches the text ignoring tashkeel and alef/ta marbuta/alef maqsura forms.
+    """
     service = QuranService(QuranRepository())
     return service.list_ayahs_for_sura(sura_id)
 
@@ -6,6 +6,7 @@ from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
+from apps.core.search import build_search_document
 from apps.quran.models import Ayah, Sura, Word
 
 SURAS_FILE = "quran-suras-list.xlsx - Sheet1.csv"
@@ -79,6 +80,7 @@ class Command(BaseCommand):
                 sura_id=int(row["sura_id"]),
                 number_in_sura=int(row["index"]),
                 text=row["text"],
+                search_document=build_search_document([row["text"]]),
                 juz=int(row["juz"]),
                 hizb_quarter=int(row["quarter"]),
                 page=int(row["page"]),
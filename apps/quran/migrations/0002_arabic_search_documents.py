@@ -0,0 +1,50 @@
+# Generated by Django 5.2.14 on 2026-10-17 08:08
+
+import re
+import unicodedata
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+from apps.core.migration_operations import PostgresAddIndex
+
+# Mirrors apps.core.search.normalize_search_text — copied rather than imported so
+# this migration keeps working if it later changes.
+ARABIC_MARKS = re.compile("[\u0610-\u061a\u0640\u064b-\u065f\u0670\u06d6-\u06ed\u08d3-\u08ff]")
+ARABIC_LETTER_FOLDS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ة": "ه", "ى": "ي"})
+
+
+def _normalize(value):
+    value = unicodedata.normalize("NFKC", value.replace("\x00", "")).lower()
+    return ARABIC_MARKS.sub("", value).translate(ARABIC_LETTER_FOLDS)
+
+
+def backfill_search_documents(apps, schema_editor):
+    Ayah = apps.get_model("quran", "Ayah")
+    rows = Ayah.objects.values_list("pk", "text").iterator(chunk_size=500)
+    documents = [Ayah(pk=pk, search_document=_normalize(text)) for pk, text in rows]
+    Ayah.objects.bulk_update(documents, ["search_document"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quran", "0001_initial"),
+        # Creates the pg_trgm extension the index's opclass comes from.
+        ("content", "0052_search_documents"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ayah",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+        PostgresAddIndex(
+            model_name="ayah",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"], name="quran_ayah_search_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
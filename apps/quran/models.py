@@ -1,6 +1,8 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 from apps.core.models import BaseModel
+from apps.core.search import build_search_document
 
 
 class RevelationType(models.TextChoices):
@@ -54,6 +56,10 @@ class Ayah(BaseModel):
     hizb_quarter = models.PositiveSmallIntegerField(help_text="Hizb quarter number this ayah belongs to")
     page = models.PositiveSmallIntegerField(help_text="Mushaf page number this ayah appears on")
 
+    # Set on save and by import_quran (bulk_create skips save); searched by PostgresSearching.
+    SEARCH_DOCUMENT_SOURCES = ("text",)
+    search_document = models.TextField(blank=True, default="", editable=False)
+
     class Meta:
         ordering = ["id"]
         constraints = [
@@ -62,8 +68,13 @@ class Ayah(BaseModel):
         indexes = [
             models.Index(fields=["sura", "number_in_sura"]),
             models.Index(fields=["page"]),
+            GinIndex(fields=["search_document"], name="quran_ayah_search_trgm", opclasses=["gin_trgm_ops"]),
         ]
 
+    def save(self, *args, **kwargs):
+        self.search_document = build_search_document([self.text])
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Ayah({self.sura_id}:{self.number_in_sura})"
 
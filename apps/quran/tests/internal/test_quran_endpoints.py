@@ -58,6 +58,18 @@ class QuranEndpointsTest(BaseTestCase):
         self.assertEqual(body["number_in_sura"], 1)
         self.assertEqual([w["text"] for w in body["words"]], ["بِسْمِ", "اللَّهِ"])
 
+    def test_list_ayahs_where_search_has_no_tashkeel_should_match_uthmani_text(self):
+        # Arrange
+        user = baker.make(User, email="reader@example.com", is_active=True)
+        self.authenticate_user(user)
+
+        # Act
+        response = self.client.get("/cms-api/suras/1/ayahs/", {"search": "الحمد"})
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([ayah["id"] for ayah in response.json()], [2])
+
     def test_get_sura_where_missing_should_return_404_sura_not_found(self):
         # Arrange
         user = baker.make(User, email="reader@example.com", is_active=True)
@@ -10,12 +10,16 @@ can enrich or override the event by calling :func:`track_extra` from inside the
 publisher is recorded per-served-object because the publisher of a served asset can only
 be known *after* the asset is fetched (it is a property of the Asset, not of the
 requesting user).
+
+Events are not pushed to Redis from the request: they go on :data:`usage_event_queue`,
+whose background flusher batches them into the tracking buffer.
 """
 
 from __future__ import annotations
 
 from collections.abc import Callable
 from functools import wraps
+import inspect
 import json
 import logging
 import time
@@ -23,8 +27,12 @@ from typing import Any
 from urllib.parse import parse_qs
 import uuid
 
+from asgiref.sync import sync_to_async
 from django.core.cache import cache
+from django.http import HttpResponseBase
 
+from apps.core.local_cache import LocalCache
+from apps.usage_tracking.services.event_queue import UsageEventQueue
 from apps.usage_tracking.tasks import TRACKING_BUFFER_KEY, _get_tracking_redis
 
 logger = logging.getLogger(__name__)
@@ -43,6 +51,7 @@ _KNOWN_FILTER_KEYS = ("reciter_id", "riwayah_id", "qiraah_id")
 # also resolve a human-readable name and cache it to keep this off the hot path.
 _RECITER_NAME_CACHE_KEY = "usage_tracking:reciter_name:{id}"
 _RECITER_NAME_CACHE_TTL = 60 * 60  # 1 hour
+_reciter_name_cache = LocalCache("usage_tracking_reciter_name", ttl=60 * 5)
 
 
 def track_extra(request, **props: Any) -> None:
@@ -90,10 +99,30 @@ def track_usage(
 
     Entity ids/names are extracted from the served objects (``id`` and ``name``). The
     view may override any of these via :func:`track_extra`. On a raised exception the
-    error propagates and **no** event is dispatched.
+    error propagates and **no** event is dispatched. Async views are supported: the
+    dispatch then runs in a thread, off the event loop.
     """
 
+    dispatch_options = {"event": event, "entity_type": entity_type, "publisher_from": publisher_from}
+
     def wrapper(view: Callable) -> Callable:
+        if inspect.iscoroutinefunction(view):
+
+            @wraps(view)
+            async def atracked(request, *args: Any, **kwargs: Any) -> Any:
+                setattr(request, _EXTRA_ATTR, {})
+                start = time.monotonic()
+                result = await view(request, *args, **kwargs)
+                latency_ms = int((time.monotonic() - start) * 1000)
+                try:
+                    # Served objects may still load relations (publisher) from the DB.
+                    await sync_to_async(_dispatch)(request, result, latency_ms=latency_ms, **dispatch_options)
+                except Exception:
+                    logger.exception("usage_tracking decorator dispatch failed")
+                return result
+
+            return atracked
+
         @wraps(view)
         def tracked(request, *args: Any, **kwargs: Any) -> Any:
             setattr(request, _EXTRA_ATTR, {})
@@ -101,14 +130,7 @@ def track_usage(
             result = view(request, *args, **kwargs)
             latency_ms = int((time.monotonic() - start) * 1000)
             try:
-                _dispatch(
-                    request,
-                    result,
-                    event=event,
-                    entity_type=entity_type,
-                    publisher_from=publisher_from,
-                    latency_ms=latency_ms,
-                )
+                _dispatch(request, result, latency_ms=latency_ms, **dispatch_options)
             except Exception:
                 logger.exception("usage_tracking decorator dispatch failed")
             return result
@@ -129,6 +151,9 @@ def _served_objects(result: Any) -> list:
     Handles paginated ``{"results": [...]}`` dicts, raw lists/querysets, and single
     objects. The slice is one page, so materializing it here is cheap.
     """
+    if isinstance(result, HttpResponseBase):
+        # Pre-rendered bodies (and 304s) carry no objects; such views use track_extra.
+        return []
     if isinstance(result, dict):
         page = result.get(_PAGINATION_KEY)
         return list(page) if page is not None else []
@@ -143,15 +168,22 @@ def _served_objects(result: Any) -> list:
         return [result]
 
 
+def _value(obj: Any, name: str) -> Any:
+    # Projected list pages serve dicts (see apps/core/ninja_utils/projection.py).
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
 def _extract_entities(objects: list) -> tuple[list, list]:
     ids: list = []
     names: list = []
     for obj in objects[:MAX_ENTITY_IDS]:
-        obj_id = getattr(obj, "id", None)
+        obj_id = _value(obj, "id")
         if obj_id is None:
             continue
         ids.append(obj_id)
-        names.append(getattr(obj, "name_ar", "") or "")
+        names.append(_value(obj, "name_ar") or "")
     return ids, names
 
 
@@ -160,13 +192,13 @@ def _extract_publishers(objects: list, publisher_from: str) -> tuple[list, list]
     names: list = []
     seen: set = set()
     for obj in objects:
-        pub_id = getattr(obj, f"{publisher_from}_id", None)
+        pub_id = _value(obj, f"{publisher_from}_id")
         if pub_id is None or pub_id in seen:
             continue
         seen.add(pub_id)
         ids.append(pub_id)
-        publisher = getattr(obj, publisher_from, None)
-        names.append(getattr(publisher, "name_ar", "") or "" if publisher is not None else "")
+        publisher = _value(obj, publisher_from)
+        names.append(_value(publisher, "name_ar") or "" if publisher is not None else "")
     return ids, names
 
 
@@ -179,6 +211,9 @@ def _dispatch(
     publisher_from: str | None,
     latency_ms: int,
 ) -> None:
+    if _get_tracking_redis() is None:
+        return  # no Redis available (e.g. dev/LocMemCache); tracking disabled
+
     application_id, application_name = _resolve_application(request)
     query_string = request.META.get("QUERY_STRING") or None
 
@@ -195,7 +230,7 @@ def _dispatch(
         "method": request.method,
         "path": request.path,
         "endpoint": f"{request.method} {request.path}",
-        "status_code": 200,
+        "status_code": result.status_code if isinstance(result, HttpResponseBase) else 200,
         "latency_ms": latency_ms,
         "application_id": application_id,
         "application_name": application_name,
@@ -212,35 +247,53 @@ def _dispatch(
         **(getattr(request, _EXTRA_ATTR, {}) or {}),
     }
 
-    # The reciter_id filter is opaque; add human-readable names (cached) for Mixpanel.
-    # reciter_id is a repeatable list filter (?reciter_id=1&reciter_id=2), so resolve a
-    # name for every id passed. filter_reciter_name (first id) is kept for back-compat.
-    reciter_ids = _parsed_reciter_ids(query_string or "")
-    if reciter_ids:
-        names = _resolve_reciter_names(reciter_ids)
-        properties["filter_reciter_names"] = names
-        properties["filter_reciter_name"] = names[0]
-
     ip = _client_ip(request)
     if ip:
         # Mixpanel resolves geo from $ip on ingest and does not store the raw IP.
         properties["$ip"] = ip
 
-    payload = json.dumps(
+    usage_event_queue.put(
         {
             "distinct_id": _distinct_id(request),
             "event": event,
             "properties": properties,
             "meta": {},
+            # Resolved to names on the flusher thread, one lookup per batch.
+            "reciter_ids": _parsed_reciter_ids(query_string or ""),
         }
     )
-    redis_client = _get_tracking_redis()
-    if redis_client is None:
-        return  # no Redis available (e.g. dev/LocMemCache); tracking disabled
-    try:
-        redis_client.rpush(TRACKING_BUFFER_KEY, payload)
-    except Exception:
-        logger.exception("usage_tracking: failed to push event to Redis buffer")
+
+
+def _serialize_events(events: list[dict[str, Any]]) -> list[str]:
+    """Encode a drained batch for the tracking buffer; runs on the queue's flusher thread."""
+    # The reciter_id filter is opaque; add human-readable names (cached) for Mixpanel.
+    # reciter_id is a repeatable list filter (?reciter_id=1&reciter_id=2), so resolve a
+    # name for every id passed. filter_reciter_name (first id) is kept for back-compat.
+    reciter_ids = list(dict.fromkeys(reciter_id for event in events for reciter_id in event["reciter_ids"]))
+    reciter_names = dict(zip(reciter_ids, _resolve_reciter_names(reciter_ids), strict=True)) if reciter_ids else {}
+
+    payloads: list[str] = []
+    for event in events:
+        ids = event.pop("reciter_ids")
+        if ids:
+            names = [reciter_names[reciter_id] for reciter_id in ids]
+            event["properties"]["filter_reciter_names"] = names
+            event["properties"]["filter_reciter_name"] = names[0]
+        try:
+            payloads.append(json.dumps(event))
+        except (TypeError, ValueError):
+            logger.exception("usage_tracking: dropping event that is not JSON-serializable")
+    return payloads
+
+
+# Requests only append to this; a background thread pushes batches to the Redis buffer
+# that flush_tracking_buffer_task drains. The lambda keeps _get_tracking_redis patchable.
+usage_event_queue = UsageEventQueue(
+    "usage_tracking",
+    key=TRACKING_BUFFER_KEY,
+    serialize=_serialize_events,
+    get_redis=lambda: _get_tracking_redis(),
+)
 
 
 def _parsed_reciter_ids(query_string: str) -> list[int]:
@@ -286,10 +339,11 @@ def _resolve_reciter_names(reciter_ids: list[int]) -> list[str | None]:
     fetching only the misses in a single query. A missing reciter resolves to ``None``."""
     names: dict[int, str | None] = {}
     misses: list[int] = []
-    for reciter_id in reciter_ids:
-        cached = cache.get(_RECITER_NAME_CACHE_KEY.format(id=reciter_id))
-        if cached is not None:
-            names[reciter_id] = cached or None
+    keys = {reciter_id: _RECITER_NAME_CACHE_KEY.format(id=reciter_id) for reciter_id in reciter_ids}
+    cached = _reciter_name_cache.get_many(list(keys.values()))
+    for reciter_id, key in keys.items():
+        if key in cached:
+            names[reciter_id] = cached[key] or None
         else:
             misses.append(reciter_id)
 
@@ -302,7 +356,8 @@ def _resolve_reciter_names(reciter_ids: list[int]) -> list[str | None]:
         }
         for reciter_id in misses:
             name = fetched.get(reciter_id, "")
-            cache.set(_RECITER_NAME_CACHE_KEY.format(id=reciter_id), name, _RECITER_NAME_CACHE_TTL)
+            cache.set(keys[reciter_id], name, _RECITER_NAME_CACHE_TTL)
+            _reciter_name_cache.set(keys[reciter_id], name)
             names[reciter_id] = name or None
 
     return [names[reciter_id] for reciter_id in reciter_ids]
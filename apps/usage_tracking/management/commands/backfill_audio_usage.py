@@ -0,0 +1,63 @@
+"""
+Replay Cloudflare audio usage into Mixpanel for a historical range:
+
+    python manage.py backfill_audio_usage --start 2026-09-01 --end 2026-10-01
+
+The range is covered with the same aligned windows the periodic sync uses, so the
+events' `$insert_id`s match and windows that were already imported dedup on
+Mixpanel's side. Rerunning a range, or resuming after a failure, is safe. Only
+elapsed windows are replayed; Cloudflare's analytics retention bounds how far back
+data exists.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.usage_tracking.services.audio_usage_sync import (
+    cloudflare_configured,
+    compute_time_window,
+    iter_windows,
+    sync_audio_usage_window,
+)
+
+
+def _utc(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed.replace(tzinfo=UTC) if parsed.tzinfo is None else parsed.astimezone(UTC)
+
+
+class Command(BaseCommand):
+    help = "Import Cloudflare .mp3 usage to Mixpanel for [--start, --end), one aligned window at a time."
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--start", required=True, type=_utc, help="ISO date or datetime, UTC unless offset given")
+        parser.add_argument("--end", type=_utc, default=None, help="exclusive; defaults to the last elapsed window")
+        parser.add_argument("--window-hours", type=int, default=6)
+
+    def handle(self, *args: Any, start: datetime, end: datetime | None, window_hours: int, **kwargs: Any) -> None:
+        if not cloudflare_configured():
+            raise CommandError("CF_ZONE_ID, CF_API_TOKEN and CF_R2_CUSTOM_DOMAIN must be set")
+        try:
+            last_elapsed = compute_time_window(datetime.now(UTC), window_hours=window_hours).end
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        end = min(end or last_elapsed, last_elapsed)
+        if start >= end:
+            raise CommandError(f"Nothing to replay: --start must be before {end.isoformat()}")
+
+        total = 0
+        for window in iter_windows(start, end, window_hours=window_hours):
+            try:
+                imported = sync_audio_usage_window(window)
+            except Exception as exc:
+                raise CommandError(
+                    f"Window [{window.start.isoformat()}, {window.end.isoformat()}) failed: {exc}. "
+                    f"Resume with --start {window.start.isoformat()}"
+                ) from exc
+            total += imported
+            self.stdout.write(f"[{window.start.isoformat()}, {window.end.isoformat()}) imported={imported}")
+        self.stdout.write(self.style.SUCCESS(f"Imported {total} event(s)"))
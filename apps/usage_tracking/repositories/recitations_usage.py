@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import itertools
 
 from apps.content.models import Asset
 
+# Keeps each IN (...) list, and the rows fetched per query, bounded for large windows.
+_LOOKUP_BATCH_SIZE = 1000
+
 
 @dataclass(frozen=True, slots=True)
 class RecitationInfo:
@@ -20,28 +24,28 @@ class RecitationUsageRepository:
         if not asset_ids:
             return {}
 
-        rows = (
-            Asset.objects.filter(id__in=asset_ids)
-            .select_related("publisher", "reciter", "riwayah", "qiraah")
-            .values(
-                "id",
-                "name",
-                "publisher_id",
-                "publisher__name",
-                "reciter__name",
-                "riwayah__name",
-                "qiraah__name",
-            )
-        )
-
-        return {
-            row["id"]: RecitationInfo(
-                name=row["name"],
-                publisher_id=row["publisher_id"],
-                publisher_name=row["publisher__name"],
-                reciter=row["reciter__name"],
-                riwayah=row["riwayah__name"],
-                qiraah=row["qiraah__name"],
+        lookup: dict[int, RecitationInfo] = {}
+        for batch in itertools.batched(sorted(asset_ids), _LOOKUP_BATCH_SIZE, strict=False):
+            rows = (
+                Asset.objects.filter(id__in=batch)
+                .select_related("publisher", "reciter", "riwayah", "qiraah")
+                .values(
+                    "id",
+                    "name",
+                    "publisher_id",
+                    "publisher__name",
+                    "reciter__name",
+                    "riwayah__name",
+                    "qiraah__name",
+                )
             )
-            for row in rows
-        }
+            for row in rows:
+                lookup[row["id"]] = RecitationInfo(
+                    name=row["name"],
+                    publisher_id=row["publisher_id"],
+                    publisher_name=row["publisher__name"],
+                    reciter=row["reciter__name"],
+                    riwayah=row["riwayah__name"],
+                    qiraah=row["qiraah__name"],
+                )
+        return lookup
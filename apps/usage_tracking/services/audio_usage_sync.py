@@ -8,6 +8,8 @@ duplicate rows.
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 import logging
@@ -20,7 +22,7 @@ from django.utils.translation import gettext_lazy as _
 
 from apps.usage_tracking.repositories.recitations_usage import RecitationInfo, RecitationUsageRepository
 from apps.usage_tracking.services.cf_analytics_client import CFUsageRow, CloudflareAnalyticsClient
-from apps.usage_tracking.services.mixpanel_client import MixpanelIngestClient
+from apps.usage_tracking.services.mixpanel_client import MixpanelIngestClient, get_ingest_client
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +40,11 @@ _INSERT_ID_NAMESPACE = uuid.UUID("3f6f8e2a-9d1c-4b7e-8a2f-6c1d9e4b7a3f")
 # production recitation tracks are all mp3, matching the CF query's `pathLike="%.mp3"`.
 _AUDIO_PATH_RE = re.compile(r"(?:/media)?/uploads/assets/(?P<asset_id>\d+)/recitations/(?P<surah>\d+)\.mp3$")
 
+# A window whose CF result hits the query limit is bisected and re-queried, down to
+# this size; below it, rows past the limit are dropped (and logged).
+_MIN_SLICE = timedelta(minutes=5)
+_CF_MAX_CONCURRENT_QUERIES = 4
+
 # CF cache statuses that mean the edge served bytes without hitting the origin.
 _CACHE_HIT_STATUSES = {"hit", "stale", "revalidated", "expired", "updating"}
 
@@ -158,6 +165,29 @@ def _build_event_properties(
     }
 
 
+def parse_row_paths(rows: Iterable[CFUsageRow]) -> dict[str, ParsedAudioPath | None]:
+    """Parse each distinct request path once; the same path recurs across countries/devices/statuses."""
+    parsed_paths: dict[str, ParsedAudioPath | None] = {}
+    for row in rows:
+        path = row["dimensions"]["clientRequestPath"]
+        if path not in parsed_paths:
+            parsed_paths[path] = parse_audio_path(path)
+    return parsed_paths
+
+
+def iter_events(
+    rows: Iterable[CFUsageRow],
+    assets_lookup: dict[int, RecitationInfo],
+    window: SyncWindow,
+    parsed_paths: dict[str, ParsedAudioPath | None],
+) -> Iterator[dict[str, Any]]:
+    """Yield one Mixpanel import event per row, built only as the consumer asks for it."""
+    for row in rows:
+        parsed = parsed_paths[row["dimensions"]["clientRequestPath"]]
+        asset = assets_lookup.get(parsed.asset_id) if parsed else None
+        yield {"event": EVENT_NAME, "properties": _build_event_properties(row, asset, parsed, window)}
+
+
 def build_events(
     rows: list[CFUsageRow],
     assets_lookup: dict[int, RecitationInfo],
@@ -165,13 +195,7 @@ def build_events(
     window_end: datetime,
 ) -> list[dict[str, Any]]:
     window = SyncWindow(start=window_start, end=window_end)
-    events = []
-    for row in rows:
-        parsed = parse_audio_path(row["dimensions"]["clientRequestPath"])
-        asset = assets_lookup.get(parsed.asset_id) if parsed else None
-        properties = _build_event_properties(row, asset, parsed, window)
-        events.append({"event": EVENT_NAME, "properties": properties})
-    return events
+    return list(iter_events(rows, assets_lookup, window, parse_row_paths(rows)))
 
 
 def _build_cf_client() -> CloudflareAnalyticsClient:
@@ -179,12 +203,85 @@ def _build_cf_client() -> CloudflareAnalyticsClient:
 
 
 def _build_ingest_client() -> MixpanelIngestClient:
-    return MixpanelIngestClient(
-        token=settings.MIXPANEL_PROJECT_TOKEN,
-        ingest_host=settings.MIXPANEL_INGEST_HOST,
-        enabled=settings.MIXPANEL_ENABLED,
-        project_id=settings.MIXPANEL_PROJECT_ID,
-    )
+    return get_ingest_client()
+
+
+def iter_windows(start: datetime, end: datetime, window_hours: int = 6) -> Iterator[SyncWindow]:
+    """Yield the aligned `window_hours` windows covering `[start, end)`.
+
+    These are the windows the periodic sync uses, so a replay derives the same
+    `$insert_id`s and dedups against what was already imported.
+    """
+    # compute_time_window returns the window that ends at or before its `now`.
+    window = compute_time_window(start + timedelta(hours=window_hours), window_hours=window_hours)
+    step = timedelta(hours=window_hours)
+    while window.start < end:
+        yield window
+        window = SyncWindow(start=window.end, end=window.end + step)
+
+
+def merge_rows(rows: list[CFUsageRow]) -> list[CFUsageRow]:
+    """Sum rows that share dimensions, e.g. the same path/country/... from different sub-windows."""
+    merged: dict[tuple[str, str, str, int, str], CFUsageRow] = {}
+    for row in rows:
+        key = _dimensions_key(row)
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = {
+                "count": row["count"],
+                "dimensions": row["dimensions"],
+                "sum": {"edgeResponseBytes": row["sum"]["edgeResponseBytes"]},
+            }
+        else:
+            existing["count"] += row["count"]
+            existing["sum"]["edgeResponseBytes"] += row["sum"]["edgeResponseBytes"]
+    return list(merged.values())
+
+
+def fetch_window_rows(cf_client: CloudflareAnalyticsClient, hostname: str, window: SyncWindow) -> list[CFUsageRow]:
+    """Fetch every usage row for `window`, bisecting any sub-window whose result hit the query limit.
+
+    The sub-windows of each split level are queried in parallel, at most
+    `_CF_MAX_CONCURRENT_QUERIES` at once, and their rows are merged back into one
+    aggregate per dimensions key, so events stay per `window` whatever the slicing.
+    """
+    rows: list[CFUsageRow] = []
+    pending = [window]
+    with ThreadPoolExecutor(max_workers=_CF_MAX_CONCURRENT_QUERIES, thread_name_prefix="cf-analytics") as executor:
+        while pending:
+            results = executor.map(
+                lambda sub_window: cf_client.fetch_audio_usage(
+                    hostname=hostname, start=sub_window.start, end=sub_window.end
+                ),
+                pending,
+            )
+            split: list[SyncWindow] = []
+            for sub_window, result in zip(pending, results, strict=True):
+                if result.truncated and sub_window.end - sub_window.start >= 2 * _MIN_SLICE:
+                    split.extend(_bisect(sub_window))
+                    continue
+                if result.truncated:
+                    logger.warning(
+                        "sync_audio_usage: CF result hit the query limit for window %s-%s even at the minimum "
+                        "slice; rows beyond the limit are dropped",
+                        sub_window.start.isoformat(),
+                        sub_window.end.isoformat(),
+                    )
+                rows.extend(result.rows)
+            if split:
+                logger.info("sync_audio_usage: re-querying %d truncated window(s) in halves", len(split) // 2)
+            pending = split
+    return merge_rows(rows)
+
+
+def _bisect(window: SyncWindow) -> tuple[SyncWindow, SyncWindow]:
+    # Whole seconds: the CF query formats its bounds to the second.
+    middle = window.start + timedelta(seconds=(window.end - window.start).total_seconds() // 2)
+    return SyncWindow(start=window.start, end=middle), SyncWindow(start=middle, end=window.end)
+
+
+def cloudflare_configured() -> bool:
+    return bool(settings.CF_ZONE_ID and settings.CF_API_TOKEN and settings.CF_R2_CUSTOM_DOMAIN)
 
 
 def sync_audio_usage(window_hours: int = 6) -> int:
@@ -193,44 +290,42 @@ def sync_audio_usage(window_hours: int = 6) -> int:
         logger.info("sync_audio_usage: disabled via ENABLE_AUDIO_USAGE_SYNC; skipping")
         return 0
 
-    if not (settings.CF_ZONE_ID and settings.CF_API_TOKEN and settings.CF_R2_CUSTOM_DOMAIN):
+    if not cloudflare_configured():
         logger.warning(
             "sync_audio_usage: missing Cloudflare configuration (CF_ZONE_ID/CF_API_TOKEN/CF_R2_CUSTOM_DOMAIN); skipping"
         )
         return 0
 
-    window = compute_time_window(datetime.now(UTC), window_hours=window_hours)
+    return sync_audio_usage_window(compute_time_window(datetime.now(UTC), window_hours=window_hours))
+
+
+def sync_audio_usage_window(window: SyncWindow) -> int:
+    """Fetch `window` from CF and import it to Mixpanel, returning the records imported.
+
+    Safe to rerun over the same window: the events' `$insert_id`s dedup on `/import`.
+    """
     logger.info(
-        "sync_audio_usage: start window=[%s, %s) window_hours=%d host=%s zone=%s",
+        "sync_audio_usage: start window=[%s, %s) host=%s zone=%s",
         window.start.isoformat(),
         window.end.isoformat(),
-        window_hours,
         settings.CF_R2_CUSTOM_DOMAIN,
         settings.CF_ZONE_ID,
     )
 
     cf_client = _build_cf_client()
-    result = cf_client.fetch_audio_usage(hostname=settings.CF_R2_CUSTOM_DOMAIN, start=window.start, end=window.end)
+    rows = fetch_window_rows(cf_client, settings.CF_R2_CUSTOM_DOMAIN, window)
     logger.info(
         "sync_audio_usage: CF returned %d row(s) for window=[%s, %s)",
-        len(result.rows),
+        len(rows),
         window.start.isoformat(),
         window.end.isoformat(),
     )
-    if result.truncated:
-        logger.warning(
-            "sync_audio_usage: CF result hit the query limit for window %s-%s; window may need finer "
-            "slicing to avoid dropped rows",
-            window.start.isoformat(),
-            window.end.isoformat(),
-        )
-    if not result.rows:
+    if not rows:
         logger.info("sync_audio_usage: no rows to import; done")
         return 0
 
-    asset_ids = {
-        parsed.asset_id for row in result.rows if (parsed := parse_audio_path(row["dimensions"]["clientRequestPath"]))
-    }
+    parsed_paths = parse_row_paths(rows)
+    asset_ids = {parsed.asset_id for parsed in parsed_paths.values() if parsed}
     assets_lookup = load_assets_lookup(asset_ids)
     logger.info(
         "sync_audio_usage: parsed %d distinct asset_id(s); enriched %d from DB",
@@ -238,17 +333,14 @@ def sync_audio_usage(window_hours: int = 6) -> int:
         len(assets_lookup),
     )
 
-    events = build_events(result.rows, assets_lookup, window.start, window.end)
-    logger.info("sync_audio_usage: built %d Mixpanel event(s); importing", len(events))
-
+    # Events are built chunk by chunk as the client uploads them, never all at once.
     ingest_client = _build_ingest_client()
-    imported = ingest_client.import_events(events)
+    imported = ingest_client.import_event_stream(iter_events(rows, assets_lookup, window, parsed_paths))
     logger.info(
-        "sync_audio_usage: done window=[%s, %s) rows=%d events=%d imported=%d",
+        "sync_audio_usage: done window=[%s, %s) rows=%d imported=%d",
         window.start.isoformat(),
         window.end.isoformat(),
-        len(result.rows),
-        len(events),
+        len(rows),
         imported,
     )
     return imported
@@ -0,0 +1,148 @@
+"""
+In-process queue between tracked requests and the Redis tracking buffer.
+
+``@track_usage`` used to serialise every event and RPUSH it on the request thread, so
+a slow or unreachable Redis added up to the client's socket timeout to the response.
+A request now only appends its event here -- no lock, no I/O. A daemon thread in each
+process drains the queue every ``flush_interval`` seconds, or as soon as ``batch_size``
+events are waiting, serialises the batch and pushes it in one pipelined round trip.
+
+The queue is bounded: when Redis falls behind, new events are dropped and counted
+instead of growing the worker's memory. Whatever is still queued is flushed when the
+process exits. Like the L1 cache, the flusher thread only runs in front of django-redis;
+without it (tests) call ``flush()`` directly.
+"""
+
+import atexit
+from collections import deque
+from collections.abc import Callable
+import logging
+import os
+import threading
+from typing import Any
+
+from django.db import close_old_connections
+
+from apps.core.local_cache import _redis_backed
+
+logger = logging.getLogger(__name__)
+
+
+class UsageEventQueue:
+    """
+    Bounded FIFO of pending events, pushed to the Redis list ``key`` in batches.
+
+    ``serialize`` turns a drained batch into the list payloads; it runs on the flusher
+    thread, so per-batch work (name lookups, JSON encoding) stays off the request.
+    ``get_redis`` returns the client to push with, or ``None`` to discard the batch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        key: str,
+        serialize: Callable[[list[dict[str, Any]]], list[str]],
+        get_redis: Callable[[], Any],
+        max_events: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.25,
+        background: bool | None = None,
+    ) -> None:
+        self.name = name
+        self.key = key
+        self.max_events = max_events
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._serialize = serialize
+        self._get_redis = get_redis
+        self._background = background
+        # deque.append/popleft are atomic, so producers never wait on the flusher.
+        self._events: deque[dict[str, Any]] = deque()
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"dropped": 0, "pushed": 0, "failed": 0}
+        self._dropped_reported = 0
+        self._flusher_pid: int | None = None
+        self._flusher_lock = threading.Lock()
+
+    def put(self, event: dict[str, Any]) -> bool:
+        """Queue ``event`` for the next flush; returns ``False`` if it was dropped."""
+        if len(self._events) >= self.max_events:
+            self._count("dropped", 1)
+            return False
+        self._events.append(event)
+        self._ensure_flusher()
+        if len(self._events) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """Push everything queued so far in one pipeline; returns the number of events pushed."""
+        with self._flush_lock:
+            self._report_drops()
+            events = [self._events.popleft() for _ in range(len(self._events))]
+            if not events:
+                return 0
+            try:
+                redis_client = self._get_redis()
+                if redis_client is None:
+                    return 0
+                payloads = self._serialize(events)
+                if not payloads:
+                    return 0
+                pipeline = redis_client.pipeline(transaction=False)
+                for start in range(0, len(payloads), self.batch_size):
+                    pipeline.rpush(self.key, *payloads[start : start + self.batch_size])
+                pipeline.execute()
+            except Exception:
+                # Analytics loss is acceptable; retrying would only back the queue up.
+                logger.exception("%s: failed to push %d events to Redis", self.name, len(events))
+                self._count("failed", len(events))
+                return 0
+            self._count("pushed", len(payloads))
+            return len(payloads)
+
+    def clear(self) -> None:
+        self._events.clear()
+
+    def metrics(self) -> dict[str, int]:
+        """Events waiting now, and dropped/pushed/failed totals since the process started."""
+        with self._stats_lock:
+            return {"queued": len(self._events), **self._stats}
+
+    def _count(self, stat: str, amount: int) -> None:
+        with self._stats_lock:
+            self._stats[stat] += amount
+
+    def _report_drops(self) -> None:
+        with self._stats_lock:
+            dropped = self._stats["dropped"] - self._dropped_reported
+            self._dropped_reported = self._stats["dropped"]
+        if dropped:
+            logger.warning("%s: queue full (%d events), dropped %d events", self.name, self.max_events, dropped)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            # Serialising may have queried the database from this thread.
+            close_old_connections()
+
+    def _ensure_flusher(self) -> None:
+        """Start this process's flusher thread once; re-checked after fork (gunicorn prefork)."""
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._flusher_lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+            if self._background is None:
+                self._background = _redis_backed()
+            if not self._background:
+                return
+            threading.Thread(target=self._run, name=f"{self.name}-flusher", daemon=True).start()
+            atexit.register(self.flush)
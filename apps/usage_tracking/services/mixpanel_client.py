@@ -1,48 +1,101 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import gzip
 import itertools
+import json
 import logging
 import math
+import random
+import threading
+import time
 from typing import Any
 
-from mixpanel import BufferedConsumer, Consumer, Mixpanel
+from django.conf import settings
+from mixpanel import Mixpanel, MixpanelException
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
 _IMPORT_CHUNK_SIZE = 2000
+# Mixpanel's /track accepts at most 50 events per request.
+_TRACK_BATCH_SIZE = 50
 _REQUEST_TIMEOUT_SECONDS = 30
+# Chunks one call uploads at once, and the size of the client's connection pool.
+# Callers that send batches concurrently (the tracking-buffer flush) stay within it.
+_MAX_PARALLEL_REQUESTS = 4
+_MAX_ATTEMPTS = 4
+_BACKOFF_BASE_SECONDS = 0.5
+_MAX_BACKOFF_SECONDS = 30
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_GZIP_JSON_HEADERS = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+
+_clients: dict[tuple[str, str, bool, str], MixpanelIngestClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_ingest_client() -> MixpanelIngestClient:
+    """Return this process's client for the configured project, so its connections are reused across tasks."""
+    key = (
+        settings.MIXPANEL_PROJECT_TOKEN,
+        settings.MIXPANEL_INGEST_HOST,
+        settings.MIXPANEL_ENABLED,
+        settings.MIXPANEL_PROJECT_ID,
+    )
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            token, ingest_host, enabled, project_id = key
+            client = _clients[key] = MixpanelIngestClient(
+                token=token, ingest_host=ingest_host, enabled=enabled, project_id=project_id
+            )
+        return client
+
+
+class _MessageCollector:
+    """SDK consumer that keeps each formatted message instead of sending it."""
+
+    def __init__(self) -> None:
+        self.messages: list[str] = []
+
+    def send(self, endpoint: str, json_message: str, api_key: Any = None, api_secret: Any = None) -> None:
+        self.messages.append(json_message)
 
 
 class MixpanelIngestClient:
-    """Sends events to Mixpanel, real-time via `track` or historical via `import_events`"""
+    """Sends events to Mixpanel, real-time via `track` or historical via `import_events`.
+
+    Requests go through one pooled HTTP session with gzip-compressed JSON bodies, and are
+    retried with backoff on connection errors, 5xx and 429 (honouring `Retry-After`).
+    The client is safe to share between threads.
+    """
 
     def __init__(self, token: str, ingest_host: str, enabled: bool, project_id: str = "") -> None:
         self._token = token
         self._ingest_host = ingest_host
         self._enabled = enabled
         self._project_id = project_id
-        self._sdk: Mixpanel | None = None
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
 
     def track(
         self, distinct_id: str, event: str, properties: dict[str, Any], meta: dict[str, Any] | None = None
     ) -> None:
-        if not self._enabled or not self._token:
-            return
-        if self._sdk is None:
-            self._sdk = Mixpanel(self._token, consumer=Consumer(api_host=self._ingest_host))
-        self._sdk.track(distinct_id, event, properties, meta=meta)
+        self.track_batch([{"distinct_id": distinct_id, "event": event, "properties": properties, "meta": meta}])
 
     def track_batch(self, events: list[dict[str, Any]]) -> None:
-        """Send a batch of pre-serialized events in a single HTTP call.
+        """Send a batch of pre-serialized events to `/track`, 50 per HTTP call.
 
         Each event dict must have keys: distinct_id, event, properties, meta.
         No-ops when disabled, empty list, or no token.
         """
         if not self._enabled or not self._token or not events:
             return
-        consumer = BufferedConsumer(max_size=len(events), api_host=self._ingest_host)
-        sdk = Mixpanel(self._token, consumer=consumer)
+        # The SDK adds the token, time, $insert_id and library properties to each event.
+        collector = _MessageCollector()
+        sdk = Mixpanel(self._token, consumer=collector)
         for item in events:
             sdk.track(
                 item["distinct_id"],
@@ -50,14 +103,20 @@ class MixpanelIngestClient:
                 item.get("properties", {}),
                 meta=item.get("meta"),
             )
-        consumer.flush()
+        for batch in itertools.batched(collector.messages, _TRACK_BATCH_SIZE, strict=False):
+            response = self._post("/track", f"[{','.join(batch)}]", params={"verbose": "1", "ip": "0"})
+            response.raise_for_status()
+            body = response.json()
+            if body.get("status") != 1:
+                raise MixpanelException(f"Mixpanel rejected /track batch: {body.get('error')}")
 
     def import_events(self, events: list[dict[str, Any]]) -> int:
         """POST `events` to `/import` in chunks, returning the total records imported.
 
         Unlike `track`, `/import` accepts a fixed historical `time` per event and dedups
         on `$insert_id` -- the right tool for batch jobs that may rerun or retry over the
-        same time window (see the CF audio-usage sync).
+        same time window (see the CF audio-usage sync). Up to four chunks are in flight
+        at once.
 
         Each event dict must already be in Mixpanel's import shape: `{"event": ...,
         "properties": {"time": ..., "distinct_id": ..., "$insert_id": ..., ...}}`.
@@ -67,45 +126,113 @@ class MixpanelIngestClient:
             logger.info("MixpanelIngestClient: import no-op (enabled=%s, events=%d)", self._enabled, len(events))
             return 0
 
-        url = f"https://{self._ingest_host}/import"
-        total_imported = 0
         num_chunks = math.ceil(len(events) / _IMPORT_CHUNK_SIZE)
         logger.info(
-            "MixpanelIngestClient: importing %d event(s) in %d chunk(s) to %s project_id=%s",
+            "MixpanelIngestClient: importing %d event(s) in %d chunk(s) to https://%s/import project_id=%s",
             len(events),
             num_chunks,
-            url,
+            self._ingest_host,
             self._project_id,
         )
-        for chunk_index, chunk in enumerate(itertools.batched(events, _IMPORT_CHUNK_SIZE, strict=False)):
-            response = requests.post(
-                url,
-                params={"strict": "1", "project_id": self._project_id},
-                json=list(chunk),
-                auth=(self._token, ""),
-                timeout=_REQUEST_TIMEOUT_SECONDS,
-            )
-            # `strict=1` returns validation failures in the body with a 400; surface it
-            # so a rejected batch is traceable instead of a bare HTTPError.
-            if response.status_code >= 400:
-                logger.error(
-                    "MixpanelIngestClient: /import returned %d for chunk %d: %.500s",
-                    response.status_code,
-                    chunk_index,
-                    response.text,
-                )
+        total_imported = self.import_event_stream(events)
+        logger.info("MixpanelIngestClient: total imported %d/%d event(s)", total_imported, len(events))
+        return total_imported
 
-            response.raise_for_status()
-            body = response.json()
-            imported = body.get("num_records_imported", 0)
-            total_imported += imported
-            logger.info(
-                "MixpanelIngestClient: chunk %d imported %d/%d (status=%s)",
+    def import_event_stream(self, events: Iterable[dict[str, Any]]) -> int:
+        """Like `import_events`, but consumes `events` lazily, one 2,000-event chunk at a time.
+
+        At most four chunks are uploading and one is being built at any moment, so memory
+        stays flat however many events the iterable yields.
+        """
+        if not self._enabled or not self._token:
+            logger.info("MixpanelIngestClient: import no-op (enabled=%s)", self._enabled)
+            return 0
+
+        total_imported = 0
+        with ThreadPoolExecutor(max_workers=_MAX_PARALLEL_REQUESTS, thread_name_prefix="mixpanel-upload") as executor:
+            pending: set[Future[int]] = set()
+            for chunk_index, chunk in enumerate(itertools.batched(events, _IMPORT_CHUNK_SIZE, strict=False)):
+                if len(pending) >= _MAX_PARALLEL_REQUESTS:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    total_imported += sum(future.result() for future in done)
+                pending.add(executor.submit(self._import_chunk, chunk_index, chunk))
+            total_imported += sum(future.result() for future in wait(pending).done)
+        return total_imported
+
+    def _import_chunk(self, chunk_index: int, chunk: Sequence[dict[str, Any]]) -> int:
+        response = self._post(
+            "/import",
+            json.dumps(list(chunk)),
+            params={"strict": "1", "project_id": self._project_id},
+            auth=(self._token, ""),
+        )
+        # `strict=1` returns validation failures in the body with a 400; surface it
+        # so a rejected batch is traceable instead of a bare HTTPError.
+        if response.status_code >= 400:
+            logger.error(
+                "MixpanelIngestClient: /import returned %d for chunk %d: %.500s",
+                response.status_code,
                 chunk_index,
-                imported,
-                len(chunk),
-                body.get("status"),
+                response.text,
             )
 
-        logger.info("MixpanelIngestClient: total imported %d/%d event(s)", total_imported, len(events))
-        return total_imported
+        response.raise_for_status()
+        body = response.json()
+        imported = body.get("num_records_imported", 0)
+        logger.info(
+            "MixpanelIngestClient: chunk %d imported %d/%d (status=%s)",
+            chunk_index,
+            imported,
+            len(chunk),
+            body.get("status"),
+        )
+        return imported
+
+    def _post(
+        self, path: str, payload: str, *, params: dict[str, str], auth: tuple[str, str] | None = None
+    ) -> requests.Response:
+        """POST `payload` gzipped, retrying transient failures; returns the last response."""
+        url = f"https://{self._ingest_host}{path}"
+        body = gzip.compress(payload.encode(), compresslevel=6)
+        for attempt in range(1, _MAX_ATTEMPTS + 1):
+            try:
+                response = self._get_session().post(
+                    url,
+                    params=params,
+                    data=body,
+                    auth=auth,
+                    headers=_GZIP_JSON_HEADERS,
+                    timeout=_REQUEST_TIMEOUT_SECONDS,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == _MAX_ATTEMPTS:
+                    raise
+                delay = _backoff_seconds(attempt)
+            else:
+                if response.status_code not in _RETRY_STATUSES or attempt == _MAX_ATTEMPTS:
+                    return response
+                delay = _retry_after_seconds(response) or _backoff_seconds(attempt)
+            logger.warning("MixpanelIngestClient: %s attempt %d failed; retrying in %.1fs", path, attempt, delay)
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def _get_session(self) -> requests.Session:
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=_MAX_PARALLEL_REQUESTS))
+                self._session = session
+            return self._session
+
+
+def _backoff_seconds(attempt: int) -> float:
+    delay = min(_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1), _MAX_BACKOFF_SECONDS)
+    return delay * random.uniform(0.5, 1)
+
+
+def _retry_after_seconds(response: requests.Response) -> float | None:
+    """`Retry-After` in seconds, capped; `None` if absent or not a number of seconds."""
+    try:
+        return min(float(response.headers.get("Retry-After", "")), _MAX_BACKOFF_SECONDS)
+    except ValueError:
+        return None
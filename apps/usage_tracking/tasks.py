@@ -3,20 +3,22 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from contextlib import ExitStack, contextmanager
 import functools
 import json
 import logging
+import time
 from typing import Any
+import uuid
 
 from celery import shared_task
-from django.conf import settings
 from django.db import connections
 import redis
 from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout as RequestsTimeout
 
 from apps.usage_tracking.services.audio_usage_sync import sync_audio_usage
-from apps.usage_tracking.services.mixpanel_client import MixpanelIngestClient
+from apps.usage_tracking.services.mixpanel_client import MixpanelIngestClient, get_ingest_client
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +26,14 @@ _TRANSIENT_ERRORS = (RequestsConnectionError, RequestsTimeout, ConnectionError,
 
 TRACKING_BUFFER_KEY = "usage_tracking:tracking_buffer"
 _TRACKING_INFLIGHT_KEY = "usage_tracking:tracking_buffer:inflight"
+_TRACKING_DEAD_LETTER_KEY = "usage_tracking:tracking_buffer:dead_letter"
+# Events per LPOP and per Mixpanel send; a run holds at most _FLUSH_CONCURRENCY chunks.
+_FLUSH_CHUNK_SIZE = 500
+_FLUSH_CONCURRENCY = 4
+# The flush runs every 30s; stop claiming chunks before the next run starts. What is
+# left stays in the inflight list for that run.
+_FLUSH_MAX_SECONDS = 25
+_DEAD_LETTER_MAX_ATTEMPTS = 10
 # Separate Redis DB from the Django cache (DB 1) to avoid eviction by cache policies.
 _TRACKING_REDIS_DB = 2
 
@@ -62,12 +72,7 @@ def no_db_queries_task(func: Callable) -> Callable:
 
 
 def _build_ingest_client() -> MixpanelIngestClient:
-    return MixpanelIngestClient(
-        token=settings.MIXPANEL_PROJECT_TOKEN,
-        ingest_host=settings.MIXPANEL_INGEST_HOST,
-        enabled=settings.MIXPANEL_ENABLED,
-        project_id=settings.MIXPANEL_PROJECT_ID,
-    )
+    return get_ingest_client()
 
 
 # Sentinel distinguishing "not resolved yet" from a resolved-to-None client (no Redis,
@@ -145,46 +150,128 @@ def track_api_request_task(
 @shared_task(ignore_result=True)
 @no_db_queries_task
 def flush_tracking_buffer_task() -> None:
-    """Drain the Redis tracking buffer and send all queued events to Mixpanel in one batch.
+    """Drain the Redis tracking buffer to Mixpanel in fixed-size chunks.
 
-    Uses RENAME to atomically move the live buffer to an inflight key before reading,
-    so concurrent requests keep writing to a fresh buffer and a crash between read and
-    delete cannot cause double-processing of the same batch on the next flush.
+    RENAMENX claims the live buffer as the inflight list, so requests keep writing to a
+    fresh buffer. If an inflight list is still there (an earlier run hit its deadline or
+    crashed), it is not overwritten: this run keeps draining it and leaves the buffer for
+    the next one. Chunks are LPOPped from the inflight list and sent concurrently, so a
+    worker holds at most a few chunks however large the backlog grows.
+
+    A chunk Mixpanel rejects goes to the dead-letter list and the run stops claiming new
+    chunks; dead letters are retried first on later runs, up to a few attempts.
     """
     r = _get_tracking_redis()
     if r is None:
         return  # no Redis available (e.g. dev/LocMemCache); tracking disabled
 
-    # Atomically claim the current buffer. If the key doesn't exist, RENAME raises
-    # ResponseError -- treat that as empty buffer.
-    try:
-        r.rename(TRACKING_BUFFER_KEY, _TRACKING_INFLIGHT_KEY)
-    except redis.ResponseError:
-        return  # buffer was empty
-
-    raw_items: list[str] = r.lrange(_TRACKING_INFLIGHT_KEY, 0, -1)
-
-    if not raw_items:
-        r.delete(_TRACKING_INFLIGHT_KEY)
-        return
-
+    started = time.monotonic()
+    client = _build_ingest_client()
+    stats = {"sent": 0, "dead_lettered": 0}
+    # Dead letters are the oldest events; while Mixpanel still rejects them there is no
+    # point moving the live buffer into the dead-letter list too.
+    if _retry_dead_letters(r, client, stats):
+        try:
+            r.renamenx(TRACKING_BUFFER_KEY, _TRACKING_INFLIGHT_KEY)
+        except redis.ResponseError:
+            pass  # buffer was empty; an earlier run may still have left events inflight
+        _drain_inflight(r, client, stats, deadline=started + _FLUSH_MAX_SECONDS)
+
+    if stats["sent"] or stats["dead_lettered"]:
+        elapsed = time.monotonic() - started
+        logger.info(
+            "flush_tracking_buffer_task: sent %d events to Mixpanel in %.1fs (%.0f events/s), "
+            "dead-lettered %d; backlog %s",
+            stats["sent"],
+            elapsed,
+            stats["sent"] / elapsed if elapsed else 0,
+            stats["dead_lettered"],
+            tracking_backlog(r),
+        )
+
+
+def tracking_backlog(r: redis.Redis) -> dict[str, int]:
+    """Events waiting in the live buffer, the inflight list and the dead-letter list."""
+    pipeline = r.pipeline(transaction=False)
+    for key in (TRACKING_BUFFER_KEY, _TRACKING_INFLIGHT_KEY, _TRACKING_DEAD_LETTER_KEY):
+        pipeline.llen(key)
+    buffered, inflight, dead_letter = pipeline.execute()
+    return {"buffer": buffered, "inflight": inflight, "dead_letter": dead_letter}
+
+
+def _drain_inflight(r: redis.Redis, client: MixpanelIngestClient, stats: dict[str, int], *, deadline: float) -> None:
+    with ThreadPoolExecutor(max_workers=_FLUSH_CONCURRENCY, thread_name_prefix="tracking-flush") as executor:
+        pending: dict[Future, list[dict[str, Any]]] = {}
+        healthy = True
+        while True:
+            while healthy and len(pending) < _FLUSH_CONCURRENCY and time.monotonic() < deadline:
+                raw_items = r.lpop(_TRACKING_INFLIGHT_KEY, _FLUSH_CHUNK_SIZE)
+                if not raw_items:
+                    break
+                events = _parse_events(raw_items)
+                if events:
+                    pending[executor.submit(client.track_batch, events)] = events
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                events = pending.pop(future)
+                try:
+                    future.result()
+                except Exception:
+                    logger.exception("flush_tracking_buffer_task: failed to send %d events", len(events))
+                    _dead_letter(r, [(1, event) for event in events])
+                    stats["dead_lettered"] += len(events)
+                    healthy = False
+                else:
+                    stats["sent"] += len(events)
+
+
+def _retry_dead_letters(r: redis.Redis, client: MixpanelIngestClient, stats: dict[str, int]) -> bool:
+    """Resend dead-lettered events chunk by chunk; ``False`` if Mixpanel still rejects them."""
+    while raw_items := r.lpop(_TRACKING_DEAD_LETTER_KEY, _FLUSH_CHUNK_SIZE):
+        entries = [json.loads(raw) for raw in raw_items]
+        try:
+            client.track_batch([entry["event"] for entry in entries])
+        except Exception:
+            logger.warning("flush_tracking_buffer_task: dead-letter retry failed", exc_info=True)
+            retained = [(entry["attempts"] + 1, entry["event"]) for entry in entries]
+            retained = [(attempts, event) for attempts, event in retained if attempts <= _DEAD_LETTER_MAX_ATTEMPTS]
+            if len(retained) < len(entries):
+                logger.error(
+                    "flush_tracking_buffer_task: dropping %d events after %d attempts",
+                    len(entries) - len(retained),
+                    _DEAD_LETTER_MAX_ATTEMPTS,
+                )
+            _dead_letter(r, retained)
+            return False
+        stats["sent"] += len(entries)
+    return True
+
+
+def _dead_letter(r: redis.Redis, entries: list[tuple[int, dict[str, Any]]]) -> None:
+    if entries:
+        r.rpush(
+            _TRACKING_DEAD_LETTER_KEY,
+            *(json.dumps({"attempts": attempts, "event": event}) for attempts, event in entries),
+        )
+
+
+def _parse_events(raw_items: list[str]) -> list[dict[str, Any]]:
     events: list[dict[str, Any]] = []
     for raw in raw_items:
         try:
-            events.append(json.loads(raw))
+            event = json.loads(raw)
         except (json.JSONDecodeError, TypeError):
             logger.warning("flush_tracking_buffer_task: skipping malformed event: %.120s", raw)
-
-    # Send then delete in finally so inflight is always cleaned up. A network failure
-    # during track_batch logs and drops the batch -- analytics loss is acceptable and
-    # leaving inflight would not help (next RENAME silently overwrites it anyway).
-    try:
-        if events:
-            client = _build_ingest_client()
-            client.track_batch(events)
-            logger.info("flush_tracking_buffer_task: sent %d events to Mixpanel", len(events))
-    finally:
-        r.delete(_TRACKING_INFLIGHT_KEY)
+            continue
+        # Pin the ids Mixpanel dedups on, so a chunk resent from the dead-letter list
+        # (possibly after a partial send) is not counted twice.
+        properties = event.setdefault("properties", {})
+        properties.setdefault("$insert_id", uuid.uuid4().hex)
+        properties.setdefault("time", time.time())
+        events.append(event)
+    return events
 
 
 @shared_task(
@@ -10,15 +10,19 @@ from apps.core.tests.base import BaseTestCase
 from apps.usage_tracking.repositories.recitations_usage import RecitationInfo
 from apps.usage_tracking.services import audio_usage_sync
 from apps.usage_tracking.services.audio_usage_sync import (
+    SyncWindow,
     build_events,
     build_insert_id,
     compute_time_window,
+    fetch_window_rows,
+    iter_windows,
     load_assets_lookup,
     parse_audio_path,
+    parse_row_paths,
     sync_audio_usage,
 )
 from apps.usage_tracking.services.cf_analytics_client import CFUsageResult, CFUsageRow, CloudflareAnalyticsClient
-from apps.usage_tracking.services.mixpanel_client import MixpanelIngestClient
+from apps.usage_tracking.services.mixpanel_client import get_ingest_client
 
 _OVERRIDE_CF_SETTINGS = {
     "ENABLE_AUDIO_USAGE_SYNC": True,
@@ -253,6 +257,73 @@ class TestBuildEvents:
         assert events1[0]["properties"]["$insert_id"] == events2[0]["properties"]["$insert_id"]
 
 
+class TestParseRowPaths:
+    def test_parse_row_paths_where_path_repeats_across_rows_should_parse_it_once(self):
+        # Arrange
+        rows = [_row(country="SA"), _row(country="EG"), _row(path="/media/uploads/assets/3/recitations/002.mp3")]
+
+        # Act
+        with patch.object(
+            audio_usage_sync, parse_audio_path.__name__, wraps=audio_usage_sync.parse_audio_path
+        ) as mock_parse:
+            parsed_paths = parse_row_paths(rows)
+
+        # Assert
+        assert mock_parse.call_count == 2
+        assert {parsed.asset_id for parsed in parsed_paths.values()} == {2, 3}
+
+
+class TestIterWindows:
+    def test_iter_windows_where_range_starts_mid_window_should_yield_aligned_windows_covering_it(self):
+        # Act
+        windows = list(iter_windows(datetime(2026, 10, 1, 7, 30, tzinfo=UTC), datetime(2026, 10, 1, 13, 0, tzinfo=UTC)))
+
+        # Assert
+        assert [(w.start.hour, w.end.hour) for w in windows] == [(6, 12), (12, 18)]
+
+
+class TestFetchWindowRows:
+    _window = SyncWindow(start=datetime(2026, 10, 1, 0, 0, tzinfo=UTC), end=datetime(2026, 10, 1, 6, 0, tzinfo=UTC))
+
+    def test_fetch_window_rows_where_window_is_truncated_should_bisect_and_merge_halves(self):
+        # Arrange
+        cf_client = MagicMock()
+
+        def fetch(hostname, start, end):
+            if end - start == timedelta(hours=6):
+                return CFUsageResult(rows=[_row(count=1)], truncated=True)
+            return CFUsageResult(
+                rows=[_row(count=2, bytes_served=10), _row(count=1, country=f"C{start.hour}")], truncated=False
+            )
+
+        cf_client.fetch_audio_usage.side_effect = fetch
+
+        # Act
+        rows = fetch_window_rows(cf_client, "cdn.example.com", self._window)
+
+        # Assert
+        queried = sorted(
+            (call.kwargs["start"].hour, call.kwargs["end"].hour) for call in cf_client.fetch_audio_usage.call_args_list
+        )
+        assert queried == [(0, 3), (0, 6), (3, 6)]
+        by_country = {row["dimensions"]["clientCountryName"]: row for row in rows}
+        assert by_country["SA"]["count"] == 4
+        assert by_country["SA"]["sum"]["edgeResponseBytes"] == 20
+        assert {"C0", "C3"} <= by_country.keys()
+
+    def test_fetch_window_rows_where_minimum_slice_still_truncated_should_keep_rows_and_stop(self):
+        # Arrange
+        cf_client = MagicMock()
+        cf_client.fetch_audio_usage.return_value = CFUsageResult(rows=[_row(count=1)], truncated=True)
+
+        # Act
+        rows = fetch_window_rows(cf_client, "cdn.example.com", self._window)
+
+        # Assert - six halvings take 6h below twice the minimum slice: 64 leaves
+        assert cf_client.fetch_audio_usage.call_count == 127
+        assert rows[0]["count"] == 64
+
+
 class TestLoadAssetLookup(BaseTestCase):
     def test_load_assets_lookup_where_ids_are_empty_should_return_empty_dict_without_query(self):
         # Act / Assert
@@ -326,7 +397,7 @@ class TestSyncAudioUsage:
             override_settings(**_OVERRIDE_CF_SETTINGS),
             patch.object(audio_usage_sync, CloudflareAnalyticsClient.__name__, return_value=mock_cf_client),
             patch.object(audio_usage_sync, load_assets_lookup.__name__) as mock_load_lookup,
-            patch.object(audio_usage_sync, MixpanelIngestClient.__name__) as mock_ingest_cls,
+            patch.object(audio_usage_sync, get_ingest_client.__name__) as mock_get_ingest_client,
         ):
             # Act
             result = sync_audio_usage()
@@ -334,20 +405,20 @@ class TestSyncAudioUsage:
             # Assert
             assert result == 0
             mock_load_lookup.assert_not_called()
-            mock_ingest_cls.return_value.import_events.assert_not_called()
+            mock_get_ingest_client.return_value.import_event_stream.assert_not_called()
 
     def test_sync_audio_usage_where_cf_result_is_truncated_should_log_warning(self):
         # Arrange
         mock_cf_client = MagicMock()
         mock_cf_client.fetch_audio_usage.return_value = CFUsageResult(rows=[_row()], truncated=True)
         mock_ingest_client = MagicMock()
-        mock_ingest_client.import_events.return_value = 1
+        mock_ingest_client.import_event_stream.return_value = 1
 
         with (
             override_settings(**_OVERRIDE_CF_SETTINGS),
             patch.object(audio_usage_sync, CloudflareAnalyticsClient.__name__, return_value=mock_cf_client),
             patch.object(audio_usage_sync, load_assets_lookup.__name__, return_value={}),
-            patch.object(audio_usage_sync, MixpanelIngestClient.__name__, return_value=mock_ingest_client),
+            patch.object(audio_usage_sync, get_ingest_client.__name__, return_value=mock_ingest_client),
             patch.object(audio_usage_sync, "logger") as mock_logger,
         ):
             # Act
@@ -362,13 +433,13 @@ class TestSyncAudioUsage:
         mock_cf_client = MagicMock()
         mock_cf_client.fetch_audio_usage.return_value = CFUsageResult(rows=[_row()], truncated=False)
         mock_ingest_client = MagicMock()
-        mock_ingest_client.import_events.return_value = 1
+        mock_ingest_client.import_event_stream.side_effect = lambda events: len(list(events))
 
         with (
             override_settings(**_OVERRIDE_CF_SETTINGS),
             patch.object(audio_usage_sync, CloudflareAnalyticsClient.__name__, return_value=mock_cf_client),
             patch.object(audio_usage_sync, load_assets_lookup.__name__, return_value={}) as mock_load_lookup,
-            patch.object(audio_usage_sync, MixpanelIngestClient.__name__, return_value=mock_ingest_client),
+            patch.object(audio_usage_sync, get_ingest_client.__name__, return_value=mock_ingest_client),
         ):
             # Act
             result = sync_audio_usage()
@@ -376,6 +447,4 @@ class TestSyncAudioUsage:
             # Assert
             assert result == 1
             mock_load_lookup.assert_called_once_with({2})
-            mock_ingest_client.import_events.assert_called_once()
-            sent_events = mock_ingest_client.import_events.call_args[0][0]
-            assert len(sent_events) == 1
+            mock_ingest_client.import_event_stream.assert_called_once()
@@ -0,0 +1,86 @@
+import json
+from unittest.mock import MagicMock
+
+from apps.usage_tracking.services.event_queue import UsageEventQueue
+
+_KEY = "usage_tracking:test_buffer"
+
+
+def _queue(redis_client, **kwargs):
+    return UsageEventQueue(
+        "test_queue",
+        key=_KEY,
+        serialize=lambda events: [json.dumps(event) for event in events],
+        get_redis=lambda: redis_client,
+        background=False,
+        **kwargs,
+    )
+
+
+class TestUsageEventQueue:
+    def test_put_where_queue_is_full_should_drop_and_count(self):
+        # Arrange
+        queue = _queue(MagicMock(), max_events=2)
+
+        # Act
+        accepted = [queue.put({"n": n}) for n in range(3)]
+
+        # Assert
+        assert accepted == [True, True, False]
+        assert queue.metrics() == {"queued": 2, "dropped": 1, "pushed": 0, "failed": 0}
+
+    def test_flush_where_events_exceed_batch_size_should_push_batches_in_one_pipeline(self):
+        # Arrange
+        redis_client = MagicMock()
+        queue = _queue(redis_client, batch_size=2)
+        for n in range(5):
+            queue.put({"n": n})
+
+        # Act
+        pushed = queue.flush()
+
+        # Assert
+        pipeline = redis_client.pipeline.return_value
+        assert pushed == 5
+        assert [call.args[0] for call in pipeline.rpush.call_args_list] == [_KEY, _KEY, _KEY]
+        assert [json.loads(p)["n"] for call in pipeline.rpush.call_args_list for p in call.args[1:]] == [0, 1, 2, 3, 4]
+        pipeline.execute.assert_called_once_with()
+        assert queue.metrics()["queued"] == 0
+
+    def test_put_where_batch_size_is_reached_should_wake_flusher(self):
+        # Arrange
+        queue = _queue(MagicMock(), batch_size=2)
+        queue.put({"n": 0})
+        assert not queue._wake.is_set()
+
+        # Act
+        queue.put({"n": 1})
+
+        # Assert
+        assert queue._wake.is_set()
+
+    def test_flush_where_redis_fails_should_count_failed_and_empty_queue(self):
+        # Arrange
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value.execute.side_effect = ConnectionError("redis down")
+        queue = _queue(redis_client)
+        queue.put({"n": 0})
+
+        # Act
+        pushed = queue.flush()
+
+        # Assert
+        assert pushed == 0
+        assert queue.metrics() == {"queued": 0, "dropped": 0, "pushed": 0, "failed": 1}
+
+    def test_flush_where_redis_is_unavailable_should_discard_events(self):
+        # Arrange
+        queue = _queue(None)
+        queue.put({"n": 0})
+
+        # Act
+        pushed = queue.flush()
+
+        # Assert
+        assert pushed == 0
+        assert queue.metrics()["queued"] == 0
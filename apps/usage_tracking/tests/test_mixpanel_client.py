@@ -1,15 +1,25 @@
+from contextlib import contextmanager
+import gzip
+import json
 from unittest.mock import MagicMock, patch
 
+from mixpanel import MixpanelException
 import pytest
 import requests
 
 from apps.usage_tracking.services import mixpanel_client
-from apps.usage_tracking.services.mixpanel_client import _IMPORT_CHUNK_SIZE, MixpanelIngestClient
+from apps.usage_tracking.services.mixpanel_client import (
+    _IMPORT_CHUNK_SIZE,
+    _MAX_ATTEMPTS,
+    _TRACK_BATCH_SIZE,
+    MixpanelIngestClient,
+)
 
 
-def _mock_response(status_code: int = 200, num_records_imported: int = 0) -> MagicMock:
+def _mock_response(status_code: int = 200, num_records_imported: int = 0, headers: dict | None = None) -> MagicMock:
     response = MagicMock()
     response.status_code = status_code
+    response.headers = headers or {}
     response.json.return_value = {
         "status": "OK" if status_code < 400 else "FAIL",
         "num_records_imported": num_records_imported,
@@ -21,6 +31,17 @@ def _mock_response(status_code: int = 200, num_records_imported: int = 0) -> Mag
     return response
 
 
+@contextmanager
+def _patched_post(client: MixpanelIngestClient):
+    """Patch the client's pooled session and yield its ``post`` mock."""
+    with patch.object(client, client._get_session.__name__) as mock_get_session:
+        yield mock_get_session.return_value.post
+
+
+def _sent_json(call) -> list:
+    return json.loads(gzip.decompress(call.kwargs["data"]))
+
+
 def _make_import_event(index: int = 0) -> dict:
     return {"event": "audio_usage_summary", "properties": {"time": 0, "distinct_id": "", "$insert_id": str(index)}}
 
@@ -54,6 +75,78 @@ class TestMixpanelIngestClient:
 
         mock_mixpanel_cls.assert_not_called()
 
+    def test_track_batch_where_events_exceed_request_limit_should_post_gzipped_batches(self):
+        # Arrange
+        client = MixpanelIngestClient(token="test-token", ingest_host="api-eu.mixpanel.com", enabled=True)
+        events = [
+            {"distinct_id": f"anon-{i}", "event": "public_api_request", "properties": {}, "meta": {}}
+            for i in range(_TRACK_BATCH_SIZE + 1)
+        ]
+
+        with _patched_post(client) as mock_post:
+            mock_post.return_value.status_code = 200
+            mock_post.return_value.json.return_value = {"status": 1, "error": None}
+
+            # Act
+            client.track_batch(events)
+
+            # Assert
+            batches = [_sent_json(call) for call in mock_post.call_args_list]
+            assert [len(batch) for batch in batches] == [_TRACK_BATCH_SIZE, 1]
+            assert batches[1][0]["properties"]["distinct_id"] == f"anon-{_TRACK_BATCH_SIZE}"
+            assert batches[1][0]["properties"]["token"] == "test-token"
+            assert mock_post.call_args.args[0] == "https://api-eu.mixpanel.com/track"
+
+    def test_track_batch_where_mixpanel_rejects_batch_should_raise(self):
+        # Arrange
+        client = MixpanelIngestClient(token="test-token", ingest_host="api-eu.mixpanel.com", enabled=True)
+
+        with _patched_post(client) as mock_post:
+            mock_post.return_value.status_code = 200
+            mock_post.return_value.json.return_value = {"status": 0, "error": "invalid token"}
+
+            # Act / Assert
+            with pytest.raises(MixpanelException):
+                client.track_batch([{"distinct_id": "anon-1", "event": "public_api_request", "properties": {}}])
+
+
+class TestPostRetries:
+    def test_import_events_where_rate_limited_should_wait_retry_after_then_retry(self):
+        # Arrange
+        client = MixpanelIngestClient(token="test-token", ingest_host="api-eu.mixpanel.com", enabled=True)
+
+        with (
+            _patched_post(client) as mock_post,
+            patch.object(mixpanel_client.time, mixpanel_client.time.sleep.__name__) as mock_sleep,
+        ):
+            mock_post.side_effect = [
+                _mock_response(status_code=429, headers={"Retry-After": "2"}),
+                _mock_response(num_records_imported=1),
+            ]
+
+            # Act
+            imported = client.import_events([_make_import_event()])
+
+            # Assert
+            assert imported == 1
+            assert mock_post.call_count == 2
+            mock_sleep.assert_called_once_with(2.0)
+
+    def test_import_events_where_server_keeps_failing_should_raise_after_max_attempts(self):
+        # Arrange
+        client = MixpanelIngestClient(token="test-token", ingest_host="api-eu.mixpanel.com", enabled=True)
+
+        with (
+            _patched_post(client) as mock_post,
+            patch.object(mixpanel_client.time, mixpanel_client.time.sleep.__name__),
+        ):
+            mock_post.return_value = _mock_response(status_code=503)
+
+            # Act / Assert
+            with pytest.raises(requests.HTTPError):
+                client.import_events([_make_import_event()])
+            assert mock_post.call_count == _MAX_ATTEMPTS
+
 
 class TestImportEvents:
     def test_import_events_where_disabled_should_be_noop(self):
@@ -61,7 +154,7 @@ class TestImportEvents:
         client = MixpanelIngestClient(token="test-token", ingest_host="api-eu.mixpanel.com", enabled=False)
 
         # Act / Assert
-        with patch.object(mixpanel_client.requests, mixpanel_client.requests.post.__name__) as mock_post:
+        with _patched_post(client) as mock_post:
             assert client.import_events([_make_import_event()]) == 0
             mock_post.assert_not_called()
 
@@ -70,7 +163,7 @@ class TestImportEvents:
         client = MixpanelIngestClient(token="", ingest_host="api-eu.mixpanel.com", enabled=True)
 
         # Act / Assert
-        with patch.object(mixpanel_client.requests, mixpanel_client.requests.post.__name__) as mock_post:
+        with _patched_post(client) as mock_post:
             assert client.import_events([_make_import_event()]) == 0
             mock_post.assert_not_called()
 
@@ -79,7 +172,7 @@ class TestImportEvents:
         client = MixpanelIngestClient(token="test-token", ingest_host="api-eu.mixpanel.com", enabled=True)
 
         # Act / Assert
-        with patch.object(mixpanel_client.requests, mixpanel_client.requests.post.__name__) as mock_post:
+        with _patched_post(client) as mock_post:
             assert client.import_events([]) == 0
             mock_post.assert_not_called()
 
@@ -88,7 +181,7 @@ class TestImportEvents:
         client = MixpanelIngestClient(token="test-token", ingest_host="api-eu.mixpanel.com", enabled=True)
         events = [_make_import_event(i) for i in range(_IMPORT_CHUNK_SIZE + 1)]
 
-        with patch.object(mixpanel_client.requests, mixpanel_client.requests.post.__name__) as mock_post:
+        with _patched_post(client) as mock_post:
             mock_post.return_value = _mock_response(num_records_imported=1)
 
             # Act
@@ -96,17 +189,16 @@ class TestImportEvents:
 
             # Assert
             assert mock_post.call_count == 2
-            first_chunk = mock_post.call_args_list[0].kwargs["json"]
-            second_chunk = mock_post.call_args_list[1].kwargs["json"]
-            assert len(first_chunk) == _IMPORT_CHUNK_SIZE
-            assert len(second_chunk) == 1
+            chunk_sizes = sorted(len(_sent_json(call)) for call in mock_post.call_args_list)
+            assert chunk_sizes == [1, _IMPORT_CHUNK_SIZE]
+            assert all(call.kwargs["headers"]["Content-Encoding"] == "gzip" for call in mock_post.call_args_list)
 
     def test_import_events_where_posts_succeed_should_sum_num_records_imported(self):
         # Arrange
         client = MixpanelIngestClient(token="test-token", ingest_host="api-eu.mixpanel.com", enabled=True)
         events = [_make_import_event(i) for i in range(_IMPORT_CHUNK_SIZE + 1)]
 
-        with patch.object(mixpanel_client.requests, mixpanel_client.requests.post.__name__) as mock_post:
+        with _patched_post(client) as mock_post:
             mock_post.side_effect = [
                 _mock_response(num_records_imported=_IMPORT_CHUNK_SIZE),
                 _mock_response(num_records_imported=1),
@@ -118,12 +210,33 @@ class TestImportEvents:
             # Assert
             assert total == _IMPORT_CHUNK_SIZE + 1
 
+    def test_import_event_stream_where_events_are_a_generator_should_upload_in_chunks(self):
+        # Arrange
+        client = MixpanelIngestClient(token="test-token", ingest_host="api-eu.mixpanel.com", enabled=True)
+        events = (_make_import_event(i) for i in range(2 * _IMPORT_CHUNK_SIZE + 1))
+
+        with _patched_post(client) as mock_post:
+            mock_post.side_effect = lambda *args, **kwargs: _mock_response(
+                num_records_imported=len(json.loads(gzip.decompress(kwargs["data"])))
+            )
+
+            # Act
+            total = client.import_event_stream(events)
+
+            # Assert
+            assert total == 2 * _IMPORT_CHUNK_SIZE + 1
+            assert sorted(len(_sent_json(call)) for call in mock_post.call_args_list) == [
+                1,
+                _IMPORT_CHUNK_SIZE,
+                _IMPORT_CHUNK_SIZE,
+            ]
+
     def test_import_events_where_response_is_400_should_log_then_raise(self):
         # Arrange
         client = MixpanelIngestClient(token="test-token", ingest_host="api-eu.mixpanel.com", enabled=True)
 
         with (
-            patch.object(mixpanel_client.requests, mixpanel_client.requests.post.__name__) as mock_post,
+            _patched_post(client) as mock_post,
             patch.object(mixpanel_client, "logger") as mock_logger,
         ):
             mock_post.return_value = _mock_response(status_code=400)
@@ -6,6 +6,8 @@ import redis
 
 from apps.core.tests.base import BaseTestCase
 from apps.usage_tracking.tasks import (
+    _DEAD_LETTER_MAX_ATTEMPTS,
+    _TRACKING_DEAD_LETTER_KEY,
     _TRACKING_INFLIGHT_KEY,
     TRACKING_BUFFER_KEY,
     UnexpectedDatabaseQuery,
@@ -140,92 +142,170 @@ def _make_event(distinct_id="user-1", event="public_api_request", props=None):
 
 
 class TestFlushTrackingBufferTask:
-    def _mock_redis_with_events(self, events):
-        """Return a mock Redis client that simulates a buffer containing the given events."""
+    def _mock_redis(self, inflight=(), dead_letter=()):
+        """Return a mock Redis client whose inflight and dead-letter lists pop in chunks."""
+        lists = {_TRACKING_INFLIGHT_KEY: list(inflight), _TRACKING_DEAD_LETTER_KEY: list(dead_letter)}
+
+        def lpop(key, count):
+            items, lists[key] = lists[key][:count], lists[key][count:]
+            return items or None
+
         mock_r = MagicMock()
-        mock_r.rename.return_value = True
-        mock_r.lrange.return_value = [json.dumps(e) for e in events]
+        mock_r.renamenx.return_value = True
+        mock_r.lpop.side_effect = lpop
+        mock_r.pipeline.return_value.execute.return_value = [0, 0, 0]
         return mock_r
 
+    def _dead_lettered(self, mock_r):
+        return [
+            json.loads(raw)
+            for call in mock_r.rpush.call_args_list
+            if call.args[0] == _TRACKING_DEAD_LETTER_KEY
+            for raw in call.args[1:]
+        ]
+
     @patch("apps.usage_tracking.tasks._build_ingest_client")
     @patch("apps.usage_tracking.tasks._get_tracking_redis")
     def test_flush_tracking_buffer_task_where_buffer_has_events_should_send_batch(self, mock_get_redis, mock_build):
         events = [_make_event("user-1"), _make_event("user-2")]
-        mock_r = self._mock_redis_with_events(events)
+        mock_r = self._mock_redis(inflight=[json.dumps(e) for e in events])
         mock_get_redis.return_value = mock_r
         client = MagicMock()
         mock_build.return_value = client
 
         flush_tracking_buffer_task.run()
 
-        mock_r.rename.assert_called_once_with(TRACKING_BUFFER_KEY, _TRACKING_INFLIGHT_KEY)
-        mock_r.lrange.assert_called_once_with(_TRACKING_INFLIGHT_KEY, 0, -1)
-        mock_r.delete.assert_called_once_with(_TRACKING_INFLIGHT_KEY)
+        mock_r.renamenx.assert_called_once_with(TRACKING_BUFFER_KEY, _TRACKING_INFLIGHT_KEY)
         client.track_batch.assert_called_once()
         sent = client.track_batch.call_args[0][0]
         assert len(sent) == 2
         assert sent[0]["distinct_id"] == "user-1"
         assert sent[1]["distinct_id"] == "user-2"
+        assert sent[0]["properties"]["$insert_id"] != sent[1]["properties"]["$insert_id"]
+
+    @patch("apps.usage_tracking.tasks._FLUSH_CHUNK_SIZE", 2)
+    @patch("apps.usage_tracking.tasks._build_ingest_client")
+    @patch("apps.usage_tracking.tasks._get_tracking_redis")
+    def test_flush_tracking_buffer_task_where_backlog_exceeds_chunk_size_should_send_in_chunks(
+        self, mock_get_redis, mock_build
+    ):
+        # Arrange
+        mock_r = self._mock_redis(inflight=[json.dumps(_make_event(f"user-{n}")) for n in range(5)])
+        mock_get_redis.return_value = mock_r
+        client = MagicMock()
+        mock_build.return_value = client
+
+        # Act
+        flush_tracking_buffer_task.run()
+
+        # Assert
+        chunks = [call.args[0] for call in client.track_batch.call_args_list]
+        assert sorted(len(chunk) for chunk in chunks) == [1, 2, 2]
+        assert sorted(event["distinct_id"] for chunk in chunks for event in chunk) == [f"user-{n}" for n in range(5)]
 
     @patch("apps.usage_tracking.tasks._build_ingest_client")
     @patch("apps.usage_tracking.tasks._get_tracking_redis")
     def test_flush_tracking_buffer_task_where_buffer_empty_should_be_noop(self, mock_get_redis, mock_build):
-        mock_r = MagicMock()
-        mock_r.rename.side_effect = redis.ResponseError("ERR no such key")
+        mock_r = self._mock_redis()
+        mock_r.renamenx.side_effect = redis.ResponseError("ERR no such key")
         mock_get_redis.return_value = mock_r
         client = MagicMock()
         mock_build.return_value = client
 
         flush_tracking_buffer_task.run()
 
-        mock_r.lrange.assert_not_called()
         client.track_batch.assert_not_called()
 
     @patch("apps.usage_tracking.tasks._build_ingest_client")
     @patch("apps.usage_tracking.tasks._get_tracking_redis")
-    def test_flush_tracking_buffer_task_where_inflight_is_empty_after_rename_should_be_noop(
+    def test_flush_tracking_buffer_task_where_earlier_run_left_inflight_should_drain_it_first(
         self, mock_get_redis, mock_build
     ):
-        mock_r = MagicMock()
-        mock_r.rename.return_value = True
-        mock_r.lrange.return_value = []
+        # Arrange - RENAMENX refuses to overwrite the leftover inflight list
+        mock_r = self._mock_redis(inflight=[json.dumps(_make_event("user-left-over"))])
+        mock_r.renamenx.return_value = False
         mock_get_redis.return_value = mock_r
         client = MagicMock()
         mock_build.return_value = client
 
+        # Act
         flush_tracking_buffer_task.run()
 
-        client.track_batch.assert_not_called()
+        # Assert
+        sent = client.track_batch.call_args[0][0]
+        assert [event["distinct_id"] for event in sent] == ["user-left-over"]
+
+    @patch("apps.usage_tracking.tasks._FLUSH_CHUNK_SIZE", 1)
+    @patch("apps.usage_tracking.tasks._FLUSH_CONCURRENCY", 1)
+    @patch("apps.usage_tracking.tasks._build_ingest_client")
+    @patch("apps.usage_tracking.tasks._get_tracking_redis")
+    def test_flush_tracking_buffer_task_where_track_batch_raises_should_dead_letter_chunk_and_stop(
+        self, mock_get_redis, mock_build
+    ):
+        """A rejected chunk is kept for retry; the rest of the backlog stays in Redis."""
+        # Arrange
+        mock_r = self._mock_redis(inflight=[json.dumps(_make_event("user-1")), json.dumps(_make_event("user-2"))])
+        mock_get_redis.return_value = mock_r
+        client = MagicMock()
+        client.track_batch.side_effect = ConnectionError("Mixpanel down")
+        mock_build.return_value = client
+
+        # Act
+        flush_tracking_buffer_task.run()
+
+        # Assert
+        dead_lettered = self._dead_lettered(mock_r)
+        assert [(entry["attempts"], entry["event"]["distinct_id"]) for entry in dead_lettered] == [(1, "user-1")]
+        client.track_batch.assert_called_once()
 
     @patch("apps.usage_tracking.tasks._build_ingest_client")
     @patch("apps.usage_tracking.tasks._get_tracking_redis")
-    def test_flush_tracking_buffer_task_where_track_batch_raises_should_still_delete_inflight(
+    def test_flush_tracking_buffer_task_where_dead_letters_succeed_should_then_drain_buffer(
         self, mock_get_redis, mock_build
     ):
-        """Inflight key is always deleted after the send attempt.
-
-        A network failure drops the batch (analytics loss is acceptable) but must
-        not leave the inflight key lingering -- next RENAME would silently overwrite
-        it, losing both old and new data.
-        """
-        events = [_make_event("user-1")]
-        mock_r = self._mock_redis_with_events(events)
+        # Arrange
+        dead_letter = [json.dumps({"attempts": 2, "event": _make_event("user-retried")})]
+        mock_r = self._mock_redis(inflight=[json.dumps(_make_event("user-new"))], dead_letter=dead_letter)
+        mock_get_redis.return_value = mock_r
+        client = MagicMock()
+        mock_build.return_value = client
+
+        # Act
+        flush_tracking_buffer_task.run()
+
+        # Assert
+        sent = [call.args[0][0]["distinct_id"] for call in client.track_batch.call_args_list]
+        assert sent == ["user-retried", "user-new"]
+        assert self._dead_lettered(mock_r) == []
+
+    @patch("apps.usage_tracking.tasks._build_ingest_client")
+    @patch("apps.usage_tracking.tasks._get_tracking_redis")
+    def test_flush_tracking_buffer_task_where_dead_letters_still_fail_should_leave_buffer_and_drop_exhausted(
+        self, mock_get_redis, mock_build
+    ):
+        # Arrange
+        dead_letter = [
+            json.dumps({"attempts": 1, "event": _make_event("user-young")}),
+            json.dumps({"attempts": _DEAD_LETTER_MAX_ATTEMPTS, "event": _make_event("user-exhausted")}),
+        ]
+        mock_r = self._mock_redis(dead_letter=dead_letter)
         mock_get_redis.return_value = mock_r
         client = MagicMock()
         client.track_batch.side_effect = ConnectionError("Mixpanel down")
         mock_build.return_value = client
 
-        with pytest.raises(ConnectionError):
-            flush_tracking_buffer_task.run()
+        # Act
+        flush_tracking_buffer_task.run()
 
-        mock_r.delete.assert_called_once_with(_TRACKING_INFLIGHT_KEY)
+        # Assert
+        mock_r.renamenx.assert_not_called()
+        dead_lettered = self._dead_lettered(mock_r)
+        assert [(entry["attempts"], entry["event"]["distinct_id"]) for entry in dead_lettered] == [(2, "user-young")]
 
     @patch("apps.usage_tracking.tasks._build_ingest_client")
     @patch("apps.usage_tracking.tasks._get_tracking_redis")
     def test_flush_tracking_buffer_task_where_event_is_malformed_json_should_skip_it(self, mock_get_redis, mock_build):
-        mock_r = MagicMock()
-        mock_r.rename.return_value = True
-        mock_r.lrange.return_value = ["not-json", json.dumps(_make_event("user-good"))]
+        mock_r = self._mock_redis(inflight=["not-json", json.dumps(_make_event("user-good"))])
         mock_get_redis.return_value = mock_r
         client = MagicMock()
         mock_build.return_value = client
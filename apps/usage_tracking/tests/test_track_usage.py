@@ -13,6 +13,7 @@ from apps.usage_tracking.decorators.track_usage import (
     _resolve_application,
     track_extra,
     track_usage,
+    usage_event_queue,
 )
 from apps.usage_tracking.tasks import TRACKING_BUFFER_KEY
 
@@ -29,16 +30,22 @@ def _mock_redis():
     return mock_get_redis, mock_r
 
 
+def _pipeline(mock_r):
+    return mock_r.pipeline.return_value
+
+
 def _dispatched_props(mock_r):
-    """Parse the JSON payload pushed to the tracking buffer and return its properties."""
-    assert mock_r.rpush.called, "expected rpush to be called on Redis mock"
-    raw = mock_r.rpush.call_args[0][1]
+    """Flush the event queue, then parse the last payload pushed to the tracking buffer."""
+    usage_event_queue.flush()
+    assert _pipeline(mock_r).rpush.called, "expected rpush to be called on the Redis pipeline"
+    raw = _pipeline(mock_r).rpush.call_args[0][-1]
     return json.loads(raw)["properties"]
 
 
 class TestTrackUsageDecorator:
     def setup_method(self):
         self.factory = RequestFactory()
+        usage_event_queue.clear()
 
     @patch("apps.usage_tracking.decorators.track_usage._get_tracking_redis")
     def test_paginated_list_extracts_entities_and_publishers(self, mock_get_redis):
@@ -66,7 +73,8 @@ class TestTrackUsageDecorator:
         assert props["publisher_names"] == ["Pub10", "Pub20"]
         assert props["status_code"] == 200
         assert "latency_ms" in props
-        mock_r.rpush.assert_called_once_with(TRACKING_BUFFER_KEY, mock_r.rpush.call_args[0][1])
+        _pipeline(mock_r).rpush.assert_called_once_with(TRACKING_BUFFER_KEY, _pipeline(mock_r).rpush.call_args[0][1])
+        _pipeline(mock_r).execute.assert_called_once_with()
 
     @patch("apps.usage_tracking.decorators.track_usage._get_tracking_redis")
     def test_no_publisher_from_leaves_publishers_empty(self, mock_get_redis):
@@ -141,12 +149,13 @@ class TestTrackUsageDecorator:
         except ValueError:
             pass
 
-        mock_r.rpush.assert_not_called()
+        assert usage_event_queue.flush() == 0
+        _pipeline(mock_r).rpush.assert_not_called()
 
     @patch("apps.usage_tracking.decorators.track_usage._get_tracking_redis")
     def test_dispatch_failure_does_not_break_response(self, mock_get_redis):
         mock_r = MagicMock()
-        mock_r.rpush.side_effect = RuntimeError("redis down")
+        _pipeline(mock_r).execute.side_effect = RuntimeError("redis down")
         mock_get_redis.return_value = mock_r
 
         @track_usage()
@@ -156,6 +165,7 @@ class TestTrackUsageDecorator:
         result = view(self.factory.get("/recitations/"))
 
         assert result == {"results": [], "count": 0}
+        assert usage_event_queue.flush() == 0
 
     @patch("apps.usage_tracking.decorators.track_usage._get_tracking_redis")
     def test_query_params_captured(self, mock_get_redis):
@@ -241,7 +251,8 @@ class TestTrackUsageDecorator:
 
         view(self.factory.get("/recitations/"))
 
-        assert mock_r.rpush.call_args[0][0] == TRACKING_BUFFER_KEY
+        usage_event_queue.flush()
+        assert _pipeline(mock_r).rpush.call_args[0][0] == TRACKING_BUFFER_KEY
 
     @patch("apps.usage_tracking.decorators.track_usage._get_tracking_redis")
     def test_dispatch_payload_is_valid_json_with_required_keys(self, mock_get_redis):
@@ -255,7 +266,8 @@ class TestTrackUsageDecorator:
 
         view(self.factory.get("/recitations/"))
 
-        raw = mock_r.rpush.call_args[0][1]
+        usage_event_queue.flush()
+        raw = _pipeline(mock_r).rpush.call_args[0][1]
         payload = json.loads(raw)
         assert "distinct_id" in payload
         assert "event" in payload
@@ -0,0 +1,186 @@
+"""
+Verified API-key cache for ``ApiKeyAuth``.
+
+Resolving an ``X-API-Key`` costs a DB lookup by prefix plus the ninja-keys hash
+verification, on every public request. A verified key is cached here under a
+keyed digest of the presented key -- never the key itself -- with just what the
+auth needs: id, prefix, owner id, expiry and revocation state. Expiry is checked
+on every hit, so an entry never outlives its key.
+
+Only keys that verify are cached: a wrong secret costs a full verification every
+time, as before. Saving or deleting an ``APIKey`` (``ApiKeyService`` update,
+revoke and delete, the admin, user deletion) drops its entry everywhere through
+``invalidate_verified_api_key``.
+"""
+
+from collections import Counter
+from datetime import datetime
+import hashlib
+import threading
+import time
+from typing import TypedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.local_cache import LocalCache
+from apps.users.models import APIKey
+
+VERIFIED_API_KEY_CACHE_TTL = 60 * 5  # 5 minutes
+API_KEY_CACHE_METRICS = ("hits", "misses", "verifications", "verify_us")
+# Counters are batched per process: one shared-cache write per window, not per request.
+_METRICS_FLUSH_SECONDS = 10
+
+verified_api_key_l1 = LocalCache("verified_api_keys", ttl=60)
+
+_metrics_lock = threading.Lock()
+_pending_metrics: Counter[str] = Counter()
+_last_metrics_flush = time.monotonic()
+
+
+class VerifiedApiKey(TypedDict):
+    id: str
+    prefix: str
+    user_id: int
+    expiry_date: datetime | None
+    revoked: bool
+
+
+def api_key_digest(raw_key: str) -> str:
+    """Keyed digest of a presented key: a cache dump reveals nothing usable offline."""
+    secret = settings.SECRET_KEY.encode()[:64]
+    return hashlib.blake2b(raw_key.encode(), key=secret, digest_size=20).hexdigest()
+
+
+def verified_api_key_cache_key(digest: str) -> str:
+    return f"verified_api_key:{digest}"
+
+
+def _verified_api_key_index_key(key_id: str) -> str:
+    # Invalidation starts from the key id, but entries are keyed by the digest of the
+    # raw key, which only the request ever sees; this maps one to the other.
+    return f"verified_api_key:index:{key_id}"
+
+
+def get_verified_api_key(raw_key: str) -> VerifiedApiKey | None:
+    """
+    The verified key for ``raw_key``, or None when it does not verify.
+
+    Revoked and expired keys are returned too (their state is what the caller
+    rejects them on), so repeated use of a revoked key stays a cache hit.
+    """
+    cache_key = verified_api_key_cache_key(api_key_digest(raw_key))
+    entry = verified_api_key_l1.get(cache_key)
+    if entry is None:
+        entry = cache.get(cache_key)
+        if entry is not None:
+            verified_api_key_l1.set(cache_key, entry)
+    if entry is not None:
+        _record("hits")
+        return entry
+
+    _record("misses")
+    return _verify_and_store(raw_key, cache_key)
+
+
+async def aget_verified_api_key(raw_key: str) -> VerifiedApiKey | None:
+    """``get_verified_api_key`` for async views; only a miss leaves the event loop."""
+    cache_key = verified_api_key_cache_key(api_key_digest(raw_key))
+    entry = verified_api_key_l1.get(cache_key)
+    if entry is None:
+        entry = await cache.aget(cache_key)
+        if entry is not None:
+            verified_api_key_l1.set(cache_key, entry)
+    if entry is not None:
+        _record("hits")
+        return entry
+
+    _record("misses")
+    # The lookup and the (deliberately slow) hash check run in a thread.
+    return await sync_to_async(_verify_and_store)(raw_key, cache_key)
+
+
+def _verify_and_store(raw_key: str, cache_key: str) -> VerifiedApiKey | None:
+    api_key = _verify(raw_key)
+    if api_key is None:
+        return None
+    entry = VerifiedApiKey(
+        id=api_key.id,
+        prefix=api_key.prefix,
+        user_id=api_key.user_id,
+        expiry_date=api_key.expiry_date,
+        revoked=api_key.revoked,
+    )
+    cache.set(cache_key, entry, VERIFIED_API_KEY_CACHE_TTL)
+    # Outlives the entry by more than an L1 TTL, so L1 copies stay reachable for invalidation.
+    cache.set(_verified_api_key_index_key(api_key.id), cache_key, VERIFIED_API_KEY_CACHE_TTL * 2)
+    verified_api_key_l1.set(cache_key, entry)
+    return entry
+
+
+def _verify(raw_key: str) -> APIKey | None:
+    prefix, _, _ = raw_key.partition(".")
+    # Unlike ``get_from_key`` revoked keys are looked up too, so their state is cached.
+    api_key = APIKey.objects.filter(prefix=prefix).first()
+    if api_key is None:
+        return None
+    started = time.perf_counter()
+    valid = api_key.is_valid(raw_key)
+    _record("verifications")
+    _record("verify_us", int((time.perf_counter() - started) * 1_000_000))
+    return api_key if valid else None
+
+
+def invalidate_verified_api_key(key_id: str) -> None:
+    index_key = _verified_api_key_index_key(key_id)
+    cache_key = cache.get(index_key)
+    if cache_key is None:
+        return
+    verified_api_key_l1.invalidate([cache_key, index_key])
+
+
+def _api_key_metric_key(metric: str) -> str:
+    return f"verified_api_key:metrics:{metric}"
+
+
+def _record(metric: str, amount: int = 1) -> None:
+    global _last_metrics_flush
+    with _metrics_lock:
+        _pending_metrics[metric] += amount
+        now = time.monotonic()
+        if now - _last_metrics_flush < _METRICS_FLUSH_SECONDS:
+            return
+        _last_metrics_flush = now
+    _flush_metrics()
+
+
+def _flush_metrics() -> None:
+    with _metrics_lock:
+        pending = dict(_pending_metrics)
+        _pending_metrics.clear()
+    for metric, amount in pending.items():
+        key = _api_key_metric_key(metric)
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            if not cache.add(key, amount, timeout=None):
+                cache.incr(key, amount)
+
+
+def api_key_cache_metrics() -> dict[str, float]:
+    """
+    Counters across all workers, plus the derived hit rate and mean verify latency.
+
+    This process's unflushed counts are written first; other workers' may lag by
+    up to the flush window.
+    """
+    _flush_metrics()
+    found = cache.get_many([_api_key_metric_key(metric) for metric in API_KEY_CACHE_METRICS])
+    metrics: dict[str, float] = {metric: found.get(_api_key_metric_key(metric), 0) for metric in API_KEY_CACHE_METRICS}
+    lookups = metrics["hits"] + metrics["misses"]
+    metrics["hit_rate"] = metrics["hits"] / lookups if lookups else 0.0
+    metrics["verify_avg_ms"] = (
+        metrics["verify_us"] / metrics["verifications"] / 1000 if metrics["verifications"] else 0.0
+    )
+    return metrics
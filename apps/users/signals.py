@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.users.cache import invalidate_verified_api_key
+from apps.users.models import APIKey
+
+
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def clear_verified_api_key_cache(sender: type[APIKey], instance: APIKey, **kwargs: object) -> None:
+    # Again after commit: a request in between may have re-cached the pre-commit row,
+    # and a revoked key must not stay usable until the entry's TTL.
+    key_id = instance.pk
+    invalidate_verified_api_key(key_id)
+    transaction.on_commit(lambda: invalidate_verified_api_key(key_id))
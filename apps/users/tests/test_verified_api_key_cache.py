@@ -0,0 +1,137 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.utils import timezone
+from model_bakery import baker
+from ninja.errors import AuthenticationError
+
+from apps.core.ninja_utils.auth import ApiKeyAuth, PublicAuth
+from apps.core.tests.base import BaseTestCase
+from apps.users.cache import (
+    api_key_cache_metrics,
+    api_key_digest,
+    get_verified_api_key,
+    verified_api_key_cache_key,
+)
+from apps.users.models import APIKey, User
+from apps.users.services.api_key import ApiKeyService
+
+
+class VerifiedApiKeyCacheTest(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = baker.make(User)
+
+    def setUp(self):
+        api_key_cache_metrics()  # flushes counts earlier tests left pending in this process
+        cache.clear()
+        self.api_key, self.raw_key = APIKey.objects.create_key(name="Cached Key", user=self.user)
+
+    def test_get_verified_api_key_where_cached_should_not_query_or_verify(self):
+        # Arrange
+        get_verified_api_key(self.raw_key)
+
+        # Act
+        with self.assertNumQueries(0):
+            verified = get_verified_api_key(self.raw_key)
+
+        # Assert
+        self.assertEqual(self.api_key.id, verified["id"])
+        self.assertEqual(self.api_key.prefix, verified["prefix"])
+        self.assertEqual(self.user.id, verified["user_id"])
+        metrics = api_key_cache_metrics()
+        self.assertEqual(1, metrics["hits"])
+        self.assertEqual(1, metrics["verifications"])
+        self.assertEqual(0.5, metrics["hit_rate"])
+
+    def test_get_verified_api_key_where_secret_is_wrong_should_return_none(self):
+        # Arrange
+        prefix, _, _ = self.raw_key.partition(".")
+
+        # Act
+        verified = get_verified_api_key(f"{prefix}.wrong-secret")
+
+        # Assert
+        self.assertIsNone(verified)
+        self.assertIsNotNone(get_verified_api_key(self.raw_key))
+
+    def test_get_verified_api_key_where_revoked_through_service_should_reflect_revocation(self):
+        # Arrange
+        get_verified_api_key(self.raw_key)
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            ApiKeyService().update(self.user, self.api_key.id, {"revoked": True})
+
+        # Assert
+        self.assertTrue(get_verified_api_key(self.raw_key)["revoked"])
+
+    def test_get_verified_api_key_where_deleted_through_service_should_return_none(self):
+        # Arrange
+        get_verified_api_key(self.raw_key)
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            ApiKeyService().delete(self.user, self.api_key.id)
+
+        # Assert
+        self.assertIsNone(get_verified_api_key(self.raw_key))
+
+
+class ApiKeyAuthTest(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = baker.make(User)
+
+    def setUp(self):
+        cache.clear()
+        self.api_key, self.raw_key = APIKey.objects.create_key(name="Auth Key", user=self.user)
+
+    def test_authenticate_where_key_is_valid_should_return_key_and_bind_owner(self):
+        # Arrange
+        request = RequestFactory().get("/recitations/")
+
+        # Act
+        result = ApiKeyAuth().authenticate(request, self.raw_key)
+
+        # Assert
+        self.assertEqual(self.api_key.prefix, result.prefix)
+        self.assertEqual(self.user.pk, request.user.pk)
+
+    def test_authenticate_where_key_is_revoked_should_return_none(self):
+        # Arrange
+        with self.captureOnCommitCallbacks(execute=True):
+            ApiKeyService().update(self.user, self.api_key.id, {"revoked": True})
+
+        # Act
+        result = ApiKeyAuth().authenticate(RequestFactory().get("/recitations/"), self.raw_key)
+
+        # Assert
+        self.assertIsNone(result)
+
+    def test_authenticate_where_expired_after_caching_should_raise(self):
+        # Arrange - cached while valid, then the expiry passes without any write
+        with self.captureOnCommitCallbacks(execute=True):
+            ApiKeyService().update(self.user, self.api_key.id, {"expiry_date": timezone.now() + timedelta(minutes=1)})
+        cached = get_verified_api_key(self.raw_key)
+        cached["expiry_date"] = timezone.now() - timedelta(seconds=1)
+        cache.set(verified_api_key_cache_key(api_key_digest(self.raw_key)), cached)
+
+        # Act / Assert
+        with self.assertRaises(AuthenticationError):
+            ApiKeyAuth().authenticate(RequestFactory().get("/recitations/"), self.raw_key)
+
+    async def test_public_auth_where_called_in_event_loop_should_resolve_key_and_owner_eagerly(self):
+        # Arrange
+        request = RequestFactory().get("/recitations/", HTTP_X_API_KEY=self.raw_key)
+
+        # Act
+        result = await PublicAuth()(request)
+
+        # Assert
+        self.assertEqual(self.api_key.prefix, result.prefix)
+        self.assertIsInstance(request.user, User)
+        self.assertEqual(self.user.pk, request.user.pk)
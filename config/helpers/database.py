@@ -0,0 +1,34 @@
+from typing import Any
+
+from decouple import config
+
+
+def connection_reuse_settings() -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Connection reuse for deployed databases, as ``(database settings, OPTIONS)`` to merge.
+
+    With ``DB_POOL`` on (the default), each process keeps a psycopg pool (Django 5.1+);
+    connections are checked out per request and returned at its end, which also suits
+    ASGI, where sync ORM calls run on per-request executor threads. With it off,
+    connections last ``DB_CONN_MAX_AGE`` seconds, 0 (one per request) by default:
+    persistent connections pile up under ASGI, so only raise it for WSGI deployments.
+
+    Pool sizes are per process: every gunicorn worker and every Celery prefork child
+    owns one, so the server sees up to (workers + celery concurrency) x DB_POOL_MAX_SIZE.
+    """
+    if config("DB_POOL", cast=bool, default=True):
+        pool = {
+            "min_size": config("DB_POOL_MIN_SIZE", cast=int, default=1),
+            "max_size": config("DB_POOL_MAX_SIZE", cast=int, default=4),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": config("DB_POOL_TIMEOUT", cast=float, default=10),
+            # Idle connections above min_size are closed after this many seconds.
+            "max_idle": config("DB_POOL_MAX_IDLE", cast=float, default=300),
+            # Recycled after this long, so failovers and server restarts are picked up.
+            "max_lifetime": config("DB_POOL_MAX_LIFETIME", cast=float, default=1800),
+        }
+        return {"CONN_MAX_AGE": 0}, {"pool": pool}
+    return {
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", cast=int, default=0),
+        "CONN_HEALTH_CHECKS": True,
+    }, {}
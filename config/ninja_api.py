@@ -9,6 +9,7 @@ from ninja.types import TCallable
 from scalar_ninja import ScalarViewer
 
 from apps.core.ninja_utils.parser import NinjaParser
+from apps.core.ninja_utils.renderer import NinjaRenderer
 from apps.core.ninja_utils.router import ItqanRouter
 from apps.core.ninja_utils.throttle import NinjaUserPathRateThrottle
 
@@ -49,6 +50,7 @@ def create_ninja_api(
         default_router=router,
         throttle=throttle,
         parser=parser,
+        renderer=NinjaRenderer(),
         docs=ScalarViewer(openapi_url=f"{docs_base_path}/openapi.json", hide_models=True),
         docs_url="/docs/",
         urls_namespace=urls_namespace,
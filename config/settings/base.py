@@ -70,6 +70,8 @@ LOCAL_APPS = ["apps.core", "apps.content", "apps.users", "apps.publishers", "app
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # Before anything that reads or rewrites response bodies; compresses JSON only.
+    "apps.core.middlewares.compression.CompressionMiddleware",
     "ninja.compatibility.files.fix_request_files_middleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -174,6 +176,22 @@ AYAH_SLICING_WARN_ESTIMATED_BYTES = config("AYAH_SLICING_WARN_ESTIMATED_BYTES",
 R2_STORAGE_COST_PER_GB_MONTH = config("R2_STORAGE_COST_PER_GB_MONTH", cast=float, default=0)
 R2_EGRESS_COST_PER_GB = config("R2_EGRESS_COST_PER_GB", cast=float, default=0)
 
+# Per-track ayah slicing parallelism: how many ffmpeg processes RecitationAudioSlicingService
+# runs at once for one surah. Each process seeks to its own ayah, so this scales with cores.
+AYAH_SLICING_MAX_WORKERS = config("AYAH_SLICING_MAX_WORKERS", cast=int, default=4)
+
+# R2UploadPipeline: concurrent PUT threads, and how many finished objects may wait for
+# upload before the producer blocks (bounds memory/disk held by a fast producer).
+R2_UPLOAD_MAX_WORKERS = config("R2_UPLOAD_MAX_WORKERS", cast=int, default=8)
+R2_UPLOAD_MAX_PENDING = config("R2_UPLOAD_MAX_PENDING", cast=int, default=32)
+
+# Public ayah-range audio: longest range (in ayahs) combined on request, and the R2 byte
+# budget for cached combined files; the least recently served ranges are evicted beyond it.
+AYAH_RANGE_MAX_AYAHS = config("AYAH_RANGE_MAX_AYAHS", cast=int, default=50)
+AYAH_RANGE_CACHE_MAX_BYTES = config("AYAH_RANGE_CACHE_MAX_BYTES", cast=int, default=10 * 1024**3)
+# Concurrent slice downloads while combining a cold range.
+AYAH_RANGE_DOWNLOAD_MAX_WORKERS = config("AYAH_RANGE_DOWNLOAD_MAX_WORKERS", cast=int, default=8)
+
 # Use R2 if configured, otherwise fall back to local storage
 if CLOUDFLARE_R2_ENDPOINT:
     CLOUDFLARE_R2_CONFIG_OPTIONS = {
@@ -539,8 +557,15 @@ PUBLIC_API_ANON_THROTTLE_RATE = config("PUBLIC_API_ANON_THROTTLE_RATE", default=
 
 # Ninja configs
 NINJA_PAGINATION_CLASS = "apps.core.ninja_utils.paginations.NinjaPagination"
-NINJA_SEARCHING_CLASS = "apps.core.ninja_utils.searching.Searching"
+# Uses the trigram-indexed search documents on Postgres and falls back to
+# apps.core.ninja_utils.searching.Searching (per-field icontains) everywhere else.
+NINJA_SEARCHING_CLASS = config(
+    "NINJA_SEARCHING_CLASS", default="apps.core.ninja_utils.searching_postgres.PostgresSearching"
+)
 NINJA_ORDERING_CLASS = "apps.core.ninja_utils.ordering.Ordering"
+# Paginated lists whose planner estimate reaches this many rows report the estimate
+# (count_kind="estimated") instead of running COUNT(*). Postgres only.
+LIST_COUNT_ESTIMATE_THRESHOLD = config("LIST_COUNT_ESTIMATE_THRESHOLD", default=50_000, cast=int)
 
 RUNNING_TESTS = False
 if (len(sys.argv) >= 2 and sys.argv[0].endswith("manage.py") and sys.argv[1] == "test") or ("pytest" in sys.argv[0]):
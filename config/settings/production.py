@@ -5,6 +5,8 @@ Itqan CMS - Production Settings
 from decouple import config
 from django.conf import settings
 
+from config.helpers.database import connection_reuse_settings
+
 from .base import *  # noqa: F401, F403
 
 # ============================================================
@@ -52,14 +54,19 @@ CORS_ALLOWED_ORIGINS = [
 # Database
 # ============================================================
 
+# Pooled connections: a fresh TLS handshake per request dominated
+# cache-miss latency. Sizes and timeouts are DB_POOL_* env vars; see the helper.
+_connection_reuse, _pool_options = connection_reuse_settings()
+
 settings.DATABASES["default"].update(
     {
         "ENGINE": "django.db.backends.postgresql",
-        "CONN_MAX_AGE": 0,
         "DISABLE_SERVER_SIDE_CURSORS": True,
+        **_connection_reuse,
         "OPTIONS": {
             "sslmode": "require",
             "connect_timeout": 10,
+            **_pool_options,
         },
     }
 )
@@ -5,6 +5,8 @@ Itqan CMS - Staging Settings
 from decouple import config
 from django.conf import settings
 
+from config.helpers.database import connection_reuse_settings
+
 from .base import *  # noqa: F401, F403
 
 # ============================================================
@@ -35,6 +37,8 @@ X_FRAME_OPTIONS = "DENY"
 # Database
 # ============================================================
 
+_connection_reuse, _pool_options = connection_reuse_settings()
+
 settings.DATABASES.update(
     {
         "default": {
@@ -44,9 +48,11 @@ settings.DATABASES.update(
             "PASSWORD": config("DB_PASSWORD"),
             "HOST": config("DB_HOST"),
             "PORT": config("DB_PORT"),
+            **_connection_reuse,
             "OPTIONS": {
                 "sslmode": "require",
                 "connect_timeout": 10,
+                **_pool_options,
             },
         }
     }